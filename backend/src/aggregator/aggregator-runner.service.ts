@@ -8,10 +8,20 @@ import { RollupConfigService } from "./rollup-config.service";
 import { MinuteWindowPlanner } from "./window-planner.service";
 import { SpanMinuteAggregationService } from "./span-minute-aggregation.service";
 import { RollupMetricsRepository } from "./rollup-metrics.repository";
-import { RollupCheckpointService } from "./rollup-checkpoint.service";
+import {
+  RollupCheckpointService,
+  shardCheckpointId,
+} from "./rollup-checkpoint.service";
+import { RollupTierCascadeService } from "./rollup-tier-cascade.service";
+import { RollupBackfillService } from "./rollup-backfill.service";
+import { RollupLeaseService } from "./rollup-lease.service";
+import type { MinuteWindow } from "./types/minute-window.type";
+import type { RollupShard } from "./types/rollup-shard.type";
 
 /**
  * 주기적으로 롤업 집계를 실행하는 메인 실행기
+ * - 레플리카마다 리스로 잡은 서비스 샤드만 1분 롤업하고 샤드별 체크포인트를 남긴다.
+ * - 늦은 스팬 재집계와 상위 티어 cascade 는 코디네이터 리스를 잡은 레플리카 하나만 수행한다.
  */
 @Injectable()
 export class AggregatorRunner implements OnModuleInit, OnModuleDestroy {
@@ -25,6 +35,9 @@ export class AggregatorRunner implements OnModuleInit, OnModuleDestroy {
     private readonly spanAggregator: SpanMinuteAggregationService,
     private readonly rollupRepository: RollupMetricsRepository,
     private readonly checkpoint: RollupCheckpointService,
+    private readonly tierCascade: RollupTierCascadeService,
+    private readonly backfill: RollupBackfillService,
+    private readonly lease: RollupLeaseService,
   ) {}
 
   async onModuleInit(): Promise<void> {
@@ -68,35 +81,152 @@ export class AggregatorRunner implements OnModuleInit, OnModuleDestroy {
     this.running = true;
     try {
       this.logger.log("롤업 집계 사이클을 시작합니다.");
-      const windows = await this.windowPlanner.plan();
-      if (windows.length === 0) {
-        this.logger.log("집계 가능한 닫힌 분이 없어 이번 주기를 건너뜁니다.");
+      const shards = await this.lease.acquireShards();
+      if (shards.length === 0) {
+        this.logger.log(
+          "다른 레플리카가 모든 샤드를 맡고 있어 1분 롤업을 건너뜁니다.",
+        );
+      }
+
+      let completed = true;
+      for (const shard of shards) {
+        completed = (await this.processShard(shard)) && completed;
+      }
+      if (!completed || !(await this.lease.acquireCoordinator())) {
         return;
       }
 
-      for (const window of windows) {
-        const started = Date.now();
-        try {
-          const documents = await this.spanAggregator.aggregate(window);
-          if (documents.length > 0) {
-            await this.rollupRepository.bulkCreate(documents);
-          }
-          await this.checkpoint.saveCheckpoint(window.end);
-          const elapsed = Date.now() - started;
-          this.logger.log(
-            `1분 롤업 완료 window=${window.start.toISOString()}~${window.end.toISOString()} docs=${documents.length} elapsed=${elapsed}ms`,
-          );
-        } catch (error) {
-          this.logger.error(
-            `윈도우 집계 중 오류가 발생했습니다. window=${window.start.toISOString()}~${window.end.toISOString()}`,
-            error instanceof Error ? error.stack : String(error),
+      await this.advanceDefaultCheckpoint();
+      await this.reaggregateLateMinutes();
+      await this.cascadeTiers();
+    } finally {
+      this.running = false;
+    }
+  }
+
+  /**
+   * @returns 샤드의 닫힌 분을 모두 처리했으면 true
+   */
+  private async processShard(shard: RollupShard): Promise<boolean> {
+    const windows = await this.windowPlanner.plan(new Date(), shard);
+    if (windows.length === 0) {
+      this.logger.log(
+        `집계 가능한 닫힌 분이 없어 이번 주기를 건너뜁니다. shard=${shard.index}/${shard.count}`,
+      );
+    }
+
+    // 밀린 분이 많으면 여러 분을 묶어 병렬로 따라잡는다.
+    return this.backfill.shouldBackfill(windows)
+      ? this.backfill.run(windows, shard)
+      : this.processWindows(windows, shard);
+  }
+
+  /**
+   * 닫힌 분을 하나씩 집계하고 분마다 체크포인트를 저장한다.
+   * @returns 모든 분을 처리했으면 true
+   */
+  private async processWindows(
+    windows: MinuteWindow[],
+    shard: RollupShard,
+  ): Promise<boolean> {
+    for (const window of windows) {
+      const started = Date.now();
+      try {
+        if (!(await this.lease.ensureHeld(shard))) {
+          this.logger.warn(
+            `샤드 리스를 잃어 집계를 멈춥니다. shard=${shard.index}/${shard.count}`,
           );
-          // 오류가 발생해도 다음 반복에서는 동일 윈도우부터 다시 시도할 수 있도록 바로 반환한다.
-          return;
+          return false;
         }
+        const { serviceDocuments, endpointDocuments } =
+          await this.spanAggregator.aggregate(window, shard);
+        await this.rollupRepository.bulkCreate(serviceDocuments);
+        await this.rollupRepository.bulkCreate(
+          endpointDocuments,
+          "apmEndpointRollupMetrics",
+        );
+        await this.checkpoint.saveCheckpoint(window.end, shard.checkpointId);
+        const elapsed = Date.now() - started;
+        this.logger.log(
+          `1분 롤업 완료 shard=${shard.index}/${shard.count} window=${window.start.toISOString()}~${window.end.toISOString()} docs=${serviceDocuments.length} endpoint_docs=${endpointDocuments.length} elapsed=${elapsed}ms`,
+        );
+      } catch (error) {
+        this.logger.error(
+          `윈도우 집계 중 오류가 발생했습니다. window=${window.start.toISOString()}~${window.end.toISOString()}`,
+          error instanceof Error ? error.stack : String(error),
+        );
+        // 오류가 발생해도 다음 반복에서는 동일 윈도우부터 다시 시도할 수 있도록 바로 반환한다.
+        return false;
       }
-    } finally {
-      this.running = false;
+    }
+    return true;
+  }
+
+  /**
+   * 모든 샤드가 집계를 마친 지점까지 기본 체크포인트를 옮긴다.
+   * (재집계와 상위 티어 cascade 는 기본 체크포인트까지만 믿고 읽는다)
+   */
+  private async advanceDefaultCheckpoint(): Promise<void> {
+    const count = this.config.getShardCount();
+    if (count <= 1) {
+      return;
+    }
+    const ids = Array.from({ length: count }, (_, index) =>
+      shardCheckpointId(index, count),
+    );
+    const earliest = await this.checkpoint.loadEarliestCheckpoint(ids);
+    if (!earliest) {
+      return;
+    }
+    const current = await this.checkpoint.loadLastCheckpoint();
+    if (current && current.getTime() >= earliest.getTime()) {
+      return;
+    }
+    await this.checkpoint.saveCheckpoint(earliest);
+  }
+
+  /**
+   * 유예 기간 안에서 늦게 도착한 스팬이 있는 분을 다시 집계해 덮어쓰고, 이미 만든 상위 티어도 고친다.
+   */
+  private async reaggregateLateMinutes(): Promise<void> {
+    try {
+      const late = await this.windowPlanner.planLateWindows();
+      if (late.length === 0) {
+        return;
+      }
+      const windows = late.map((minute) => minute.window);
+      for (const window of windows) {
+        const { serviceDocuments, endpointDocuments } =
+          await this.spanAggregator.aggregate(window);
+        await this.rollupRepository.bulkUpsert(serviceDocuments);
+        await this.rollupRepository.bulkUpsert(
+          endpointDocuments,
+          "apmEndpointRollupMetrics",
+        );
+      }
+      await this.tierCascade.recascade(windows);
+      this.windowPlanner.markReconciled(late);
+      this.logger.log(
+        `늦게 도착한 스팬을 반영해 재집계했습니다. minutes=${windows.map((window) => window.start.toISOString()).join(",")}`,
+      );
+    } catch (error) {
+      // 기록하지 않은 분은 다음 주기에 다시 비교해 재시도한다.
+      this.logger.error(
+        "늦게 도착한 스팬 재집계 중 오류가 발생했습니다.",
+        error instanceof Error ? error.stack : String(error),
+      );
+    }
+  }
+
+  private async cascadeTiers(): Promise<void> {
+    try {
+      await this.tierCascade.cascade();
+    } catch (error) {
+      // 티어 체크포인트가 남아 있으므로 다음 주기에 실패한 버킷부터 다시 합친다.
+      this.logger.error(
+        "상위 티어 롤업 중 오류가 발생했습니다.",
+        error instanceof Error ? error.stack : String(error),
+      );
     }
   }
 }
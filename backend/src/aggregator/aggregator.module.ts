@@ -3,8 +3,12 @@ import { LogInfrastructureModule } from "../shared/logs/logs.module";
 import { RollupConfigService } from "./rollup-config.service";
 import { RollupCheckpointService } from "./rollup-checkpoint.service";
 import { MinuteWindowPlanner } from "./window-planner.service";
+import { LateArrivalDetector } from "./late-arrival-detector.service";
 import { SpanMinuteAggregationService } from "./span-minute-aggregation.service";
 import { RollupMetricsRepository } from "./rollup-metrics.repository";
+import { RollupTierCascadeService } from "./rollup-tier-cascade.service";
+import { RollupBackfillService } from "./rollup-backfill.service";
+import { RollupLeaseService } from "./rollup-lease.service";
 import { AggregatorRunner } from "./aggregator-runner.service";
 
 /**
@@ -15,9 +19,13 @@ import { AggregatorRunner } from "./aggregator-runner.service";
   providers: [
     RollupConfigService,
     RollupCheckpointService,
+    RollupLeaseService,
+    LateArrivalDetector,
     MinuteWindowPlanner,
     SpanMinuteAggregationService,
     RollupMetricsRepository,
+    RollupTierCascadeService,
+    RollupBackfillService,
     AggregatorRunner,
   ],
 })
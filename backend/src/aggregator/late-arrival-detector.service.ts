@@ -0,0 +1,168 @@
+import { Injectable, Logger } from "@nestjs/common";
+import type { Client } from "@elastic/elasticsearch";
+import { LogStorageService } from "../shared/logs/log-storage.service";
+import { RollupConfigService } from "./rollup-config.service";
+import type { MinuteWindow } from "./types/minute-window.type";
+
+export interface LateMinute {
+  window: MinuteWindow;
+  // 감지 시점의 RAW 스팬 수 (SERVER 스팬)
+  spanCount: number;
+}
+
+interface MinuteCountResponse {
+  minutes?: {
+    buckets: Array<{
+      key: number;
+      doc_count: number;
+      requests?: { value: number | null };
+    }>;
+  };
+}
+
+/**
+ * 이미 롤업한 분에 늦게 도착한 스팬이 있는지 찾는다.
+ * - 분마다 RAW 스팬 수와 롤업 문서의 request_count 합계를 date_histogram 두 번으로 비교한다.
+ * - 서비스/환경 terms 상한 때문에 합계가 계속 모자란 분은, RAW 스팬 수가 다시 늘어날 때만 재집계하도록
+ *   마지막으로 맞춘 스팬 수를 기억한다.
+ */
+@Injectable()
+export class LateArrivalDetector {
+  private readonly logger = new Logger(LateArrivalDetector.name);
+  private readonly client: Client;
+  private readonly spanIndex: string;
+  private readonly rollupIndex: string;
+  // 분 시작 시각(ms) → 마지막으로 재집계했을 때의 RAW 스팬 수
+  private readonly reconciled = new Map<number, number>();
+
+  constructor(
+    storage: LogStorageService,
+    private readonly config: RollupConfigService,
+  ) {
+    this.client = storage.getClient();
+    this.spanIndex = storage.getDataStream("apmSpans");
+    this.rollupIndex = storage.getDataStream("apmRollupMetrics");
+  }
+
+  async findLateMinutes(from: Date, to: Date): Promise<LateMinute[]> {
+    const [spanCounts, rolledUpCounts] = await Promise.all([
+      this.countSpans(from, to),
+      this.countRolledUp(from, to),
+    ]);
+
+    for (const minute of this.reconciled.keys()) {
+      if (minute < from.getTime()) {
+        this.reconciled.delete(minute);
+      }
+    }
+
+    const bucketMs = this.config.getBucketDurationMs();
+    const late: LateMinute[] = [];
+    let lateSpans = 0;
+    for (const [minute, spanCount] of spanCounts) {
+      const rolledUp = rolledUpCounts.get(minute) ?? 0;
+      if (spanCount <= rolledUp || this.reconciled.get(minute) === spanCount) {
+        continue;
+      }
+      lateSpans += spanCount - rolledUp;
+      late.push({
+        window: { start: new Date(minute), end: new Date(minute + bucketMs) },
+        spanCount,
+      });
+    }
+
+    if (late.length > 0) {
+      this.logger.log(
+        `롤업 이후 늦게 도착한 스팬을 발견했습니다. minutes=${late.length} late_spans=${lateSpans} range=${from.toISOString()}~${to.toISOString()}`,
+      );
+    }
+    return late.sort(
+      (a, b) => a.window.start.getTime() - b.window.start.getTime(),
+    );
+  }
+
+  /**
+   * 재집계를 마친 분의 스팬 수를 기록한다.
+   */
+  markReconciled(minutes: LateMinute[]): void {
+    for (const minute of minutes) {
+      this.reconciled.set(minute.window.start.getTime(), minute.spanCount);
+    }
+  }
+
+  private async countSpans(
+    from: Date,
+    to: Date,
+  ): Promise<Map<number, number>> {
+    const response = await this.client.search<unknown, MinuteCountResponse>({
+      index: this.spanIndex,
+      size: 0,
+      query: {
+        bool: {
+          filter: [
+            { term: { kind: "SERVER" } },
+            {
+              range: {
+                "@timestamp": {
+                  gte: from.toISOString(),
+                  lt: to.toISOString(),
+                },
+              },
+            },
+          ],
+        },
+      },
+      aggs: {
+        minutes: {
+          date_histogram: {
+            field: "@timestamp",
+            fixed_interval: `${this.config.getBucketDurationSeconds()}s`,
+            min_doc_count: 1,
+          },
+        },
+      },
+    });
+    return new Map(
+      (response.aggregations?.minutes?.buckets ?? []).map((bucket) => [
+        bucket.key,
+        bucket.doc_count,
+      ]),
+    );
+  }
+
+  private async countRolledUp(
+    from: Date,
+    to: Date,
+  ): Promise<Map<number, number>> {
+    const response = await this.client.search<unknown, MinuteCountResponse>({
+      index: this.rollupIndex,
+      size: 0,
+      query: {
+        range: {
+          "@timestamp_bucket": {
+            gte: from.toISOString(),
+            lt: to.toISOString(),
+          },
+        },
+      },
+      aggs: {
+        minutes: {
+          date_histogram: {
+            field: "@timestamp_bucket",
+            fixed_interval: `${this.config.getBucketDurationSeconds()}s`,
+            min_doc_count: 1,
+          },
+          aggs: {
+            requests: { sum: { field: "request_count" } },
+          },
+        },
+      },
+    });
+    return new Map(
+      (response.aggregations?.minutes?.buckets ?? []).map((bucket) => [
+        bucket.key,
+        bucket.requests?.value ?? 0,
+      ]),
+    );
+  }
+}
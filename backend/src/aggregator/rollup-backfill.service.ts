@@ -0,0 +1,190 @@
+import { Injectable, Logger } from "@nestjs/common";
+import { RollupConfigService } from "./rollup-config.service";
+import { SpanMinuteAggregationService } from "./span-minute-aggregation.service";
+import { RollupMetricsRepository } from "./rollup-metrics.repository";
+import { RollupCheckpointService } from "./rollup-checkpoint.service";
+import { RollupLeaseService } from "./rollup-lease.service";
+import type { MinuteWindow } from "./types/minute-window.type";
+import type { MinuteRollupResult } from "./types/minute-rollup-result.type";
+import type { RollupShard } from "./types/rollup-shard.type";
+
+/**
+ * 밀린 닫힌 분을 빠르게 따라잡는 백필 실행기
+ * - 연속된 분을 묶어 date_histogram 검색 한 번으로 집계하고, 여러 묶음을 동시에 처리한다.
+ * - 체크포인트는 앞에서부터 연속으로 끝난 묶음까지만, 일정 간격으로 모아서 저장한다.
+ *   (먼저 끝난 뒤쪽 묶음은 재시도 시 create 충돌로 건너뛰므로 중복 저장되지 않는다)
+ * - 묶음마다 샤드 리스를 확인해, 리스를 잃으면 넘겨받은 레플리카에 맡기고 멈춘다.
+ */
+@Injectable()
+export class RollupBackfillService {
+  private readonly logger = new Logger(RollupBackfillService.name);
+
+  constructor(
+    private readonly config: RollupConfigService,
+    private readonly spanAggregator: SpanMinuteAggregationService,
+    private readonly rollupRepository: RollupMetricsRepository,
+    private readonly checkpoint: RollupCheckpointService,
+    private readonly lease: RollupLeaseService,
+  ) {}
+
+  shouldBackfill(windows: MinuteWindow[]): boolean {
+    return (
+      this.config.isBackfillEnabled() &&
+      windows.length >= this.config.getBackfillThresholdMinutes()
+    );
+  }
+
+  /**
+   * @returns 모든 분을 처리했으면 true, 중간에 실패했으면 false
+   */
+  async run(windows: MinuteWindow[], shard: RollupShard): Promise<boolean> {
+    const perQuery = this.config.getBackfillMinutesPerQuery();
+    const groups: MinuteWindow[][] = [];
+    for (let index = 0; index < windows.length; index += perQuery) {
+      groups.push(windows.slice(index, index + perQuery));
+    }
+    const concurrency = Math.min(
+      this.config.getBackfillConcurrency(),
+      groups.length,
+    );
+    const checkpointIntervalMs = this.config.getBackfillCheckpointIntervalMs();
+    this.logger.log(
+      `백필 모드로 밀린 분을 집계합니다. shard=${shard.index}/${shard.count} minutes=${windows.length} groups=${groups.length} minutes_per_query=${perQuery} concurrency=${concurrency}`,
+    );
+
+    const started = Date.now();
+    const completed = new Array<boolean>(groups.length).fill(false);
+    let nextGroup = 0;
+    let failed = false;
+    let caughtUpMinutes = 0;
+    // 앞에서부터 연속으로 끝난 묶음 수와, 마지막으로 저장한 값
+    let watermark = 0;
+    let savedWatermark = 0;
+    let lastSavedAt = started;
+    // 저장 요청이 순서대로 반영되도록 직렬화한다.
+    let saving: Promise<void> = Promise.resolve();
+
+    const saveProgress = (force: boolean): Promise<void> => {
+      while (watermark < groups.length && completed[watermark]) {
+        watermark += 1;
+      }
+      if (watermark === savedWatermark) {
+        return saving;
+      }
+      if (!force && Date.now() - lastSavedAt < checkpointIntervalMs) {
+        return saving;
+      }
+      savedWatermark = watermark;
+      lastSavedAt = Date.now();
+      const lastGroup = groups[watermark - 1];
+      const windowEnd = lastGroup[lastGroup.length - 1].end;
+      saving = saving.then(async () => {
+        await this.checkpoint.saveCheckpoint(windowEnd, shard.checkpointId);
+        this.logger.log(
+          `백필 진행 caught_up=${caughtUpMinutes}/${windows.length}분 rate=${this.formatRate(caughtUpMinutes, started)}분/s checkpoint=${windowEnd.toISOString()}`,
+        );
+      });
+      return saving;
+    };
+
+    const worker = async (): Promise<void> => {
+      while (!failed && nextGroup < groups.length) {
+        const index = nextGroup;
+        nextGroup += 1;
+        const group = groups[index];
+        try {
+          if (!(await this.lease.ensureHeld(shard))) {
+            failed = true;
+            this.logger.warn(
+              `샤드 리스를 잃어 백필을 멈춥니다. shard=${shard.index}/${shard.count}`,
+            );
+            return;
+          }
+          await this.processGroup(group, shard);
+        } catch (error) {
+          failed = true;
+          this.logger.error(
+            `백필 묶음 집계 중 오류가 발생했습니다. window=${group[0].start.toISOString()}~${group[group.length - 1].end.toISOString()}`,
+            error instanceof Error ? error.stack : String(error),
+          );
+          return;
+        }
+        completed[index] = true;
+        caughtUpMinutes += group.length;
+        await saveProgress(false);
+      }
+    };
+
+    try {
+      await Promise.all(Array.from({ length: concurrency }, () => worker()));
+    } finally {
+      await saveProgress(true);
+    }
+
+    const elapsed = Date.now() - started;
+    this.logger.log(
+      `백필 ${failed ? "중단" : "완료"} caught_up=${caughtUpMinutes}/${windows.length}분 elapsed=${elapsed}ms rate=${this.formatRate(caughtUpMinutes, started)}분/s`,
+    );
+    return !failed;
+  }
+
+  private async processGroup(
+    group: MinuteWindow[],
+    shard: RollupShard,
+  ): Promise<void> {
+    const { serviceDocuments, endpointDocuments } = await this.aggregateGroup(
+      group,
+      shard,
+    );
+    await this.rollupRepository.bulkCreate(serviceDocuments);
+    await this.rollupRepository.bulkCreate(
+      endpointDocuments,
+      "apmEndpointRollupMetrics",
+    );
+  }
+
+  /**
+   * search.max_buckets 를 넘으면 묶음을 반으로 나눠 다시 시도한다.
+   */
+  private async aggregateGroup(
+    group: MinuteWindow[],
+    shard: RollupShard,
+  ): Promise<MinuteRollupResult> {
+    try {
+      return await this.spanAggregator.aggregateRange(group, shard);
+    } catch (error) {
+      if (!this.isTooManyBuckets(error)) {
+        throw error;
+      }
+      if (group.length <= 1) {
+        // 한 분만으로도 한도를 넘으면 엔드포인트를 나눠 집계하는 분 단위 경로로 넘긴다.
+        return this.spanAggregator.aggregate(group[0], shard);
+      }
+      const middle = Math.ceil(group.length / 2);
+      this.logger.warn(
+        `집계 버킷 수 한도를 넘어 묶음을 나눕니다. minutes=${group.length} → ${middle}+${group.length - middle}`,
+      );
+      const left = await this.aggregateGroup(group.slice(0, middle), shard);
+      const right = await this.aggregateGroup(group.slice(middle), shard);
+      return {
+        serviceDocuments: [...left.serviceDocuments, ...right.serviceDocuments],
+        endpointDocuments: [
+          ...left.endpointDocuments,
+          ...right.endpointDocuments,
+        ],
+      };
+    }
+  }
+
+  private isTooManyBuckets(error: unknown): boolean {
+    return (
+      error instanceof Error &&
+      error.message.includes("too_many_buckets_exception")
+    );
+  }
+
+  private formatRate(minutes: number, started: number): string {
+    const seconds = Math.max((Date.now() - started) / 1000, 0.001);
+    return (minutes / seconds).toFixed(2);
+  }
+}
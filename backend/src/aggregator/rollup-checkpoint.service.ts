@@ -4,6 +4,18 @@ import { errors } from "@elastic/elasticsearch";
 import { LogStorageService } from "../shared/logs/log-storage.service";
 import { RollupConfigService } from "./rollup-config.service";
 
+// 스팬 → 1분 롤업 체크포인트 ID (상위 티어는 `rollup-checkpoint-<tier>`)
+export const DEFAULT_CHECKPOINT_ID = "default-rollup-checkpoint";
+
+/**
+ * 서비스 샤드별 체크포인트 ID. 샤드가 하나면 기본 체크포인트를 그대로 쓴다.
+ */
+export function shardCheckpointId(index: number, count: number): string {
+  return count <= 1
+    ? DEFAULT_CHECKPOINT_ID
+    : `${DEFAULT_CHECKPOINT_ID}-${index}-of-${count}`;
+}
+
 interface CheckpointDocument {
   lastRolledUpAt: string;
   updatedAt: string;
@@ -18,7 +30,6 @@ export class RollupCheckpointService implements OnModuleInit {
   private readonly logger = new Logger(RollupCheckpointService.name);
   private readonly client: Client;
   private readonly indexName: string;
-  private readonly checkpointId = "default-rollup-checkpoint";
 
   constructor(
     private readonly storage: LogStorageService,
@@ -35,11 +46,13 @@ export class RollupCheckpointService implements OnModuleInit {
   /**
    * 마지막으로 완료한 분(minute)의 끝 시각을 반환한다.
    */
-  async loadLastCheckpoint(): Promise<Date | null> {
+  async loadLastCheckpoint(
+    checkpointId: string = DEFAULT_CHECKPOINT_ID,
+  ): Promise<Date | null> {
     try {
       const response = await this.client.get<CheckpointDocument>({
         index: this.indexName,
-        id: this.checkpointId,
+        id: checkpointId,
       });
       const iso = response._source?.lastRolledUpAt;
       return iso ? new Date(iso) : null;
@@ -55,13 +68,38 @@ export class RollupCheckpointService implements OnModuleInit {
     }
   }
 
+  /**
+   * 여러 체크포인트 중 가장 이른 시각을 반환한다. 하나라도 없으면 null 이다.
+   * (모든 샤드가 집계를 마친 지점 = 상위 티어/재집계가 믿을 수 있는 지점)
+   */
+  async loadEarliestCheckpoint(checkpointIds: string[]): Promise<Date | null> {
+    const response = await this.client.mget<CheckpointDocument>({
+      index: this.indexName,
+      ids: checkpointIds,
+    });
+    let earliest: number | null = null;
+    for (const doc of response.docs) {
+      const iso =
+        "found" in doc && doc.found ? doc._source?.lastRolledUpAt : undefined;
+      if (!iso) {
+        return null;
+      }
+      const time = new Date(iso).getTime();
+      earliest = earliest === null ? time : Math.min(earliest, time);
+    }
+    return earliest === null ? null : new Date(earliest);
+  }
+
   /**
    * 특정 분 구간을 처리한 뒤 체크포인트를 갱신한다.
    */
-  async saveCheckpoint(windowEnd: Date): Promise<void> {
+  async saveCheckpoint(
+    windowEnd: Date,
+    checkpointId: string = DEFAULT_CHECKPOINT_ID,
+  ): Promise<void> {
     await this.client.index({
       index: this.indexName,
-      id: this.checkpointId,
+      id: checkpointId,
       document: {
         lastRolledUpAt: windowEnd.toISOString(),
         updatedAt: new Date().toISOString(),
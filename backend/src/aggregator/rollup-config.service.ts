@@ -1,4 +1,10 @@
 import { Injectable } from "@nestjs/common";
+import { randomUUID } from "crypto";
+import { hostname } from "os";
+import {
+  ROLLUP_TIERS,
+  type RollupTier,
+} from "../shared/apm/rollup/rollup-tier";
 
 /**
  * 롤업 집계기에 필요한 환경 변수/기본값을 캡슐화한 설정 서비스
@@ -39,6 +45,85 @@ export class RollupConfigService {
     10,
   );
 
+  // 롤업 이후 늦게 도착한 스팬을 찾아 최근 분을 다시 집계할지 여부
+  private readonly lateDataEnabled =
+    (process.env.ROLLUP_LATE_DATA_ENABLED ?? "true").toLowerCase() === "true";
+
+  // 체크포인트 이전 몇 분까지 늦게 도착한 스팬을 확인할지 결정 (유예 기간)
+  private readonly lateDataGraceMinutes = this.parseNumber(
+    process.env.ROLLUP_LATE_DATA_GRACE_MINUTES,
+    10,
+  );
+
+  // 밀린 분이 많을 때(장애 복구, 긴 초기 lookback) 백필 모드를 쓸지 여부
+  private readonly backfillEnabled =
+    (process.env.ROLLUP_BACKFILL_ENABLED ?? "true").toLowerCase() === "true";
+
+  // 한 사이클에 계획된 닫힌 분이 이 값 이상이면 백필 모드로 처리한다.
+  private readonly backfillThresholdMinutes = this.parseNumber(
+    process.env.ROLLUP_BACKFILL_THRESHOLD_MINUTES,
+    10,
+  );
+
+  // 백필 시 ES 검색 한 번(date_histogram)으로 집계할 분 수. search.max_buckets 에 맞춰 조정한다.
+  private readonly backfillMinutesPerQuery = this.parseNumber(
+    process.env.ROLLUP_BACKFILL_MINUTES_PER_QUERY,
+    10,
+  );
+
+  // 동시에 집계할 분 묶음 수
+  private readonly backfillConcurrency = this.parseNumber(
+    process.env.ROLLUP_BACKFILL_CONCURRENCY,
+    4,
+  );
+
+  // 백필 중 체크포인트를 저장하는 최소 간격(ms)
+  private readonly backfillCheckpointIntervalMs = this.parseNumber(
+    process.env.ROLLUP_BACKFILL_CHECKPOINT_INTERVAL_MS,
+    5_000,
+  );
+
+  // 서비스/환경/엔드포인트(스팬 이름) 단위 롤업도 함께 만들지 여부
+  private readonly endpointRollupsEnabled =
+    (process.env.ROLLUP_ENDPOINTS_ENABLED ?? "true").toLowerCase() === "true";
+
+  // 환경 버킷 안의 엔드포인트 수 상한(terms size)
+  private readonly maxEndpointBuckets = this.parseNumber(
+    process.env.ROLLUP_MAX_ENDPOINT_BUCKETS,
+    200,
+  );
+
+  // 1분 롤업을 10m → 1h → 1d 티어로 cascade 할지 여부
+  private readonly tiersEnabled =
+    (process.env.ROLLUP_TIERS_ENABLED ?? "true").toLowerCase() === "true";
+
+  // 티어 체크포인트가 없을 때 하위 티어 데이터를 몇 시간 전부터 합칠지 결정 (0: 가장 이른 하위 티어 버킷부터)
+  private readonly tierInitialLookbackHours = this.parseNumber(
+    process.env.ROLLUP_TIER_INITIAL_LOOKBACK_HOURS,
+    0,
+  );
+
+  // 서비스를 몇 개의 해시 파티션(샤드)으로 나눠 여러 Aggregator 레플리카가 나눠 집계할지 결정
+  private readonly shardCount = this.parseNumber(
+    process.env.ROLLUP_SHARD_COUNT,
+    1,
+  );
+
+  // 샤드 리스 만료 시간(초). 레플리카가 죽으면 이 시간 뒤 다른 레플리카가 샤드를 넘겨받는다.
+  private readonly leaseTtlSeconds = this.parseNumber(
+    process.env.ROLLUP_LEASE_TTL_SECONDS,
+    60,
+  );
+
+  // 리스/워커 하트비트 문서를 저장하는 인덱스 이름
+  private readonly leaseIndex =
+    process.env.ROLLUP_LEASE_INDEX ?? ".metrics-rollup-leases";
+
+  // 리스 소유자로 기록할 워커 ID (기본: 호스트명 + 임의 접미사)
+  private readonly workerId =
+    process.env.ROLLUP_WORKER_ID ??
+    `${hostname()}-${randomUUID().slice(0, 8)}`;
+
   // lastRolledUpAt 을 저장하는 전용 인덱스 이름
   private readonly checkpointIndex =
     process.env.ROLLUP_CHECKPOINT_INDEX ?? ".metrics-rollup-state";
@@ -75,6 +160,76 @@ export class RollupConfigService {
     return this.maxEnvironmentBuckets;
   }
 
+  isLateDataEnabled(): boolean {
+    return this.lateDataEnabled;
+  }
+
+  getLateDataGraceMs(): number {
+    return this.lateDataGraceMinutes * 60 * 1000;
+  }
+
+  isBackfillEnabled(): boolean {
+    return this.backfillEnabled;
+  }
+
+  getBackfillThresholdMinutes(): number {
+    return Math.max(2, Math.floor(this.backfillThresholdMinutes));
+  }
+
+  getBackfillMinutesPerQuery(): number {
+    return Math.max(1, Math.floor(this.backfillMinutesPerQuery));
+  }
+
+  getBackfillConcurrency(): number {
+    return Math.max(1, Math.floor(this.backfillConcurrency));
+  }
+
+  getBackfillCheckpointIntervalMs(): number {
+    return this.backfillCheckpointIntervalMs;
+  }
+
+  areEndpointRollupsEnabled(): boolean {
+    return this.endpointRollupsEnabled;
+  }
+
+  getMaxEndpointBuckets(): number {
+    return this.maxEndpointBuckets;
+  }
+
+  areTiersEnabled(): boolean {
+    return this.tiersEnabled;
+  }
+
+  /**
+   * 기본 버킷(ROLLUP_BUCKET_SECONDS)의 배수인 상위 티어만 순서대로 돌려준다.
+   */
+  getCascadeTiers(): RollupTier[] {
+    const baseMs = this.getBucketDurationMs();
+    return ROLLUP_TIERS.filter(
+      (tier) => tier.bucketMs > baseMs && tier.bucketMs % baseMs === 0,
+    );
+  }
+
+  getTierInitialLookbackMs(): number {
+    return this.tierInitialLookbackHours * 60 * 60 * 1000;
+  }
+
+  getShardCount(): number {
+    return Math.max(1, Math.floor(this.shardCount));
+  }
+
+  getLeaseTtlMs(): number {
+    return this.leaseTtlSeconds * 1000;
+  }
+
+  getLeaseIndex(): string {
+    return this.leaseIndex;
+  }
+
+  getWorkerId(): string {
+    return this.workerId;
+  }
+
   getCheckpointIndex(): string {
     return this.checkpointIndex;
   }
@@ -0,0 +1,327 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+} from "@nestjs/common";
+import type { Client } from "@elastic/elasticsearch";
+import { errors } from "@elastic/elasticsearch";
+import { LogStorageService } from "../shared/logs/log-storage.service";
+import { RollupConfigService } from "./rollup-config.service";
+import { shardCheckpointId } from "./rollup-checkpoint.service";
+import type { RollupShard } from "./types/rollup-shard.type";
+
+// 늦은 스팬 재집계 + 상위 티어 cascade 를 맡는 단일 역할
+const COORDINATOR_LEASE_ID = "rollup-lease-coordinator";
+
+interface LeaseDocument {
+  kind: "lease" | "worker";
+  owner: string;
+  expiresAt: string;
+  updatedAt: string;
+}
+
+interface HeldLease {
+  expiresAt: number;
+  seqNo?: number;
+  primaryTerm?: number;
+}
+
+/**
+ * Aggregator 레플리카끼리 일을 나누는 TTL 리스 관리자
+ * - 서비스 해시 샤드와 코디네이터 역할을 리스 문서로 나눠 갖는다. 리스 문서는 seq_no 조건부 쓰기로만
+ *   바꾸므로 같은 샤드를 두 레플리카가 동시에 잡지 못한다.
+ * - 리스가 넘어가는 순간 같은 분을 두 번 집계해도 롤업 문서는 결정적인 _id 로 create 하므로 중복되지 않는다.
+ * - 워커 하트비트로 살아 있는 레플리카 수를 세어, 각자 ceil(샤드 수 / 레플리카 수)개까지만 잡는다.
+ */
+@Injectable()
+export class RollupLeaseService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(RollupLeaseService.name);
+  private readonly client: Client;
+  private readonly indexName: string;
+  private readonly workerId: string;
+  private readonly held = new Map<string, HeldLease>();
+
+  constructor(
+    storage: LogStorageService,
+    private readonly config: RollupConfigService,
+  ) {
+    this.client = storage.getClient();
+    this.indexName = config.getLeaseIndex();
+    this.workerId = config.getWorkerId();
+  }
+
+  async onModuleInit(): Promise<void> {
+    if (!this.config.isEnabled()) {
+      return;
+    }
+    await this.ensureIndex();
+    this.logger.log(
+      `롤업 리스 관리자를 시작합니다. worker=${this.workerId} shards=${this.config.getShardCount()} ttl=${this.config.getLeaseTtlMs()}ms`,
+    );
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    // 다른 레플리카가 TTL 만료를 기다리지 않고 바로 넘겨받도록 잡고 있던 리스를 반납한다.
+    for (const leaseId of [...this.held.keys()]) {
+      await this.release(leaseId);
+    }
+    try {
+      await this.client.delete({
+        index: this.indexName,
+        id: this.workerDocumentId(),
+      });
+    } catch {
+      // 하트비트는 TTL이 지나면 집계 대상에서 빠지므로 삭제 실패는 무시한다.
+    }
+  }
+
+  /**
+   * 하트비트를 남기고 이번 주기에 집계할 샤드 리스를 갱신/획득한다.
+   */
+  async acquireShards(): Promise<RollupShard[]> {
+    const count = this.config.getShardCount();
+    await this.heartbeat();
+    const workers = await this.countActiveWorkers();
+    const target = Math.ceil(count / workers);
+    // 레플리카마다 다른 샤드부터 살펴 처음 잡는 샤드가 겹치지 않게 한다.
+    const offset = this.hashWorkerId() % count;
+    const shards: RollupShard[] = [];
+
+    // 이미 잡고 있는 샤드부터 연장하고, 몫을 넘는 샤드는 반납한다.
+    for (let step = 0; step < count; step += 1) {
+      const index = (offset + step) % count;
+      const leaseId = this.shardLeaseId(index, count);
+      if (!this.held.has(leaseId)) {
+        continue;
+      }
+      if (shards.length < target && (await this.tryAcquire(leaseId))) {
+        shards.push(this.toShard(index, count));
+      } else {
+        await this.release(leaseId);
+      }
+    }
+
+    // 남은 몫만큼 비어 있거나 만료된 샤드를 잡는다.
+    for (let step = 0; step < count && shards.length < target; step += 1) {
+      const index = (offset + step) % count;
+      const leaseId = this.shardLeaseId(index, count);
+      if (!this.held.has(leaseId) && (await this.tryAcquire(leaseId))) {
+        shards.push(this.toShard(index, count));
+      }
+    }
+
+    this.logger.debug(
+      `샤드 리스 worker=${this.workerId} workers=${workers} target=${target} shards=${shards.map((shard) => shard.index).join(",")}`,
+    );
+    return shards.sort((a, b) => a.index - b.index);
+  }
+
+  /**
+   * 늦은 스팬 재집계와 상위 티어 cascade 는 한 레플리카만 수행한다.
+   */
+  async acquireCoordinator(): Promise<boolean> {
+    return this.tryAcquire(COORDINATOR_LEASE_ID);
+  }
+
+  /**
+   * 긴 작업 도중 샤드 리스를 아직 쥐고 있는지 확인하고, 만료가 가까우면 연장한다.
+   */
+  async ensureHeld(shard: RollupShard): Promise<boolean> {
+    const leaseId = this.shardLeaseId(shard.index, shard.count);
+    const lease = this.held.get(leaseId);
+    if (!lease) {
+      return false;
+    }
+    if (lease.expiresAt - Date.now() > this.config.getLeaseTtlMs() / 2) {
+      return true;
+    }
+    return this.tryAcquire(leaseId);
+  }
+
+  private async tryAcquire(leaseId: string): Promise<boolean> {
+    const now = Date.now();
+    const expiresAt = now + this.config.getLeaseTtlMs();
+    const document: LeaseDocument = {
+      kind: "lease",
+      owner: this.workerId,
+      expiresAt: new Date(expiresAt).toISOString(),
+      updatedAt: new Date(now).toISOString(),
+    };
+
+    try {
+      let condition = this.toCondition(this.held.get(leaseId));
+      if (!condition) {
+        const current = await this.client.get<LeaseDocument>(
+          { index: this.indexName, id: leaseId },
+          { ignore: [404] },
+        );
+        const owner = current.found ? current._source : undefined;
+        if (
+          owner &&
+          owner.owner !== this.workerId &&
+          Date.parse(owner.expiresAt) > now
+        ) {
+          return false;
+        }
+        if (current.found) {
+          condition = this.toCondition({
+            expiresAt: 0,
+            seqNo: current._seq_no,
+            primaryTerm: current._primary_term,
+          });
+          if (!condition) {
+            return false;
+          }
+        }
+      }
+
+      const response = condition
+        ? await this.client.index({
+            index: this.indexName,
+            id: leaseId,
+            document,
+            ...condition,
+          })
+        : await this.client.create({
+            index: this.indexName,
+            id: leaseId,
+            document,
+          });
+      this.held.set(leaseId, {
+        expiresAt,
+        seqNo: response._seq_no,
+        primaryTerm: response._primary_term,
+      });
+      return true;
+    } catch (error) {
+      this.held.delete(leaseId);
+      if (error instanceof errors.ResponseError && error.statusCode === 409) {
+        // 다른 레플리카가 먼저 잡았거나 넘겨받았다.
+        return false;
+      }
+      throw error;
+    }
+  }
+
+  private async release(leaseId: string): Promise<void> {
+    const condition = this.toCondition(this.held.get(leaseId));
+    this.held.delete(leaseId);
+    if (!condition) {
+      return;
+    }
+    try {
+      await this.client.delete({
+        index: this.indexName,
+        id: leaseId,
+        ...condition,
+      });
+    } catch (error) {
+      // 이미 만료돼 다른 레플리카가 잡은 리스는 건드리지 않는다.
+      if (
+        !(error instanceof errors.ResponseError) ||
+        (error.statusCode !== 404 && error.statusCode !== 409)
+      ) {
+        this.logger.warn(
+          `리스 반납 중 오류가 발생했습니다. lease=${leaseId}`,
+          error instanceof Error ? error.stack : String(error),
+        );
+      }
+    }
+  }
+
+  private toCondition(
+    lease: HeldLease | undefined,
+  ): { if_seq_no: number; if_primary_term: number } | null {
+    if (lease?.seqNo === undefined || lease.primaryTerm === undefined) {
+      return null;
+    }
+    return { if_seq_no: lease.seqNo, if_primary_term: lease.primaryTerm };
+  }
+
+  private async heartbeat(): Promise<void> {
+    const now = Date.now();
+    const document: LeaseDocument = {
+      kind: "worker",
+      owner: this.workerId,
+      expiresAt: new Date(now + this.config.getLeaseTtlMs()).toISOString(),
+      updatedAt: new Date(now).toISOString(),
+    };
+    await this.client.index({
+      index: this.indexName,
+      id: this.workerDocumentId(),
+      document,
+    });
+  }
+
+  private async countActiveWorkers(): Promise<number> {
+    const response = await this.client.count({
+      index: this.indexName,
+      query: {
+        bool: {
+          filter: [
+            { term: { kind: "worker" } },
+            { range: { expiresAt: { gt: "now" } } },
+          ],
+        },
+      },
+    });
+    // 방금 남긴 하트비트가 아직 refresh 되지 않았어도 자신은 센다.
+    return Math.max(1, response.count);
+  }
+
+  private toShard(index: number, count: number): RollupShard {
+    return { index, count, checkpointId: shardCheckpointId(index, count) };
+  }
+
+  private shardLeaseId(index: number, count: number): string {
+    return `rollup-lease-shard-${index}-of-${count}`;
+  }
+
+  private workerDocumentId(): string {
+    return `rollup-worker-${this.workerId}`;
+  }
+
+  private hashWorkerId(): number {
+    let hash = 0;
+    for (let index = 0; index < this.workerId.length; index += 1) {
+      hash = (hash * 31 + this.workerId.charCodeAt(index)) >>> 0;
+    }
+    return hash;
+  }
+
+  private async ensureIndex(): Promise<void> {
+    const exists = await this.client.indices.exists({ index: this.indexName });
+    if (exists) {
+      return;
+    }
+
+    this.logger.log(`롤업 리스 인덱스를 생성합니다. index=${this.indexName}`);
+    try {
+      await this.client.indices.create({
+        index: this.indexName,
+        mappings: {
+          properties: {
+            kind: { type: "keyword" },
+            owner: { type: "keyword" },
+            expiresAt: { type: "date" },
+            updatedAt: { type: "date" },
+          },
+        },
+        settings: {
+          number_of_shards: 1,
+          number_of_replicas: 0,
+        },
+      });
+    } catch (error) {
+      // 여러 레플리카가 동시에 떠서 먼저 만든 경우
+      if (
+        error instanceof errors.ResponseError &&
+        error.body?.error?.type === "resource_already_exists_exception"
+      ) {
+        return;
+      }
+      throw error;
+    }
+  }
+}
@@ -1,8 +1,18 @@
 import { Injectable, Logger } from "@nestjs/common";
+import { createHash } from "crypto";
 import type { Client } from "@elastic/elasticsearch";
-import { LogStorageService } from "../shared/logs/log-storage.service";
+import {
+  LogStorageService,
+  type LogStreamKey,
+} from "../shared/logs/log-storage.service";
 import type { RollupMetricDocument } from "../shared/apm/rollup/rollup-metric.document";
 
+// 재집계 시 기존 문서 위치를 찾고 덮어쓰는 묶음 크기
+const UPSERT_CHUNK_SIZE = 1000;
+
+// 상위 티어 cascade 시 하위 티어 문서를 한 번에 읽어오는 페이지 크기
+const SOURCE_PAGE_SIZE = 1000;
+
 /**
  * 롤업 결과를 metrics data stream 에 저장하는 책임을 가지는 레포지토리
  */
@@ -10,26 +20,28 @@ import type { RollupMetricDocument } from "../shared/apm/rollup/rollup-metric.do
 export class RollupMetricsRepository {
   private readonly logger = new Logger(RollupMetricsRepository.name);
   private readonly client: Client;
-  private readonly indexName: string;
 
-  constructor(storage: LogStorageService) {
+  constructor(private readonly storage: LogStorageService) {
     this.client = storage.getClient();
-    this.indexName = storage.getDataStream("apmRollupMetrics");
   }
 
   /**
-   * 1분 버킷 묶음을 bulk API를 통해 저장한다.
+   * 롤업 버킷 묶음을 bulk API를 통해 저장한다. (기본: 1분 롤업 스트림)
    */
-  async bulkCreate(documents: RollupMetricDocument[]): Promise<void> {
+  async bulkCreate(
+    documents: RollupMetricDocument[],
+    streamKey: LogStreamKey = "apmRollupMetrics",
+  ): Promise<void> {
     if (documents.length === 0) {
       return;
     }
 
+    const indexName = this.storage.getDataStream(streamKey);
     const operations: Array<Record<string, unknown>> = documents.flatMap(
       (doc) => [
         {
           create: {
-            _index: this.indexName,
+            _index: indexName,
             _id: this.buildDocumentId(doc),
           },
         },
@@ -46,7 +58,7 @@ export class RollupMetricsRepository {
     const elapsed = Date.now() - started;
     if (!response.errors) {
       this.logger.log(
-        `롤업 문서를 저장했습니다. index=${this.indexName} docs=${documents.length} took=${elapsed}ms`,
+        `롤업 문서를 저장했습니다. index=${indexName} docs=${documents.length} took=${elapsed}ms`,
       );
       return;
     }
@@ -73,7 +85,190 @@ export class RollupMetricsRepository {
     }
   }
 
+  /**
+   * 이미 저장된 롤업 문서를 새 값으로 덮어쓴다. (늦게 도착한 스팬 재집계용)
+   * - 데이터 스트림은 create 만 허용하므로, 기존 문서는 백킹 인덱스에 seq_no 조건을 걸어 index 하고
+   *   없는 문서만 데이터 스트림에 create 한다.
+   * - 바로 이어지는 상위 티어 재집계가 새 값을 읽도록 refresh=wait_for 로 저장한다.
+   */
+  async bulkUpsert(
+    documents: RollupMetricDocument[],
+    streamKey: LogStreamKey = "apmRollupMetrics",
+  ): Promise<void> {
+    if (documents.length === 0) {
+      return;
+    }
+
+    const indexName = this.storage.getDataStream(streamKey);
+    const started = Date.now();
+    let updated = 0;
+    for (let index = 0; index < documents.length; index += UPSERT_CHUNK_SIZE) {
+      updated += await this.upsertChunk(
+        indexName,
+        documents.slice(index, index + UPSERT_CHUNK_SIZE),
+      );
+    }
+    this.logger.log(
+      `롤업 문서를 다시 저장했습니다. index=${indexName} updated=${updated} created=${documents.length - updated} took=${Date.now() - started}ms`,
+    );
+  }
+
+  /**
+   * @returns 기존 문서를 덮어쓴 수
+   */
+  private async upsertChunk(
+    indexName: string,
+    documents: RollupMetricDocument[],
+  ): Promise<number> {
+    const ids = documents.map((doc) => this.buildDocumentId(doc));
+    const existing = await this.client.search({
+      index: indexName,
+      size: ids.length,
+      _source: false,
+      seq_no_primary_term: true,
+      query: { ids: { values: ids } },
+    });
+    const located = new Map(
+      existing.hits.hits.map((hit) => [hit._id as string, hit] as const),
+    );
+
+    const operations: Array<Record<string, unknown>> = documents.flatMap(
+      (doc, index) => {
+        const id = ids[index];
+        const hit = located.get(id);
+        const action = hit
+          ? {
+              index: {
+                _index: hit._index,
+                _id: id,
+                if_seq_no: hit._seq_no,
+                if_primary_term: hit._primary_term,
+              },
+            }
+          : { create: { _index: indexName, _id: id } };
+        return [action, doc];
+      },
+    );
+
+    const response = await this.client.bulk({
+      operations,
+      refresh: "wait_for",
+    });
+    if (response.errors) {
+      // 동시에 같은 문서를 고친 경우도 다음 주기에 다시 비교하도록 실패로 처리한다.
+      const failure = response.items
+        ?.map((item) => item.index?.error ?? item.create?.error)
+        .find((error) => error);
+      const reason = failure?.reason ?? "알 수 없는 Bulk 에러";
+      this.logger.error(
+        `롤업 문서 재저장 중 오류가 발생했습니다. index=${indexName} reason=${reason}`,
+      );
+      throw new Error(reason);
+    }
+    return located.size;
+  }
+
+  /**
+   * 방금 저장한 롤업 문서가 검색에 보이도록 데이터 스트림을 refresh 한다.
+   */
+  async refresh(streamKey: LogStreamKey): Promise<void> {
+    await this.client.indices.refresh({
+      index: this.storage.getDataStream(streamKey),
+    });
+  }
+
+  /**
+   * [from, to) 구간에 속한 모든 서비스/환경의 롤업 문서를 읽는다.
+   * - 상위 티어 cascade 의 입력으로 쓰며, search_after 로 끝까지 페이지를 넘긴다.
+   */
+  async findBuckets(
+    streamKey: LogStreamKey,
+    from: Date,
+    to: Date,
+  ): Promise<RollupMetricDocument[]> {
+    const documents: RollupMetricDocument[] = [];
+    let searchAfter: Array<string | number> | undefined;
+    for (;;) {
+      const response = await this.client.search<RollupMetricDocument>({
+        index: this.storage.getDataStream(streamKey),
+        size: SOURCE_PAGE_SIZE,
+        sort: [
+          { "@timestamp_bucket": { order: "asc" as const } },
+          { service_name: { order: "asc" as const } },
+          { environment: { order: "asc" as const } },
+          // 엔드포인트 롤업 스트림에서만 매핑된 필드
+          {
+            endpoint_name: {
+              order: "asc" as const,
+              unmapped_type: "keyword",
+            },
+          },
+        ],
+        search_after: searchAfter,
+        query: {
+          range: {
+            "@timestamp_bucket": {
+              gte: from.toISOString(),
+              lt: to.toISOString(),
+            },
+          },
+        },
+      });
+
+      const hits = response.hits.hits;
+      for (const hit of hits) {
+        if (hit._source) {
+          documents.push(hit._source);
+        }
+      }
+      if (hits.length < SOURCE_PAGE_SIZE) {
+        return documents;
+      }
+      searchAfter = hits[hits.length - 1]?.sort as
+        | Array<string | number>
+        | undefined;
+      if (!searchAfter) {
+        return documents;
+      }
+    }
+  }
+
+  /**
+   * 스트림에서 가장 이른 롤업 버킷 시작 시각. 문서가 없거나 스트림이 아직 없으면 null
+   */
+  async findEarliestBucket(streamKey: LogStreamKey): Promise<Date | null> {
+    const response = await this.client.search({
+      index: this.storage.getDataStream(streamKey),
+      ignore_unavailable: true,
+      allow_no_indices: true,
+      size: 0,
+      aggs: {
+        earliest: { min: { field: "@timestamp_bucket" } },
+      },
+    });
+    const aggregations = response.aggregations as
+      | { earliest?: { value: number | null } }
+      | undefined;
+    const earliest = aggregations?.earliest?.value;
+    return typeof earliest === "number" && Number.isFinite(earliest)
+      ? new Date(earliest)
+      : null;
+  }
+
+  /**
+   * 같은 버킷을 다시 써도 중복되지 않도록 결정적인 _id 를 만든다.
+   * - 엔드포인트 이름은 길이 제한이 없고 ':' 를 포함할 수 있어,
+   *   서비스/환경/엔드포인트를 구분자(\0)로 이은 값의 sha256 해시를 쓴다. (_id 512바이트 제한, 충돌 방지)
+   */
   private buildDocumentId(doc: RollupMetricDocument): string {
+    if (typeof doc.endpoint_name === "string") {
+      const key = createHash("sha256")
+        .update(
+          `${doc.service_name}\0${doc.environment}\0${doc.endpoint_name}`,
+        )
+        .digest("hex");
+      return `${key}:${doc["@timestamp_bucket"]}`;
+    }
     return `${doc.service_name}:${doc.environment}:${doc["@timestamp_bucket"]}`;
   }
 }
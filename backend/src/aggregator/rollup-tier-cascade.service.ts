@@ -0,0 +1,284 @@
+import { Injectable, Logger } from "@nestjs/common";
+import { mergeRollupMetrics } from "../shared/apm/rollup/rollup-merge.util";
+import type { RollupMetricDocument } from "../shared/apm/rollup/rollup-metric.document";
+import {
+  ROLLUP_TIERS,
+  type RollupTier,
+} from "../shared/apm/rollup/rollup-tier";
+import type { LogStreamKey } from "../shared/logs/log-storage.service";
+import {
+  DEFAULT_CHECKPOINT_ID,
+  RollupCheckpointService,
+} from "./rollup-checkpoint.service";
+import { RollupConfigService } from "./rollup-config.service";
+import { RollupMetricsRepository } from "./rollup-metrics.repository";
+import type { MinuteWindow } from "./types/minute-window.type";
+
+// 한 사이클에 티어마다 합칠 최대 버킷 수. 처음 켤 때 쌓여 있던 하위 티어는 여러 사이클에 걸쳐 따라잡는다.
+const MAX_TIER_WINDOWS_PER_CYCLE = 144;
+
+/**
+ * 1분 롤업을 상위 티어(10m → 1h → 1d)로 합치는 서비스
+ * - 각 티어는 바로 아래 티어 문서를 서비스/환경(엔드포인트 롤업은 엔드포인트까지)별로 병합해 만든다.
+ * - 아래 티어 체크포인트까지 완전히 채워진 버킷만 합치므로 늦게 닫힌 분이 빠지지 않는다.
+ */
+@Injectable()
+export class RollupTierCascadeService {
+  private readonly logger = new Logger(RollupTierCascadeService.name);
+
+  constructor(
+    private readonly config: RollupConfigService,
+    private readonly checkpoint: RollupCheckpointService,
+    private readonly repository: RollupMetricsRepository,
+  ) {}
+
+  /**
+   * 티어 순서대로 닫힌 버킷을 합쳐 한 사이클 안에서 1d 까지 연쇄 반영한다.
+   */
+  async cascade(): Promise<void> {
+    if (!this.config.areTiersEnabled()) {
+      return;
+    }
+
+    let source: RollupTier = ROLLUP_TIERS[0];
+    let sourceCheckpointId = DEFAULT_CHECKPOINT_ID;
+    for (const tier of this.config.getCascadeTiers()) {
+      const sourceCheckpoint =
+        await this.checkpoint.loadLastCheckpoint(sourceCheckpointId);
+      if (!sourceCheckpoint) {
+        // 아래 티어가 아직 한 번도 채워지지 않았으면 위 티어도 만들 수 없다.
+        return;
+      }
+
+      const checkpointId = this.tierCheckpointId(tier);
+      const windows = await this.planWindows(
+        source,
+        tier,
+        sourceCheckpoint,
+        checkpointId,
+      );
+      if (windows.length > 0) {
+        // 같은 사이클에 방금 저장한 아래 티어 문서까지 검색에 보이게 한다.
+        await this.refreshSource(source);
+      }
+      for (const window of windows) {
+        const started = Date.now();
+        const [docs, endpointDocs] = await this.buildTierBucket(
+          source,
+          tier,
+          window,
+          false,
+        );
+        // 서비스/엔드포인트 티어 문서를 모두 저장한 뒤에만 체크포인트를 옮긴다.
+        await this.checkpoint.saveCheckpoint(window.end, checkpointId);
+        this.logger.log(
+          `${tier.key} 롤업 완료 window=${window.start.toISOString()}~${window.end.toISOString()} docs=${docs} endpoint_docs=${endpointDocs} elapsed=${Date.now() - started}ms`,
+        );
+      }
+
+      source = tier;
+      sourceCheckpointId = checkpointId;
+    }
+  }
+
+  /**
+   * 다시 집계한 1분 버킷이 속한 상위 티어 버킷 중, 이미 만들어 둔 버킷만 아래 티어부터 다시 합쳐 덮어쓴다.
+   * - 아직 만들지 않은 버킷은 다음 cascade() 가 최신 값으로 만든다.
+   */
+  async recascade(minutes: MinuteWindow[]): Promise<void> {
+    if (!this.config.areTiersEnabled() || minutes.length === 0) {
+      return;
+    }
+
+    let source: RollupTier = ROLLUP_TIERS[0];
+    for (const tier of this.config.getCascadeTiers()) {
+      const built = await this.checkpoint.loadLastCheckpoint(
+        this.tierCheckpointId(tier),
+      );
+      if (!built) {
+        return;
+      }
+      const starts = new Set(
+        minutes.map((minute) =>
+          this.floorToBucket(minute.start.getTime(), tier.bucketMs),
+        ),
+      );
+      for (const start of [...starts].sort((a, b) => a - b)) {
+        if (start + tier.bucketMs > built.getTime()) {
+          continue;
+        }
+        const window: MinuteWindow = {
+          start: new Date(start),
+          end: new Date(start + tier.bucketMs),
+        };
+        const [docs, endpointDocs] = await this.buildTierBucket(
+          source,
+          tier,
+          window,
+          true,
+        );
+        this.logger.log(
+          `${tier.key} 롤업 재집계 완료 window=${window.start.toISOString()}~${window.end.toISOString()} docs=${docs} endpoint_docs=${endpointDocs}`,
+        );
+      }
+      source = tier;
+    }
+  }
+
+  /**
+   * 아래 티어 문서를 합쳐 티어 버킷 하나를 저장한다.
+   * @param overwrite true 이면 기존 티어 문서를 덮어쓴다(재집계).
+   * @returns [서비스 문서 수, 엔드포인트 문서 수]
+   */
+  private async buildTierBucket(
+    source: RollupTier,
+    tier: RollupTier,
+    window: MinuteWindow,
+    overwrite: boolean,
+  ): Promise<[number, number]> {
+    const save = (
+      documents: RollupMetricDocument[],
+      key: LogStreamKey,
+    ): Promise<void> =>
+      overwrite
+        ? this.repository.bulkUpsert(documents, key)
+        : this.repository.bulkCreate(documents, key);
+
+    const documents = await this.rollUp(source.streamKey, tier, window);
+    await save(documents, tier.streamKey);
+    if (!this.config.areEndpointRollupsEnabled()) {
+      return [documents.length, 0];
+    }
+    const endpointDocuments = await this.rollUp(
+      source.endpointStreamKey,
+      tier,
+      window,
+    );
+    await save(endpointDocuments, tier.endpointStreamKey);
+    return [documents.length, endpointDocuments.length];
+  }
+
+  private async refreshSource(source: RollupTier): Promise<void> {
+    await this.repository.refresh(source.streamKey);
+    if (this.config.areEndpointRollupsEnabled()) {
+      await this.repository.refresh(source.endpointStreamKey);
+    }
+  }
+
+  private tierCheckpointId(tier: RollupTier): string {
+    return `rollup-checkpoint-${tier.key}`;
+  }
+
+  /**
+   * 티어 체크포인트부터 아래 티어 체크포인트까지 닫힌 버킷을 나눈다.
+   * - 체크포인트가 없으면 아래 티어의 가장 이른 버킷부터 시작해, 기존 1분 롤업 구간도 상위 티어로 채운다.
+   *   (ROLLUP_TIER_INITIAL_LOOKBACK_HOURS 를 지정하면 그 이전은 건너뛴다)
+   */
+  private async planWindows(
+    source: RollupTier,
+    tier: RollupTier,
+    sourceCheckpoint: Date,
+    checkpointId: string,
+  ): Promise<MinuteWindow[]> {
+    const bucketMs = tier.bucketMs;
+    const closedUntil = this.floorToBucket(
+      sourceCheckpoint.getTime(),
+      bucketMs,
+    );
+    const initialStart =
+      (await this.checkpoint.loadLastCheckpoint(checkpointId))?.getTime() ??
+      (await this.resolveInitialStart(source, closedUntil));
+    if (initialStart === null) {
+      return [];
+    }
+
+    const windows: MinuteWindow[] = [];
+    let nextStart = this.floorToBucket(Math.max(0, initialStart), bucketMs);
+    while (
+      nextStart + bucketMs <= closedUntil &&
+      windows.length < MAX_TIER_WINDOWS_PER_CYCLE
+    ) {
+      windows.push({
+        start: new Date(nextStart),
+        end: new Date(nextStart + bucketMs),
+      });
+      nextStart += bucketMs;
+    }
+    return windows;
+  }
+
+  /**
+   * @returns 아래 티어 문서가 아직 없으면 null
+   */
+  private async resolveInitialStart(
+    source: RollupTier,
+    closedUntil: number,
+  ): Promise<number | null> {
+    const earliest = await this.repository.findEarliestBucket(source.streamKey);
+    if (!earliest) {
+      return null;
+    }
+    const lookbackMs = this.config.getTierInitialLookbackMs();
+    return lookbackMs > 0
+      ? Math.max(earliest.getTime(), closedUntil - lookbackMs)
+      : earliest.getTime();
+  }
+
+  private async rollUp(
+    sourceStreamKey: LogStreamKey,
+    tier: RollupTier,
+    window: MinuteWindow,
+  ): Promise<RollupMetricDocument[]> {
+    const sourceDocs = await this.repository.findBuckets(
+      sourceStreamKey,
+      window.start,
+      window.end,
+    );
+
+    const groups = new Map<string, RollupMetricDocument[]>();
+    for (const doc of sourceDocs) {
+      const key = `${doc.service_name}\u0000${doc.environment}\u0000${doc.endpoint_name ?? ""}`;
+      const group = groups.get(key);
+      if (group) {
+        group.push(doc);
+      } else {
+        groups.set(key, [doc]);
+      }
+    }
+
+    const ingestedAt = new Date().toISOString();
+    const documents: RollupMetricDocument[] = [];
+    for (const group of groups.values()) {
+      const merged = mergeRollupMetrics(group);
+      if (merged.requestCount === 0) {
+        continue;
+      }
+      documents.push({
+        "@timestamp": window.start.toISOString(),
+        "@timestamp_bucket": window.start.toISOString(),
+        bucket_duration_seconds: tier.bucketMs / 1000,
+        service_name: group[0].service_name,
+        environment: group[0].environment,
+        ...(typeof group[0].endpoint_name === "string"
+          ? { endpoint_name: group[0].endpoint_name }
+          : {}),
+        request_count: merged.requestCount,
+        error_count: merged.errorCount,
+        error_rate: merged.errorCount / merged.requestCount,
+        latency_p50_ms: merged.latencyP50,
+        latency_p90_ms: merged.latencyP90,
+        latency_p95_ms: merged.latencyP95,
+        latency_p99_ms: merged.latencyP99,
+        latency_sketch: merged.sketch?.toJSON(),
+        source_window_from: window.start.toISOString(),
+        source_window_to: window.end.toISOString(),
+        ingestedAt,
+      });
+    }
+    return documents;
+  }
+
+  private floorToBucket(timestamp: number, bucketMs: number): number {
+    return timestamp - (timestamp % bucketMs);
+  }
+}
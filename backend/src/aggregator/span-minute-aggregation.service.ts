@@ -2,31 +2,83 @@ import { Injectable, Logger } from "@nestjs/common";
 import type { Client } from "@elastic/elasticsearch";
 import { LogStorageService } from "../shared/logs/log-storage.service";
 import type { MinuteWindow } from "./types/minute-window.type";
+import type { RollupShard } from "./types/rollup-shard.type";
 import type { RollupMetricDocument } from "../shared/apm/rollup/rollup-metric.document";
 import { RollupConfigService } from "./rollup-config.service";
+import {
+  buildLatencySketchAggregations,
+  readLatencySketch,
+  type LatencySketchAggregationResult,
+} from "../shared/apm/rollup/latency-sketch-aggregation";
+import type { LatencySketch } from "../shared/apm/rollup/latency-sketch";
+import { errorSpanFilter } from "../shared/apm/spans/span-filters";
+import type { MinuteRollupResult } from "./types/minute-rollup-result.type";
 
 const UNKNOWN_SERVICE = "unknown-service";
 const UNKNOWN_ENVIRONMENT = "unknown";
+// 한 분 집계가 search.max_buckets 를 넘을 때 서비스/엔드포인트 terms 를 각각 최대 몇 배까지 나눌지
+const MAX_PARTITION_SPLIT = 16;
+// 나눠도 넘으면 스케치 버킷을 이만큼까지 묶는다. (4배씩 키운다)
+const MAX_SKETCH_COARSENING = 16;
+
+// 이름 해시로 나눈 terms partition
+interface TermsPartition {
+  index: number;
+  count: number;
+}
+
+/**
+ * 한 번의 분 집계 검색이 다루는 범위
+ * - services: 샤드 partition(shardCount 개)을 더 잘게 나눈 서비스 partition
+ *   (hash % (n·k) 가 shard.index 와 mod n 으로 같은 partition 들이 모이면 샤드 전체와 같다)
+ * - endpoints: 엔드포인트 partition. index 0 인 partition 에서만 서비스 문서를 만든다.
+ * - sketchCoarsening: 스케치 버킷을 몇 개씩 묶을지 (1: 원래 정확도)
+ */
+interface MinuteAggregationScope {
+  shardCount: number;
+  services: TermsPartition;
+  endpoints: TermsPartition;
+  sketchCoarsening: number;
+}
+
+type SketchBucket = LatencySketchAggregationResult & {
+  key: string;
+  doc_count: number;
+  errors: { doc_count: number };
+};
+
+type ServiceBucket = {
+  key: string;
+  doc_count: number;
+  environments: {
+    buckets: Array<
+      SketchBucket & {
+        // ROLLUP_ENDPOINTS_ENABLED=false 이면 요청하지 않는다.
+        endpoints?: { buckets: SketchBucket[] };
+      }
+    >;
+  };
+};
 
 interface AggregationResponse {
   services?: {
+    buckets: ServiceBucket[];
+  };
+}
+
+interface RangeAggregationResponse {
+  minutes?: {
     buckets: Array<{
-      key: string;
+      key: number;
       doc_count: number;
-      environments: {
-        buckets: Array<{
-          key: string;
-          doc_count: number;
-          latency: { values: Record<string, number> };
-          errors: { doc_count: number };
-        }>;
-      };
+      services: { buckets: ServiceBucket[] };
     }>;
   };
 }
 
 /**
  * 스팬 원본 데이터를 1분 단위로 집계해 롤업 문서를 생성한다.
+ * - 같은 검색 한 번으로 서비스/환경 단위와 엔드포인트(스팬 이름) 단위 문서를 함께 만든다.
  */
 @Injectable()
 export class SpanMinuteAggregationService {
@@ -42,69 +94,309 @@ export class SpanMinuteAggregationService {
     this.spanIndex = storage.getDataStream("apmSpans");
   }
 
-  async aggregate(window: MinuteWindow): Promise<RollupMetricDocument[]> {
+  /**
+   * @param shard 지정하면 그 샤드에 속한 서비스만 집계한다.
+   */
+  async aggregate(
+    window: MinuteWindow,
+    shard?: RollupShard,
+  ): Promise<MinuteRollupResult> {
     // ES 집계 쿼리 시간이 얼마나 걸렸는지 추적한다.
     const queryStarted = Date.now();
-    const body = await this.client.search<unknown, AggregationResponse>({
+    const result: MinuteRollupResult = {
+      serviceDocuments: [],
+      endpointDocuments: [],
+    };
+    const { serviceCount, spanCount: totalSpanCount } =
+      await this.aggregateMinute(
+        result,
+        window,
+        new Date().toISOString(),
+        this.initialScope(shard),
+      );
+    const took = Date.now() - queryStarted;
+
+    if (result.serviceDocuments.length === 0) {
+      this.logger.log(
+        `집계 대상 스팬이 없어 비어 있는 분을 건너뜁니다. window=${window.start.toISOString()}~${window.end.toISOString()} spans=0 es_took=${took}ms`,
+      );
+    } else {
+      this.logger.log(
+        `스팬 집계 완료 window=${window.start.toISOString()}~${window.end.toISOString()} services=${serviceCount} docs=${result.serviceDocuments.length} endpoint_docs=${result.endpointDocuments.length} spans=${totalSpanCount} es_took=${took}ms`,
+      );
+    }
+
+    return result;
+  }
+
+  /**
+   * 한 분을 검색해 result 에 문서를 더한다.
+   * - search.max_buckets 를 넘으면 서비스/엔드포인트 terms 중 덜 나눈 쪽을 partition 으로 반씩 나눠 다시 검색한다.
+   *   partition 끼리 문서가 겹치지 않고, 서비스 문서는 엔드포인트 index 0 partition 에서만 만든다.
+   * - 둘 다 최대로 나눠도 넘으면 스케치 버킷을 묶어 정확도를 낮춘다. 같은 분에서 계속 멈추지 않게 하기 위함이다.
+   */
+  private async aggregateMinute(
+    result: MinuteRollupResult,
+    window: MinuteWindow,
+    ingestedAt: string,
+    scope: MinuteAggregationScope,
+  ): Promise<{ serviceCount: number; spanCount: number }> {
+    let services: ServiceBucket[];
+    try {
+      const body = await this.client.search<unknown, AggregationResponse>({
+        index: this.spanIndex,
+        size: 0,
+        query: this.buildRangeQuery(window.start, window.end),
+        aggs: {
+          services: this.buildServiceAggregation(scope),
+        },
+      });
+      services =
+        body.aggregations?.services?.buckets ??
+        (body as unknown as AggregationResponse).services?.buckets ??
+        [];
+    } catch (error) {
+      const next = this.isTooManyBuckets(error)
+        ? this.narrowScope(scope, window)
+        : null;
+      if (!next) {
+        throw error;
+      }
+      const counts = { serviceCount: 0, spanCount: 0 };
+      for (const narrowed of next) {
+        const partial = await this.aggregateMinute(
+          result,
+          window,
+          ingestedAt,
+          narrowed,
+        );
+        counts.serviceCount += partial.serviceCount;
+        counts.spanCount += partial.spanCount;
+      }
+      return counts;
+    }
+
+    if (scope.endpoints.index > 0) {
+      const partial: MinuteRollupResult = {
+        serviceDocuments: [],
+        endpointDocuments: [],
+      };
+      this.appendDocuments(partial, window, services, ingestedAt, scope);
+      result.endpointDocuments.push(...partial.endpointDocuments);
+      return { serviceCount: 0, spanCount: 0 };
+    }
+    return {
+      serviceCount: services.length,
+      spanCount: this.appendDocuments(
+        result,
+        window,
+        services,
+        ingestedAt,
+        scope,
+      ),
+    };
+  }
+
+  private initialScope(shard?: RollupShard): MinuteAggregationScope {
+    const services =
+      shard && shard.count > 1
+        ? { index: shard.index, count: shard.count }
+        : { index: 0, count: 1 };
+    return {
+      shardCount: services.count,
+      services,
+      endpoints: { index: 0, count: 1 },
+      sketchCoarsening: 1,
+    };
+  }
+
+  /**
+   * search.max_buckets 를 넘은 범위를 다시 검색할 범위로 바꾼다. 더 줄일 수 없으면 null
+   * - hash % 2n 은 hash % n 이 index 인 이름을 index, index + n 두 partition 으로 나눈다.
+   */
+  private narrowScope(
+    scope: MinuteAggregationScope,
+    window: MinuteWindow,
+  ): MinuteAggregationScope[] | null {
+    const split = (partition: TermsPartition): TermsPartition[] => [
+      { index: partition.index, count: partition.count * 2 },
+      { index: partition.index + partition.count, count: partition.count * 2 },
+    ];
+    const serviceSplit = scope.services.count / scope.shardCount;
+    const endpointSplit = this.config.areEndpointRollupsEnabled()
+      ? scope.endpoints.count
+      : MAX_PARTITION_SPLIT;
+    const describe = `window=${window.start.toISOString()} services=${scope.services.index}/${scope.services.count} endpoints=${scope.endpoints.index}/${scope.endpoints.count} sketch_coarsening=${scope.sketchCoarsening}`;
+
+    if (serviceSplit < MAX_PARTITION_SPLIT && serviceSplit <= endpointSplit) {
+      this.logger.warn(
+        `집계 버킷 수 한도를 넘어 서비스를 나눠 다시 집계합니다. ${describe}`,
+      );
+      return split(scope.services).map((services) => ({ ...scope, services }));
+    }
+    if (endpointSplit < MAX_PARTITION_SPLIT) {
+      this.logger.warn(
+        `집계 버킷 수 한도를 넘어 엔드포인트를 나눠 다시 집계합니다. ${describe}`,
+      );
+      return split(scope.endpoints).map((endpoints) => ({
+        ...scope,
+        endpoints,
+      }));
+    }
+    if (scope.sketchCoarsening < MAX_SKETCH_COARSENING) {
+      this.logger.error(
+        `서비스/엔드포인트를 최대로 나눠도 집계 버킷 수 한도를 넘어 지연 시간 스케치 정확도를 낮춥니다. ${describe}`,
+      );
+      return [{ ...scope, sketchCoarsening: scope.sketchCoarsening * 4 }];
+    }
+    return null;
+  }
+
+  /**
+   * 연속된 닫힌 분 여러 개를 date_histogram 검색 한 번으로 집계한다. (백필용)
+   * - 분마다 aggregate() 와 같은 문서를 만들며, 스팬이 없는 분은 문서를 만들지 않는다.
+   */
+  async aggregateRange(
+    windows: MinuteWindow[],
+    shard?: RollupShard,
+  ): Promise<MinuteRollupResult> {
+    const result: MinuteRollupResult = {
+      serviceDocuments: [],
+      endpointDocuments: [],
+    };
+    if (windows.length === 0) {
+      return result;
+    }
+
+    const bucketMs = this.config.getBucketDurationMs();
+    const from = windows[0].start;
+    const to = windows[windows.length - 1].end;
+    const body = await this.client.search<unknown, RangeAggregationResponse>({
       index: this.spanIndex,
       size: 0,
-      query: {
-        bool: {
-          must: [{ term: { kind: "SERVER" } }],
-          filter: [
-            {
-              range: {
-                "@timestamp": {
-                  gte: window.start.toISOString(),
-                  lt: window.end.toISOString(),
-                },
+      query: this.buildRangeQuery(from, to),
+      aggs: {
+        minutes: {
+          date_histogram: {
+            field: "@timestamp",
+            fixed_interval: `${this.config.getBucketDurationSeconds()}s`,
+            min_doc_count: 1,
+          },
+          aggs: {
+            services: this.buildServiceAggregation(this.initialScope(shard)),
+          },
+        },
+      },
+    });
+
+    const ingestedAt = new Date().toISOString();
+    for (const minute of body.aggregations?.minutes?.buckets ?? []) {
+      const window: MinuteWindow = {
+        start: new Date(minute.key),
+        end: new Date(minute.key + bucketMs),
+      };
+      this.appendDocuments(
+        result,
+        window,
+        minute.services?.buckets ?? [],
+        ingestedAt,
+      );
+    }
+    return result;
+  }
+
+  private buildRangeQuery(from: Date, to: Date): Record<string, unknown> {
+    return {
+      bool: {
+        must: [{ term: { kind: "SERVER" } }],
+        filter: [
+          {
+            range: {
+              "@timestamp": {
+                gte: from.toISOString(),
+                lt: to.toISOString(),
               },
             },
-          ],
-        },
+          },
+        ],
+      },
+    };
+  }
+
+  /**
+   * 서비스 partition 이 있으면 terms partition 으로 서비스 이름 해시 범위 하나만 집계한다.
+   * (서비스가 여러 샤드/partition 에 걸치지 않으므로 결과를 그대로 이어 붙이면 전체와 같다)
+   * 엔드포인트 partition 을 나눌 때는 partition 수만큼 terms size 를 나눠 전체 상한을 유지한다.
+   */
+  private buildServiceAggregation(
+    scope: MinuteAggregationScope,
+  ): Record<string, unknown> {
+    const endpointsEnabled = this.config.areEndpointRollupsEnabled();
+    const { services, endpoints, sketchCoarsening } = scope;
+    return {
+      terms: {
+        field: "service_name",
+        size: this.config.getMaxServiceBuckets(),
+        missing: UNKNOWN_SERVICE,
+        ...(services.count > 1
+          ? {
+              include: {
+                partition: services.index,
+                num_partitions: services.count,
+              },
+            }
+          : {}),
       },
       aggs: {
-        services: {
+        environments: {
           terms: {
-            field: "service_name",
-            size: this.config.getMaxServiceBuckets(),
-            missing: UNKNOWN_SERVICE,
+            field: "environment",
+            size: this.config.getMaxEnvironmentBuckets(),
+            missing: UNKNOWN_ENVIRONMENT,
           },
           aggs: {
-            environments: {
-              terms: {
-                field: "environment",
-                size: this.config.getMaxEnvironmentBuckets(),
-                missing: UNKNOWN_ENVIRONMENT,
-              },
-              aggs: {
-                latency: {
-                  percentiles: {
-                    field: "duration_ms",
-                    percents: [50, 90, 95],
+            ...this.buildBucketAggregations(sketchCoarsening),
+            ...(endpointsEnabled
+              ? {
+                  endpoints: {
+                    terms: {
+                      field: "name",
+                      ...(endpoints.count > 1
+                        ? {
+                            size: Math.ceil(
+                              this.config.getMaxEndpointBuckets() /
+                                endpoints.count,
+                            ),
+                            include: {
+                              partition: endpoints.index,
+                              num_partitions: endpoints.count,
+                            },
+                          }
+                        : { size: this.config.getMaxEndpointBuckets() }),
+                    },
+                    aggs: this.buildBucketAggregations(sketchCoarsening),
                   },
-                },
-                errors: {
-                  filter: {
-                    term: { status: "ERROR" },
-                  },
-                },
-              },
-            },
+                }
+              : {}),
           },
         },
       },
-    });
-
-    const took = Date.now() - queryStarted;
-    const services =
-      body.aggregations?.services?.buckets ??
-      (body as unknown as AggregationResponse).services?.buckets ??
-      [];
+    };
+  }
 
-    const bucketDocs: RollupMetricDocument[] = [];
+  /**
+   * 한 분의 서비스 버킷을 롤업 문서로 바꿔 result 에 더한다.
+   * @returns 집계된 스팬 수
+   */
+  private appendDocuments(
+    result: MinuteRollupResult,
+    window: MinuteWindow,
+    services: ServiceBucket[],
+    ingestedAt: string,
+    scope?: MinuteAggregationScope,
+  ): number {
     let totalSpanCount = 0;
-    const ingestedAt = new Date().toISOString();
+    const coarsening = scope?.sketchCoarsening ?? 1;
     const bucketDurationSeconds = this.config.getBucketDurationSeconds();
 
     for (const serviceBucket of services) {
@@ -118,54 +410,90 @@ export class SpanMinuteAggregationService {
           continue;
         }
 
-        const doc: RollupMetricDocument = {
+        const base = {
           "@timestamp": window.start.toISOString(),
           "@timestamp_bucket": window.start.toISOString(),
           bucket_duration_seconds: bucketDurationSeconds,
           service_name: serviceName,
           environment,
-          request_count: total,
-          error_count: errors,
-          error_rate: total > 0 ? errors / total : 0,
-          latency_p50_ms: this.extractPercentile(
-            envBucket.latency.values,
-            "50",
-          ),
-          latency_p90_ms: this.extractPercentile(
-            envBucket.latency.values,
-            "90",
-          ),
-          latency_p95_ms: this.extractPercentile(
-            envBucket.latency.values,
-            "95",
-          ),
           source_window_from: window.start.toISOString(),
           source_window_to: window.end.toISOString(),
           ingestedAt,
         };
-        bucketDocs.push(doc);
+        result.serviceDocuments.push({
+          ...base,
+          ...this.toMetricFields(
+            total,
+            errors,
+            readLatencySketch(envBucket, coarsening),
+          ),
+        });
+
+        for (const endpointBucket of envBucket.endpoints?.buckets ?? []) {
+          const endpointTotal = endpointBucket.doc_count ?? 0;
+          if (endpointTotal === 0) {
+            continue;
+          }
+          result.endpointDocuments.push({
+            ...base,
+            endpoint_name: endpointBucket.key,
+            ...this.toMetricFields(
+              endpointTotal,
+              endpointBucket.errors.doc_count ?? 0,
+              readLatencySketch(endpointBucket, coarsening),
+            ),
+          });
+        }
       }
     }
+    return totalSpanCount;
+  }
 
-    if (bucketDocs.length === 0) {
-      this.logger.log(
-        `집계 대상 스팬이 없어 비어 있는 분을 건너뜁니다. window=${window.start.toISOString()}~${window.end.toISOString()} spans=0 es_took=${took}ms`,
-      );
-    } else {
-      this.logger.log(
-        `스팬 집계 완료 window=${window.start.toISOString()}~${window.end.toISOString()} services=${services.length} docs=${bucketDocs.length} spans=${totalSpanCount} es_took=${took}ms`,
-      );
-    }
+  private isTooManyBuckets(error: unknown): boolean {
+    return (
+      error instanceof Error &&
+      error.message.includes("too_many_buckets_exception")
+    );
+  }
 
-    return bucketDocs;
+  private buildBucketAggregations(
+    sketchCoarsening: number,
+  ): Record<string, unknown> {
+    return {
+      ...buildLatencySketchAggregations(sketchCoarsening),
+      errors: {
+        filter: errorSpanFilter(),
+      },
+    };
   }
 
-  private extractPercentile(
-    values: Record<string, number>,
-    percentile: string,
-  ): number {
-    const preciseKey = `${percentile}.0`;
-    const raw = values[preciseKey] ?? values[percentile] ?? 0;
-    return Number.isFinite(raw) ? raw : 0;
+  /**
+   * 분위수는 병합 가능한 스케치에서 계산해, 더 큰 구간으로 합친 값과 같은 기준을 쓰게 한다.
+   */
+  private toMetricFields(
+    total: number,
+    errors: number,
+    sketch: LatencySketch,
+  ): Pick<
+    RollupMetricDocument,
+    | "request_count"
+    | "error_count"
+    | "error_rate"
+    | "latency_p50_ms"
+    | "latency_p90_ms"
+    | "latency_p95_ms"
+    | "latency_p99_ms"
+    | "latency_sketch"
+  > {
+    return {
+      request_count: total,
+      error_count: errors,
+      error_rate: total > 0 ? errors / total : 0,
+      latency_p50_ms: sketch.quantile(0.5),
+      latency_p90_ms: sketch.quantile(0.9),
+      latency_p95_ms: sketch.quantile(0.95),
+      latency_p99_ms: sketch.quantile(0.99),
+      latency_sketch: sketch.toJSON(),
+    };
   }
 }
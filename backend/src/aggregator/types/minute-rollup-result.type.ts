@@ -0,0 +1,14 @@
+import type {
+  EndpointRollupMetricDocument,
+  RollupMetricDocument,
+} from "../../shared/apm/rollup/rollup-metric.document";
+
+/**
+ * 1분 구간 하나를 집계한 결과
+ * - serviceDocuments: 서비스/환경 단위 롤업
+ * - endpointDocuments: 서비스/환경/엔드포인트 단위 롤업 (비활성화 시 빈 배열)
+ */
+export interface MinuteRollupResult {
+  serviceDocuments: RollupMetricDocument[];
+  endpointDocuments: EndpointRollupMetricDocument[];
+}
@@ -0,0 +1,10 @@
+/**
+ * 서비스 해시 파티션(샤드) 하나
+ * - Aggregator 레플리카는 리스를 잡은 샤드의 서비스만 집계하고, 샤드마다 체크포인트를 따로 둔다.
+ * - count=1 이면 기존과 같이 전체 서비스를 기본 체크포인트로 집계한다.
+ */
+export interface RollupShard {
+  index: number;
+  count: number;
+  checkpointId: string;
+}
@@ -2,10 +2,16 @@ import { Injectable, Logger } from "@nestjs/common";
 import { RollupCheckpointService } from "./rollup-checkpoint.service";
 import { RollupConfigService } from "./rollup-config.service";
 import type { MinuteWindow } from "./types/minute-window.type";
+import type { RollupShard } from "./types/rollup-shard.type";
+import {
+  LateArrivalDetector,
+  type LateMinute,
+} from "./late-arrival-detector.service";
 
 /**
  * 언제 어떤 1분 버킷을 집계해야 하는지 결정하는 서비스
  * - 체크포인트와 현재 시각을 비교해 "닫힌(closed) 분"만 반환한다.
+ * - 유예 기간 안의 이미 집계한 분 중 늦게 도착한 스팬이 있는 분은 따로 골라 재집계하게 한다.
  */
 @Injectable()
 export class MinuteWindowPlanner {
@@ -14,9 +20,16 @@ export class MinuteWindowPlanner {
   constructor(
     private readonly checkpoint: RollupCheckpointService,
     private readonly config: RollupConfigService,
+    private readonly lateArrivals: LateArrivalDetector,
   ) {}
 
-  async plan(now: Date = new Date()): Promise<MinuteWindow[]> {
+  /**
+   * @param shard 지정하면 그 샤드 체크포인트 이후의 닫힌 분을 돌려준다.
+   */
+  async plan(
+    now: Date = new Date(),
+    shard?: RollupShard,
+  ): Promise<MinuteWindow[]> {
     if (!this.config.isEnabled()) {
       return [];
     }
@@ -27,7 +40,7 @@ export class MinuteWindowPlanner {
       return [];
     }
 
-    const last = await this.checkpoint.loadLastCheckpoint();
+    const last = await this.loadStartCheckpoint(shard);
     const initialStart =
       last?.getTime() ??
       Math.max(0, closedUntil - this.config.getInitialLookbackMs());
@@ -49,6 +62,45 @@ export class MinuteWindowPlanner {
     return windows;
   }
 
+  /**
+   * [now - 유예 기간, 체크포인트) 사이에서 롤업 이후 스팬이 더 들어온 분을 돌려준다.
+   */
+  async planLateWindows(now: Date = new Date()): Promise<LateMinute[]> {
+    if (!this.config.isEnabled() || !this.config.isLateDataEnabled()) {
+      return [];
+    }
+    const last = await this.checkpoint.loadLastCheckpoint();
+    if (!last) {
+      return [];
+    }
+
+    const bucketMs = this.config.getBucketDurationMs();
+    const to = last.getTime();
+    const from = this.alignToBucket(
+      Math.max(0, now.getTime() - this.config.getLateDataGraceMs()),
+      bucketMs,
+    );
+    if (to <= from) {
+      return [];
+    }
+    return this.lateArrivals.findLateMinutes(new Date(from), new Date(to));
+  }
+
+  markReconciled(minutes: LateMinute[]): void {
+    this.lateArrivals.markReconciled(minutes);
+  }
+
+  private async loadStartCheckpoint(shard?: RollupShard): Promise<Date | null> {
+    if (!shard) {
+      return this.checkpoint.loadLastCheckpoint();
+    }
+    // 샤드를 처음 나눴을 때는 샤드 없이 쌓아 온 기본 체크포인트부터 이어서 집계한다.
+    return (
+      (await this.checkpoint.loadLastCheckpoint(shard.checkpointId)) ??
+      (await this.checkpoint.loadLastCheckpoint())
+    );
+  }
+
   private floorToBucket(timestamp: number, bucketMs: number): number | null {
     if (Number.isNaN(timestamp) || timestamp <= 0) {
       return null;
@@ -85,8 +85,9 @@ export class MetricsQueryNormalizerService {
       return `${minutes}m`;
     }
 
-    if (query.interval && /^\d+(s|m|h)$/i.test(query.interval)) {
-      return query.interval;
+    if (query.interval && /^\d+(s|m|h|d)$/i.test(query.interval)) {
+      // ES fixed_interval 단위는 소문자만 받는다. (대문자 M 은 월 단위로 해석되거나 거부된다)
+      return query.interval.toLowerCase();
     }
 
     return undefined;
@@ -98,7 +99,11 @@ export class MetricsQueryNormalizerService {
    * - 2시간 이하: 1분
    * - 6시간 이하: 5분
    * - 24시간 이하: 10분
-   * - 그 이상: 30분
+   * - 3일 이하: 30분
+   * - 30일 이하: 1시간
+   * - 90일 이하: 6시간
+   * - 그 이상: 1일
+   * (1h 이상 간격은 1h/1d 롤업 티어를 그대로 읽는다)
    */
   private autoInterval(from: Date, to: Date): string {
     const diffMinutes = Math.max(
@@ -121,7 +126,16 @@ export class MetricsQueryNormalizerService {
     if (diffMinutes <= 1440) {
       return "10m";
     }
-    return "30m";
+    if (diffMinutes <= 3 * 1440) {
+      return "30m";
+    }
+    if (diffMinutes <= 30 * 1440) {
+      return "1h";
+    }
+    if (diffMinutes <= 90 * 1440) {
+      return "6h";
+    }
+    return "1d";
   }
 
   /**
@@ -63,7 +63,7 @@ export class ServiceMetricsController {
   @ApiQuery({
     name: "interval",
     required: false,
-    description: "시계열 버킷 간격 문자열 (예: 1m,5m,1h)",
+    description: "시계열 버킷 간격 문자열 (예: 1m,5m,1h,1d)",
     example: "5m",
   })
   @ApiQuery({
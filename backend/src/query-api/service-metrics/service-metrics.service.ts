@@ -4,6 +4,13 @@ import { SpanRepository } from "../../shared/apm/spans/span.repository";
 import type { ServiceMetricBucket } from "../../shared/apm/spans/span.repository";
 import { RollupMetricsReadRepository } from "../../shared/apm/rollup/rollup-metrics-read.repository";
 import type { RollupMetricDocument } from "../../shared/apm/rollup/rollup-metric.document";
+import { mergeRollupMetrics } from "../../shared/apm/rollup/rollup-merge.util";
+import {
+  ROLLUP_TIERS,
+  planRollupTierSegments,
+  selectRollupTier,
+  type RollupTier,
+} from "../../shared/apm/rollup/rollup-tier";
 import type {
   MetricResponse,
   AggregationProfiler,
@@ -43,6 +50,12 @@ export class ServiceMetricsService {
     500,
     Number(process.env.ROLLUP_MAX_QUERY_BUCKETS ?? "43200"),
   );
+  // 조회 간격에 맞는 상위 롤업 티어(10m/1h/1d) 사용 여부
+  private readonly rollupTiersEnabled =
+    (process.env.ROLLUP_TIERS_ENABLED ?? "true").toLowerCase() === "true";
+  // 상위 티어는 하위 티어가 닫힌 뒤 cascade 되므로, 최근 구간은 이만큼 더 RAW로 남긴다.
+  private readonly rollupTierLagMs =
+    Math.max(0, Number(process.env.ROLLUP_TIER_LAG_SECONDS ?? "120")) * 1000;
 
   constructor(
     private readonly spanRepository: SpanRepository,
@@ -51,7 +64,7 @@ export class ServiceMetricsService {
     private readonly metricsCache: MetricsCacheService,
   ) {
     this.logger.log(
-      `롤업 조회 설정: enabled=${this.rollupEnabled} thresholdMinutes=${this.rollupThresholdMs / 60000} bucketMinutes=${this.rollupBucketMs / 60000}`,
+      `롤업 조회 설정: enabled=${this.rollupEnabled} thresholdMinutes=${this.rollupThresholdMs / 60000} bucketMinutes=${this.rollupBucketMs / 60000} tiers=${this.rollupTiersEnabled}`,
     );
   }
 
@@ -232,7 +245,9 @@ export class ServiceMetricsService {
   }
 
   /**
-   * 롤업 데이터 스트림에서 1분 버킷을 조회하고 ServiceMetricBucket 형태로 변환한다.
+   * 조회 간격에 맞는 롤업 티어 데이터 스트림에서 버킷을 조회하고 ServiceMetricBucket 형태로 변환한다.
+   * - 티어가 아직 만들지 않은 과거 구간과 티어 경계에 맞지 않는 앞뒤 구간은 더 잘게 나눈 티어로 메운다.
+   *   (1분 경계보다 작은 자투리는 이전처럼 읽지 않는다)
    * - Redis 캐시가 켜져 있으면 window 범위 전체를 캐시에 저장한다.
    */
   private async fetchRollupBuckets(
@@ -271,32 +286,37 @@ export class ServiceMetricsService {
       return [];
     }
 
-    // 롤업 문서는 1분 버킷이므로 검색 구간을 버킷 경계로 정규화한다.
-    const searchFrom = this.floorToBucket(fromMs);
-    const searchTo = this.floorToBucket(toMs);
-    if (searchTo <= searchFrom) {
-      return [];
-    }
-
-    const expectedBuckets = Math.min(
-      this.maxRollupBuckets,
-      Math.max(1, Math.ceil((searchTo - searchFrom) / this.rollupBucketMs) + 5),
-    );
-    const documents = await this.rollupRepository.search({
+    const tiers = this.resolveRollupTierChain(normalized.interval);
+    const coverage = await this.rollupRepository.findTierCoverage({
       serviceName: normalized.serviceName,
       environment: normalized.environment,
-      from: new Date(searchFrom).toISOString(),
-      to: new Date(searchTo).toISOString(),
-      size: expectedBuckets,
+      tiers,
     });
-    const lowerBound = fromMs;
-    const upperBound = toMs;
-    const buckets = documents
-      .map((doc) => this.mapRollupDocument(doc))
-      .filter((bucket) => {
-        const ts = Date.parse(bucket.timestamp);
-        return ts >= lowerBound && ts < upperBound;
-      });
+    const plan = planRollupTierSegments(fromMs, toMs, tiers, coverage);
+    const segmentDocuments = await Promise.all(
+      plan.segments.map((segment) =>
+        this.rollupRepository.search({
+          serviceName: normalized.serviceName,
+          environment: normalized.environment,
+          from: new Date(segment.from).toISOString(),
+          to: new Date(segment.to).toISOString(),
+          size: Math.min(
+            this.maxRollupBuckets,
+            Math.ceil((segment.to - segment.from) / segment.tier.bucketMs) + 5,
+          ),
+          streamKey: segment.tier.streamKey,
+        }),
+      ),
+    );
+    const documents = segmentDocuments.flat();
+    this.logger.debug(
+      `롤업 티어 조회 service=${normalized.serviceName} interval=${normalized.interval} segments=${plan.segments.map((segment) => segment.tier.key).join(",")} docs=${documents.length}`,
+    );
+    // 아래 티어 버킷은 조회 간격 티어의 버킷을 나누므로 간격 단위로 그대로 합칠 수 있다.
+    const buckets = this.mergeRollupDocuments(
+      documents,
+      this.resolveRollupMergeMs(normalized.interval),
+    );
 
     if (cacheKey) {
       await this.metricsCache.set(
@@ -368,7 +388,16 @@ export class ServiceMetricsService {
     }
 
     // 최신 threshold 구간만 raw 데이터로 남기고, 이전 구간은 롤업 인덱스로 대체한다.
-    const splitPoint = toMs - this.rollupThresholdMs;
+    // 경계를 조회 간격에 맞춰 내려야 같은 버킷이 롤업/RAW 양쪽에서 중복으로 나오지 않는다.
+    // 상위 티어는 cascade 지연만큼 경계를 더 과거로 당긴다.
+    const mergeMs = this.resolveRollupMergeMs(normalized.interval);
+    const tierLagMs =
+      this.resolveRollupTier(normalized.interval) === ROLLUP_TIERS[0]
+        ? 0
+        : this.rollupTierLagMs;
+    const splitPoint =
+      Math.floor((toMs - this.rollupThresholdMs - tierLagMs) / mergeMs) *
+      mergeMs;
     if (splitPoint <= fromMs) {
       return {
         rollupWindow: null,
@@ -398,28 +427,99 @@ export class ServiceMetricsService {
   }
 
   /**
-   * 롤업 인덱스 문서를 raw 메트릭 버킷과 동일한 형태로 변환한다.
+   * 1분 롤업 문서를 조회 간격 단위 버킷으로 합친다.
+   * - 요청/에러 수는 더하고, 분위수는 지연 시간 스케치를 병합해 다시 계산한다.
+   * - 스케치가 없는 이전 문서가 섞인 버킷은 요청 수 가중 평균으로 근사한다.
    */
-  private mapRollupDocument(doc: RollupMetricDocument): ServiceMetricBucket {
-    const total = typeof doc.request_count === "number" ? doc.request_count : 0;
-    const errors = typeof doc.error_count === "number" ? doc.error_count : 0;
-    const errorRate =
-      typeof doc.error_rate === "number"
-        ? doc.error_rate
-        : total > 0
-          ? errors / total
-          : 0;
+  private mergeRollupDocuments(
+    documents: RollupMetricDocument[],
+    mergeMs: number,
+  ): ServiceMetricBucket[] {
+    const groups = new Map<number, RollupMetricDocument[]>();
+    for (const doc of documents) {
+      const bucketStart =
+        Math.floor(Date.parse(doc["@timestamp_bucket"]) / mergeMs) * mergeMs;
+      const group = groups.get(bucketStart);
+      if (group) {
+        group.push(doc);
+      } else {
+        groups.set(bucketStart, [doc]);
+      }
+    }
 
+    return [...groups.entries()]
+      .sort(([a], [b]) => a - b)
+      .map(([bucketStart, docs]) =>
+        this.toRollupBucket(new Date(bucketStart).toISOString(), docs),
+      );
+  }
+
+  /**
+   * 같은 버킷에 속한 롤업 문서들을 raw 메트릭 버킷과 동일한 형태로 변환한다.
+   */
+  private toRollupBucket(
+    timestamp: string,
+    documents: RollupMetricDocument[],
+  ): ServiceMetricBucket {
+    const merged = mergeRollupMetrics(documents);
     return {
-      timestamp: doc["@timestamp_bucket"],
-      total,
-      errorRate,
-      p95Latency: Number(doc.latency_p95_ms ?? 0),
-      p90Latency: Number(doc.latency_p90_ms ?? 0),
-      p50Latency: Number(doc.latency_p50_ms ?? 0),
+      timestamp,
+      total: merged.requestCount,
+      errorRate:
+        merged.requestCount > 0 ? merged.errorCount / merged.requestCount : 0,
+      p95Latency: merged.latencyP95,
+      p90Latency: merged.latencyP90,
+      p50Latency: merged.latencyP50,
     };
   }
 
+  /**
+   * 1m 부터 조회 간격 티어까지의 티어 목록 (1m 티어는 ROLLUP_BUCKET_MINUTES 경계를 쓴다)
+   */
+  private resolveRollupTierChain(interval: string): RollupTier[] {
+    const tier = this.resolveRollupTier(interval);
+    return ROLLUP_TIERS.slice(0, ROLLUP_TIERS.indexOf(tier) + 1).map(
+      (candidate) =>
+        candidate.bucketMs < this.rollupBucketMs
+          ? { ...candidate, bucketMs: this.rollupBucketMs }
+          : candidate,
+    );
+  }
+
+  /**
+   * 조회 간격을 정확히 나눌 수 있는 가장 거친 롤업 티어 (티어 비활성화 시 1m)
+   */
+  private resolveRollupTier(interval: string): RollupTier {
+    if (!this.rollupTiersEnabled) {
+      return ROLLUP_TIERS[0];
+    }
+    return selectRollupTier(this.resolveRollupMergeMs(interval));
+  }
+
+  /**
+   * 롤업 문서를 합칠 버킷 크기. 롤업 해상도(1분)보다 잘게 나눌 수는 없다.
+   */
+  private resolveRollupMergeMs(interval: string): number {
+    return Math.max(this.rollupBucketMs, this.intervalToMs(interval));
+  }
+
+  /**
+   * `10s`/`5m`/`1h`/`1d` 형태의 간격 표현식을 밀리초로 변환한다.
+   */
+  private intervalToMs(interval: string): number {
+    const match = /^(\d+)(s|m|h|d)$/i.exec(interval);
+    if (!match) {
+      return 0;
+    }
+    const unitMs: Record<string, number> = {
+      s: 1000,
+      m: 60 * 1000,
+      h: 60 * 60 * 1000,
+      d: 24 * 60 * 60 * 1000,
+    };
+    return Number(match[1]) * unitMs[match[2].toLowerCase()];
+  }
+
   /**
    * 롤업 결과 캐시 키를 window 기준으로 생성한다.
    */
@@ -432,6 +532,7 @@ export class ServiceMetricsService {
       `service:${normalized.serviceName}`,
       `env:${normalized.environment ?? "all"}`,
       `metric:${normalized.metric ?? "all"}`,
+      `interval:${normalized.interval}`,
       `from:${window.from}`,
       `to:${window.to}`,
     ].join("|");
@@ -444,16 +545,6 @@ export class ServiceMetricsService {
     return this.rollupCacheTtlSeconds > 0 && this.metricsCache.isEnabled();
   }
 
-  /**
-   * timestamp를 롤업 버킷 크기에 맞춰 내림 정렬한다.
-   */
-  private floorToBucket(timestampMs: number): number {
-    if (!Number.isFinite(timestampMs) || timestampMs <= 0) {
-      return 0;
-    }
-    return Math.floor(timestampMs / this.rollupBucketMs) * this.rollupBucketMs;
-  }
-
   /**
    * 분 단위 입력 값을 밀리초로 변환한다.
    */
@@ -1,5 +1,12 @@
-import { Injectable } from "@nestjs/common";
+import { Injectable, Logger } from "@nestjs/common";
 import { SpanRepository } from "../../../shared/apm/spans/span.repository";
+import { RollupMetricsReadRepository } from "../../../shared/apm/rollup/rollup-metrics-read.repository";
+import { LatencySketch } from "../../../shared/apm/rollup/latency-sketch";
+import {
+  ROLLUP_TIERS,
+  planRollupTierSegments,
+} from "../../../shared/apm/rollup/rollup-tier";
+import { normalizeEnvironmentFilter } from "../../../shared/apm/common/environment.util";
 import { resolveTimeRange } from "../../common/time-range.util";
 import type { EndpointMetricsQueryDto } from "./dto/endpoint-metrics-query.dto";
 import type {
@@ -7,14 +14,50 @@ import type {
   EndpointMetricsResponseDto,
 } from "./endpoint-metrics.types";
 import type { EndpointTraceQueryDto } from "./dto/endpoint-trace-query.dto";
-import type { EndpointTraceItem } from "../../../shared/apm/spans/span.repository";
+import type {
+  EndpointMetricsItem,
+  EndpointMetricsParams,
+  EndpointTraceItem,
+} from "../../../shared/apm/spans/span.repository";
+
+const MINUTE_MS = 60 * 1000;
+
+interface EndpointAccumulator {
+  requestCount: number;
+  errorCount: number;
+  sketch: LatencySketch;
+}
 
 /**
  * 서비스 엔드포인트 단위 메트릭 집계 서비스
+ * - 긴 구간은 Aggregator가 만든 엔드포인트 롤업(티어별)을 합치고, 최신 구간과 자투리만 RAW 스팬에서 읽는다.
  */
 @Injectable()
 export class EndpointMetricsService {
-  constructor(private readonly spanRepository: SpanRepository) {}
+  private readonly logger = new Logger(EndpointMetricsService.name);
+  // 서비스 메트릭과 같은 롤업 조회 스위치/경계를 쓴다.
+  private readonly rollupEnabled =
+    (process.env.ROLLUP_ENABLED ?? "true").toLowerCase() === "true";
+  // Aggregator가 엔드포인트 롤업을 만들지 않으면 RAW 스팬만 읽는다.
+  private readonly rollupEndpointsEnabled =
+    (process.env.ROLLUP_ENDPOINTS_ENABLED ?? "true").toLowerCase() === "true";
+  private readonly rollupThresholdMs =
+    Math.max(1, Number(process.env.ROLLUP_THRESHOLD_MINUTES ?? "5") || 5) *
+    MINUTE_MS;
+  private readonly rollupTiersEnabled =
+    (process.env.ROLLUP_TIERS_ENABLED ?? "true").toLowerCase() === "true";
+  private readonly rollupTierLagMs =
+    Math.max(0, Number(process.env.ROLLUP_TIER_LAG_SECONDS ?? "120")) * 1000;
+  // RAW 구간에서 모을 엔드포인트 수 상한 (Aggregator의 ROLLUP_MAX_ENDPOINT_BUCKETS 와 맞춘다)
+  private readonly maxEndpoints = Math.max(
+    10,
+    Number(process.env.ROLLUP_MAX_ENDPOINT_BUCKETS ?? "200") || 200,
+  );
+
+  constructor(
+    private readonly spanRepository: SpanRepository,
+    private readonly rollupRepository: RollupMetricsReadRepository,
+  ) {}
 
   async getEndpointMetrics(
     serviceName: string,
@@ -24,14 +67,17 @@ export class EndpointMetricsService {
     const limit = query.limit ?? 10;
     const sortBy = query.sort_by ?? query.metric ?? "request_count";
 
-    const items = await this.spanRepository.aggregateEndpointMetrics({
+    const params: EndpointMetricsParams = {
       serviceName,
       environment: query.environment,
       from,
       to,
       limit,
       nameFilter: query.name_filter,
-    });
+    };
+    const items = this.shouldUseRollup(from, to)
+      ? await this.aggregateFromRollups(params)
+      : await this.spanRepository.aggregateEndpointMetrics(params);
 
     const normalized = items.map<EndpointMetricsItemDto>((item) => ({
       endpoint_name: item.endpointName,
@@ -53,6 +99,133 @@ export class EndpointMetricsService {
     };
   }
 
+  private shouldUseRollup(from: string, to: string): boolean {
+    const fromMs = Date.parse(from);
+    const toMs = Date.parse(to);
+    return (
+      this.rollupEnabled &&
+      this.rollupEndpointsEnabled &&
+      Number.isFinite(fromMs) &&
+      Number.isFinite(toMs) &&
+      toMs - fromMs > this.rollupThresholdMs
+    );
+  }
+
+  /**
+   * 닫힌 구간은 가장 거친 티어부터 엔드포인트 롤업으로 채우고,
+   * 최신 threshold(+티어 cascade 지연) 구간과 분 경계 자투리만 RAW 스팬 스케치로 계산해 합친다.
+   * - 티어마다 실제로 만들어진 범위 안에서만 읽고, 나머지는 더 잘게 나눈 티어로 메운다.
+   *   1m 티어도 덮지 않는 구간(롤업 시작 이전, 마지막 롤업 버킷 이후)은 RAW 로 읽는다.
+   * - 롤업 구간이 없으면 기존 RAW 집계를 그대로 쓴다.
+   */
+  private async aggregateFromRollups(
+    params: EndpointMetricsParams,
+  ): Promise<EndpointMetricsItem[]> {
+    const fromMs = Date.parse(params.from);
+    const toMs = Date.parse(params.to);
+    const lagMs = this.rollupTiersEnabled ? this.rollupTierLagMs : 0;
+    const splitPoint = Math.max(
+      fromMs,
+      Math.floor((toMs - this.rollupThresholdMs - lagMs) / MINUTE_MS) *
+        MINUTE_MS,
+    );
+    const tiers = this.rollupTiersEnabled
+      ? ROLLUP_TIERS
+      : ROLLUP_TIERS.slice(0, 1);
+    const coverage = await this.rollupRepository.findTierCoverage({
+      serviceName: params.serviceName,
+      environment: params.environment,
+      tiers,
+      endpoints: true,
+    });
+    const plan = planRollupTierSegments(fromMs, splitPoint, tiers, coverage);
+    if (plan.segments.length === 0) {
+      return this.spanRepository.aggregateEndpointMetrics(params);
+    }
+
+    const rawRanges = [...plan.rawRanges, { from: splitPoint, to: toMs }]
+      .filter((range) => range.to > range.from)
+      .map((range) => ({
+        from: new Date(range.from).toISOString(),
+        to: new Date(range.to).toISOString(),
+      }));
+
+    const started = Date.now();
+    const [segmentDocs, rawItems] = await Promise.all([
+      Promise.all(
+        plan.segments.map((segment) =>
+          this.rollupRepository.searchEndpoints({
+            serviceName: params.serviceName,
+            environment: params.environment,
+            from: new Date(segment.from).toISOString(),
+            to: new Date(segment.to).toISOString(),
+            streamKey: segment.tier.endpointStreamKey,
+          }),
+        ),
+      ),
+      this.spanRepository.aggregateEndpointSketches({
+        serviceName: params.serviceName,
+        environment: params.environment,
+        ranges: rawRanges,
+        size: Math.max(params.limit, this.maxEndpoints),
+      }),
+    ]);
+
+    const endpoints = new Map<string, EndpointAccumulator>();
+    const resolve = (name: string): EndpointAccumulator => {
+      let entry = endpoints.get(name);
+      if (!entry) {
+        entry = { requestCount: 0, errorCount: 0, sketch: new LatencySketch() };
+        endpoints.set(name, entry);
+      }
+      return entry;
+    };
+    let rollupDocCount = 0;
+    for (const docs of segmentDocs) {
+      rollupDocCount += docs.length;
+      for (const doc of docs) {
+        const entry = resolve(doc.endpoint_name);
+        entry.requestCount += Number(doc.request_count) || 0;
+        entry.errorCount += Number(doc.error_count) || 0;
+        const sketch = LatencySketch.fromJSON(doc.latency_sketch);
+        if (sketch) {
+          entry.sketch.merge(sketch);
+        }
+      }
+    }
+    for (const item of rawItems) {
+      const entry = resolve(item.endpointName);
+      entry.requestCount += item.requestCount;
+      entry.errorCount += item.errorCount;
+      entry.sketch.merge(item.sketch);
+    }
+
+    this.logger.debug(
+      `엔드포인트 롤업 조회 service=${params.serviceName} segments=${plan.segments.map((segment) => segment.tier.key).join(",")} rollup_docs=${rollupDocCount} raw_ranges=${rawRanges.length} took=${Date.now() - started}ms`,
+    );
+
+    const environment = normalizeEnvironmentFilter(params.environment) ?? "all";
+    const keyword = params.nameFilter?.toLowerCase();
+    const items: EndpointMetricsItem[] = [];
+    for (const [endpointName, entry] of endpoints) {
+      if (keyword && !endpointName.toLowerCase().includes(keyword)) {
+        continue;
+      }
+      if (entry.requestCount === 0) {
+        continue;
+      }
+      items.push({
+        endpointName,
+        serviceName: params.serviceName,
+        environment,
+        requestCount: entry.requestCount,
+        latencyP95: entry.sketch.count > 0 ? entry.sketch.quantile(0.95) : 0,
+        errorRate: entry.errorCount / entry.requestCount,
+      });
+    }
+    return items;
+  }
+
   private sortEndpoints(
     items: EndpointMetricsItemDto[],
     sortBy: "request_count" | "latency_p95_ms" | "error_rate",
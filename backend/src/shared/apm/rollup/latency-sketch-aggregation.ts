@@ -0,0 +1,118 @@
+import {
+  LATENCY_SKETCH_LN_GAMMA,
+  LATENCY_SKETCH_MIN_INDEX,
+  LATENCY_SKETCH_MIN_MS,
+  LatencySketch,
+} from "./latency-sketch";
+
+// 스팬 문서에 수집 시점에 계산해 넣는 스케치 버킷 인덱스 필드
+export const LATENCY_BUCKET_FIELD = "duration_bucket";
+
+// 0.001ms ~ 하루 범위의 버킷 수(약 630개)보다 넉넉하게 잡는다.
+const MAX_SKETCH_BUCKETS = 1024;
+
+// duration_bucket 이 없는 (enrichment 이전에 색인된) 스팬은 같은 인덱스를 스크립트로 계산한다.
+const LEGACY_BUCKET_SCRIPT = `
+if (doc['duration_ms'].size() == 0) { return null; }
+double v = doc['duration_ms'].value;
+if (v <= params.min) { return params.minIndex; }
+return (long) Math.ceil(Math.log(v) / params.lnGamma);
+`;
+
+export interface LatencySketchAggregationResult {
+  latency_stats?: {
+    min?: number | null;
+    max?: number | null;
+    sum?: number | null;
+  };
+  latency_buckets?: {
+    buckets: Array<{ key: number | string; doc_count: number }>;
+  };
+  latency_legacy?: {
+    doc_count: number;
+    latency_buckets?: {
+      buckets: Array<{ key: number | string; doc_count: number }>;
+    };
+  };
+}
+
+/**
+ * 버킷 집계 안에 넣으면 LatencySketch를 만들 수 있는 하위 집계 묶음
+ * - 스크립트는 duration_bucket 이 없는 문서(missing 버킷)에 대해서만 실행된다.
+ * @param coarsening 1보다 크면 인접한 버킷 인덱스를 그만큼씩 histogram 으로 묶어 버킷 수를 줄인다.
+ *   (search.max_buckets 를 넘을 때의 마지막 수단. 상대 오차가 약 γ^(coarsening/2) 까지 커진다)
+ */
+export function buildLatencySketchAggregations(
+  coarsening = 1,
+): Record<string, unknown> {
+  const script = {
+    lang: "painless",
+    source: LEGACY_BUCKET_SCRIPT,
+    params: {
+      min: LATENCY_SKETCH_MIN_MS,
+      minIndex: LATENCY_SKETCH_MIN_INDEX,
+      lnGamma: LATENCY_SKETCH_LN_GAMMA,
+    },
+  };
+  if (coarsening > 1) {
+    return {
+      latency_stats: { stats: { field: "duration_ms" } },
+      latency_buckets: {
+        histogram: {
+          field: LATENCY_BUCKET_FIELD,
+          interval: coarsening,
+          min_doc_count: 1,
+        },
+      },
+      latency_legacy: {
+        missing: { field: LATENCY_BUCKET_FIELD },
+        aggs: {
+          latency_buckets: {
+            histogram: { script, interval: coarsening, min_doc_count: 1 },
+          },
+        },
+      },
+    };
+  }
+  return {
+    latency_stats: { stats: { field: "duration_ms" } },
+    latency_buckets: {
+      terms: { field: LATENCY_BUCKET_FIELD, size: MAX_SKETCH_BUCKETS },
+    },
+    latency_legacy: {
+      missing: { field: LATENCY_BUCKET_FIELD },
+      aggs: {
+        latency_buckets: {
+          terms: { size: MAX_SKETCH_BUCKETS, script },
+        },
+      },
+    },
+  };
+}
+
+/**
+ * buildLatencySketchAggregations() 결과를 LatencySketch로 변환한다.
+ * - 묶은(coarsening) 버킷은 묶음 가운데 인덱스로 넣는다.
+ */
+export function readLatencySketch(
+  result: LatencySketchAggregationResult,
+  coarsening = 1,
+): LatencySketch {
+  const sketch = new LatencySketch();
+  const buckets = [
+    ...(result.latency_buckets?.buckets ?? []),
+    ...(result.latency_legacy?.latency_buckets?.buckets ?? []),
+  ];
+  for (const bucket of buckets) {
+    const index = Number(bucket.key);
+    if (Number.isFinite(index)) {
+      sketch.addBucket(index + Math.floor(coarsening / 2), bucket.doc_count);
+    }
+  }
+  sketch.includeStats(
+    result.latency_stats?.min,
+    result.latency_stats?.max,
+    result.latency_stats?.sum,
+  );
+  return sketch;
+}
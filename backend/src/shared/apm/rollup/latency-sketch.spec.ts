@@ -0,0 +1,134 @@
+import {
+  LATENCY_SKETCH_MIN_INDEX,
+  LATENCY_SKETCH_MIN_MS,
+  LATENCY_SKETCH_RELATIVE_ACCURACY,
+  LatencySketch,
+  latencyBucketValue,
+  toLatencyBucket,
+} from "./latency-sketch";
+
+// 부동소수점 오차 여유
+const EPSILON = 1e-9;
+
+function relativeError(actual: number, expected: number): number {
+  return Math.abs(actual - expected) / expected;
+}
+
+function sketchOf(values: number[]): LatencySketch {
+  const sketch = new LatencySketch();
+  values.forEach((value) => sketch.add(value));
+  return sketch;
+}
+
+const ONE_TO_THOUSAND = Array.from({ length: 1000 }, (_, index) => index + 1);
+
+describe("toLatencyBucket / latencyBucketValue", () => {
+  it.each([0.0015, 0.5, 1, 12.5, 99.9, 1_000, 60_000, 3_600_000])(
+    "%pms 의 버킷 대표값은 상대 오차 α 이내다",
+    (durationMs) => {
+      const value = latencyBucketValue(toLatencyBucket(durationMs));
+      expect(relativeError(value, durationMs)).toBeLessThanOrEqual(
+        LATENCY_SKETCH_RELATIVE_ACCURACY + EPSILON,
+      );
+    },
+  );
+
+  it("버킷 경계값은 아래 버킷에 들어간다 ((γ^(i-1), γ^i] 구간)", () => {
+    const gamma =
+      (1 + LATENCY_SKETCH_RELATIVE_ACCURACY) /
+      (1 - LATENCY_SKETCH_RELATIVE_ACCURACY);
+    const index = toLatencyBucket(100);
+    expect(Math.pow(gamma, index - 1)).toBeLessThan(100);
+    expect(Math.pow(gamma, index)).toBeGreaterThanOrEqual(100 - EPSILON);
+  });
+
+  it("최소값 이하, 음수, NaN 은 최소 버킷으로 보낸다", () => {
+    expect(toLatencyBucket(0)).toBe(LATENCY_SKETCH_MIN_INDEX);
+    expect(toLatencyBucket(-5)).toBe(LATENCY_SKETCH_MIN_INDEX);
+    expect(toLatencyBucket(LATENCY_SKETCH_MIN_MS)).toBe(
+      LATENCY_SKETCH_MIN_INDEX,
+    );
+    expect(toLatencyBucket(Number.NaN)).toBe(LATENCY_SKETCH_MIN_INDEX);
+  });
+
+  it("지연 시간이 커지면 버킷 인덱스도 줄지 않는다", () => {
+    let previous = toLatencyBucket(0.01);
+    for (let durationMs = 0.02; durationMs < 10_000; durationMs *= 1.01) {
+      const index = toLatencyBucket(durationMs);
+      expect(index).toBeGreaterThanOrEqual(previous);
+      previous = index;
+    }
+  });
+});
+
+describe("LatencySketch", () => {
+  it("빈 스케치의 분위수와 평균은 0 이다", () => {
+    const sketch = new LatencySketch();
+    expect(sketch.count).toBe(0);
+    expect(sketch.quantile(0.95)).toBe(0);
+    expect(sketch.mean()).toBe(0);
+  });
+
+  it.each([
+    [0.5, 500],
+    [0.9, 900],
+    [0.95, 950],
+    [0.99, 990],
+  ])("1~1000ms 균등 분포의 p%p 는 %pms 의 α 이내다", (q, expected) => {
+    const actual = sketchOf(ONE_TO_THOUSAND).quantile(q);
+    expect(relativeError(actual, expected)).toBeLessThanOrEqual(
+      LATENCY_SKETCH_RELATIVE_ACCURACY + EPSILON,
+    );
+  });
+
+  it("분위수는 관측한 최소/최대값을 벗어나지 않는다", () => {
+    const sketch = sketchOf([12.5, 12.5, 12.5]);
+    expect(sketch.quantile(0)).toBe(12.5);
+    expect(sketch.quantile(0.5)).toBe(12.5);
+    expect(sketch.quantile(1)).toBe(12.5);
+  });
+
+  it("평균은 버킷이 아니라 실제 합계로 계산한다", () => {
+    expect(sketchOf([10, 20, 60]).mean()).toBe(30);
+  });
+
+  it("나눠서 만든 스케치를 병합하면 한 번에 만든 스케치와 같다", () => {
+    const whole = sketchOf(ONE_TO_THOUSAND);
+    const odd = sketchOf(ONE_TO_THOUSAND.filter((value) => value % 2 === 1));
+    const even = sketchOf(ONE_TO_THOUSAND.filter((value) => value % 2 === 0));
+
+    odd.merge(even);
+    expect(odd.count).toBe(1000);
+    expect(odd.toJSON()).toEqual(whole.toJSON());
+    expect(odd.quantile(0.95)).toBe(whole.quantile(0.95));
+  });
+
+  it("직렬화 후 복원해도 버킷/통계/분위수가 같다", () => {
+    const sketch = sketchOf([0.2, 3, 3, 47.5, 120, 980, 15_000]);
+    const restored = LatencySketch.fromJSON(
+      JSON.parse(JSON.stringify(sketch.toJSON())),
+    );
+
+    expect(restored).not.toBeNull();
+    expect(restored?.toJSON()).toEqual(sketch.toJSON());
+    for (const q of [0.5, 0.9, 0.95, 0.99]) {
+      expect(restored?.quantile(q)).toBe(sketch.quantile(q));
+    }
+  });
+
+  it("정확도가 다르거나 형식이 맞지 않으면 복원하지 않는다", () => {
+    const serialized = sketchOf([1, 2, 3]).toJSON();
+    expect(LatencySketch.fromJSON(null)).toBeNull();
+    expect(LatencySketch.fromJSON({ ...serialized, alpha: 0.01 })).toBeNull();
+    expect(LatencySketch.fromJSON({ ...serialized, counts: [1] })).toBeNull();
+    expect(LatencySketch.fromJSON({ ...serialized, keys: "1,2" })).toBeNull();
+  });
+
+  it("0 이하 카운트는 무시한다", () => {
+    const sketch = new LatencySketch();
+    sketch.addBucket(10, 0);
+    sketch.addBucket(10, -3);
+    expect(sketch.count).toBe(0);
+    expect(sketch.toJSON().keys).toEqual([]);
+  });
+});
@@ -0,0 +1,168 @@
+/**
+ * 병합 가능한 지연 시간 스케치 (DDSketch 방식의 로그 버킷 히스토그램)
+ * - 버킷 인덱스 i는 (γ^(i-1), γ^i] ms 구간이며, 대표값 2γ^i/(γ+1)의 상대 오차는 α 이하다.
+ * - 버킷별 카운트를 더하기만 하면 되므로 분 단위 롤업을 어떤 구간/버킷 크기로도 합칠 수 있다.
+ * - stream-processor는 스팬마다 버킷 인덱스(duration_bucket)를 계산해 색인하고,
+ *   aggregator는 그 값을 terms 집계로 모아 롤업 문서에 직렬화한다.
+ */
+
+// 상대 오차 2% (γ ≈ 1.0408)
+export const LATENCY_SKETCH_RELATIVE_ACCURACY = 0.02;
+// 이 값 이하(0, 음수 포함)의 지연 시간은 모두 최소 버킷에 넣는다.
+export const LATENCY_SKETCH_MIN_MS = 0.001;
+
+const GAMMA =
+  (1 + LATENCY_SKETCH_RELATIVE_ACCURACY) /
+  (1 - LATENCY_SKETCH_RELATIVE_ACCURACY);
+export const LATENCY_SKETCH_LN_GAMMA = Math.log(GAMMA);
+export const LATENCY_SKETCH_MIN_INDEX = Math.ceil(
+  Math.log(LATENCY_SKETCH_MIN_MS) / LATENCY_SKETCH_LN_GAMMA,
+);
+
+/**
+ * 롤업 문서의 `latency_sketch` 필드에 저장되는 직렬화 형식
+ */
+export interface SerializedLatencySketch {
+  // 생성 시 사용한 상대 오차. 다르면 병합하지 않는다.
+  alpha: number;
+  // 버킷 인덱스 오름차순
+  keys: number[];
+  counts: number[];
+  min: number;
+  max: number;
+  sum: number;
+}
+
+/**
+ * 지연 시간(ms)을 스케치 버킷 인덱스로 변환한다.
+ */
+export function toLatencyBucket(durationMs: number): number {
+  if (!(durationMs > LATENCY_SKETCH_MIN_MS)) {
+    return LATENCY_SKETCH_MIN_INDEX;
+  }
+  return Math.ceil(Math.log(durationMs) / LATENCY_SKETCH_LN_GAMMA);
+}
+
+/**
+ * 버킷 인덱스의 대표 지연 시간(ms)
+ */
+export function latencyBucketValue(index: number): number {
+  return (2 * Math.pow(GAMMA, index)) / (GAMMA + 1);
+}
+
+export class LatencySketch {
+  private readonly bins = new Map<number, number>();
+  private total = 0;
+  private min = Number.POSITIVE_INFINITY;
+  private max = Number.NEGATIVE_INFINITY;
+  private sum = 0;
+
+  get count(): number {
+    return this.total;
+  }
+
+  /**
+   * 직렬화된 스케치를 복원한다. 형식이 다르거나 정확도가 다르면 null을 돌려준다.
+   */
+  static fromJSON(value: unknown): LatencySketch | null {
+    const raw = value as Partial<SerializedLatencySketch> | null | undefined;
+    if (
+      !raw ||
+      raw.alpha !== LATENCY_SKETCH_RELATIVE_ACCURACY ||
+      !Array.isArray(raw.keys) ||
+      !Array.isArray(raw.counts) ||
+      raw.keys.length !== raw.counts.length
+    ) {
+      return null;
+    }
+    const keys = raw.keys;
+    const counts = raw.counts;
+    const sketch = new LatencySketch();
+    keys.forEach((key, index) => sketch.addBucket(key, counts[index]));
+    sketch.includeStats(raw.min, raw.max, raw.sum);
+    return sketch;
+  }
+
+  add(durationMs: number, count = 1): void {
+    this.addBucket(toLatencyBucket(durationMs), count);
+    this.includeStats(durationMs, durationMs, durationMs * count);
+  }
+
+  addBucket(index: number, count: number): void {
+    if (!(count > 0)) {
+      return;
+    }
+    this.bins.set(index, (this.bins.get(index) ?? 0) + count);
+    this.total += count;
+  }
+
+  /**
+   * 버킷 카운트와 별도로 집계한 최소/최대/합계를 반영한다. (ES stats 집계 결과 등)
+   */
+  includeStats(
+    min: number | null | undefined,
+    max: number | null | undefined,
+    sum: number | null | undefined,
+  ): void {
+    if (typeof min === "number" && Number.isFinite(min)) {
+      this.min = Math.min(this.min, min);
+    }
+    if (typeof max === "number" && Number.isFinite(max)) {
+      this.max = Math.max(this.max, max);
+    }
+    if (typeof sum === "number" && Number.isFinite(sum)) {
+      this.sum += sum;
+    }
+  }
+
+  merge(other: LatencySketch): void {
+    for (const [index, count] of other.bins) {
+      this.addBucket(index, count);
+    }
+    this.includeStats(other.min, other.max, other.sum);
+  }
+
+  /**
+   * @param q 0~1 사이의 분위수 (예: 0.95)
+   */
+  quantile(q: number): number {
+    if (this.total === 0) {
+      return 0;
+    }
+    const rank = Math.min(Math.max(q, 0), 1) * (this.total - 1);
+    const keys = [...this.bins.keys()].sort((a, b) => a - b);
+    let cumulative = 0;
+    let value = latencyBucketValue(keys[keys.length - 1]);
+    for (const key of keys) {
+      cumulative += this.bins.get(key) ?? 0;
+      if (cumulative > rank) {
+        value = latencyBucketValue(key);
+        break;
+      }
+    }
+    // 버킷 대표값이 실제 관측 범위를 벗어나지 않도록 보정한다.
+    if (Number.isFinite(this.min)) {
+      value = Math.max(value, this.min);
+    }
+    if (Number.isFinite(this.max)) {
+      value = Math.min(value, this.max);
+    }
+    return value;
+  }
+
+  mean(): number {
+    return this.total > 0 ? this.sum / this.total : 0;
+  }
+
+  toJSON(): SerializedLatencySketch {
+    const keys = [...this.bins.keys()].sort((a, b) => a - b);
+    return {
+      alpha: LATENCY_SKETCH_RELATIVE_ACCURACY,
+      keys,
+      counts: keys.map((key) => this.bins.get(key) ?? 0),
+      min: Number.isFinite(this.min) ? this.min : 0,
+      max: Number.isFinite(this.max) ? this.max : 0,
+      sum: this.sum,
+    };
+  }
+}
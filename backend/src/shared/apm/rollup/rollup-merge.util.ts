@@ -0,0 +1,71 @@
+import { LatencySketch } from "./latency-sketch";
+import type { RollupMetricDocument } from "./rollup-metric.document";
+
+export interface MergedRollupMetrics {
+  requestCount: number;
+  errorCount: number;
+  latencyP50: number;
+  latencyP90: number;
+  latencyP95: number;
+  latencyP99: number;
+  // 모든 문서에 스케치가 있을 때만 채운다.
+  sketch: LatencySketch | null;
+}
+
+/**
+ * 같은 버킷(또는 같은 서비스/환경 키)에 속한 롤업 문서들을 합친다.
+ * - 요청/에러 수는 더하고, 분위수는 지연 시간 스케치를 병합해 다시 계산한다.
+ * - 스케치가 없는 이전 문서가 섞이면 요청 수 가중 평균으로 근사한다.
+ */
+export function mergeRollupMetrics(
+  documents: RollupMetricDocument[],
+): MergedRollupMetrics {
+  let requestCount = 0;
+  let errorCount = 0;
+  let sketchComplete = true;
+  const sketch = new LatencySketch();
+  for (const doc of documents) {
+    requestCount +=
+      typeof doc.request_count === "number" ? doc.request_count : 0;
+    errorCount += typeof doc.error_count === "number" ? doc.error_count : 0;
+    const docSketch = LatencySketch.fromJSON(doc.latency_sketch);
+    if (docSketch) {
+      sketch.merge(docSketch);
+    } else {
+      sketchComplete = false;
+    }
+  }
+
+  if (sketchComplete && sketch.count > 0) {
+    return {
+      requestCount,
+      errorCount,
+      latencyP50: sketch.quantile(0.5),
+      latencyP90: sketch.quantile(0.9),
+      latencyP95: sketch.quantile(0.95),
+      latencyP99: sketch.quantile(0.99),
+      sketch,
+    };
+  }
+
+  const weighted = (pick: (doc: RollupMetricDocument) => unknown): number => {
+    if (requestCount <= 0) {
+      return documents.length > 0 ? Number(pick(documents[0]) ?? 0) : 0;
+    }
+    const weightedSum = documents.reduce(
+      (sum, doc) =>
+        sum + Number(pick(doc) ?? 0) * (Number(doc.request_count) || 0),
+      0,
+    );
+    return weightedSum / requestCount;
+  };
+  return {
+    requestCount,
+    errorCount,
+    latencyP50: weighted((doc) => doc.latency_p50_ms),
+    latencyP90: weighted((doc) => doc.latency_p90_ms),
+    latencyP95: weighted((doc) => doc.latency_p95_ms),
+    latencyP99: weighted((doc) => doc.latency_p99_ms ?? doc.latency_p95_ms),
+    sketch: null,
+  };
+}
@@ -1,3 +1,5 @@
+import type { SerializedLatencySketch } from "./latency-sketch";
+
 /**
  * 롤업된 APM 메트릭 문서 스키마
  * - Query API와 Aggregator가 함께 참조한다.
@@ -16,7 +18,17 @@ export interface RollupMetricDocument extends Record<string, unknown> {
   latency_p90_ms: number;
   latency_p95_ms: number;
   latency_p99_ms?: number;
+  // 구간/버킷 병합용 지연 시간 스케치 (스케치 도입 이전 문서에는 없다)
+  latency_sketch?: SerializedLatencySketch;
   source_window_from: string;
   source_window_to: string;
   ingestedAt: string;
 }
+
+/**
+ * 서비스/환경/엔드포인트(SERVER 스팬 이름) 단위 롤업 문서
+ * - 서비스 롤업과 같은 필드에 endpoint_name 만 더해 별도 데이터 스트림에 저장한다.
+ */
+export interface EndpointRollupMetricDocument extends RollupMetricDocument {
+  endpoint_name: string;
+}
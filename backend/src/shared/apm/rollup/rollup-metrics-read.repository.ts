@@ -1,8 +1,22 @@
 import { Injectable } from "@nestjs/common";
 import type { Client } from "@elastic/elasticsearch";
-import { LogStorageService } from "../../logs/log-storage.service";
+import {
+  LogStorageService,
+  type LogStreamKey,
+} from "../../logs/log-storage.service";
 import { normalizeEnvironmentFilter } from "../common/environment.util";
-import type { RollupMetricDocument } from "./rollup-metric.document";
+import type {
+  EndpointRollupMetricDocument,
+  RollupMetricDocument,
+} from "./rollup-metric.document";
+import type {
+  RollupTier,
+  RollupTierCoverage,
+  RollupTierKey,
+} from "./rollup-tier";
+
+// 엔드포인트 롤업을 search_after 로 읽을 때의 페이지 크기
+const ENDPOINT_PAGE_SIZE = 2000;
 
 export interface RollupMetricsSearchParams {
   serviceName: string;
@@ -10,19 +24,36 @@ export interface RollupMetricsSearchParams {
   from: string;
   to: string;
   size: number;
+  // 조회할 롤업 티어 데이터 스트림 (기본: 1분 롤업)
+  streamKey?: LogStreamKey;
+}
+
+export interface EndpointRollupSearchParams {
+  serviceName: string;
+  environment?: string;
+  from: string;
+  to: string;
+  // 조회할 엔드포인트 롤업 티어 데이터 스트림
+  streamKey: LogStreamKey;
+}
+
+export interface RollupTierCoverageParams {
+  serviceName: string;
+  environment?: string;
+  tiers: readonly RollupTier[];
+  // true 이면 엔드포인트 롤업 스트림의 범위를 구한다.
+  endpoints?: boolean;
 }
 
 /**
- * Query API가 `metrics-apm` 데이터 스트림을 읽어오는 전용 레포지토리
+ * Query API가 롤업 데이터 스트림(`metrics-apm`, 티어/엔드포인트 롤업)을 읽어오는 전용 레포지토리
  */
 @Injectable()
 export class RollupMetricsReadRepository {
   private readonly client: Client;
-  private readonly dataStream: string;
 
-  constructor(storage: LogStorageService) {
+  constructor(private readonly storage: LogStorageService) {
     this.client = storage.getClient();
-    this.dataStream = storage.getDataStream("apmRollupMetrics");
   }
 
   async search(
@@ -46,7 +77,9 @@ export class RollupMetricsReadRepository {
     }
 
     const response = await this.client.search<RollupMetricDocument>({
-      index: this.dataStream,
+      index: this.storage.getDataStream(
+        params.streamKey ?? "apmRollupMetrics",
+      ),
       size: Math.max(1, params.size),
       sort: [{ "@timestamp_bucket": { order: "asc" as const } }],
       query: {
@@ -62,4 +95,126 @@ export class RollupMetricsReadRepository {
       )
       .map((hit) => hit._source);
   }
+
+  /**
+   * 티어마다 서비스의 롤업 문서가 실제로 덮고 있는 범위 [첫 버킷 시작, 마지막 버킷 끝)를 구한다.
+   * - 문서가 없거나 아직 만들어지지 않은 티어 스트림은 결과에서 빠진다.
+   */
+  async findTierCoverage(
+    params: RollupTierCoverageParams,
+  ): Promise<Map<RollupTierKey, RollupTierCoverage>> {
+    const filter: Array<Record<string, unknown>> = [
+      { term: { service_name: params.serviceName } },
+    ];
+    const env = normalizeEnvironmentFilter(params.environment);
+    if (env) {
+      filter.push({ term: { environment: env } });
+    }
+
+    const coverage = new Map<RollupTierKey, RollupTierCoverage>();
+    await Promise.all(
+      params.tiers.map(async (tier) => {
+        const response = await this.client.search({
+          index: this.storage.getDataStream(
+            params.endpoints ? tier.endpointStreamKey : tier.streamKey,
+          ),
+          ignore_unavailable: true,
+          allow_no_indices: true,
+          size: 0,
+          query: {
+            bool: {
+              filter,
+            },
+          },
+          aggs: {
+            earliest: { min: { field: "@timestamp_bucket" } },
+            latest: { max: { field: "@timestamp_bucket" } },
+          },
+        });
+        const aggregations = response.aggregations as
+          | {
+              earliest?: { value: number | null };
+              latest?: { value: number | null };
+            }
+          | undefined;
+        const earliest = aggregations?.earliest?.value;
+        const latest = aggregations?.latest?.value;
+        if (
+          typeof earliest === "number" &&
+          typeof latest === "number" &&
+          Number.isFinite(earliest) &&
+          Number.isFinite(latest)
+        ) {
+          coverage.set(tier.key, {
+            from: earliest,
+            to: latest + tier.bucketMs,
+          });
+        }
+      }),
+    );
+    return coverage;
+  }
+
+  /**
+   * 구간 안의 엔드포인트 롤업 문서를 모두 읽는다. (엔드포인트 수 × 버킷 수만큼 페이지를 넘긴다)
+   * - 병합에 필요한 필드만 _source 로 가져온다.
+   */
+  async searchEndpoints(
+    params: EndpointRollupSearchParams,
+  ): Promise<EndpointRollupMetricDocument[]> {
+    const filter: Array<Record<string, unknown>> = [
+      { term: { service_name: params.serviceName } },
+      {
+        range: {
+          "@timestamp_bucket": {
+            gte: params.from,
+            lt: params.to,
+          },
+        },
+      },
+    ];
+    const env = normalizeEnvironmentFilter(params.environment);
+    if (env) {
+      filter.push({ term: { environment: env } });
+    }
+
+    const documents: EndpointRollupMetricDocument[] = [];
+    let searchAfter: Array<string | number> | undefined;
+    for (;;) {
+      const response = await this.client.search<EndpointRollupMetricDocument>({
+        index: this.storage.getDataStream(params.streamKey),
+        size: ENDPOINT_PAGE_SIZE,
+        _source: [
+          "endpoint_name",
+          "request_count",
+          "error_count",
+          "latency_sketch",
+        ],
+        sort: [
+          { "@timestamp_bucket": { order: "asc" as const } },
+          { environment: { order: "asc" as const } },
+          { endpoint_name: { order: "asc" as const } },
+        ],
+        search_after: searchAfter,
+        query: {
+          bool: {
+            filter,
+          },
+        },
+      });
+
+      const hits = response.hits.hits;
+      for (const hit of hits) {
+        if (hit._source) {
+          documents.push(hit._source);
+        }
+      }
+      searchAfter = hits[hits.length - 1]?.sort as
+        | Array<string | number>
+        | undefined;
+      if (hits.length < ENDPOINT_PAGE_SIZE || !searchAfter) {
+        return documents;
+      }
+    }
+  }
 }
@@ -0,0 +1,213 @@
+import {
+  ROLLUP_TIERS,
+  planRollupTierSegments,
+  selectRollupTier,
+  type RollupTierCoverage,
+  type RollupTierKey,
+  type RollupTierPlan,
+} from "./rollup-tier";
+
+const MINUTE_MS = 60 * 1000;
+const HOUR_MS = 60 * MINUTE_MS;
+const DAY_MS = 24 * HOUR_MS;
+
+function at(iso: string): number {
+  return Date.parse(iso);
+}
+
+// 비교하기 쉽도록 티어 키와 ISO 문자열로 바꾼다.
+function describePlan(plan: RollupTierPlan): {
+  segments: string[];
+  rawRanges: string[];
+} {
+  const range = (from: number, to: number): string =>
+    `${new Date(from).toISOString()}~${new Date(to).toISOString()}`;
+  return {
+    segments: plan.segments.map(
+      (segment) => `${segment.tier.key} ${range(segment.from, segment.to)}`,
+    ),
+    rawRanges: plan.rawRanges.map((raw) => range(raw.from, raw.to)),
+  };
+}
+
+describe("selectRollupTier", () => {
+  it.each([
+    [10 * 1000, "1m"],
+    [MINUTE_MS, "1m"],
+    [5 * MINUTE_MS, "1m"],
+    [7 * MINUTE_MS, "1m"],
+    [10 * MINUTE_MS, "10m"],
+    [30 * MINUTE_MS, "10m"],
+    [90 * MINUTE_MS, "10m"],
+    [HOUR_MS, "1h"],
+    [6 * HOUR_MS, "1h"],
+    [36 * HOUR_MS, "1h"],
+    [DAY_MS, "1d"],
+    [7 * DAY_MS, "1d"],
+  ])("간격 %pms 는 %s 티어를 읽는다", (intervalMs, expected) => {
+    expect(selectRollupTier(intervalMs).key).toBe(expected);
+  });
+});
+
+describe("planRollupTierSegments", () => {
+  it("가장 거친 티어로 가운데를 채우고 가장자리는 더 잘게 나눈다", () => {
+    const plan = planRollupTierSegments(
+      at("2026-10-17T09:37:00.000Z"),
+      at("2026-10-18T10:05:00.000Z"),
+    );
+
+    expect(describePlan(plan)).toEqual({
+      segments: [
+        "1m 2026-10-17T09:37:00.000Z~2026-10-17T09:40:00.000Z",
+        "10m 2026-10-17T09:40:00.000Z~2026-10-17T10:00:00.000Z",
+        "1h 2026-10-17T10:00:00.000Z~2026-10-18T10:00:00.000Z",
+        "1m 2026-10-18T10:00:00.000Z~2026-10-18T10:05:00.000Z",
+      ],
+      rawRanges: [],
+    });
+  });
+
+  it("하루 경계를 온전히 덮는 구간은 1d 티어로 읽는다", () => {
+    const plan = planRollupTierSegments(
+      at("2026-10-14T23:00:00.000Z"),
+      at("2026-10-17T01:00:00.000Z"),
+    );
+
+    expect(describePlan(plan).segments).toEqual([
+      "1h 2026-10-14T23:00:00.000Z~2026-10-15T00:00:00.000Z",
+      "1d 2026-10-15T00:00:00.000Z~2026-10-17T00:00:00.000Z",
+      "1h 2026-10-17T00:00:00.000Z~2026-10-17T01:00:00.000Z",
+    ]);
+  });
+
+  it("1분 경계에 맞지 않는 가장자리는 RAW 구간으로 남긴다", () => {
+    const plan = planRollupTierSegments(
+      at("2026-10-17T09:37:30.000Z"),
+      at("2026-10-17T09:40:15.000Z"),
+    );
+
+    expect(describePlan(plan)).toEqual({
+      segments: ["1m 2026-10-17T09:38:00.000Z~2026-10-17T09:40:00.000Z"],
+      rawRanges: [
+        "2026-10-17T09:37:30.000Z~2026-10-17T09:38:00.000Z",
+        "2026-10-17T09:40:00.000Z~2026-10-17T09:40:15.000Z",
+      ],
+    });
+  });
+
+  it("넘겨준 티어만 사용한다", () => {
+    const plan = planRollupTierSegments(
+      at("2026-10-17T09:37:00.000Z"),
+      at("2026-10-17T12:05:00.000Z"),
+      ROLLUP_TIERS.slice(0, 1),
+    );
+
+    expect(describePlan(plan).segments).toEqual([
+      "1m 2026-10-17T09:37:00.000Z~2026-10-17T12:05:00.000Z",
+    ]);
+  });
+
+  it("빈 구간이나 뒤집힌 구간은 아무것도 읽지 않는다", () => {
+    const from = at("2026-10-17T09:00:00.000Z");
+    expect(planRollupTierSegments(from, from)).toEqual({
+      segments: [],
+      rawRanges: [],
+    });
+    expect(planRollupTierSegments(from, from - HOUR_MS)).toEqual({
+      segments: [],
+      rawRanges: [],
+    });
+  });
+
+  describe("티어 커버리지", () => {
+    const coverage = (
+      entries: Array<[RollupTierKey, string, string]>,
+    ): Map<RollupTierKey, RollupTierCoverage> =>
+      new Map(
+        entries.map(([key, from, to]) => [key, { from: at(from), to: at(to) }]),
+      );
+
+    it("상위 티어가 아직 만들지 않은 과거 구간은 더 잘게 나눈 티어로 읽는다", () => {
+      const plan = planRollupTierSegments(
+        at("2026-10-15T00:00:00.000Z"),
+        at("2026-10-17T12:00:00.000Z"),
+        ROLLUP_TIERS.slice(0, 3),
+        coverage([
+          ["1m", "2026-10-01T00:00:00.000Z", "2026-10-18T00:00:00.000Z"],
+          ["1h", "2026-10-17T00:00:00.000Z", "2026-10-18T00:00:00.000Z"],
+        ]),
+      );
+
+      expect(describePlan(plan)).toEqual({
+        segments: [
+          "1m 2026-10-15T00:00:00.000Z~2026-10-17T00:00:00.000Z",
+          "1h 2026-10-17T00:00:00.000Z~2026-10-17T12:00:00.000Z",
+        ],
+        rawRanges: [],
+      });
+    });
+
+    it("상위 티어가 따라잡지 못한 최신 구간도 더 잘게 나눈 티어로 읽는다", () => {
+      const plan = planRollupTierSegments(
+        at("2026-10-17T09:37:00.000Z"),
+        at("2026-10-17T12:00:00.000Z"),
+        ROLLUP_TIERS.slice(0, 3),
+        coverage([
+          ["1m", "2026-10-17T00:00:00.000Z", "2026-10-17T12:00:00.000Z"],
+          ["10m", "2026-10-17T00:00:00.000Z", "2026-10-17T11:50:00.000Z"],
+          ["1h", "2026-10-17T00:00:00.000Z", "2026-10-17T11:00:00.000Z"],
+        ]),
+      );
+
+      expect(describePlan(plan).segments).toEqual([
+        "1m 2026-10-17T09:37:00.000Z~2026-10-17T09:40:00.000Z",
+        "10m 2026-10-17T09:40:00.000Z~2026-10-17T10:00:00.000Z",
+        "1h 2026-10-17T10:00:00.000Z~2026-10-17T11:00:00.000Z",
+        "10m 2026-10-17T11:00:00.000Z~2026-10-17T11:50:00.000Z",
+        "1m 2026-10-17T11:50:00.000Z~2026-10-17T12:00:00.000Z",
+      ]);
+    });
+
+    it("어느 티어도 덮지 않는 구간은 RAW 로 남긴다", () => {
+      const from = at("2026-10-17T09:00:00.000Z");
+      const to = at("2026-10-17T10:00:00.000Z");
+
+      expect(
+        describePlan(planRollupTierSegments(from, to, ROLLUP_TIERS, new Map())),
+      ).toEqual({
+        segments: [],
+        rawRanges: ["2026-10-17T09:00:00.000Z~2026-10-17T10:00:00.000Z"],
+      });
+    });
+  });
+
+  it.each([
+    ["2026-10-01T00:00:00.000Z", "2026-10-17T00:00:00.000Z"],
+    ["2026-10-03T05:17:42.123Z", "2026-10-17T09:41:07.999Z"],
+    ["2026-10-17T09:59:59.000Z", "2026-10-17T10:00:01.000Z"],
+    ["2026-09-30T23:50:00.000Z", "2026-10-02T00:10:00.000Z"],
+  ])("%s~%s 구간을 빈틈과 겹침 없이 덮는다", (fromIso, toIso) => {
+    const from = at(fromIso);
+    const to = at(toIso);
+    const plan = planRollupTierSegments(from, to);
+    const pieces = [
+      ...plan.segments.map((segment) => ({
+        from: segment.from,
+        to: segment.to,
+        bucketMs: segment.tier.bucketMs,
+      })),
+      ...plan.rawRanges.map((raw) => ({ ...raw, bucketMs: 1 })),
+    ].sort((a, b) => a.from - b.from);
+
+    let cursor = from;
+    for (const piece of pieces) {
+      expect(piece.from).toBe(cursor);
+      expect(piece.to).toBeGreaterThan(piece.from);
+      // 티어 구간은 해당 티어 버킷 경계에 정확히 맞는다.
+      expect(piece.from % piece.bucketMs).toBe(0);
+      expect(piece.to % piece.bucketMs).toBe(0);
+      cursor = piece.to;
+    }
+    expect(cursor).toBe(to);
+  });
+});
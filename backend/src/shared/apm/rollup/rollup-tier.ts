@@ -0,0 +1,118 @@
+import type { LogStreamKey } from "../../logs/log-storage.service";
+
+export type RollupTierKey = "1m" | "10m" | "1h" | "1d";
+
+/**
+ * 롤업 해상도 티어
+ * - 1m 은 Aggregator가 스팬 원본에서 직접 만들고, 상위 티어는 바로 아래 티어 문서를 합쳐(cascade) 만든다.
+ * - 티어마다 별도 데이터 스트림을 써서 보존 기간을 따로 둔다.
+ */
+export interface RollupTier {
+  key: RollupTierKey;
+  bucketMs: number;
+  streamKey: LogStreamKey;
+  // 서비스/환경/엔드포인트(스팬 이름) 단위 롤업 스트림
+  endpointStreamKey: LogStreamKey;
+}
+
+export const ROLLUP_TIERS: readonly RollupTier[] = [
+  {
+    key: "1m",
+    bucketMs: 60 * 1000,
+    streamKey: "apmRollupMetrics",
+    endpointStreamKey: "apmEndpointRollupMetrics",
+  },
+  {
+    key: "10m",
+    bucketMs: 10 * 60 * 1000,
+    streamKey: "apmRollupMetrics10m",
+    endpointStreamKey: "apmEndpointRollupMetrics10m",
+  },
+  {
+    key: "1h",
+    bucketMs: 60 * 60 * 1000,
+    streamKey: "apmRollupMetrics1h",
+    endpointStreamKey: "apmEndpointRollupMetrics1h",
+  },
+  {
+    key: "1d",
+    bucketMs: 24 * 60 * 60 * 1000,
+    streamKey: "apmRollupMetrics1d",
+    endpointStreamKey: "apmEndpointRollupMetrics1d",
+  },
+];
+
+export interface RollupTierSegment {
+  tier: RollupTier;
+  from: number;
+  to: number;
+}
+
+// 티어 스트림에 실제로 만들어진 버킷 범위 [from, to) (epoch ms)
+export interface RollupTierCoverage {
+  from: number;
+  to: number;
+}
+
+export interface RollupTierPlan {
+  segments: RollupTierSegment[];
+  // 어떤 티어 버킷 경계에도 맞지 않아 RAW로 읽어야 하는 구간
+  rawRanges: Array<{ from: number; to: number }>;
+}
+
+/**
+ * 조회 간격을 정확히 나눌 수 있는 가장 거친 티어를 고른다. (예: 30m → 10m, 2h → 1h)
+ * 1분보다 작은 간격은 1m 티어를 돌려준다.
+ */
+export function selectRollupTier(intervalMs: number): RollupTier {
+  let selected = ROLLUP_TIERS[0];
+  for (const tier of ROLLUP_TIERS) {
+    if (tier.bucketMs <= intervalMs && intervalMs % tier.bucketMs === 0) {
+      selected = tier;
+    }
+  }
+  return selected;
+}
+
+/**
+ * [fromMs, toMs) 구간을 가장 거친 티어부터 채우고, 가장자리는 더 잘게 나눈 티어로 메운다.
+ * (예: 09:37~다음 날 10:05 → 1m 09:37~09:40, 10m 09:40~10:00, 1h ..., 1m 10:00~10:05)
+ * coverage 를 넘기면 티어마다 실제로 만들어진 범위 안에서만 읽고, 나머지는 더 잘게 나눈 티어로 메운다.
+ * (coverage 에 없는 티어는 읽지 않는다)
+ */
+export function planRollupTierSegments(
+  fromMs: number,
+  toMs: number,
+  tiers: readonly RollupTier[] = ROLLUP_TIERS,
+  coverage?: ReadonlyMap<RollupTierKey, RollupTierCoverage>,
+): RollupTierPlan {
+  const plan: RollupTierPlan = { segments: [], rawRanges: [] };
+  const fill = (from: number, to: number, index: number): void => {
+    if (to <= from) {
+      return;
+    }
+    if (index < 0) {
+      plan.rawRanges.push({ from, to });
+      return;
+    }
+    const tier = tiers[index];
+    const covered = coverage ? coverage.get(tier.key) : { from, to };
+    if (!covered) {
+      fill(from, to, index - 1);
+      return;
+    }
+    const lower = Math.max(from, covered.from);
+    const upper = Math.min(to, covered.to);
+    const start = Math.ceil(lower / tier.bucketMs) * tier.bucketMs;
+    const end = Math.floor(upper / tier.bucketMs) * tier.bucketMs;
+    if (end <= start) {
+      fill(from, to, index - 1);
+      return;
+    }
+    fill(from, start, index - 1);
+    plan.segments.push({ tier, from: start, to: end });
+    fill(end, to, index - 1);
+  };
+  fill(fromMs, toMs, tiers.length - 1);
+  return plan;
+}
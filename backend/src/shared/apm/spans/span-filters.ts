@@ -0,0 +1,61 @@
+/**
+ * 수집 시점에 계산한 is_error / is_root 로 만드는 스팬 필터
+ * - SPAN_LEGACY_FIELD_FALLBACK=true(기본)이면 파생 필드가 없는 이전 스팬은 status / parent_span_id 로 판정한다.
+ * - SpanEnricher 가 켜져 있고 파생 필드가 없는 스팬이 보존 기간을 지나 모두 지워졌다면 false 로 꺼서
+ *   term 필터 하나만 쓴다.
+ */
+function isLegacyFallbackEnabled(): boolean {
+  return (
+    (process.env.SPAN_LEGACY_FIELD_FALLBACK ?? "true").toLowerCase() === "true"
+  );
+}
+
+/**
+ * status=ERROR 스팬
+ */
+export function errorSpanFilter(): Record<string, unknown> {
+  const filter = { term: { is_error: true } };
+  if (!isLegacyFallbackEnabled()) {
+    return filter;
+  }
+  return {
+    bool: {
+      should: [
+        filter,
+        {
+          bool: {
+            filter: [{ term: { status: "ERROR" } }],
+            must_not: [{ exists: { field: "is_error" } }],
+          },
+        },
+      ],
+      minimum_should_match: 1,
+    },
+  };
+}
+
+/**
+ * parent_span_id 가 없는 루트 스팬
+ */
+export function rootSpanFilter(): Record<string, unknown> {
+  const filter = { term: { is_root: true } };
+  if (!isLegacyFallbackEnabled()) {
+    return filter;
+  }
+  return {
+    bool: {
+      should: [
+        filter,
+        {
+          bool: {
+            must_not: [
+              { exists: { field: "is_root" } },
+              { exists: { field: "parent_span_id" } },
+            ],
+          },
+        },
+      ],
+      minimum_should_match: 1,
+    },
+  };
+}
@@ -12,4 +12,9 @@ export interface SpanDocument extends BaseApmDocument {
   http_path?: string;
   http_status_code?: number;
   labels?: Record<string, string | number | boolean>;
+  // 수집 시점에 계산한 파생 필드 (SpanEnricher). 이전에 색인된 문서에는 없다.
+  is_error?: boolean;
+  is_root?: boolean;
+  // 지연 시간 스케치 버킷 인덱스 (shared/apm/rollup/latency-sketch.ts)
+  duration_bucket?: number;
 }
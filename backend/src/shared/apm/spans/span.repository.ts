@@ -6,6 +6,13 @@ import {
 import type { SpanDocument } from "./span.document";
 import { LogStorageService } from "../../logs/log-storage.service";
 import { normalizeEnvironmentFilter } from "../common/environment.util";
+import {
+  buildLatencySketchAggregations,
+  readLatencySketch,
+  type LatencySketchAggregationResult,
+} from "../rollup/latency-sketch-aggregation";
+import type { LatencySketch } from "../rollup/latency-sketch";
+import { errorSpanFilter, rootSpanFilter } from "./span-filters";
 
 export interface SpanSearchParams {
   traceId: string;
@@ -65,6 +72,21 @@ export interface EndpointMetricsItem {
   errorRate: number;
 }
 
+export interface EndpointSketchParams {
+  serviceName: string;
+  environment?: string;
+  // [from, to) 구간 목록. 롤업이 덮지 못한 구간만 넘긴다.
+  ranges: Array<{ from: string; to: string }>;
+  size: number;
+}
+
+export interface EndpointSketchItem {
+  endpointName: string;
+  requestCount: number;
+  errorCount: number;
+  sketch: LatencySketch;
+}
+
 export interface EndpointTraceQueryParams {
   serviceName: string;
   endpointName: string;
@@ -144,6 +166,10 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
     };
   }
 
+  private buildStatusFilter(status: string): Record<string, unknown> {
+    return status === "ERROR" ? errorSpanFilter() : { term: { status } };
+  }
+
   private buildDurationRangeFilter(
     min?: number,
     max?: number,
@@ -242,11 +268,7 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
           aggs: {
             total_requests: { value_count: { field: "span_id" } },
             error_requests: {
-              filter: {
-                term: {
-                  status: "ERROR",
-                },
-              },
+              filter: errorSpanFilter(),
             },
             latency: {
               percentiles: {
@@ -335,9 +357,7 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
                   },
                 },
                 error_requests: {
-                  filter: {
-                    term: { status: "ERROR" },
-                  },
+                  filter: errorSpanFilter(),
                 },
               },
             },
@@ -435,9 +455,7 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
               },
             },
             error_requests: {
-              filter: {
-                term: { status: "ERROR" },
-              },
+              filter: errorSpanFilter(),
             },
           },
         },
@@ -484,6 +502,80 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
     return items;
   }
 
+  /**
+   * 엔드포인트별 호출/에러 수와 지연 시간 스케치를 RAW 스팬에서 계산한다.
+   * - 엔드포인트 롤업과 같은 스케치로 만들어, 롤업 구간과 합쳐도 분위수 기준이 같게 한다.
+   */
+  async aggregateEndpointSketches(
+    params: EndpointSketchParams,
+  ): Promise<EndpointSketchItem[]> {
+    if (params.ranges.length === 0) {
+      return [];
+    }
+    const environmentFilter = normalizeEnvironmentFilter(params.environment);
+    const response = await this.client.search({
+      index: this.dataStream,
+      size: 0,
+      query: {
+        bool: {
+          filter: [
+            { term: { service_name: params.serviceName } },
+            { term: { kind: "SERVER" } },
+            {
+              bool: {
+                should: params.ranges.map((range) => ({
+                  range: {
+                    "@timestamp": { gte: range.from, lt: range.to },
+                  },
+                })),
+                minimum_should_match: 1,
+              },
+            },
+            ...(environmentFilter
+              ? [{ term: { environment: environmentFilter } }]
+              : []),
+          ],
+        },
+      },
+      aggs: {
+        endpoints: {
+          terms: {
+            field: "name",
+            size: params.size,
+          },
+          aggs: {
+            ...buildLatencySketchAggregations(),
+            error_requests: {
+              filter: errorSpanFilter(),
+            },
+          },
+        },
+      },
+    });
+
+    const buckets =
+      (
+        response.aggregations as {
+          endpoints?: {
+            buckets: Array<
+              LatencySketchAggregationResult & {
+                key: string;
+                doc_count: number;
+                error_requests: { doc_count: number };
+              }
+            >;
+          };
+        }
+      )?.endpoints?.buckets ?? [];
+
+    return buckets.map((bucket) => ({
+      endpointName: bucket.key,
+      requestCount: bucket.doc_count,
+      errorCount: bucket.error_requests.doc_count ?? 0,
+      sketch: readLatencySketch(bucket),
+    }));
+  }
+
   /**
    * 특정 서비스/엔드포인트에 대한 최신 trace 목록을 조회한다.
    * - status=ERROR 인 경우 에러 trace만 반환
@@ -508,7 +600,7 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
         : null;
 
     if (params.status === "ERROR") {
-      filters.push({ term: { status: "ERROR" } });
+      filters.push(errorSpanFilter());
     }
 
     const response = await this.client.search<SpanDocument>({
@@ -609,7 +701,7 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
         : []),
       ...(params.name ? [{ term: { name: params.name } }] : []),
       ...(params.kind ? [{ term: { kind: params.kind } }] : []),
-      ...(params.status ? [{ term: { status: params.status } }] : []),
+      ...(params.status ? [this.buildStatusFilter(params.status)] : []),
       ...(params.traceId ? [{ term: { trace_id: params.traceId } }] : []),
       ...(params.parentSpanId
         ? [{ term: { parent_span_id: params.parentSpanId } }]
@@ -670,14 +762,14 @@ export class SpanRepository extends BaseApmRepository<SpanDocument> {
       { term: { service_name: params.serviceName } },
       { term: { kind: "SERVER" } },
       this.buildTimeRangeFilter(params.from, params.to),
-      { bool: { must_not: [{ exists: { field: "parent_span_id" } }] } },
+      rootSpanFilter(),
     ];
 
     if (normalizedEnv) {
       filters.push({ term: { environment: normalizedEnv } });
     }
     if (params.status) {
-      filters.push({ term: { status: params.status } });
+      filters.push(this.buildStatusFilter(params.status));
     }
     if (params.minDurationMs != null || params.maxDurationMs != null) {
       filters.push({
@@ -1,5 +1,5 @@
 import { MicroserviceOptions, Transport } from "@nestjs/microservices";
-import type { KafkaConfig } from "kafkajs";
+import type { ConsumerConfig, KafkaConfig } from "kafkajs";
 
 const DEFAULT_BROKER = "localhost:9092";
 
@@ -131,6 +131,39 @@ export function getKafkaSecurityOverrides(): KafkaSecurityOverrides {
   return buildKafkaSecurityConfig();
 }
 
+/**
+ * 파티션 동시 처리 수 (KAFKA_CONCURRENT_PARTITIONS, 기본 3)
+ */
+export function resolvePartitionsConsumedConcurrently(): number {
+  return Number.parseInt(process.env.KAFKA_CONCURRENT_PARTITIONS ?? "3", 10);
+}
+
+/**
+ * Nest 마이크로서비스와 kafkajs 직접 컨슈머가 함께 쓰는 consumer 설정
+ */
+export function buildKafkaConsumerConfig(
+  groupId: string,
+  allowAutoTopicCreation: boolean,
+): ConsumerConfig {
+  return {
+    groupId,
+    allowAutoTopicCreation,
+    // fetch 용량/대기 시간을 환경 변수로 조절해 한 번에 더 많은 레코드를 끌어올 수 있다.
+    maxBytes:
+      parsePositiveInt(process.env.KAFKA_FETCH_MAX_BYTES) ??
+      DEFAULT_FETCH_MAX_BYTES,
+    maxBytesPerPartition:
+      parsePositiveInt(process.env.KAFKA_FETCH_MAX_BYTES_PER_PARTITION) ??
+      DEFAULT_FETCH_MAX_BYTES_PER_PARTITION,
+    minBytes:
+      parsePositiveInt(process.env.KAFKA_FETCH_MIN_BYTES) ??
+      DEFAULT_FETCH_MIN_BYTES,
+    maxWaitTimeInMs:
+      parsePositiveInt(process.env.KAFKA_FETCH_MAX_WAIT_MS) ??
+      DEFAULT_FETCH_MAX_WAIT_MS,
+  };
+}
+
 export function createKafkaMicroserviceOptions(
   params: KafkaMicroserviceParams,
 ): MicroserviceOptions {
@@ -153,25 +186,11 @@ export function createKafkaMicroserviceOptions(
         sasl,
       },
       consumer: {
-        groupId: params.groupId,
-        allowAutoTopicCreation: params.allowAutoTopicCreation ?? true,
-        partitionsConsumedConcurrently: Number.parseInt(
-          process.env.KAFKA_CONCURRENT_PARTITIONS ?? "3",
-          10,
+        ...buildKafkaConsumerConfig(
+          params.groupId,
+          params.allowAutoTopicCreation ?? true,
         ),
-        // fetch 용량/대기 시간을 환경 변수로 조절해 한 번에 더 많은 레코드를 끌어올 수 있다.
-        maxBytes:
-          parsePositiveInt(process.env.KAFKA_FETCH_MAX_BYTES) ??
-          DEFAULT_FETCH_MAX_BYTES,
-        maxBytesPerPartition:
-          parsePositiveInt(process.env.KAFKA_FETCH_MAX_BYTES_PER_PARTITION) ??
-          DEFAULT_FETCH_MAX_BYTES_PER_PARTITION,
-        minBytes:
-          parsePositiveInt(process.env.KAFKA_FETCH_MIN_BYTES) ??
-          DEFAULT_FETCH_MIN_BYTES,
-        maxWaitTimeInMs:
-          parsePositiveInt(process.env.KAFKA_FETCH_MAX_WAIT_MS) ??
-          DEFAULT_FETCH_MAX_WAIT_MS,
+        partitionsConsumedConcurrently: resolvePartitionsConsumedConcurrently(),
       },
     },
   };
@@ -10,8 +10,18 @@ import { Transport, TransportOptions } from "@elastic/transport";
 const DEFAULT_ROLLOVER_SIZE = "10gb";
 const DEFAULT_ROLLOVER_AGE = "1d";
 
-// APM 로그/스팬/롤업 데이터 스트림 키
-export type LogStreamKey = "apmLogs" | "apmSpans" | "apmRollupMetrics";
+// APM 로그/스팬/롤업(서비스·엔드포인트, 티어별) 데이터 스트림 키
+export type LogStreamKey =
+  | "apmLogs"
+  | "apmSpans"
+  | "apmRollupMetrics"
+  | "apmRollupMetrics10m"
+  | "apmRollupMetrics1h"
+  | "apmRollupMetrics1d"
+  | "apmEndpointRollupMetrics"
+  | "apmEndpointRollupMetrics10m"
+  | "apmEndpointRollupMetrics1h"
+  | "apmEndpointRollupMetrics1d";
 
 interface DataStreamConfig {
   key: LogStreamKey;
@@ -21,8 +31,42 @@ interface DataStreamConfig {
   mappings: Record<string, unknown>;
   rolloverSize: string;
   rolloverAge: string;
+  // 롤오버 이후 삭제까지의 기간 (비어 있으면 삭제하지 않는다)
+  retention?: string;
 }
 
+// 롤업 데이터 스트림(1m/10m/1h/1d 티어) 공통 매핑
+const ROLLUP_METRIC_MAPPINGS: Record<string, unknown> = {
+  properties: {
+    "@timestamp": { type: "date" },
+    "@timestamp_bucket": { type: "date" },
+    bucket_duration_seconds: { type: "integer" },
+    service_name: { type: "keyword" },
+    environment: { type: "keyword" },
+    target: { type: "keyword" },
+    request_count: { type: "long" },
+    error_count: { type: "long" },
+    error_rate: { type: "double" },
+    latency_p50_ms: { type: "double" },
+    latency_p90_ms: { type: "double" },
+    latency_p95_ms: { type: "double" },
+    latency_p99_ms: { type: "double" },
+    // 병합 가능한 지연 시간 스케치. 조회 시 _source로만 읽으므로 색인하지 않는다.
+    latency_sketch: { type: "object", enabled: false },
+    source_window_from: { type: "date" },
+    source_window_to: { type: "date" },
+    ingestedAt: { type: "date" },
+  },
+};
+
+// 엔드포인트 롤업 데이터 스트림 매핑 (서비스 롤업 + 엔드포인트 이름)
+const ENDPOINT_ROLLUP_METRIC_MAPPINGS: Record<string, unknown> = {
+  properties: {
+    ...(ROLLUP_METRIC_MAPPINGS.properties as Record<string, unknown>),
+    endpoint_name: { type: "keyword" },
+  },
+};
+
 /**
  * Elasticsearch 데이터 스트림 생성/보호를 담당하는 인프라 서비스
  * - stream-processor 는 쓰기 전용으로 사용
@@ -150,6 +194,9 @@ export class LogStorageService implements OnModuleInit, OnModuleDestroy {
             http_path: { type: "keyword" },
             http_status_code: { type: "integer" },
             labels: { type: "object", dynamic: true },
+            is_error: { type: "boolean" },
+            is_root: { type: "boolean" },
+            duration_bucket: { type: "integer" },
             ingestedAt: { type: "date" },
           },
         },
@@ -169,27 +216,80 @@ export class LogStorageService implements OnModuleInit, OnModuleDestroy {
         rolloverAge:
           process.env.ELASTICSEARCH_APM_ROLLUP_ROLLOVER_AGE ??
           DEFAULT_ROLLOVER_AGE,
-        mappings: {
-          properties: {
-            "@timestamp": { type: "date" },
-            "@timestamp_bucket": { type: "date" },
-            bucket_duration_seconds: { type: "integer" },
-            service_name: { type: "keyword" },
-            environment: { type: "keyword" },
-            target: { type: "keyword" },
-            request_count: { type: "long" },
-            error_count: { type: "long" },
-            error_rate: { type: "double" },
-            latency_p50_ms: { type: "double" },
-            latency_p90_ms: { type: "double" },
-            latency_p95_ms: { type: "double" },
-            latency_p99_ms: { type: "double" },
-            source_window_from: { type: "date" },
-            source_window_to: { type: "date" },
-            ingestedAt: { type: "date" },
-          },
-        },
+        // 기존 1분 롤업 스트림에는 삭제 단계가 없었으므로, 지정하지 않으면 계속 삭제하지 않는다.
+        retention: process.env.ELASTICSEARCH_APM_ROLLUP_RETENTION ?? "",
+        mappings: ROLLUP_METRIC_MAPPINGS,
       },
+      apmRollupMetrics10m: this.buildRollupTierConfig(
+        "apmRollupMetrics10m",
+        process.env.ELASTICSEARCH_APM_ROLLUP_10M_STREAM ?? "metrics-10m-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_10M_RETENTION ?? "180d",
+      ),
+      apmRollupMetrics1h: this.buildRollupTierConfig(
+        "apmRollupMetrics1h",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1H_STREAM ?? "metrics-1h-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1H_RETENTION ?? "730d",
+      ),
+      apmRollupMetrics1d: this.buildRollupTierConfig(
+        "apmRollupMetrics1d",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1D_STREAM ?? "metrics-1d-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1D_RETENTION ?? "",
+      ),
+      // 엔드포인트 롤업은 같은 티어의 서비스 롤업과 보존 기간을 공유한다.
+      apmEndpointRollupMetrics: this.buildRollupTierConfig(
+        "apmEndpointRollupMetrics",
+        process.env.ELASTICSEARCH_APM_ENDPOINT_ROLLUP_STREAM ??
+          "metrics-endpoint-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_RETENTION ?? "",
+        ENDPOINT_ROLLUP_METRIC_MAPPINGS,
+      ),
+      apmEndpointRollupMetrics10m: this.buildRollupTierConfig(
+        "apmEndpointRollupMetrics10m",
+        process.env.ELASTICSEARCH_APM_ENDPOINT_ROLLUP_10M_STREAM ??
+          "metrics-endpoint-10m-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_10M_RETENTION ?? "180d",
+        ENDPOINT_ROLLUP_METRIC_MAPPINGS,
+      ),
+      apmEndpointRollupMetrics1h: this.buildRollupTierConfig(
+        "apmEndpointRollupMetrics1h",
+        process.env.ELASTICSEARCH_APM_ENDPOINT_ROLLUP_1H_STREAM ??
+          "metrics-endpoint-1h-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1H_RETENTION ?? "730d",
+        ENDPOINT_ROLLUP_METRIC_MAPPINGS,
+      ),
+      apmEndpointRollupMetrics1d: this.buildRollupTierConfig(
+        "apmEndpointRollupMetrics1d",
+        process.env.ELASTICSEARCH_APM_ENDPOINT_ROLLUP_1D_STREAM ??
+          "metrics-endpoint-1d-apm",
+        process.env.ELASTICSEARCH_APM_ROLLUP_1D_RETENTION ?? "",
+        ENDPOINT_ROLLUP_METRIC_MAPPINGS,
+      ),
+    };
+  }
+
+  /**
+   * 롤업 티어 데이터 스트림 설정. 매핑은 1분 롤업과 같고 보존 기간만 다르다.
+   * - 1분 롤업 스트림 이름으로 시작하면 ISM 템플릿 패턴(`<stream>*`)이 겹치므로 다른 접두사를 쓴다.
+   */
+  private buildRollupTierConfig(
+    key: LogStreamKey,
+    dataStream: string,
+    retention: string,
+    mappings: Record<string, unknown> = ROLLUP_METRIC_MAPPINGS,
+  ): DataStreamConfig {
+    return {
+      key,
+      dataStream,
+      templateName: `${dataStream}-template`,
+      ilmPolicyName: `${dataStream}-ilm-policy`,
+      rolloverSize:
+        process.env.ELASTICSEARCH_APM_ROLLUP_ROLLOVER_SIZE ??
+        DEFAULT_ROLLOVER_SIZE,
+      rolloverAge:
+        process.env.ELASTICSEARCH_APM_ROLLUP_ROLLOVER_AGE ??
+        DEFAULT_ROLLOVER_AGE,
+      retention,
+      mappings,
     };
   }
 
@@ -235,6 +335,14 @@ export class LogStorageService implements OnModuleInit, OnModuleDestroy {
                   },
                 },
               },
+              ...(config.retention
+                ? {
+                    delete: {
+                      min_age: config.retention,
+                      actions: { delete: {} },
+                    },
+                  }
+                : {}),
             },
           },
         });
@@ -324,8 +432,18 @@ export class LogStorageService implements OnModuleInit, OnModuleDestroy {
                         },
                       },
                     ],
-                    transitions: [],
+                    transitions: config.retention
+                      ? [
+                          {
+                            state_name: "delete",
+                            conditions: { min_index_age: config.retention },
+                          },
+                        ]
+                      : [],
                   },
+                  ...(config.retention
+                    ? [{ name: "delete", actions: [{ delete: {} }] }]
+                    : []),
                 ],
               },
             },
@@ -2,6 +2,7 @@ import { Injectable } from "@nestjs/common";
 import type { LogEventDto } from "../../../shared/apm/logs/dto/log-event.dto";
 import type { LogDocument } from "../../../shared/apm/logs/log.document";
 import type { LogStreamKey } from "../../../shared/logs/log-storage.service";
+import type { BulkAckGroup } from "../../common/bulk-ack";
 import { BulkIndexerService } from "../../common/bulk-indexer.service";
 
 /**
@@ -13,7 +14,10 @@ export class LogIngestService {
 
   constructor(private readonly bulkIndexer: BulkIndexerService) {}
 
-  ingest(dto: LogEventDto): void {
+  /**
+   * @param ack 배치 컨슈머가 ES 확인을 기다릴 때 넘기는 ack 그룹
+   */
+  ingest(dto: LogEventDto, ack?: BulkAckGroup): void {
     const document: LogDocument = {
       "@timestamp": this.resolveTimestamp(dto.timestamp),
       type: "log",
@@ -31,7 +35,7 @@ export class LogIngestService {
     };
 
     // 로그 문서를 bulk 버퍼에 적재하고 즉시 반환해 Kafka 처리를 막지 않는다.
-    this.bulkIndexer.enqueue(LogIngestService.STREAM_KEY, document);
+    this.bulkIndexer.enqueue(LogIngestService.STREAM_KEY, document, ack);
   }
 
   /**
@@ -0,0 +1,62 @@
+import { toLatencyBucket } from "../../../shared/apm/rollup/latency-sketch";
+import type { SpanDocument } from "../../../shared/apm/spans/span.document";
+
+/**
+ * 스팬 문서에 조회용 파생 필드를 미리 계산해 넣는 수집 단계
+ * - is_error / is_root: status=ERROR 여부, parent_span_id 가 없는 루트 스팬 여부 (shared/apm/spans/span-filters.ts)
+ * - duration_bucket: 지연 시간 스케치 버킷 인덱스 (aggregator가 롤업 스케치를 만들 때 사용)
+ * - 반복되는 문자열(서비스/환경/스팬 이름)은 인터닝해 캐시가 값마다 한 벌만 들고 있게 한다.
+ * 엔드포인트 집계/필터는 롤업과 같은 키를 쓰도록 스팬 이름(name)을 그대로 쓴다.
+ */
+export class SpanEnricher {
+  private readonly strings = new Map<string, string>();
+
+  constructor(
+    private readonly enabled: boolean,
+    private readonly maxCacheEntries: number,
+  ) {}
+
+  /**
+   * SPAN_ENRICHMENT_ENABLED=false 이면 파생 필드를 붙이지 않는다.
+   */
+  static fromEnv(): SpanEnricher {
+    const cacheSize = Number.parseInt(
+      process.env.SPAN_ENRICHMENT_CACHE_SIZE ?? "50000",
+      10,
+    );
+    return new SpanEnricher(
+      process.env.SPAN_ENRICHMENT_ENABLED !== "false",
+      Math.max(1000, cacheSize || 0),
+    );
+  }
+
+  isEnabled(): boolean {
+    return this.enabled;
+  }
+
+  enrich(document: SpanDocument): SpanDocument {
+    if (!this.enabled) {
+      return document;
+    }
+    document.service_name = this.intern(document.service_name);
+    document.environment = this.intern(document.environment);
+    document.name = this.intern(document.name);
+    document.is_error = document.status === "ERROR";
+    document.is_root = !document.parent_span_id;
+    document.duration_bucket = toLatencyBucket(document.duration_ms);
+    return document;
+  }
+
+  intern(value: string): string {
+    const existing = this.strings.get(value);
+    if (existing !== undefined) {
+      return existing;
+    }
+    // 카디널리티가 폭주하면 LRU 대신 통째로 비워 비용을 일정하게 유지한다.
+    if (this.strings.size >= this.maxCacheEntries) {
+      this.strings.clear();
+    }
+    this.strings.set(value, value);
+    return value;
+  }
+}
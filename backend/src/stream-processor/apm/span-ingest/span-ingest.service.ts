@@ -2,7 +2,9 @@ import { Injectable } from "@nestjs/common";
 import type { SpanEventDto } from "../../../shared/apm/spans/dto/span-event.dto";
 import type { SpanDocument } from "../../../shared/apm/spans/span.document";
 import type { LogStreamKey } from "../../../shared/logs/log-storage.service";
+import type { BulkAckGroup } from "../../common/bulk-ack";
 import { BulkIndexerService } from "../../common/bulk-indexer.service";
+import { SpanEnricher } from "./span-enricher";
 
 /**
  * 스팬 이벤트를 Elasticsearch에 저장하는 서비스
@@ -10,10 +12,14 @@ import { BulkIndexerService } from "../../common/bulk-indexer.service";
 @Injectable()
 export class SpanIngestService {
   private static readonly STREAM_KEY: LogStreamKey = "apmSpans";
+  private readonly enricher = SpanEnricher.fromEnv();
 
   constructor(private readonly bulkIndexer: BulkIndexerService) {}
 
-  ingest(dto: SpanEventDto): void {
+  /**
+   * @param ack 배치 컨슈머가 ES 확인을 기다릴 때 넘기는 ack 그룹
+   */
+  ingest(dto: SpanEventDto, ack?: BulkAckGroup): void {
     const document: SpanDocument = {
       "@timestamp": this.resolveTimestamp(dto.timestamp),
       type: "span",
@@ -32,9 +38,11 @@ export class SpanIngestService {
       labels: this.normalizeLabels(dto.labels),
       ingestedAt: new Date().toISOString(),
     };
+    // is_error/is_root/duration_bucket 등 조회용 파생 필드를 미리 계산해 둔다.
+    this.enricher.enrich(document);
 
     // 스팬 문서를 BulkIndexer 버퍼에 적재해 Kafka 처리가 지연되지 않도록 한다.
-    this.bulkIndexer.enqueue(SpanIngestService.STREAM_KEY, document);
+    this.bulkIndexer.enqueue(SpanIngestService.STREAM_KEY, document, ack);
   }
 
   /**
@@ -0,0 +1,140 @@
+import { readFileSync } from "fs";
+import { performance } from "perf_hooks";
+import type { SpanDocument } from "../../shared/apm/spans/span.document";
+import { SpanEnricher } from "../apm/span-ingest/span-enricher";
+
+/**
+ * 스팬 enrichment(파생 필드 + 문자열 인터닝) 비용 벤치마크
+ *
+ * 사용법:
+ *   # 기록된 이벤트 코퍼스(NDJSON, 한 줄에 스팬/로그 이벤트 하나)
+ *   cd dummy_script/scripts && python3 -m payload_gen.dataset --spans 50000 --logs 0 --out /tmp/corpus
+ *   cat /tmp/corpus/*.ndjson > /tmp/corpus.ndjson
+ *
+ *   npm run bench:enrichment -- /tmp/corpus.ndjson
+ *
+ * 문서 생성 + NDJSON 직렬화(BulkIndexer enqueue 경로)를 enrichment 유무로 나눠 측정하고
+ * 스팬당 추가 비용(ns)과 직렬화 크기 증가량(bytes)을 출력한다.
+ * 캐시가 비어 있는 첫 패스(cold)와 반복 패스(warm)를 따로 보여준다.
+ *
+ * 환경 변수:
+ *   ENRICHMENT_BENCH_ROUNDS: 측정 반복 횟수 (기본 5)
+ */
+
+const rounds = Math.max(
+  1,
+  Number.parseInt(process.env.ENRICHMENT_BENCH_ROUNDS ?? "5", 10),
+);
+
+function loadSpans(path: string): Array<Record<string, unknown>> {
+  const spans: Array<Record<string, unknown>> = [];
+  for (const line of readFileSync(path, "utf8").split("\n")) {
+    if (line.trim().length === 0) {
+      continue;
+    }
+    const event = JSON.parse(line) as Record<string, unknown>;
+    if (event.type !== "log") {
+      spans.push(event);
+    }
+  }
+  return spans;
+}
+
+/**
+ * SpanIngestService.ingest 와 같은 필드 구성으로 문서를 만든다.
+ * (Kafka 메시지마다 새로 파싱된 문자열을 쓰도록 JSON 왕복으로 복제한다)
+ */
+function toDocument(event: Record<string, unknown>): SpanDocument {
+  const copy = JSON.parse(JSON.stringify(event)) as Record<string, unknown>;
+  return {
+    "@timestamp": String(copy.timestamp ?? new Date().toISOString()),
+    type: "span",
+    service_name: String(copy.service_name),
+    environment: String(copy.environment),
+    trace_id: String(copy.trace_id),
+    span_id: String(copy.span_id),
+    parent_span_id: (copy.parent_span_id as string | null) ?? null,
+    name: String(copy.name),
+    kind: copy.kind as SpanDocument["kind"],
+    duration_ms: Number(copy.duration_ms),
+    status: copy.status as SpanDocument["status"],
+    http_method: copy.http_method as string | undefined,
+    http_path: copy.http_path as string | undefined,
+    http_status_code: copy.http_status_code as number | undefined,
+    ingestedAt: new Date().toISOString(),
+  };
+}
+
+/**
+ * @returns [스팬당 ns, 스팬당 직렬화 bytes]
+ */
+function measurePass(
+  documents: SpanDocument[],
+  enricher: SpanEnricher | null,
+): [number, number] {
+  let bytes = 0;
+  const started = performance.now();
+  for (const document of documents) {
+    const prepared = enricher
+      ? enricher.enrich({ ...document })
+      : { ...document };
+    bytes += Buffer.byteLength(`${JSON.stringify(prepared)}\n`);
+  }
+  const elapsed = performance.now() - started;
+  return [
+    (elapsed * 1e6) / Math.max(documents.length, 1),
+    bytes / Math.max(documents.length, 1),
+  ];
+}
+
+function best(
+  documents: SpanDocument[],
+  createEnricher: () => SpanEnricher | null,
+): [number, number] {
+  const enricher = createEnricher();
+  // JIT 워밍업 겸 캐시 채우기
+  measurePass(documents, enricher);
+  let bestNs = Number.POSITIVE_INFINITY;
+  let bytes = 0;
+  for (let round = 0; round < rounds; round += 1) {
+    const [ns, size] = measurePass(documents, enricher);
+    bestNs = Math.min(bestNs, ns);
+    bytes = size;
+  }
+  return [bestNs, bytes];
+}
+
+function main(): void {
+  const path = process.argv[2] ?? process.env.ENRICHMENT_BENCH_CORPUS;
+  if (!path) {
+    console.error(
+      "코퍼스 경로가 필요합니다: npm run bench:enrichment -- <events.ndjson>",
+    );
+    process.exitCode = 1;
+    return;
+  }
+
+  const documents = loadSpans(path).map(toDocument);
+  if (documents.length === 0) {
+    console.error("코퍼스에 스팬 이벤트가 없습니다.");
+    process.exitCode = 1;
+    return;
+  }
+  console.log(
+    `📏 enrichment 벤치마크: 스팬 ${documents.length.toLocaleString()}건, 최선 ${rounds}회 기준`,
+  );
+
+  const createEnricher = (): SpanEnricher => new SpanEnricher(true, 50_000);
+  const [coldNs] = measurePass(documents, createEnricher());
+  const [baseNs, baseBytes] = best(documents, () => null);
+  const [enrichedNs, enrichedBytes] = best(documents, createEnricher);
+
+  console.log(
+    `문서 생성+직렬화: 기본 ${baseNs.toFixed(0)}ns/건, enrichment ${enrichedNs.toFixed(0)}ns/건 (cold ${coldNs.toFixed(0)}ns/건) → 스팬당 +${(enrichedNs - baseNs).toFixed(0)}ns`,
+  );
+  console.log(
+    `직렬화 크기: ${baseBytes.toFixed(0)}B → ${enrichedBytes.toFixed(0)}B/건 (+${(enrichedBytes - baseBytes).toFixed(0)}B)`,
+  );
+}
+
+main();
@@ -0,0 +1,210 @@
+import "reflect-metadata";
+import { readFileSync } from "fs";
+import { performance } from "perf_hooks";
+import { LogEventDto } from "../../shared/apm/logs/dto/log-event.dto";
+import { SpanEventDto } from "../../shared/apm/spans/dto/span-event.dto";
+import { InvalidEventPayloadError } from "../common/event-payload";
+import {
+  LOG_EVENT_SCHEMA,
+  SPAN_EVENT_SCHEMA,
+  createEventValidator,
+  type EventSchema,
+  type EventValidator,
+} from "../common/event-validator";
+
+/**
+ * 컴파일된 검증기 vs class-transformer + class-validator 벤치마크
+ *
+ * 사용법:
+ *   # 기록된 이벤트 코퍼스(NDJSON, 한 줄에 스팬/로그 이벤트 하나)
+ *   cd dummy_script/scripts && python3 -m payload_gen.dataset --spans 50000 --logs 50000 --out /tmp/corpus
+ *   cat /tmp/corpus/*.ndjson > /tmp/corpus.ndjson
+ *
+ *   npm run bench:validator -- /tmp/corpus.ndjson
+ *
+ * 1) 코퍼스 + 필드를 망가뜨린 변형 이벤트에 대해 두 검증기의 통과/거부 및 결과 문서가 같은지 확인하고
+ * 2) 각 검증기의 이벤트당 처리 시간(ns)과 속도 향상 배율을 출력한다.
+ *
+ * 환경 변수:
+ *   VALIDATOR_BENCH_ROUNDS: 측정 반복 횟수 (기본 5)
+ */
+
+interface Outcome {
+  accepted: boolean;
+  document?: string;
+}
+
+const rounds = Math.max(
+  1,
+  Number.parseInt(process.env.VALIDATOR_BENCH_ROUNDS ?? "5", 10),
+);
+
+function loadCorpus(path: string): { spans: object[]; logs: object[] } {
+  const spans: object[] = [];
+  const logs: object[] = [];
+  for (const line of readFileSync(path, "utf8").split("\n")) {
+    if (line.trim().length === 0) {
+      continue;
+    }
+    const event = JSON.parse(line) as Record<string, unknown>;
+    (event.type === "log" ? logs : spans).push(event);
+  }
+  return { spans, logs };
+}
+
+/**
+ * 거부 경로도 비교하도록 필드를 하나씩 망가뜨린 변형을 만든다.
+ */
+function buildMutations(events: object[]): object[] {
+  const mutators: Array<(event: Record<string, unknown>) => void> = [
+    (event) => delete event.service_name,
+    (event) => (event.service_name = ""),
+    (event) => (event.timestamp = "not-a-date"),
+    (event) => (event.timestamp = null),
+    (event) => (event.duration_ms = "12.5"),
+    (event) => (event.duration_ms = Number.NaN),
+    (event) => (event.kind = "server"),
+    (event) => (event.status = "FAILED"),
+    (event) => (event.level = "error"),
+    (event) => (event.level = "FATAL"),
+    (event) => (event.labels = ["a", "b"]),
+    (event) => (event.labels = null),
+    (event) => (event.parent_span_id = 42),
+    (event) => (event.http_status_code = "200"),
+    (event) => (event.extra_field = { nested: true }),
+  ];
+
+  const samples = events.slice(0, 200);
+  const mutated: object[] = [];
+  for (const mutate of mutators) {
+    for (const sample of samples) {
+      const copy = structuredClone(sample) as Record<string, unknown>;
+      mutate(copy);
+      mutated.push(copy);
+    }
+  }
+  return mutated;
+}
+
+function run<T extends object>(
+  validator: EventValidator<T>,
+  plain: object,
+): Outcome {
+  try {
+    const dto = validator.validate(plain);
+    const sorted = Object.fromEntries(
+      Object.entries(dto).sort(([a], [b]) => a.localeCompare(b)),
+    );
+    return { accepted: true, document: JSON.stringify(sorted) };
+  } catch (error) {
+    if (error instanceof InvalidEventPayloadError) {
+      return { accepted: false };
+    }
+    throw error;
+  }
+}
+
+function checkParity<T extends object>(
+  label: string,
+  reference: EventValidator<T>,
+  compiled: EventValidator<T>,
+  events: object[],
+): void {
+  let accepted = 0;
+  let mismatches = 0;
+  for (const event of events) {
+    const expected = run(reference, event);
+    const actual = run(compiled, event);
+    if (expected.accepted) {
+      accepted += 1;
+    }
+    if (
+      expected.accepted !== actual.accepted ||
+      expected.document !== actual.document
+    ) {
+      mismatches += 1;
+      if (mismatches <= 3) {
+        console.log(
+          `  ❌ 불일치: class-validator=${JSON.stringify(expected)} compiled=${JSON.stringify(actual)} event=${JSON.stringify(event)}`,
+        );
+      }
+    }
+  }
+  console.log(
+    `${label} 동등성: ${events.length.toLocaleString()}건 중 통과 ${accepted.toLocaleString()}건, 불일치 ${mismatches}건`,
+  );
+  if (mismatches > 0) {
+    process.exitCode = 1;
+  }
+}
+
+function measure<T extends object>(
+  validator: EventValidator<T>,
+  events: object[],
+): number {
+  // JIT 워밍업
+  validator.validateMany(events, () => undefined);
+
+  let best = Number.POSITIVE_INFINITY;
+  for (let round = 0; round < rounds; round += 1) {
+    const started = performance.now();
+    for (const event of events) {
+      try {
+        validator.validate(event);
+      } catch {
+        // 거부된 이벤트도 동일하게 측정한다.
+      }
+    }
+    best = Math.min(best, performance.now() - started);
+  }
+  return (best * 1e6) / Math.max(events.length, 1);
+}
+
+function benchmark<T extends object>(
+  label: string,
+  dtoClass: new () => T,
+  schema: EventSchema,
+  events: object[],
+): void {
+  if (events.length === 0) {
+    return;
+  }
+  const reference = createEventValidator(
+    "class-validator",
+    dtoClass,
+    schema,
+    label,
+  );
+  const compiled = createEventValidator("compiled", dtoClass, schema, label);
+
+  checkParity(label, reference, compiled, [
+    ...events,
+    ...buildMutations(events),
+  ]);
+
+  const referenceNs = measure(reference, events);
+  const compiledNs = measure(compiled, events);
+  console.log(
+    `${label} 검증 비용: class-validator ${referenceNs.toFixed(0)}ns/건, compiled ${compiledNs.toFixed(0)}ns/건 → ${(referenceNs / compiledNs).toFixed(1)}배`,
+  );
+}
+
+function main(): void {
+  const path = process.argv[2] ?? process.env.VALIDATOR_BENCH_CORPUS;
+  if (!path) {
+    console.error(
+      "코퍼스 경로가 필요합니다: npm run bench:validator -- <events.ndjson>",
+    );
+    process.exitCode = 1;
+    return;
+  }
+
+  const { spans, logs } = loadCorpus(path);
+  console.log(
+    `📏 검증기 벤치마크: 스팬 ${spans.length.toLocaleString()}건, 로그 ${logs.length.toLocaleString()}건, 최선 ${rounds}회 기준`,
+  );
+  benchmark("스팬", SpanEventDto, SPAN_EVENT_SCHEMA, spans);
+  benchmark("로그", LogEventDto, LOG_EVENT_SCHEMA, logs);
+}
+
+main();
@@ -0,0 +1,157 @@
+import type { Logger } from "@nestjs/common";
+import {
+  AdaptiveBulkController,
+  type BulkObservation,
+} from "./adaptive-bulk-controller";
+
+const MB = 1024 * 1024;
+
+const ADAPTIVE_ENV: Record<string, string> = {
+  BULK_ADAPTIVE: "true",
+  BULK_ADAPTIVE_MIN_BATCH_MB: "1",
+  BULK_ADAPTIVE_MAX_BATCH_MB: "4",
+  BULK_ADAPTIVE_MIN_PARALLEL: "1",
+  BULK_ADAPTIVE_MAX_PARALLEL: "4",
+  BULK_ADAPTIVE_TARGET_TOOK_MS: "1000",
+  BULK_ADAPTIVE_INTERVAL_MS: "1000",
+};
+
+// 최소 배치의 절반(512KB)씩 늘린다.
+const STEP_BYTES = MB / 2;
+
+function observation(overrides: Partial<BulkObservation>): BulkObservation {
+  return {
+    tookMs: 200,
+    bytes: 0,
+    items: 100,
+    rejected: 0,
+    failed: false,
+    ...overrides,
+  };
+}
+
+describe("AdaptiveBulkController", () => {
+  const logger = { log: jest.fn() } as unknown as Logger;
+  const originalEnv = process.env;
+  let now: number;
+
+  beforeEach(() => {
+    process.env = { ...originalEnv };
+    now = 10_000;
+    jest.spyOn(Date, "now").mockImplementation(() => now);
+  });
+
+  afterEach(() => {
+    process.env = originalEnv;
+    jest.restoreAllMocks();
+  });
+
+  describe("BULK_ADAPTIVE=false", () => {
+    it("거부가 있어도 초기값을 그대로 쓴다", () => {
+      delete process.env.BULK_ADAPTIVE;
+      const controller = AdaptiveBulkController.fromEnv(logger, 8 * MB, 3);
+
+      controller.observe(observation({ rejected: 50 }));
+      controller.observe(observation({ failed: true }));
+
+      expect(controller.currentBatchBytes).toBe(8 * MB);
+      expect(controller.currentParallelFlushes).toBe(3);
+      expect(controller.snapshot().adaptive).toBe(false);
+    });
+  });
+
+  describe("BULK_ADAPTIVE=true", () => {
+    beforeEach(() => {
+      Object.assign(process.env, ADAPTIVE_ENV);
+    });
+
+    it("초기값을 최소/최대 범위로 자른다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 200 * MB, 32);
+
+      expect(controller.currentBatchBytes).toBe(4 * MB);
+      expect(controller.currentParallelFlushes).toBe(4);
+      expect(controller.maxBatchBytes).toBe(4 * MB);
+    });
+
+    it("거부가 나면 조정 주기와 무관하게 바로 줄이고, 최솟값 아래로는 내려가지 않는다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 4 * MB, 4);
+
+      controller.observe(observation({ rejected: 10 }));
+      expect(controller.currentBatchBytes).toBe(3 * MB);
+      expect(controller.currentParallelFlushes).toBe(2);
+
+      controller.observe(observation({ rejected: 10 }));
+      expect(controller.currentBatchBytes).toBe(Math.floor(3 * MB * 0.75));
+      expect(controller.currentParallelFlushes).toBe(1);
+
+      for (let index = 0; index < 20; index += 1) {
+        controller.observe(observation({ failed: true }));
+      }
+      expect(controller.currentBatchBytes).toBe(MB);
+      expect(controller.currentParallelFlushes).toBe(1);
+    });
+
+    it("실패한 요청의 took 은 이동평균에 넣지 않는다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      controller.observe(observation({ tookMs: 60_000, failed: true }));
+      expect(controller.snapshot().tookEwmaMs).toBe(0);
+
+      controller.observe(observation({ tookMs: 400 }));
+      controller.observe(observation({ tookMs: 200 }));
+      expect(controller.snapshot().tookEwmaMs).toBe(
+        Math.round(0.3 * 200 + 0.7 * 400),
+      );
+    });
+
+    it("배치를 꽉 채워 보냈고 took 이 목표의 절반 이하면 바이트와 동시 플러시를 한 단계씩 늘린다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      controller.observe(observation({ bytes: 2 * MB }));
+      expect(controller.currentBatchBytes).toBe(2 * MB + STEP_BYTES);
+      expect(controller.currentParallelFlushes).toBe(3);
+
+      // 조정 주기 안에서는 다시 늘리지 않는다.
+      now += 500;
+      controller.observe(observation({ bytes: 3 * MB }));
+      expect(controller.currentBatchBytes).toBe(2 * MB + STEP_BYTES);
+      expect(controller.currentParallelFlushes).toBe(3);
+    });
+
+    it("took 이 목표 이하지만 절반보다 크면 바이트만 늘린다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      controller.observe(observation({ tookMs: 800, bytes: 2 * MB }));
+      expect(controller.currentBatchBytes).toBe(2 * MB + STEP_BYTES);
+      expect(controller.currentParallelFlushes).toBe(2);
+    });
+
+    it("배치를 채우지 못했으면 늘리지 않는다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      controller.observe(observation({ bytes: MB }));
+      expect(controller.currentBatchBytes).toBe(2 * MB);
+      expect(controller.currentParallelFlushes).toBe(2);
+    });
+
+    it("늘릴 때도 최댓값을 넘지 않는다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      for (let index = 0; index < 20; index += 1) {
+        now += 1_000;
+        const bytes = controller.currentBatchBytes;
+        controller.observe(observation({ bytes }));
+      }
+      expect(controller.currentBatchBytes).toBe(4 * MB);
+      expect(controller.currentParallelFlushes).toBe(4);
+    });
+
+    it("took 이동평균이 목표의 1.5배를 넘으면 바이트만 4/5로 줄인다", () => {
+      const controller = AdaptiveBulkController.fromEnv(logger, 2 * MB, 2);
+
+      controller.observe(observation({ tookMs: 2_000, bytes: 2 * MB }));
+      expect(controller.currentBatchBytes).toBe(Math.floor(2 * MB * 0.8));
+      expect(controller.currentParallelFlushes).toBe(2);
+    });
+  });
+});
@@ -0,0 +1,254 @@
+import type { Logger } from "@nestjs/common";
+
+/**
+ * 현재 적용 중인 bulk 튜닝 값
+ */
+export interface BulkTuning {
+  batchBytes: number;
+  parallelFlushes: number;
+  tookEwmaMs: number;
+  adaptive: boolean;
+}
+
+/**
+ * `_bulk` 응답 하나에 대한 관측값
+ */
+export interface BulkObservation {
+  tookMs: number;
+  bytes: number;
+  items: number;
+  rejected: number;
+  // 요청 자체가 실패(타임아웃/연결 오류/429 응답)했는지 여부
+  failed: boolean;
+}
+
+interface AdaptiveBounds {
+  minBatchBytes: number;
+  maxBatchBytes: number;
+  minParallel: number;
+  maxParallel: number;
+  targetTookMs: number;
+  stepBytes: number;
+  adjustIntervalMs: number;
+}
+
+const MB = 1024 * 1024;
+const EWMA_ALPHA = 0.3;
+
+/**
+ * `_bulk` 응답 시간(took)과 거부 건수로 배치 바이트/동시 플러시 수를 조절하는 AIMD 컨트롤러
+ * - 거부/요청 실패: 동시 플러시를 절반으로, 배치 바이트를 3/4로 즉시 줄인다 (multiplicative decrease)
+ * - took 이동평균이 목표의 1.5배 초과: 배치 바이트만 4/5로 줄인다
+ * - took 이동평균이 목표 이하이고 배치를 거의 꽉 채워 보냈다면: 배치 바이트를 한 단계 늘리고,
+ *   목표의 절반 이하로 여유가 있으면 동시 플러시도 1 늘린다 (additive increase)
+ * - 증가는 조정 주기(BULK_ADAPTIVE_INTERVAL_MS)마다 최대 한 번만 적용한다
+ */
+export class AdaptiveBulkController {
+  private batchBytes: number;
+  private parallelFlushes: number;
+  private tookEwmaMs = 0;
+  private lastAdjustedAt = 0;
+  private fullBatchSeen = false;
+
+  private constructor(
+    private readonly logger: Logger,
+    private readonly adaptive: boolean,
+    private readonly bounds: AdaptiveBounds,
+    initialBatchBytes: number,
+    initialParallel: number,
+  ) {
+    this.batchBytes = clamp(
+      initialBatchBytes,
+      bounds.minBatchBytes,
+      bounds.maxBatchBytes,
+    );
+    this.parallelFlushes = clamp(
+      initialParallel,
+      bounds.minParallel,
+      bounds.maxParallel,
+    );
+  }
+
+  /**
+   * BULK_ADAPTIVE=true 이면 적응형, 아니면 초기값을 고정으로 쓰는 컨트롤러를 만든다.
+   * 초기값은 기존 BULK_BATCH_BYTES_MB / BULK_MAX_PARALLEL_FLUSHES 설정이다.
+   */
+  static fromEnv(
+    logger: Logger,
+    initialBatchBytes: number,
+    initialParallel: number,
+  ): AdaptiveBulkController {
+    const adaptive =
+      (process.env.BULK_ADAPTIVE ?? "false").toLowerCase() === "true";
+    const minBatchBytes = Math.max(
+      64 * 1024,
+      Math.floor(
+        Number.parseFloat(process.env.BULK_ADAPTIVE_MIN_BATCH_MB ?? "1") * MB,
+      ),
+    );
+    const maxBatchBytes = Math.max(
+      minBatchBytes,
+      Math.floor(
+        Number.parseFloat(process.env.BULK_ADAPTIVE_MAX_BATCH_MB ?? "64") * MB,
+      ),
+    );
+    const minParallel = Math.max(
+      1,
+      Number.parseInt(process.env.BULK_ADAPTIVE_MIN_PARALLEL ?? "1", 10),
+    );
+    const maxParallel = Math.max(
+      minParallel,
+      Number.parseInt(process.env.BULK_ADAPTIVE_MAX_PARALLEL ?? "16", 10),
+    );
+    const targetTookMs = Math.max(
+      50,
+      Number.parseInt(process.env.BULK_ADAPTIVE_TARGET_TOOK_MS ?? "1000", 10),
+    );
+    const adjustIntervalMs = Math.max(
+      100,
+      Number.parseInt(process.env.BULK_ADAPTIVE_INTERVAL_MS ?? "2000", 10),
+    );
+
+    const bounds: AdaptiveBounds = adaptive
+      ? {
+          minBatchBytes,
+          maxBatchBytes,
+          minParallel,
+          maxParallel,
+          targetTookMs,
+          stepBytes: Math.max(64 * 1024, Math.floor(minBatchBytes / 2)),
+          adjustIntervalMs,
+        }
+      : {
+          minBatchBytes: initialBatchBytes,
+          maxBatchBytes: initialBatchBytes,
+          minParallel: initialParallel,
+          maxParallel: initialParallel,
+          targetTookMs,
+          stepBytes: 0,
+          adjustIntervalMs,
+        };
+
+    return new AdaptiveBulkController(
+      logger,
+      adaptive,
+      bounds,
+      initialBatchBytes,
+      initialParallel,
+    );
+  }
+
+  get currentBatchBytes(): number {
+    return this.batchBytes;
+  }
+
+  get currentParallelFlushes(): number {
+    return this.parallelFlushes;
+  }
+
+  /**
+   * 적응형 모드에서 배치 바이트가 도달할 수 있는 최댓값
+   */
+  get maxBatchBytes(): number {
+    return this.bounds.maxBatchBytes;
+  }
+
+  snapshot(): BulkTuning {
+    return {
+      batchBytes: this.batchBytes,
+      parallelFlushes: this.parallelFlushes,
+      tookEwmaMs: Math.round(this.tookEwmaMs),
+      adaptive: this.adaptive,
+    };
+  }
+
+  observe(observation: BulkObservation): void {
+    if (!observation.failed) {
+      this.tookEwmaMs =
+        this.tookEwmaMs === 0
+          ? observation.tookMs
+          : EWMA_ALPHA * observation.tookMs +
+            (1 - EWMA_ALPHA) * this.tookEwmaMs;
+    }
+    if (observation.bytes >= this.batchBytes * 0.8) {
+      this.fullBatchSeen = true;
+    }
+    if (!this.adaptive) {
+      return;
+    }
+
+    const now = Date.now();
+    if (observation.failed || observation.rejected > 0) {
+      this.apply(
+        Math.floor(this.batchBytes * 0.75),
+        Math.ceil(this.parallelFlushes / 2),
+        now,
+        observation.failed
+          ? "요청 실패"
+          : `거부 ${observation.rejected}/${observation.items}건`,
+      );
+      return;
+    }
+
+    if (now - this.lastAdjustedAt < this.bounds.adjustIntervalMs) {
+      return;
+    }
+
+    const target = this.bounds.targetTookMs;
+    if (this.tookEwmaMs > target * 1.5) {
+      this.apply(
+        Math.floor(this.batchBytes * 0.8),
+        this.parallelFlushes,
+        now,
+        `took ${Math.round(this.tookEwmaMs)}ms > 목표 ${target}ms`,
+      );
+    } else if (this.tookEwmaMs <= target && this.fullBatchSeen) {
+      const parallel =
+        this.tookEwmaMs <= target / 2
+          ? this.parallelFlushes + 1
+          : this.parallelFlushes;
+      this.apply(
+        this.batchBytes + this.bounds.stepBytes,
+        parallel,
+        now,
+        `took ${Math.round(this.tookEwmaMs)}ms ≤ 목표 ${target}ms`,
+      );
+    }
+  }
+
+  private apply(
+    batchBytes: number,
+    parallelFlushes: number,
+    now: number,
+    reason: string,
+  ): void {
+    const nextBytes = clamp(
+      batchBytes,
+      this.bounds.minBatchBytes,
+      this.bounds.maxBatchBytes,
+    );
+    const nextParallel = clamp(
+      parallelFlushes,
+      this.bounds.minParallel,
+      this.bounds.maxParallel,
+    );
+    this.lastAdjustedAt = now;
+    this.fullBatchSeen = false;
+    if (
+      nextBytes === this.batchBytes &&
+      nextParallel === this.parallelFlushes
+    ) {
+      return;
+    }
+
+    this.batchBytes = nextBytes;
+    this.parallelFlushes = nextParallel;
+    this.logger.log(
+      `Bulk 튜닝 조정(${reason}): batch=${(nextBytes / MB).toFixed(2)}MB parallel=${nextParallel}`,
+    );
+  }
+}
+
+function clamp(value: number, min: number, max: number): number {
+  return Math.min(max, Math.max(min, value));
+}
@@ -0,0 +1,52 @@
+/**
+ * Kafka 배치 하나에 속한 문서들의 색인 확인(ack)을 모아 기다리는 단위.
+ * - BulkIndexerService가 문서마다 ack/fail을 호출한다.
+ * - 컨슈머는 배치의 모든 문서를 enqueue 한 뒤 wait()가 끝나야 오프셋을 커밋한다.
+ * - 재시도 한도를 넘긴 문서가 하나라도 있으면 wait()는 reject 되어 배치가 재전달된다.
+ */
+export class BulkAckGroup {
+  private pending = 0;
+  private error?: Error;
+  private waiter?: {
+    resolve: () => void;
+    reject: (error: Error) => void;
+  };
+
+  add(): void {
+    this.pending += 1;
+  }
+
+  ack(): void {
+    this.pending -= 1;
+    this.settleIfDone();
+  }
+
+  fail(error: Error): void {
+    this.error ??= error;
+    this.pending -= 1;
+    this.settleIfDone();
+  }
+
+  /**
+   * 지금까지 추가된 문서가 모두 확인될 때까지 기다린다.
+   */
+  wait(): Promise<void> {
+    return new Promise<void>((resolve, reject) => {
+      this.waiter = { resolve, reject };
+      this.settleIfDone();
+    });
+  }
+
+  private settleIfDone(): void {
+    if (!this.waiter || this.pending > 0) {
+      return;
+    }
+    const waiter = this.waiter;
+    this.waiter = undefined;
+    if (this.error) {
+      waiter.reject(this.error);
+    } else {
+      waiter.resolve();
+    }
+  }
+}
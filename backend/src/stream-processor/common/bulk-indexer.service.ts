@@ -5,35 +5,104 @@ import {
   type LogStreamKey,
 } from "../../shared/logs/log-storage.service";
 import type { Client } from "@elastic/elasticsearch";
+import { performance } from "perf_hooks";
+import { promisify } from "util";
+import { constants as zlibConstants, gzip } from "zlib";
+import {
+  AdaptiveBulkController,
+  type BulkObservation,
+  type BulkTuning,
+} from "./adaptive-bulk-controller";
+import type { BulkAckGroup } from "./bulk-ack";
+import {
+  DeadLetterService,
+  type DeadLetterRecord,
+  type DeadLetterStage,
+} from "./dead-letter.service";
+import { ingestMetrics, streamMetrics } from "./ingest-metrics";
+
+const gzipAsync = promisify(gzip);
+
+type BulkCompression = "none" | "gzip";
 
 interface BufferedItem {
-  index: string;
-  document: BaseApmDocument;
+  streamKey: LogStreamKey;
+  // `{"create":{"_index":...}}\n` 액션 라인 (인덱스별로 캐시된 Buffer를 공유)
+  action: Buffer;
+  // 직렬화된 문서 + 개행. enqueue 시 한 번만 만들고 재시도 때도 그대로 재사용한다.
+  source: Buffer;
   size: number;
+  attempts: number;
+  ack?: BulkAckGroup;
+}
+
+interface BulkResponseBody {
+  errors?: boolean;
+  took?: number;
+  items?: unknown[];
+}
+
+interface BulkItemResult {
+  status?: number;
+  error?: { type?: string; reason?: string };
+}
+
+type BackpressureListener = (saturated: boolean) => void;
+
+interface DeadLetterEntry {
+  item: BufferedItem;
+  reason: string;
 }
 
 /**
  * Elasticsearch Bulk API를 이용해 로그/스팬을 배치 단위로 색인하는 유틸리티
- * - 버퍼에 문서를 모았다가 크기/시간 조건을 만족하면 NDJSON 형태로 전송
- * - 동시 플러시 수를 제한해 ES 클러스터 과부하를 막는다
+ * - 문서를 enqueue 시점에 한 번만 NDJSON 바이트로 직렬화하고, 플러시 때는 이어 붙여 그대로 전송 (선택적 gzip)
+ * - 동시 플러시 수를 제한해 ES 클러스터 과부하를 막는다 (BULK_ADAPTIVE=true면 응답 시간/거부에 따라 자동 조절)
+ * - 429/es_rejected_execution 등 일시적 거부는 문서 단위로 지터 백오프 후 재시도한다
+ * - 아직 ES가 확인하지 않은 문서 수/바이트가 한도를 넘으면 backpressure 신호를 보낸다
+ * - 재시도 불가로 거부된 문서(및 재전달 경로가 없는 재시도 한도 초과 문서)는 DLQ 토픽으로 보낸다
  */
 @Injectable()
 export class BulkIndexerService implements OnModuleDestroy {
+  // 한 프로세스에 컨텍스트별 인스턴스가 여럿 생길 수 있어 메트릭 라벨로 구분한다.
+  private static instanceCount = 0;
   private readonly logger = new Logger(BulkIndexerService.name);
+  private readonly metricLabels = {
+    indexer: String(BulkIndexerService.instanceCount++),
+  };
+  private readonly unregisterMetrics: () => void;
   private readonly client: Client;
   private readonly maxBatchSize: number;
-  private readonly maxBatchBytes: number;
   private readonly flushIntervalMs: number;
-  // 병렬 플러시
-  private readonly maxParallelFlushes: number;
+  // 배치 바이트/병렬 플러시 (고정값 또는 AIMD 조절값)
+  private readonly tuning: AdaptiveBulkController;
+  // 재시도
+  private readonly maxRetries: number;
+  private readonly retryBaseMs: number;
+  private readonly retryMaxMs: number;
+  // 미확인 문서 한도 (버퍼 + 전송 중 + 재시도 대기)
+  private readonly maxPendingDocs: number;
+  private readonly maxPendingBytes: number;
+  private readonly compression: BulkCompression;
+  private readonly actionLines = new Map<string, Buffer>();
 
   private buffer: BufferedItem[] = [];
   private bufferedBytes = 0;
   private flushTimer: NodeJS.Timeout | null = null;
   private inFlightFlushes = 0;
   private pendingFlush = false;
+  private pendingRetries = 0;
+  private pendingDeadLetters = 0;
+  private outstandingDocs = 0;
+  private outstandingBytes = 0;
+  private saturated = false;
+  private readonly backpressureListeners = new Set<BackpressureListener>();
+  private capacityWaiters: Array<() => void> = [];
 
-  constructor(private readonly storage: LogStorageService) {
+  constructor(
+    private readonly storage: LogStorageService,
+    private readonly deadLetters: DeadLetterService,
+  ) {
     this.client = this.storage.getClient();
     this.maxBatchSize = Math.max(
       1,
@@ -42,29 +111,76 @@ export class BulkIndexerService implements OnModuleDestroy {
     const byteLimitMb = Number.parseFloat(
       process.env.BULK_BATCH_BYTES_MB ?? "32",
     );
-    this.maxBatchBytes = Math.max(1024, Math.floor(byteLimitMb * 1024 * 1024));
+    const maxBatchBytes = Math.max(
+      1024,
+      Math.floor(byteLimitMb * 1024 * 1024),
+    );
     this.flushIntervalMs = Math.max(
       100,
       Number.parseInt(process.env.BULK_FLUSH_INTERVAL_MS ?? "1000", 10),
     );
-    this.maxParallelFlushes = Math.max(
+    const maxParallelFlushes = Math.max(
       1,
       Number.parseInt(process.env.BULK_MAX_PARALLEL_FLUSHES ?? "6", 10),
     );
+    this.tuning = AdaptiveBulkController.fromEnv(
+      this.logger,
+      maxBatchBytes,
+      maxParallelFlushes,
+    );
+    this.maxRetries = Math.max(
+      0,
+      Number.parseInt(process.env.BULK_MAX_RETRIES ?? "5", 10),
+    );
+    this.retryBaseMs = Math.max(
+      10,
+      Number.parseInt(process.env.BULK_RETRY_BASE_MS ?? "200", 10),
+    );
+    this.retryMaxMs = Math.max(
+      this.retryBaseMs,
+      Number.parseInt(process.env.BULK_RETRY_MAX_MS ?? "10000", 10),
+    );
+    this.maxPendingDocs = Math.max(
+      this.maxBatchSize,
+      Number.parseInt(process.env.BULK_MAX_PENDING_DOCS ?? "60000", 10),
+    );
+    const pendingLimitMb = Number.parseFloat(
+      process.env.BULK_MAX_PENDING_MB ?? "256",
+    );
+    this.maxPendingBytes = Math.max(
+      this.tuning.maxBatchBytes,
+      Math.floor(pendingLimitMb * 1024 * 1024),
+    );
+    this.compression =
+      (process.env.BULK_COMPRESSION ?? "none").toLowerCase() === "gzip"
+        ? "gzip"
+        : "none";
+    this.unregisterMetrics = streamMetrics.onCollect(() =>
+      this.collectMetrics(),
+    );
   }
 
   /**
    * Bulk 버퍼에 문서를 추가하고 조건을 만족하면 즉시 플러시한다.
    * - flush 완료를 기다리지 않으므로 Kafka 컨슈머가 block 되지 않는다.
+   * - ack 그룹을 넘기면 ES가 문서를 확인(또는 재시도 한도 초과로 포기)했을 때 그룹에 통지한다.
    */
-  enqueue(streamKey: LogStreamKey, document: BaseApmDocument): void {
-    const indexName = this.storage.getDataStream(streamKey);
-    const size =
-      Buffer.byteLength(JSON.stringify({ index: { _index: indexName } })) +
-      Buffer.byteLength(JSON.stringify(document)) +
-      2;
+  enqueue(
+    streamKey: LogStreamKey,
+    document: BaseApmDocument,
+    ack?: BulkAckGroup,
+  ): void {
+    const action = this.resolveActionLine(streamKey);
+    // 문서 직렬화는 여기서 한 번뿐이며, 크기 측정과 전송 본문에 같은 바이트를 쓴다.
+    const source = Buffer.from(`${JSON.stringify(document)}\n`);
+    const size = action.length + source.length;
 
-    this.buffer.push({ index: indexName, document, size });
+    ack?.add();
+    this.outstandingDocs += 1;
+    this.outstandingBytes += size;
+    this.updateSaturation();
+
+    this.buffer.push({ streamKey, action, source, size, attempts: 0, ack });
     this.bufferedBytes += size;
     if (this.shouldFlushBySize()) {
       this.triggerFlush();
@@ -73,15 +189,59 @@ export class BulkIndexerService implements OnModuleDestroy {
     }
   }
 
-  async onModuleDestroy(): Promise<void> {
-    if (this.buffer.length > 0) {
-      await this.flushRemaining();
+  /**
+   * 타이머를 기다리지 않고 현재 버퍼를 바로 전송하도록 요청한다.
+   * 배치 컨슈머가 ack를 기다리기 직전에 호출해 커밋 지연을 줄인다.
+   */
+  requestFlush(): void {
+    this.triggerFlush();
+  }
+
+  /**
+   * ES가 아직 확인하지 않은 문서가 한도를 넘었는지 여부
+   */
+  isSaturated(): boolean {
+    return this.saturated;
+  }
+
+  /**
+   * 미확인 문서가 저수위(한도의 50%) 아래로 내려갈 때까지 기다린다.
+   */
+  waitForCapacity(): Promise<void> {
+    if (!this.saturated) {
+      return Promise.resolve();
     }
+    return new Promise<void>((resolve) => this.capacityWaiters.push(resolve));
+  }
+
+  /**
+   * 포화/해제 전환 시 호출될 리스너를 등록한다. (Kafka consumer pause/resume 용)
+   * @returns 등록 해제 함수
+   */
+  onBackpressure(listener: BackpressureListener): () => void {
+    this.backpressureListeners.add(listener);
+    return () => this.backpressureListeners.delete(listener);
   }
 
   /**
-   * 버퍼가 비어있지 않다면 즉시 flush를 수행한다.
+   * 현재 적용 중인 배치 바이트/동시 플러시 수와 took 이동평균
    */
+  getTuning(): BulkTuning {
+    return this.tuning.snapshot();
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    this.unregisterMetrics();
+    if (
+      this.buffer.length > 0 ||
+      this.inFlightFlushes > 0 ||
+      this.pendingRetries > 0 ||
+      this.pendingDeadLetters > 0
+    ) {
+      await this.flushRemaining();
+    }
+  }
+
   /**
    * 버퍼가 차거나 타이머가 만료되었을 때 실제 bulk 요청을 트리거한다.
    * 동시 플러시 한도에 걸리면 pending 플래그만 세우고 이후에 재시도한다.
@@ -90,7 +250,7 @@ export class BulkIndexerService implements OnModuleDestroy {
     if (this.buffer.length === 0) {
       return;
     }
-    if (this.inFlightFlushes >= this.maxParallelFlushes) {
+    if (this.inFlightFlushes >= this.tuning.currentParallelFlushes) {
       this.pendingFlush = true;
       return;
     }
@@ -120,7 +280,7 @@ export class BulkIndexerService implements OnModuleDestroy {
   private shouldFlushBySize(): boolean {
     return (
       this.buffer.length >= this.maxBatchSize ||
-      this.bufferedBytes >= this.maxBatchBytes
+      this.bufferedBytes >= this.tuning.currentBatchBytes
     );
   }
 
@@ -138,84 +298,424 @@ export class BulkIndexerService implements OnModuleDestroy {
   }
 
   /**
-   * 현재 버퍼를 비우고 배치로 반환한다. 플러시 타이머도 함께 초기화한다.
+   * 현재 버퍼에서 최대 한 배치 분량을 꺼내 반환한다. 플러시 타이머도 함께 초기화한다.
    */
   private drainBuffer(): BufferedItem[] {
     if (this.flushTimer) {
       clearTimeout(this.flushTimer);
       this.flushTimer = null;
     }
-    const batch = this.buffer;
-    this.buffer = [];
-    this.bufferedBytes = 0;
-    return batch;
+    const batchBytes = this.tuning.currentBatchBytes;
+    if (
+      this.buffer.length <= this.maxBatchSize &&
+      this.bufferedBytes <= batchBytes
+    ) {
+      const batch = this.buffer;
+      this.buffer = [];
+      this.bufferedBytes = 0;
+      return batch;
+    }
+
+    // 재시도 문서가 합류했거나 배치 바이트가 줄어 한 배치 이상 쌓였다면 한 배치 분량만 잘라서 보낸다.
+    let count = 0;
+    let bytes = 0;
+    while (
+      count < this.buffer.length &&
+      count < this.maxBatchSize &&
+      (count === 0 || bytes + this.buffer[count].size <= batchBytes)
+    ) {
+      bytes += this.buffer[count].size;
+      count += 1;
+    }
+    this.bufferedBytes -= bytes;
+    return this.buffer.splice(0, count);
   }
 
   /**
-   * 실제 Elasticsearch `_bulk` 호출을 수행하고, 각 문서의 Promise를 resolve/reject 한다.
+   * 실제 Elasticsearch `_bulk` 호출을 수행하고, 문서별 결과에 따라 ack/재시도를 결정한다.
    */
   private async executeFlush(batch: BufferedItem[]): Promise<void> {
-    const operations = this.buildOperations(batch);
+    let bytes = 0;
+    for (const item of batch) {
+      bytes += item.size;
+    }
+
+    const startedAt = performance.now();
+    let response: BulkResponseBody;
     try {
-      const response = await this.client.bulk({ operations });
-      if (response.errors) {
-        this.logBulkError(response);
-        this.logger.warn(
-          `Bulk 색인 중 일부 문서가 실패했습니다. batch=${batch.length} took=${response.took ?? 0}ms`,
-        );
-      } else {
-        this.logger.debug(
-          `Bulk 색인 완료 batch=${batch.length} took=${response.took ?? 0}ms`,
-        );
-      }
+      response = await this.sendBulk(batch, bytes);
     } catch (error) {
-      const wrapped =
-        error instanceof Error
-          ? error
-          : new Error(`Bulk 색인 실패: ${String(error)}`);
+      this.recordFlush(
+        { tookMs: 0, bytes, items: batch.length, rejected: 0, failed: true },
+        startedAt,
+        0,
+      );
       this.logger.warn(
-        "Bulk 색인 요청이 실패했습니다. Kafka 컨슈머는 메시지를 계속 처리합니다.",
-        wrapped instanceof Error ? wrapped.stack : String(wrapped),
+        `Bulk 색인 요청이 실패했습니다. batch=${batch.length} 전체를 재시도합니다.`,
+        error instanceof Error ? error.stack : String(error),
       );
+      this.scheduleRetry(batch, String(error));
+      return;
+    }
+
+    if (!response.errors) {
+      this.recordFlush(
+        {
+          tookMs: response.took ?? 0,
+          bytes,
+          items: batch.length,
+          rejected: 0,
+          failed: false,
+        },
+        startedAt,
+        0,
+      );
+      for (const item of batch) {
+        this.settle(item);
+      }
+      this.logger.debug(
+        `Bulk 색인 완료 batch=${batch.length} took=${response.took ?? 0}ms`,
+      );
+      return;
+    }
+
+    const retryable: BufferedItem[] = [];
+    const rejectedItems: DeadLetterEntry[] = [];
+    let firstRejection: BulkItemResult | undefined;
+    batch.forEach((item, index) => {
+      const result = this.extractItemResult(response.items?.[index]);
+      if (!result?.error) {
+        this.settle(item);
+        return;
+      }
+      if (this.isRetryable(result)) {
+        retryable.push(item);
+        return;
+      }
+      // 매핑 오류 등 재시도로 해결되지 않는 문서는 DLQ로 보낸 뒤 확인 처리한다.
+      firstRejection ??= result;
+      rejectedItems.push({
+        item,
+        reason: `status=${result.status} type=${result.error.type} reason=${result.error.reason}`,
+      });
+    });
+    const rejected = rejectedItems.length;
+
+    this.recordFlush(
+      {
+        tookMs: response.took ?? 0,
+        bytes,
+        items: batch.length,
+        rejected: retryable.length,
+        failed: false,
+      },
+      startedAt,
+      rejected,
+    );
+    if (rejected > 0) {
+      this.logger.error(
+        `Bulk 색인 실패(재시도 불가) ${rejected}건: status=${firstRejection?.status} type=${firstRejection?.error?.type} reason=${firstRejection?.error?.reason}`,
+      );
+      this.deadLetter(rejectedItems, "bulk_rejected");
+    }
+    if (retryable.length > 0) {
+      this.logger.warn(
+        `Bulk 색인 중 ${retryable.length}/${batch.length}건이 거부되어 재시도합니다. took=${response.took ?? 0}ms`,
+      );
+      this.scheduleRetry(retryable, "es_rejected_execution_exception");
     }
   }
 
   /**
-   * Bulk API가 요구하는 `create`/`document` 쌍의 operations 배열을 생성한다.
+   * `_bulk` 결과를 튜닝 컨트롤러와 메트릭에 반영한다.
+   * @param permanent 재시도 불가로 거부된 문서 수 (observation.rejected는 재시도 대상 수)
    */
-  private buildOperations(
+  private recordFlush(
+    observation: BulkObservation,
+    startedAt: number,
+    permanent: number,
+  ): void {
+    this.tuning.observe(observation);
+
+    ingestMetrics.bulkBatchDocs.observe({}, observation.items);
+    ingestMetrics.bulkBatchBytes.observe({}, observation.bytes);
+    ingestMetrics.bulkRequestSeconds.observe(
+      {},
+      (performance.now() - startedAt) / 1000,
+    );
+    if (observation.failed) {
+      ingestMetrics.bulkRequests.inc({ outcome: "failed" });
+      return;
+    }
+    ingestMetrics.bulkTookSeconds.observe({}, observation.tookMs / 1000);
+    ingestMetrics.bulkRequests.inc({
+      outcome:
+        observation.rejected > 0 || permanent > 0 ? "partial" : "success",
+    });
+    if (observation.rejected > 0) {
+      ingestMetrics.bulkRejectedItems.inc(
+        { reason: "retryable" },
+        observation.rejected,
+      );
+    }
+    if (permanent > 0) {
+      ingestMetrics.bulkRejectedItems.inc({ reason: "permanent" }, permanent);
+    }
+  }
+
+  /**
+   * 수집 시점의 버퍼/미확인 문서 깊이와 튜닝 값을 gauge에 채운다.
+   */
+  private collectMetrics(): void {
+    const labels = this.metricLabels;
+    ingestMetrics.bulkInFlightFlushes.set(labels, this.inFlightFlushes);
+    ingestMetrics.bulkBufferDocs.set(labels, this.buffer.length);
+    ingestMetrics.bulkBufferBytes.set(labels, this.bufferedBytes);
+    ingestMetrics.bulkPendingDocs.set(labels, this.outstandingDocs);
+    ingestMetrics.bulkBackpressure.set(labels, this.saturated ? 1 : 0);
+    ingestMetrics.bulkTuningBatchBytes.set(
+      labels,
+      this.tuning.currentBatchBytes,
+    );
+    ingestMetrics.bulkTuningParallelFlushes.set(
+      labels,
+      this.tuning.currentParallelFlushes,
+    );
+  }
+
+  /**
+   * 데이터 스트림별 액션 라인을 한 번만 직렬화해 캐시한다.
+   * 데이터 스트림은 create op만 허용하므로 bulk 액션을 create로 지정한다.
+   */
+  private resolveActionLine(streamKey: LogStreamKey): Buffer {
+    const indexName = this.storage.getDataStream(streamKey);
+    let action = this.actionLines.get(indexName);
+    if (!action) {
+      action = Buffer.from(
+        `${JSON.stringify({ create: { _index: indexName } })}\n`,
+      );
+      this.actionLines.set(indexName, action);
+    }
+    return action;
+  }
+
+  /**
+   * 미리 직렬화된 액션/문서 바이트를 이어 붙인 NDJSON 본문을 `_bulk`로 그대로 전송한다.
+   * 클라이언트는 Buffer 본문을 다시 직렬화하지 않는다.
+   */
+  private async sendBulk(
     batch: BufferedItem[],
-  ): Array<Record<string, unknown>> {
-    const operations: Array<Record<string, unknown>> = [];
+    totalBytes: number,
+  ): Promise<BulkResponseBody> {
+    const chunks: Buffer[] = [];
     for (const item of batch) {
-      // 데이터 스트림은 create op만 허용하므로 bulk 액션을 create로 지정한다.
-      operations.push({ create: { _index: item.index } });
-      operations.push({ ...item.document });
+      chunks.push(item.action, item.source);
     }
-    return operations;
+    let body = Buffer.concat(chunks, totalBytes);
+    const headers: Record<string, string> = {};
+    if (this.compression === "gzip") {
+      // 색인 경로의 CPU를 아끼기 위해 압축률보다 속도를 우선한다.
+      body = await gzipAsync(body, { level: zlibConstants.Z_BEST_SPEED });
+      headers["content-encoding"] = "gzip";
+    }
+
+    return this.client.transport.request<BulkResponseBody>(
+      { method: "POST", path: "/_bulk", bulkBody: body },
+      { headers },
+    );
   }
 
   /**
-   * `_bulk` 응답 내 첫 번째 에러 내용을 추출하여 로그로 남긴다.
+   * `_bulk` 응답 items의 한 항목({ create: {...} })에서 결과 본문을 꺼낸다.
    */
-  private logBulkError(response: { items?: Array<Record<string, any>> }): void {
-    const firstError = response.items
-      ?.map((item) => Object.values(item)[0])
-      .find((result) => result && result.error);
-    if (firstError) {
-      this.logger.error(
-        `Bulk 색인 실패: type=${firstError.error?.type} reason=${firstError.error?.reason}`,
-      );
+  private extractItemResult(item: unknown): BulkItemResult | undefined {
+    if (!item || typeof item !== "object") {
+      return undefined;
+    }
+    return Object.values(item as Record<string, BulkItemResult>)[0];
+  }
+
+  /**
+   * 큐 포화(429)나 일시적 서버 오류(5xx)만 재시도 대상으로 본다.
+   */
+  private isRetryable(result: BulkItemResult): boolean {
+    const status = result.status ?? 0;
+    return (
+      status === 429 ||
+      status >= 500 ||
+      result.error?.type === "es_rejected_execution_exception"
+    );
+  }
+
+  /**
+   * 재시도 한도 안의 문서는 full jitter 지수 백오프 후 버퍼 앞쪽으로 되돌리고,
+   * 한도를 넘긴 문서는 ack 그룹에 실패로 통지한다. (ack 그룹이 없으면 재전달 경로가 없으므로 DLQ로 보낸다)
+   */
+  private scheduleRetry(items: BufferedItem[], reason: string): void {
+    const retry: BufferedItem[] = [];
+    const exhausted: DeadLetterEntry[] = [];
+    const exhaustedReason = `Bulk 색인 재시도 한도(${this.maxRetries}회)를 초과했습니다: ${reason}`;
+    for (const item of items) {
+      item.attempts += 1;
+      if (item.attempts <= this.maxRetries) {
+        retry.push(item);
+        continue;
+      }
+      ingestMetrics.bulkRetriesExhausted.inc();
+      if (item.ack) {
+        this.settle(item, new Error(exhaustedReason));
+      } else {
+        exhausted.push({ item, reason: exhaustedReason });
+      }
+    }
+    this.deadLetter(exhausted, "bulk_retry_exhausted");
+    if (retry.length === 0) {
+      return;
+    }
+
+    const attempt = Math.max(...retry.map((item) => item.attempts));
+    const ceiling = Math.min(this.retryMaxMs, this.retryBaseMs * 2 ** attempt);
+    const delay = Math.floor(Math.random() * ceiling);
+
+    this.pendingRetries += 1;
+    setTimeout(() => {
+      this.pendingRetries -= 1;
+      this.buffer.unshift(...retry);
+      for (const item of retry) {
+        this.bufferedBytes += item.size;
+      }
+      this.triggerFlush();
+    }, delay);
+  }
+
+  /**
+   * 색인하지 못한 문서를 원본 토픽별 DLQ로 보낸 뒤 확인 처리한다.
+   * DLQ 게시에 실패하면 ack 그룹에 실패로 통지해 배치가 재전달되도록 한다.
+   */
+  private deadLetter(entries: DeadLetterEntry[], stage: DeadLetterStage): void {
+    if (entries.length === 0) {
+      return;
+    }
+
+    const byTopic = new Map<string, DeadLetterEntry[]>();
+    for (const entry of entries) {
+      const topic = this.deadLetters.sourceTopicFor(entry.item.streamKey);
+      const group = byTopic.get(topic);
+      if (group) {
+        group.push(entry);
+      } else {
+        byTopic.set(topic, [entry]);
+      }
+    }
+
+    for (const [topic, group] of byTopic) {
+      const records: DeadLetterRecord[] = group.map(({ item, reason }) => ({
+        // 문서 뒤의 개행은 제외하고 JSON 본문만 담는다.
+        value: item.source.subarray(0, item.source.length - 1),
+        reason,
+        stage,
+        format: "document",
+      }));
+
+      this.pendingDeadLetters += 1;
+      void this.deadLetters
+        .publish(topic, records)
+        .then(
+          () => {
+            for (const { item } of group) {
+              this.settle(item);
+            }
+          },
+          (error: unknown) => {
+            this.logger.error(
+              `DLQ 게시에 실패했습니다. topic=${topic} count=${group.length}`,
+              error instanceof Error ? error.stack : String(error),
+            );
+            const failure =
+              error instanceof Error ? error : new Error(String(error));
+            for (const { item } of group) {
+              this.settle(item, failure);
+            }
+          },
+        )
+        .finally(() => {
+          this.pendingDeadLetters -= 1;
+        });
+    }
+  }
+
+  /**
+   * 문서 하나의 처리를 마무리한다. (성공/포기 모두 미확인 한도에서 제외)
+   */
+  private settle(item: BufferedItem, error?: Error): void {
+    if (error) {
+      item.ack?.fail(error);
     } else {
-      this.logger.error("Bulk 색인 실패: 응답 내 오류 세부 정보 없음");
+      item.ack?.ack();
+    }
+    this.outstandingDocs -= 1;
+    this.outstandingBytes -= item.size;
+    this.updateSaturation();
+  }
+
+  /**
+   * 고수위(한도 100%)에서 포화, 저수위(50%) 아래에서 해제로 전환한다.
+   */
+  private updateSaturation(): void {
+    if (!this.saturated) {
+      if (
+        this.outstandingDocs >= this.maxPendingDocs ||
+        this.outstandingBytes >= this.maxPendingBytes
+      ) {
+        this.saturated = true;
+        this.logger.warn(
+          `미확인 Bulk 문서가 한도에 도달했습니다. docs=${this.outstandingDocs} bytes=${this.outstandingBytes} → 소비를 일시 중지합니다.`,
+        );
+        this.notifyBackpressure(true);
+      }
+      return;
+    }
+
+    if (
+      this.outstandingDocs <= this.maxPendingDocs / 2 &&
+      this.outstandingBytes <= this.maxPendingBytes / 2
+    ) {
+      this.saturated = false;
+      this.logger.log(
+        `미확인 Bulk 문서가 저수위 아래로 내려갔습니다. docs=${this.outstandingDocs} → 소비를 재개합니다.`,
+      );
+      const waiters = this.capacityWaiters;
+      this.capacityWaiters = [];
+      for (const resolve of waiters) {
+        resolve();
+      }
+      this.notifyBackpressure(false);
+    }
+  }
+
+  private notifyBackpressure(saturated: boolean): void {
+    for (const listener of this.backpressureListeners) {
+      try {
+        listener(saturated);
+      } catch (error) {
+        this.logger.warn(
+          "Backpressure 리스너 실행 중 오류가 발생했습니다.",
+          error instanceof Error ? error.stack : String(error),
+        );
+      }
     }
   }
 
   /**
-   * 프로세스 종료 시 남은 버퍼/플러시가 모두 끝날 때까지 기다린다.
+   * 프로세스 종료 시 남은 버퍼/플러시/재시도/DLQ 게시가 모두 끝날 때까지 기다린다.
    */
   private async flushRemaining(): Promise<void> {
-    while (this.buffer.length > 0 || this.inFlightFlushes > 0) {
+    while (
+      this.buffer.length > 0 ||
+      this.inFlightFlushes > 0 ||
+      this.pendingRetries > 0 ||
+      this.pendingDeadLetters > 0
+    ) {
       if (this.buffer.length > 0) {
         this.triggerFlush();
       }
@@ -1,14 +1,15 @@
 import { Global, Module } from "@nestjs/common";
 import { ApmInfrastructureModule } from "../../shared/apm/apm.module";
 import { BulkIndexerService } from "./bulk-indexer.service";
+import { DeadLetterService } from "./dead-letter.service";
 
 /**
- * Bulk 인덱싱 서비스를 전역으로 제공하는 모듈
+ * Bulk 인덱싱/DLQ 서비스를 전역으로 제공하는 모듈
  */
 @Global()
 @Module({
   imports: [ApmInfrastructureModule],
-  providers: [BulkIndexerService],
-  exports: [BulkIndexerService],
+  providers: [BulkIndexerService, DeadLetterService],
+  exports: [BulkIndexerService, DeadLetterService],
 })
 export class BulkIngestModule {}
@@ -0,0 +1,177 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+} from "@nestjs/common";
+import { Kafka, type IHeaders, type Producer } from "kafkajs";
+import {
+  getKafkaSecurityOverrides,
+  parseKafkaBrokers,
+} from "../../shared/common/kafka/kafka.config";
+import type { LogStreamKey } from "../../shared/logs/log-storage.service";
+import { ingestMetrics } from "./ingest-metrics";
+
+/**
+ * DLQ로 보내게 된 단계
+ * - invalid: JSON/DTO 검증 실패 (원본 Kafka 메시지 그대로)
+ * - bulk_rejected: ES가 재시도 불가 오류로 거부한 문서 (색인용 문서 JSON)
+ * - bulk_retry_exhausted: 재시도 한도를 넘긴 문서 (ack 그룹이 없어 재전달이 불가능한 경우)
+ */
+export type DeadLetterStage =
+  | "invalid"
+  | "bulk_rejected"
+  | "bulk_retry_exhausted";
+
+/**
+ * DLQ 메시지 value 형식. replay 도구가 원본 토픽에 다시 넣기 전에 변환 여부를 판단한다.
+ * - event: 원본 이벤트 payload
+ * - document: BulkIndexer가 직렬화한 ES 문서 (@timestamp/ingestedAt 포함)
+ */
+export type DeadLetterFormat = "event" | "document";
+
+export interface DeadLetterRecord {
+  value: Buffer | string | null;
+  key?: Buffer | string | null;
+  reason: string;
+  stage: DeadLetterStage;
+  format: DeadLetterFormat;
+  partition?: number;
+  offset?: string;
+}
+
+// DLQ 메시지 헤더 이름 (replay 도구와 공유)
+export const DLQ_HEADERS = {
+  reason: "dlq.reason",
+  stage: "dlq.stage",
+  format: "dlq.format",
+  sourceTopic: "dlq.source.topic",
+  sourcePartition: "dlq.source.partition",
+  sourceOffset: "dlq.source.offset",
+  failedAt: "dlq.failed_at",
+} as const;
+
+// 헤더에 담는 실패 사유 최대 길이
+const MAX_REASON_LENGTH = 2000;
+
+export function resolveSpanTopic(): string {
+  return process.env.KAFKA_APM_SPAN_TOPIC ?? "apm.spans";
+}
+
+export function resolveLogTopic(): string {
+  return process.env.KAFKA_APM_LOG_TOPIC ?? "apm.logs";
+}
+
+/**
+ * 원본 토픽별 DLQ 토픽 이름 (기본값: `<topic>.dlq`)
+ */
+export function resolveDeadLetterTopic(sourceTopic: string): string {
+  if (sourceTopic === resolveSpanTopic()) {
+    return process.env.KAFKA_APM_SPAN_DLQ_TOPIC ?? `${sourceTopic}.dlq`;
+  }
+  if (sourceTopic === resolveLogTopic()) {
+    return process.env.KAFKA_APM_LOG_DLQ_TOPIC ?? `${sourceTopic}.dlq`;
+  }
+  return `${sourceTopic}.dlq`;
+}
+
+/**
+ * 처리하지 못한 이벤트/문서를 실패 사유와 함께 원본 토픽별 DLQ 토픽으로 게시하는 서비스
+ * - STREAM_DLQ_ENABLED=false 이면 기존처럼 로그만 남기고 버린다.
+ * - 게시에 실패하면 예외를 던져 호출자가 오프셋 커밋/ack 여부를 결정하게 한다.
+ */
+@Injectable()
+export class DeadLetterService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(DeadLetterService.name);
+  private readonly enabled = process.env.STREAM_DLQ_ENABLED !== "false";
+  private producer?: Producer;
+
+  private readonly kafka = new Kafka({
+    clientId: process.env.KAFKA_DLQ_CLIENT_ID ?? "stream-processor-dlq",
+    brokers: parseKafkaBrokers(),
+    ...getKafkaSecurityOverrides(),
+  });
+
+  async onModuleInit(): Promise<void> {
+    if (!this.enabled) {
+      return;
+    }
+    this.producer = this.kafka.producer({ allowAutoTopicCreation: true });
+    try {
+      await this.producer.connect();
+      this.logger.log("DLQ producer가 Kafka에 연결되었습니다.");
+    } catch (error) {
+      this.logger.error(
+        "DLQ producer Kafka 연결에 실패했습니다.",
+        error instanceof Error ? error.stack : String(error),
+      );
+      this.producer = undefined;
+    }
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    await this.producer?.disconnect();
+  }
+
+  /**
+   * 데이터 스트림 키에 대응하는 원본 토픽 (bulk 단계 실패 문서용)
+   */
+  sourceTopicFor(streamKey: LogStreamKey): string {
+    return streamKey === "apmSpans" ? resolveSpanTopic() : resolveLogTopic();
+  }
+
+  /**
+   * @returns DLQ에 게시했으면 true, 비활성화 상태라 건너뛰었으면 false
+   */
+  async publish(
+    sourceTopic: string,
+    records: DeadLetterRecord[],
+  ): Promise<boolean> {
+    if (records.length === 0 || !this.enabled) {
+      return false;
+    }
+    if (!this.producer) {
+      throw new Error("DLQ producer가 연결되지 않았습니다.");
+    }
+
+    const topic = resolveDeadLetterTopic(sourceTopic);
+    const failedAt = new Date().toISOString();
+    await this.producer.send({
+      topic,
+      messages: records.map((record) => ({
+        key: record.key ?? null,
+        value: record.value,
+        headers: this.buildHeaders(sourceTopic, record, failedAt),
+      })),
+    });
+
+    for (const record of records) {
+      ingestMetrics.deadLettered.inc({
+        topic: sourceTopic,
+        stage: record.stage,
+      });
+    }
+    return true;
+  }
+
+  private buildHeaders(
+    sourceTopic: string,
+    record: DeadLetterRecord,
+    failedAt: string,
+  ): IHeaders {
+    const headers: IHeaders = {
+      [DLQ_HEADERS.reason]: record.reason.slice(0, MAX_REASON_LENGTH),
+      [DLQ_HEADERS.stage]: record.stage,
+      [DLQ_HEADERS.format]: record.format,
+      [DLQ_HEADERS.sourceTopic]: sourceTopic,
+      [DLQ_HEADERS.failedAt]: failedAt,
+    };
+    if (record.partition != null) {
+      headers[DLQ_HEADERS.sourcePartition] = String(record.partition);
+    }
+    if (record.offset != null) {
+      headers[DLQ_HEADERS.sourceOffset] = record.offset;
+    }
+    return headers;
+  }
+}
@@ -0,0 +1,125 @@
+import type { EventValidator } from "./event-validator";
+
+/**
+ * Kafka payload가 JSON/DTO 형식에 맞지 않을 때 사용하는 예외.
+ * 컨슈머는 이 예외를 만나면 재시도 없이 해당 메시지만 건너뛴다.
+ */
+export class InvalidEventPayloadError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = "InvalidEventPayloadError";
+  }
+}
+
+/**
+ * kafkajs 메시지 value(문자열/Buffer/TypedArray 또는 래퍼 객체)를 JSON 객체로 변환한다.
+ * @param label 오류 메시지에 사용할 이벤트 이름 (예: "스팬", "로그")
+ */
+export function decodeEventPayload(payload: unknown, label: string): object {
+  const resolved = unwrapValue(payload);
+  let plain: unknown;
+
+  try {
+    if (typeof resolved === "string") {
+      plain = JSON.parse(resolved);
+    } else if (resolved instanceof Buffer) {
+      plain = JSON.parse(resolved.toString());
+    } else if (ArrayBuffer.isView(resolved)) {
+      plain = JSON.parse(Buffer.from(resolved.buffer).toString());
+    } else {
+      plain = resolved;
+    }
+  } catch (error) {
+    throw new InvalidEventPayloadError(
+      `Kafka ${label} payload JSON 파싱 실패: ${String(error)}`,
+    );
+  }
+
+  if (!plain || typeof plain !== "object") {
+    throw new InvalidEventPayloadError(
+      `Kafka ${label} payload가 객체 형식이 아닙니다.`,
+    );
+  }
+  return plain;
+}
+
+/**
+ * 단일 Kafka payload를 DTO로 변환하고 유효성 검증까지 수행한다.
+ */
+export function parseEventPayload<T extends object>(
+  validator: EventValidator<T>,
+  payload: unknown,
+): T {
+  return validator.validate(decodeEventPayload(payload, validator.label));
+}
+
+export interface RejectedEventPayload {
+  // decodeEventBatch에 넘긴 payloads 배열 기준 인덱스
+  index: number;
+  reason: string;
+}
+
+export interface DecodedEventBatch<T> {
+  events: T[];
+  invalid: number;
+  firstError?: string;
+  rejected: RejectedEventPayload[];
+}
+
+/**
+ * Kafka 배치 전체를 한 번에 DTO로 변환/검증한다.
+ * - 형식이 잘못된 메시지는 건너뛰고, 건수/첫 번째 사유와 함께 메시지별 거부 사유를 돌려준다.
+ */
+export function decodeEventBatch<T extends object>(
+  validator: EventValidator<T>,
+  payloads: unknown[],
+): DecodedEventBatch<T> {
+  const label = validator.label;
+  const result: DecodedEventBatch<T> = {
+    events: [],
+    invalid: 0,
+    rejected: [],
+  };
+  const reject = (error: unknown, index: number): void => {
+    if (!(error instanceof InvalidEventPayloadError)) {
+      throw error;
+    }
+    result.invalid += 1;
+    result.firstError ??= error.message;
+    result.rejected.push({ index, reason: error.message });
+  };
+
+  const plains: object[] = [];
+  // plains[i] 가 payloads의 몇 번째 메시지인지 기록해 검증 실패를 원본 메시지로 되짚는다.
+  const plainIndexes: number[] = [];
+  payloads.forEach((payload, index) => {
+    if (payload == null) {
+      reject(
+        new InvalidEventPayloadError(`Kafka ${label} 메시지에 본문이 없습니다.`),
+        index,
+      );
+      return;
+    }
+    try {
+      plains.push(decodeEventPayload(payload, label));
+      plainIndexes.push(index);
+    } catch (error) {
+      reject(error, index);
+    }
+  });
+
+  result.events = validator.validateMany(plains, (error, plainIndex) =>
+    reject(error, plainIndexes[plainIndex]),
+  );
+  return result;
+}
+
+/**
+ * kafkajs 래퍼에 감싸진 value 필드를 추출한다.
+ */
+function unwrapValue(value: unknown): unknown {
+  if (value && typeof value === "object" && "value" in value) {
+    return (value as { value: unknown }).value;
+  }
+  return value;
+}
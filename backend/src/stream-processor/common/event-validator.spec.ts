@@ -0,0 +1,193 @@
+import "reflect-metadata";
+import { LogEventDto } from "../../shared/apm/logs/dto/log-event.dto";
+import { SpanEventDto } from "../../shared/apm/spans/dto/span-event.dto";
+import { InvalidEventPayloadError } from "./event-payload";
+import {
+  LOG_EVENT_SCHEMA,
+  SPAN_EVENT_SCHEMA,
+  createEventValidator,
+  type EventValidator,
+} from "./event-validator";
+
+const VALID_SPAN = {
+  type: "span",
+  timestamp: "2026-10-17T00:00:00.000Z",
+  service_name: "checkout",
+  environment: "prod",
+  trace_id: "trace-1",
+  span_id: "span-1",
+  parent_span_id: "span-0",
+  name: "GET /orders",
+  kind: "SERVER",
+  duration_ms: 12.5,
+  status: "OK",
+  http_method: "GET",
+  http_path: "/orders",
+  http_status_code: 200,
+  labels: { region: "ap-northeast-2" },
+};
+
+const VALID_LOG = {
+  type: "log",
+  timestamp: "2026-10-17T00:00:00.000Z",
+  service_name: "checkout",
+  environment: "prod",
+  level: "INFO",
+  message: "order created",
+  trace_id: "trace-1",
+  span_id: "span-1",
+  labels: { order_id: "o-1" },
+};
+
+type Mutation = [string, (event: Record<string, unknown>) => void];
+
+// validator-benchmark 의 변형과 같은 종류의 필드 손상
+const MUTATIONS: Mutation[] = [
+  ["원본", () => undefined],
+  ["service_name 누락", (event) => delete event.service_name],
+  ["service_name 빈 문자열", (event) => (event.service_name = "")],
+  ["service_name 숫자", (event) => (event.service_name = 42)],
+  ["timestamp 형식 오류", (event) => (event.timestamp = "not-a-date")],
+  ["timestamp null", (event) => (event.timestamp = null)],
+  ["timestamp 누락", (event) => delete event.timestamp],
+  ["duration_ms 문자열", (event) => (event.duration_ms = "12.5")],
+  ["duration_ms NaN", (event) => (event.duration_ms = Number.NaN)],
+  ["kind 소문자", (event) => (event.kind = "server")],
+  ["status 허용되지 않는 값", (event) => (event.status = "FAILED")],
+  ["level 소문자", (event) => (event.level = "error")],
+  ["level 허용되지 않는 값", (event) => (event.level = "FATAL")],
+  ["level 숫자", (event) => (event.level = 3)],
+  ["labels 배열", (event) => (event.labels = ["a", "b"])],
+  ["labels null", (event) => (event.labels = null)],
+  ["parent_span_id 숫자", (event) => (event.parent_span_id = 42)],
+  ["parent_span_id null", (event) => (event.parent_span_id = null)],
+  ["http_status_code 문자열", (event) => (event.http_status_code = "200")],
+  ["스키마 밖 필드", (event) => (event.extra_field = { nested: true })],
+];
+
+function outcome<T extends object>(
+  validator: EventValidator<T>,
+  plain: object,
+): { accepted: boolean; document?: Record<string, unknown> } {
+  try {
+    const dto = validator.validate(plain);
+    // 클래스 인스턴스와 plain 객체를 같은 기준으로 비교한다.
+    return { accepted: true, document: JSON.parse(JSON.stringify(dto)) };
+  } catch (error) {
+    if (error instanceof InvalidEventPayloadError) {
+      return { accepted: false };
+    }
+    throw error;
+  }
+}
+
+interface ParityCase {
+  label: string;
+  base: Record<string, unknown>;
+  reference: EventValidator<object>;
+  compiled: EventValidator<object>;
+}
+
+describe("event-validator", () => {
+  const cases: ParityCase[] = [
+    {
+      label: "스팬",
+      base: VALID_SPAN,
+      reference: createEventValidator(
+        "class-validator",
+        SpanEventDto,
+        SPAN_EVENT_SCHEMA,
+        "스팬",
+      ),
+      compiled: createEventValidator(
+        "compiled",
+        SpanEventDto,
+        SPAN_EVENT_SCHEMA,
+        "스팬",
+      ),
+    },
+    {
+      label: "로그",
+      base: VALID_LOG,
+      reference: createEventValidator(
+        "class-validator",
+        LogEventDto,
+        LOG_EVENT_SCHEMA,
+        "로그",
+      ),
+      compiled: createEventValidator(
+        "compiled",
+        LogEventDto,
+        LOG_EVENT_SCHEMA,
+        "로그",
+      ),
+    },
+  ];
+
+  describe.each(cases)("$label", ({ base, reference, compiled }) => {
+    it.each(MUTATIONS)(
+      "%s: class-validator DTO 와 통과 여부/결과 문서가 같다",
+      (_name, mutate) => {
+        const event = structuredClone(base) as Record<string, unknown>;
+        mutate(event);
+
+        const expected = outcome(reference, event);
+        const actual = outcome(compiled, event);
+        expect(actual).toEqual(expected);
+      },
+    );
+
+    it("배열 payload 는 거부한다", () => {
+      expect(outcome(reference, [base]).accepted).toBe(false);
+      expect(outcome(compiled, [base]).accepted).toBe(false);
+    });
+
+    it("validateMany 는 실패한 항목의 인덱스만 reject 로 넘긴다", () => {
+      const invalid = { ...base, service_name: "" };
+      const rejected: number[] = [];
+      const events = compiled.validateMany([base, invalid, base], (_, index) =>
+        rejected.push(index),
+      );
+      expect(events).toHaveLength(2);
+      expect(rejected).toEqual([1]);
+    });
+  });
+
+  it("스키마 밖 필드는 결과에 남기지 않는다 (whitelist)", () => {
+    const validator = createEventValidator(
+      "compiled",
+      SpanEventDto,
+      SPAN_EVENT_SCHEMA,
+      "스팬",
+    );
+    const dto = validator.validate({ ...VALID_SPAN, extra_field: 1 });
+    expect(dto).not.toHaveProperty("extra_field");
+    expect(dto).not.toHaveProperty("type");
+  });
+
+  it("로그 level 은 대문자로 바꾼 뒤 검사한다", () => {
+    const validator = createEventValidator(
+      "compiled",
+      LogEventDto,
+      LOG_EVENT_SCHEMA,
+      "로그",
+    );
+    expect(validator.validate({ ...VALID_LOG, level: "warn" }).level).toBe(
+      "WARN",
+    );
+  });
+
+  it("거부 메시지는 class-validator 기본 문구를 쓴다", () => {
+    const validator = createEventValidator(
+      "compiled",
+      SpanEventDto,
+      SPAN_EVENT_SCHEMA,
+      "스팬",
+    );
+    expect(() =>
+      validator.validate({ ...VALID_SPAN, kind: "server", duration_ms: "1" }),
+    ).toThrow(
+      "kind must be one of the following values: SERVER, CLIENT, INTERNAL, duration_ms must be a number conforming to the specified constraints",
+    );
+  });
+});
@@ -0,0 +1,296 @@
+import { plainToInstance, type ClassConstructor } from "class-transformer";
+import {
+  isIn,
+  isISO8601,
+  isNotEmpty,
+  isNumber,
+  isObject,
+  isString,
+  validateSync,
+} from "class-validator";
+import { LogEventDto } from "../../shared/apm/logs/dto/log-event.dto";
+import { SpanEventDto } from "../../shared/apm/spans/dto/span-event.dto";
+import { InvalidEventPayloadError } from "./event-payload";
+
+/**
+ * DTO 데코레이터를 그대로 옮긴 필드 규칙.
+ * - 검사 순서/의미는 class-validator 데코레이터와 동일하다 (IsOptional → null/undefined면 나머지 생략).
+ * - 스키마에 있는 필드만 결과에 남는다 (validateSync의 whitelist: true와 동일).
+ */
+export interface EventFieldRule {
+  optional?: boolean;
+  string?: boolean;
+  notEmpty?: boolean;
+  iso8601?: boolean;
+  number?: boolean;
+  object?: boolean;
+  in?: readonly string[];
+  /** class-transformer @Transform 에 해당하는 변환 (검증 전에 적용) */
+  transform?: (value: unknown) => unknown;
+}
+
+export type EventSchema = Record<string, EventFieldRule>;
+
+/**
+ * SpanEventDto 데코레이터와 1:1로 대응하는 스키마
+ */
+export const SPAN_EVENT_SCHEMA: EventSchema = {
+  timestamp: { optional: true, iso8601: true },
+  service_name: { string: true, notEmpty: true },
+  environment: { string: true, notEmpty: true },
+  trace_id: { string: true, notEmpty: true },
+  span_id: { string: true, notEmpty: true },
+  parent_span_id: { optional: true, string: true },
+  name: { string: true, notEmpty: true },
+  kind: { in: ["SERVER", "CLIENT", "INTERNAL"] },
+  duration_ms: { number: true },
+  status: { in: ["OK", "ERROR"] },
+  http_method: { optional: true, string: true },
+  http_path: { optional: true, string: true },
+  http_status_code: { optional: true },
+  labels: { optional: true, object: true },
+};
+
+/**
+ * LogEventDto 데코레이터와 1:1로 대응하는 스키마
+ */
+export const LOG_EVENT_SCHEMA: EventSchema = {
+  timestamp: { optional: true, iso8601: true },
+  service_name: { string: true, notEmpty: true },
+  environment: { string: true, notEmpty: true },
+  level: {
+    string: true,
+    in: ["DEBUG", "INFO", "WARN", "ERROR"],
+    transform: (value) =>
+      typeof value === "string" ? value.toUpperCase() : value,
+  },
+  message: { string: true, notEmpty: true },
+  trace_id: { optional: true, string: true },
+  span_id: { optional: true, string: true },
+  http_method: { optional: true, string: true },
+  http_path: { optional: true, string: true },
+  http_status_code: { optional: true },
+  labels: { optional: true, object: true },
+};
+
+/**
+ * Kafka에서 꺼낸 plain 객체를 DTO로 변환/검증하는 검증기
+ */
+export interface EventValidator<T extends object> {
+  readonly label: string;
+  /**
+   * plain 객체 하나를 검증한다. 실패 시 InvalidEventPayloadError를 던진다.
+   */
+  validate(plain: object): T;
+  /**
+   * 배치 단위 검증. 실패한 항목은 (오류, plains 내 인덱스)로 reject에 넘기고 통과한 DTO만 반환한다.
+   */
+  validateMany(
+    plains: object[],
+    reject: (error: unknown, index: number) => void,
+  ): T[];
+}
+
+type FieldCheck = (value: unknown) => string | undefined;
+
+interface CompiledField {
+  name: string;
+  optional: boolean;
+  transform?: (value: unknown) => unknown;
+  checks: FieldCheck[];
+}
+
+/**
+ * 스키마를 기동 시 한 번 필드별 검사 함수 배열로 컴파일해 두고,
+ * 이벤트마다 리플렉션/메타데이터 조회 없이 그 배열만 실행한다.
+ * 메시지 문구는 class-validator 기본 메시지와 같다.
+ */
+class CompiledEventValidator<T extends object> implements EventValidator<T> {
+  private readonly fields: CompiledField[];
+
+  constructor(readonly label: string, schema: EventSchema) {
+    this.fields = Object.entries(schema).map(([name, rule]) => ({
+      name,
+      optional: rule.optional ?? false,
+      transform: rule.transform,
+      checks: CompiledEventValidator.compileChecks(name, rule),
+    }));
+  }
+
+  validate(plain: object): T {
+    if (Array.isArray(plain)) {
+      throw new InvalidEventPayloadError(
+        `${this.label} 이벤트 형식이 올바르지 않습니다: an unknown value was passed to the validate function`,
+      );
+    }
+
+    const source = plain as Record<string, unknown>;
+    const result: Record<string, unknown> = {};
+    let failures: string[] | undefined;
+
+    for (const field of this.fields) {
+      let value = source[field.name];
+      if (field.transform) {
+        value = field.transform(value);
+      }
+      if (value !== undefined) {
+        result[field.name] = value;
+      }
+      if (field.optional && value == null) {
+        continue;
+      }
+
+      for (const check of field.checks) {
+        const failure = check(value);
+        if (failure) {
+          (failures ??= []).push(failure);
+        }
+      }
+    }
+
+    if (failures) {
+      throw new InvalidEventPayloadError(
+        `${this.label} 이벤트 형식이 올바르지 않습니다: ${failures.join(", ")}`,
+      );
+    }
+    return result as T;
+  }
+
+  validateMany(
+    plains: object[],
+    reject: (error: unknown, index: number) => void,
+  ): T[] {
+    const events: T[] = [];
+    plains.forEach((plain, index) => {
+      try {
+        events.push(this.validate(plain));
+      } catch (error) {
+        reject(error, index);
+      }
+    });
+    return events;
+  }
+
+  private static compileChecks(
+    name: string,
+    rule: EventFieldRule,
+  ): FieldCheck[] {
+    const checks: FieldCheck[] = [];
+    if (rule.iso8601) {
+      checks.push((value) =>
+        isISO8601(value)
+          ? undefined
+          : `${name} must be a valid ISO 8601 date string`,
+      );
+    }
+    if (rule.string) {
+      checks.push((value) =>
+        isString(value) ? undefined : `${name} must be a string`,
+      );
+    }
+    if (rule.notEmpty) {
+      checks.push((value) =>
+        isNotEmpty(value) ? undefined : `${name} should not be empty`,
+      );
+    }
+    if (rule.in) {
+      const allowed = rule.in;
+      const message = `${name} must be one of the following values: ${allowed.join(", ")}`;
+      checks.push((value) => (isIn(value, allowed) ? undefined : message));
+    }
+    if (rule.number) {
+      checks.push((value) =>
+        isNumber(value)
+          ? undefined
+          : `${name} must be a number conforming to the specified constraints`,
+      );
+    }
+    if (rule.object) {
+      checks.push((value) =>
+        isObject(value) ? undefined : `${name} must be an object`,
+      );
+    }
+    return checks;
+  }
+}
+
+/**
+ * 기존 class-transformer + class-validator 리플렉션 경로 (비교/롤백용)
+ */
+class ClassValidatorEventValidator<T extends object>
+  implements EventValidator<T>
+{
+  constructor(
+    readonly label: string,
+    private readonly dtoClass: ClassConstructor<T>,
+  ) {}
+
+  validate(plain: object): T {
+    return this.check(plainToInstance(this.dtoClass, plain));
+  }
+
+  validateMany(
+    plains: object[],
+    reject: (error: unknown, index: number) => void,
+  ): T[] {
+    const events: T[] = [];
+    // class-transformer는 배열을 한 번에 변환할 수 있어 메시지마다 호출하는 비용을 줄인다.
+    plainToInstance(this.dtoClass, plains).forEach((dto, index) => {
+      try {
+        events.push(this.check(dto));
+      } catch (error) {
+        reject(error, index);
+      }
+    });
+    return events;
+  }
+
+  private check(dto: T): T {
+    const errors = validateSync(dto, { whitelist: true });
+    if (errors.length > 0) {
+      throw new InvalidEventPayloadError(
+        `${this.label} 이벤트 형식이 올바르지 않습니다: ${errors
+          .map((err) => Object.values(err.constraints ?? {}).join(", "))
+          .join("; ")}`,
+      );
+    }
+    return dto;
+  }
+}
+
+export type EventValidatorKind = "compiled" | "class-validator";
+
+/**
+ * STREAM_EVENT_VALIDATOR=class-validator 이면 기존 리플렉션 경로, 그 외에는 컴파일된 검증기를 사용한다.
+ */
+export function resolveEventValidatorKind(): EventValidatorKind {
+  return process.env.STREAM_EVENT_VALIDATOR === "class-validator"
+    ? "class-validator"
+    : "compiled";
+}
+
+export function createEventValidator<T extends object>(
+  kind: EventValidatorKind,
+  dtoClass: ClassConstructor<T>,
+  schema: EventSchema,
+  label: string,
+): EventValidator<T> {
+  return kind === "class-validator"
+    ? new ClassValidatorEventValidator(label, dtoClass)
+    : new CompiledEventValidator<T>(label, schema);
+}
+
+// 기동 시 한 번 컴파일해 두고 컨슈머(메시지/배치 모드)가 공유한다.
+export const spanEventValidator = createEventValidator(
+  resolveEventValidatorKind(),
+  SpanEventDto,
+  SPAN_EVENT_SCHEMA,
+  "스팬",
+);
+
+export const logEventValidator = createEventValidator(
+  resolveEventValidatorKind(),
+  LogEventDto,
+  LOG_EVENT_SCHEMA,
+  "로그",
+);
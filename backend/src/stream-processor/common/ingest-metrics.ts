@@ -0,0 +1,108 @@
+import { MetricsRegistry } from "./metrics";
+
+const KB = 1024;
+const MB = 1024 * KB;
+const LATENCY_BUCKETS_SECONDS = [
+  0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+];
+
+/**
+ * 스트림 프로세서 프로세스(워커 스레드별) 메트릭 레지스트리
+ */
+export const streamMetrics = new MetricsRegistry();
+
+/**
+ * 수집 파이프라인 메트릭
+ * - 컨슈머: 토픽별 소비/무효 메시지, 파티션별 lag
+ * - BulkIndexer: 배치 크기/바이트, took/왕복 지연, 요청 결과, 거부 문서, 버퍼/미확인 문서 깊이, 현재 튜닝 값
+ */
+export const ingestMetrics = {
+  messagesConsumed: streamMetrics.counter(
+    "stream_messages_consumed_total",
+    "Kafka에서 소비한 메시지 수 (topic)",
+  ),
+  messagesInvalid: streamMetrics.counter(
+    "stream_messages_invalid_total",
+    "형식/검증 오류로 건너뛴 메시지 수 (topic)",
+  ),
+  consumerLag: streamMetrics.gauge(
+    "stream_consumer_lag",
+    "파티션별 컨슈머 lag = high watermark - 마지막 처리 오프셋 - 1 (batch 모드)",
+  ),
+  bulkBatchDocs: streamMetrics.histogram(
+    "stream_bulk_batch_docs",
+    "_bulk 요청당 문서 수",
+    [100, 500, 1000, 2000, 4000, 6000, 10000, 20000],
+  ),
+  bulkBatchBytes: streamMetrics.histogram(
+    "stream_bulk_batch_bytes",
+    "_bulk 요청당 NDJSON 본문 바이트 (압축 전)",
+    [64 * KB, 256 * KB, MB, 4 * MB, 8 * MB, 16 * MB, 32 * MB, 64 * MB],
+  ),
+  bulkTookSeconds: streamMetrics.histogram(
+    "stream_bulk_took_seconds",
+    "ES가 응답한 _bulk took 시간",
+    LATENCY_BUCKETS_SECONDS,
+  ),
+  bulkRequestSeconds: streamMetrics.histogram(
+    "stream_bulk_request_duration_seconds",
+    "_bulk 요청 왕복 시간 (본문 조립/압축 포함)",
+    LATENCY_BUCKETS_SECONDS,
+  ),
+  bulkRequests: streamMetrics.counter(
+    "stream_bulk_requests_total",
+    "_bulk 요청 수 (outcome=success|partial|failed)",
+  ),
+  bulkRejectedItems: streamMetrics.counter(
+    "stream_bulk_rejected_items_total",
+    "_bulk에서 거부된 문서 수 (reason=retryable|permanent)",
+  ),
+  bulkRetriesExhausted: streamMetrics.counter(
+    "stream_bulk_retries_exhausted_total",
+    "재시도 한도를 넘겨 포기한 문서 수",
+  ),
+  deadLettered: streamMetrics.counter(
+    "stream_dead_lettered_total",
+    "DLQ 토픽으로 보낸 메시지/문서 수 (topic, stage)",
+  ),
+  errorLogsForwarded: streamMetrics.counter(
+    "stream_error_logs_forwarded_total",
+    "ERROR 로그 토픽으로 전달한 로그 수",
+  ),
+  errorLogsDropped: streamMetrics.counter(
+    "stream_error_logs_dropped_total",
+    "ERROR 로그 포워더가 버린 로그 수 (reason=overflow|send_failed)",
+  ),
+  errorLogsDeduplicated: streamMetrics.counter(
+    "stream_error_logs_deduplicated_total",
+    "dedup 창 안에서 중복으로 억제한 ERROR 로그 수",
+  ),
+  bulkInFlightFlushes: streamMetrics.sampledGauge(
+    "stream_bulk_inflight_flushes",
+    "전송 중인 _bulk 요청 수",
+  ),
+  bulkBufferDocs: streamMetrics.sampledGauge(
+    "stream_bulk_buffer_docs",
+    "전송 대기 버퍼의 문서 수",
+  ),
+  bulkBufferBytes: streamMetrics.sampledGauge(
+    "stream_bulk_buffer_bytes",
+    "전송 대기 버퍼의 바이트",
+  ),
+  bulkPendingDocs: streamMetrics.sampledGauge(
+    "stream_bulk_pending_docs",
+    "ES가 아직 확인하지 않은 문서 수 (버퍼 + 전송 중 + 재시도 대기)",
+  ),
+  bulkBackpressure: streamMetrics.sampledGauge(
+    "stream_bulk_backpressure_active",
+    "미확인 문서 한도 도달로 소비를 멈춘 상태면 1",
+  ),
+  bulkTuningBatchBytes: streamMetrics.sampledGauge(
+    "stream_bulk_tuning_batch_bytes",
+    "현재 적용 중인 배치 바이트 한도",
+  ),
+  bulkTuningParallelFlushes: streamMetrics.sampledGauge(
+    "stream_bulk_tuning_parallel_flushes",
+    "현재 적용 중인 동시 플러시 한도",
+  ),
+};
@@ -0,0 +1,153 @@
+import type { Logger } from "@nestjs/common";
+import { Kafka, type Consumer, type KafkaMessage } from "kafkajs";
+import { isMainThread, threadId } from "worker_threads";
+import {
+  buildKafkaConsumerConfig,
+  getKafkaSecurityOverrides,
+  parseKafkaBrokers,
+  resolvePartitionsConsumedConcurrently,
+} from "../../shared/common/kafka/kafka.config";
+import { ingestMetrics } from "./ingest-metrics";
+import {
+  buildPartitionThroughputTracker,
+  type PartitionThroughputTracker,
+} from "./throughput-tracker";
+
+/**
+ * KAFKA_CONSUMER_MODE=batch 이면 @EventPattern(메시지 단위) 대신 eachBatch 컨슈머를 사용한다.
+ */
+export function isBatchConsumerMode(): boolean {
+  return (
+    (process.env.KAFKA_CONSUMER_MODE ?? "message").toLowerCase() === "batch"
+  );
+}
+
+export interface KafkaBatchConsumerOptions {
+  clientId: string;
+  groupId: string;
+  topic: string;
+  allowAutoTopicCreation: boolean;
+  /**
+   * fetch된 배치 전체를 처리한다. 예외를 던지면 오프셋을 커밋하지 않아 배치가 재전달된다.
+   */
+  handleBatch: (messages: KafkaMessage[], partition: number) => Promise<void>;
+  /**
+   * 하류(BulkIndexer) 포화 신호. 포화되면 토픽 fetch를 멈추고 해제되면 재개한다.
+   */
+  backpressure?: {
+    onBackpressure(listener: (saturated: boolean) => void): () => void;
+  };
+}
+
+// ES ack를 기다리는 동안 세션 타임아웃으로 리밸런싱되지 않도록 보내는 heartbeat 주기
+const HEARTBEAT_WHILE_WAITING_MS = 3000;
+
+/**
+ * kafkajs eachBatch 기반 컨슈머
+ * - 파티션별로 fetch된 메시지 묶음을 한 번에 핸들러로 넘긴다.
+ * - 핸들러가 끝나면(= 배치 문서가 ES에 확인되면) 배치의 마지막 오프셋을 resolve 하고 배치 단위로 커밋한다.
+ * - backpressure 신호에 따라 토픽 소비를 pause/resume 한다.
+ * - 파티션별 초당 처리량을 주기적으로 로그로 남기고, 소비 건수/lag를 메트릭으로 기록한다.
+ */
+export class KafkaBatchConsumer {
+  private readonly consumer: Consumer;
+  private readonly partitionThroughput: PartitionThroughputTracker;
+  private unsubscribeBackpressure?: () => void;
+
+  constructor(
+    private readonly logger: Logger,
+    private readonly options: KafkaBatchConsumerOptions,
+  ) {
+    const kafka = new Kafka({
+      // 워커 스레드별로 clientId를 구분해 브로커/리밸런싱 로그에서 식별할 수 있게 한다.
+      clientId: isMainThread
+        ? options.clientId
+        : `${options.clientId}-t${threadId}`,
+      brokers: parseKafkaBrokers(),
+      ...getKafkaSecurityOverrides(),
+    });
+    this.consumer = kafka.consumer(
+      buildKafkaConsumerConfig(options.groupId, options.allowAutoTopicCreation),
+    );
+    this.partitionThroughput = buildPartitionThroughputTracker(
+      logger,
+      options.topic,
+    );
+  }
+
+  async start(): Promise<void> {
+    await this.consumer.connect();
+    await this.consumer.subscribe({
+      topic: this.options.topic,
+      fromBeginning: false,
+    });
+    this.unsubscribeBackpressure = this.options.backpressure?.onBackpressure(
+      (saturated) => this.handleBackpressure(saturated),
+    );
+
+    await this.consumer.run({
+      // autoCommitInterval/Threshold 미지정 → commitOffsetsIfNecessary 호출마다(배치마다) 커밋
+      eachBatchAutoResolve: false,
+      partitionsConsumedConcurrently: resolvePartitionsConsumedConcurrently(),
+      eachBatch: async ({
+        batch,
+        resolveOffset,
+        heartbeat,
+        commitOffsetsIfNecessary,
+        isRunning,
+        isStale,
+      }) => {
+        if (!isRunning() || isStale() || batch.messages.length === 0) {
+          return;
+        }
+
+        const heartbeatTimer = setInterval(() => {
+          void heartbeat().catch(() => undefined);
+        }, HEARTBEAT_WHILE_WAITING_MS);
+        try {
+          await this.options.handleBatch(batch.messages, batch.partition);
+        } finally {
+          clearInterval(heartbeatTimer);
+        }
+
+        resolveOffset(batch.lastOffset());
+        await commitOffsetsIfNecessary();
+        await heartbeat();
+        this.partitionThroughput.markProcessed(
+          batch.partition,
+          batch.messages.length,
+        );
+        ingestMetrics.messagesConsumed.inc(
+          { topic: batch.topic },
+          batch.messages.length,
+        );
+        ingestMetrics.consumerLag.set(
+          { topic: batch.topic, partition: String(batch.partition) },
+          Number(batch.offsetLag()),
+        );
+      },
+    });
+
+    this.logger.log(
+      `eachBatch 컨슈머가 시작되었습니다. topic=${this.options.topic} groupId=${this.options.groupId}`,
+    );
+  }
+
+  async stop(): Promise<void> {
+    this.unsubscribeBackpressure?.();
+    await this.consumer.disconnect();
+  }
+
+  private handleBackpressure(saturated: boolean): void {
+    const topics = [{ topic: this.options.topic }];
+    if (saturated) {
+      this.consumer.pause(topics);
+      this.logger.warn(
+        `Bulk 색인 적체로 ${this.options.topic} 소비를 일시 중지합니다.`,
+      );
+    } else {
+      this.consumer.resume(topics);
+      this.logger.log(`${this.options.topic} 소비를 재개합니다.`);
+    }
+  }
+}
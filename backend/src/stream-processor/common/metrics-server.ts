@@ -0,0 +1,52 @@
+import type { Logger } from "@nestjs/common";
+import { createServer, type Server } from "http";
+
+/**
+ * STREAM_METRICS_PORT (기본 9464, 0이면 비활성화)
+ */
+export function resolveMetricsPort(): number {
+  const port = Number.parseInt(process.env.STREAM_METRICS_PORT ?? "9464", 10);
+  return Number.isFinite(port) && port > 0 ? port : 0;
+}
+
+/**
+ * `GET /metrics`로 Prometheus 텍스트를 돌려주는 최소 HTTP 서버를 띄운다.
+ * 스트림 프로세서는 Kafka 마이크로서비스라 HTTP 어댑터가 없으므로 node http를 직접 사용한다.
+ */
+export function startMetricsServer(
+  logger: Logger,
+  render: () => Promise<string> | string,
+): Server | undefined {
+  const port = resolveMetricsPort();
+  if (port === 0) {
+    return undefined;
+  }
+
+  const server = createServer((request, response) => {
+    const path = request.url?.split("?")[0];
+    if (request.method !== "GET" || path !== "/metrics") {
+      response.writeHead(404).end();
+      return;
+    }
+    void Promise.resolve()
+      .then(render)
+      .then((body) => {
+        response
+          .writeHead(200, {
+            "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+          })
+          .end(body);
+      })
+      .catch((error: unknown) => {
+        logger.error(
+          "메트릭 수집에 실패했습니다.",
+          error instanceof Error ? error.stack : String(error),
+        );
+        response.writeHead(500).end();
+      });
+  });
+  server.listen(port, () => {
+    logger.log(`메트릭 엔드포인트: http://0.0.0.0:${port}/metrics`);
+  });
+  return server;
+}
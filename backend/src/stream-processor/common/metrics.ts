@@ -0,0 +1,306 @@
+/**
+ * 의존성 없는 Prometheus 텍스트 포맷(0.0.4) 메트릭 레지스트리
+ * - counter / gauge / histogram 만 지원한다.
+ * - collect()는 구조화된 샘플을 돌려주므로 워커 스레드 간 postMessage로 옮겨 합칠 수 있다.
+ */
+
+export type MetricType = "counter" | "gauge" | "histogram";
+export type MetricLabels = Record<string, string>;
+
+export interface MetricSample {
+  // histogram은 `_bucket`/`_sum`/`_count` 접미사가 붙는다.
+  suffix: string;
+  labels: MetricLabels;
+  value: number;
+}
+
+export interface MetricFamily {
+  name: string;
+  help: string;
+  type: MetricType;
+  samples: MetricSample[];
+}
+
+interface Metric {
+  readonly name: string;
+  collect(): MetricFamily;
+  reset(): void;
+}
+
+function labelKey(labels: MetricLabels): string {
+  return Object.keys(labels)
+    .sort()
+    .map((key) => `${key}=${labels[key]}`)
+    .join(",");
+}
+
+export class Counter implements Metric {
+  private readonly values = new Map<
+    string,
+    { labels: MetricLabels; value: number }
+  >();
+
+  constructor(
+    readonly name: string,
+    private readonly help: string,
+  ) {}
+
+  inc(labels: MetricLabels = {}, value = 1): void {
+    const key = labelKey(labels);
+    const entry = this.values.get(key);
+    if (entry) {
+      entry.value += value;
+    } else {
+      this.values.set(key, { labels, value });
+    }
+  }
+
+  collect(): MetricFamily {
+    return {
+      name: this.name,
+      help: this.help,
+      type: "counter",
+      samples: [...this.values.values()].map(({ labels, value }) => ({
+        suffix: "",
+        labels,
+        value,
+      })),
+    };
+  }
+
+  reset(): void {
+    this.values.clear();
+  }
+}
+
+export class Gauge implements Metric {
+  private readonly values = new Map<
+    string,
+    { labels: MetricLabels; value: number }
+  >();
+
+  constructor(
+    readonly name: string,
+    private readonly help: string,
+  ) {}
+
+  set(labels: MetricLabels, value: number): void {
+    this.values.set(labelKey(labels), { labels, value });
+  }
+
+  inc(labels: MetricLabels = {}, value = 1): void {
+    const key = labelKey(labels);
+    const entry = this.values.get(key);
+    if (entry) {
+      entry.value += value;
+    } else {
+      this.values.set(key, { labels, value });
+    }
+  }
+
+  collect(): MetricFamily {
+    return {
+      name: this.name,
+      help: this.help,
+      type: "gauge",
+      samples: [...this.values.values()].map(({ labels, value }) => ({
+        suffix: "",
+        labels,
+        value,
+      })),
+    };
+  }
+
+  reset(): void {
+    this.values.clear();
+  }
+}
+
+interface HistogramSeries {
+  labels: MetricLabels;
+  counts: number[];
+  sum: number;
+  count: number;
+}
+
+export class Histogram implements Metric {
+  private readonly series = new Map<string, HistogramSeries>();
+
+  constructor(
+    readonly name: string,
+    private readonly help: string,
+    private readonly buckets: readonly number[],
+  ) {}
+
+  observe(labels: MetricLabels, value: number): void {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = {
+        labels,
+        counts: new Array<number>(this.buckets.length).fill(0),
+        sum: 0,
+        count: 0,
+      };
+      this.series.set(key, series);
+    }
+    for (let index = 0; index < this.buckets.length; index += 1) {
+      if (value <= this.buckets[index]) {
+        series.counts[index] += 1;
+        break;
+      }
+    }
+    series.sum += value;
+    series.count += 1;
+  }
+
+  collect(): MetricFamily {
+    const samples: MetricSample[] = [];
+    for (const series of this.series.values()) {
+      // 버킷별 카운트를 누적(cumulative) 값으로 내보낸다.
+      let cumulative = 0;
+      this.buckets.forEach((bound, index) => {
+        cumulative += series.counts[index];
+        samples.push({
+          suffix: "_bucket",
+          labels: { ...series.labels, le: String(bound) },
+          value: cumulative,
+        });
+      });
+      samples.push(
+        {
+          suffix: "_bucket",
+          labels: { ...series.labels, le: "+Inf" },
+          value: series.count,
+        },
+        { suffix: "_sum", labels: series.labels, value: series.sum },
+        { suffix: "_count", labels: series.labels, value: series.count },
+      );
+    }
+    return { name: this.name, help: this.help, type: "histogram", samples };
+  }
+
+  reset(): void {
+    this.series.clear();
+  }
+}
+
+export class MetricsRegistry {
+  private readonly metrics = new Map<string, Metric>();
+  // 수집 직전에 현재 상태(버퍼 깊이 등)를 gauge에 채우는 훅
+  private readonly collectHooks = new Set<() => void>();
+  private readonly sampledGauges = new Set<Gauge>();
+
+  counter(name: string, help: string): Counter {
+    return this.register(new Counter(name, help));
+  }
+
+  gauge(name: string, help: string): Gauge {
+    return this.register(new Gauge(name, help));
+  }
+
+  /**
+   * 수집할 때마다 값을 비우고 collect 훅으로 다시 채우는 gauge.
+   * 같은 gauge에 여러 인스턴스가 inc()로 값을 더할 수 있다.
+   */
+  sampledGauge(name: string, help: string): Gauge {
+    const gauge = this.register(new Gauge(name, help));
+    this.sampledGauges.add(gauge);
+    return gauge;
+  }
+
+  histogram(name: string, help: string, buckets: readonly number[]): Histogram {
+    return this.register(new Histogram(name, help, buckets));
+  }
+
+  /**
+   * @returns 훅 등록 해제 함수
+   */
+  onCollect(hook: () => void): () => void {
+    this.collectHooks.add(hook);
+    return () => this.collectHooks.delete(hook);
+  }
+
+  collect(): MetricFamily[] {
+    for (const gauge of this.sampledGauges) {
+      gauge.reset();
+    }
+    for (const hook of this.collectHooks) {
+      hook();
+    }
+    return [...this.metrics.values()].map((metric) => metric.collect());
+  }
+
+  private register<T extends Metric>(metric: T): T {
+    const existing = this.metrics.get(metric.name);
+    if (existing) {
+      return existing as T;
+    }
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+}
+
+function escapeLabelValue(value: string): string {
+  return value
+    .replace(/\\/g, "\\\\")
+    .replace(/\n/g, "\\n")
+    .replace(/"/g, '\\"');
+}
+
+function formatValue(value: number): string {
+  if (Number.isNaN(value)) {
+    return "NaN";
+  }
+  if (!Number.isFinite(value)) {
+    return value > 0 ? "+Inf" : "-Inf";
+  }
+  return String(value);
+}
+
+/**
+ * 여러 소스(워커)의 메트릭 패밀리를 이름별로 합쳐 Prometheus 텍스트로 렌더링한다.
+ * 같은 이름의 패밀리는 샘플을 이어 붙이므로, 소스마다 구분 라벨을 붙여 넘겨야 한다.
+ */
+export function renderPrometheus(families: MetricFamily[]): string {
+  const merged = new Map<string, MetricFamily>();
+  for (const family of families) {
+    const existing = merged.get(family.name);
+    if (existing) {
+      existing.samples.push(...family.samples);
+    } else {
+      merged.set(family.name, { ...family, samples: [...family.samples] });
+    }
+  }
+
+  const lines: string[] = [];
+  for (const family of merged.values()) {
+    lines.push(`# HELP ${family.name} ${family.help}`);
+    lines.push(`# TYPE ${family.name} ${family.type}`);
+    for (const sample of family.samples) {
+      const labels = Object.entries(sample.labels)
+        .map(([key, value]) => `${key}="${escapeLabelValue(value)}"`)
+        .join(",");
+      lines.push(
+        `${family.name}${sample.suffix}${labels ? `{${labels}}` : ""} ${formatValue(sample.value)}`,
+      );
+    }
+  }
+  return `${lines.join("\n")}\n`;
+}
+
+/**
+ * 모든 샘플에 라벨을 덧붙인다. (예: worker="0")
+ */
+export function withLabels(
+  families: MetricFamily[],
+  extra: MetricLabels,
+): MetricFamily[] {
+  return families.map((family) => ({
+    ...family,
+    samples: family.samples.map((sample) => ({
+      ...sample,
+      labels: { ...sample.labels, ...extra },
+    })),
+  }));
+}
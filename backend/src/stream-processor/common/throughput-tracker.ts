@@ -100,6 +100,64 @@ export class ThroughputTracker {
   }
 }
 
+/**
+ * 배치 컨슈머용 파티션별 처리량 관찰 유틸리티.
+ * - minIntervalMs 마다 파티션별/합계 초당 처리량을 한 줄로 남기고 구간 카운터를 초기화한다.
+ * - 로그 형식: `파티션별 처리량[label] 합계 X건/s | p0 A건/s, p1 B건/s`
+ */
+export class PartitionThroughputTracker {
+  private readonly counts = new Map<number, number>();
+  private windowStart = Date.now();
+
+  constructor(
+    private readonly logger: Logger,
+    private readonly label: string,
+    private readonly minIntervalMs: number,
+  ) {}
+
+  markProcessed(partition: number, delta: number): void {
+    this.counts.set(partition, (this.counts.get(partition) ?? 0) + delta);
+
+    const now = Date.now();
+    const elapsedMs = now - this.windowStart;
+    if (elapsedMs < this.minIntervalMs) {
+      return;
+    }
+
+    const seconds = Math.max(elapsedMs / 1000, 0.001);
+    let total = 0;
+    const perPartition = [...this.counts.entries()]
+      .sort(([a], [b]) => a - b)
+      .map(([id, count]) => {
+        total += count;
+        return `p${id} ${(count / seconds).toFixed(1)}건/s`;
+      });
+
+    this.logger.log(
+      `파티션별 처리량[${this.label}] 합계 ${(total / seconds).toFixed(
+        1,
+      )}건/s | ${perPartition.join(", ")}`,
+    );
+
+    this.counts.clear();
+    this.windowStart = now;
+  }
+}
+
+export function buildPartitionThroughputTracker(
+  logger: Logger,
+  label: string,
+): PartitionThroughputTracker {
+  const minIntervalMs = Number(
+    process.env.STREAM_THROUGHPUT_MIN_INTERVAL_MS ?? "10000",
+  );
+  return new PartitionThroughputTracker(
+    logger,
+    label,
+    Number.isFinite(minIntervalMs) ? minIntervalMs : 10000,
+  );
+}
+
 export function buildThroughputTracker(
   logger: Logger,
   label: string,
@@ -0,0 +1,345 @@
+import { Kafka, type IHeaders, type KafkaMessage } from "kafkajs";
+import { loadEnv } from "../../shared/config/load-env";
+import {
+  getKafkaSecurityOverrides,
+  parseKafkaBrokers,
+} from "../../shared/common/kafka/kafka.config";
+import { DLQ_HEADERS } from "../common/dead-letter.service";
+
+loadEnv();
+
+/**
+ * DLQ 토픽의 메시지를 원본 토픽으로 다시 게시해 일반 수집 경로(컨슈머 → 검증 → bulk)를 다시 타게 한다.
+ *
+ * 사용법:
+ *   npm run dlq:replay -- --topic apm.spans.dlq [--partition 0] \
+ *     [--from-offset 100] [--to-offset 200] [--since 2026-01-01T00:00:00Z] [--until ...] \
+ *     [--stage invalid|bulk_rejected|bulk_retry_exhausted] [--target apm.spans] \
+ *     [--rate 500] [--limit 10000] [--dry-run]
+ *
+ * - 범위는 파티션별 [from-offset, to-offset] (또는 since 시각 이후 ~ 실행 시점의 끝 오프셋)이다.
+ * - 대상 토픽을 지정하지 않으면 메시지의 `dlq.source.topic` 헤더를 따른다.
+ * - `dlq.format=document`(bulk 단계 실패) 메시지는 ES 문서를 원본 이벤트 형태로 되돌려 게시한다.
+ * - --rate 로 초당 게시 건수를 제한해 복구 중에도 ES/컨슈머에 부담을 주지 않는다.
+ */
+
+interface ReplayOptions {
+  topic: string;
+  target?: string;
+  partition?: number;
+  fromOffset?: number;
+  toOffset?: number;
+  since?: number;
+  until?: number;
+  stage?: string;
+  rate: number;
+  limit?: number;
+  dryRun: boolean;
+}
+
+interface PartitionRange {
+  partition: number;
+  start: number;
+  // 배타적 끝 오프셋
+  end: number;
+}
+
+// 한 번의 producer.send에 담는 최대 메시지 수
+const SEND_CHUNK_SIZE = 500;
+
+function parseArgs(argv: string[]): ReplayOptions {
+  const values = new Map<string, string>();
+  const flags = new Set<string>();
+  for (let index = 0; index < argv.length; index += 1) {
+    const arg = argv[index];
+    if (!arg.startsWith("--")) {
+      continue;
+    }
+    const [name, inline] = arg.slice(2).split("=", 2);
+    if (inline !== undefined) {
+      values.set(name, inline);
+    } else if (argv[index + 1] && !argv[index + 1].startsWith("--")) {
+      values.set(name, argv[index + 1]);
+      index += 1;
+    } else {
+      flags.add(name);
+    }
+  }
+
+  const topic = values.get("topic");
+  if (!topic) {
+    throw new Error("--topic <DLQ 토픽> 인자가 필요합니다.");
+  }
+  const toInt = (name: string): number | undefined => {
+    const raw = values.get(name);
+    if (raw === undefined) {
+      return undefined;
+    }
+    const parsed = Number.parseInt(raw, 10);
+    if (!Number.isFinite(parsed) || parsed < 0) {
+      throw new Error(`--${name} 값이 올바르지 않습니다: ${raw}`);
+    }
+    return parsed;
+  };
+  const toTime = (name: string): number | undefined => {
+    const raw = values.get(name);
+    if (raw === undefined) {
+      return undefined;
+    }
+    const parsed = Date.parse(raw);
+    if (Number.isNaN(parsed)) {
+      throw new Error(`--${name} 시각 형식이 올바르지 않습니다: ${raw}`);
+    }
+    return parsed;
+  };
+
+  return {
+    topic,
+    target: values.get("target"),
+    partition: toInt("partition"),
+    fromOffset: toInt("from-offset"),
+    toOffset: toInt("to-offset"),
+    since: toTime("since"),
+    until: toTime("until"),
+    stage: values.get("stage"),
+    rate: Math.max(1, toInt("rate") ?? 500),
+    limit: toInt("limit"),
+    dryRun: flags.has("dry-run"),
+  };
+}
+
+function headerValue(headers: IHeaders | undefined, name: string): string {
+  const raw = headers?.[name];
+  const value = Array.isArray(raw) ? raw[0] : raw;
+  return value == null ? "" : value.toString();
+}
+
+/**
+ * bulk 단계에서 DLQ로 간 ES 문서를 원본 이벤트 형태로 되돌린다.
+ * (@timestamp → timestamp, ingestedAt 제거. 나머지 필드는 이벤트와 이름이 같다)
+ */
+function toEventPayload(message: KafkaMessage): Buffer | string | null {
+  if (
+    message.value == null ||
+    headerValue(message.headers, DLQ_HEADERS.format) !== "document"
+  ) {
+    return message.value;
+  }
+  const document = JSON.parse(message.value.toString()) as Record<
+    string,
+    unknown
+  >;
+  const { "@timestamp": timestamp, ...rest } = document;
+  delete rest.ingestedAt;
+  return JSON.stringify({ ...rest, timestamp });
+}
+
+async function resolveRanges(
+  kafka: Kafka,
+  options: ReplayOptions,
+): Promise<PartitionRange[]> {
+  const admin = kafka.admin();
+  await admin.connect();
+  try {
+    const offsets = await admin.fetchTopicOffsets(options.topic);
+    const sinceOffsets =
+      options.since !== undefined
+        ? await admin.fetchTopicOffsetsByTimestamp(options.topic, options.since)
+        : [];
+
+    return offsets
+      .filter(
+        ({ partition }) =>
+          options.partition === undefined || partition === options.partition,
+      )
+      .map(({ partition, offset, low }) => {
+        const sinceOffset = sinceOffsets.find(
+          (entry) => entry.partition === partition,
+        )?.offset;
+        // since 이후 메시지가 없으면 브로커는 -1을 돌려준다.
+        const sinceStart =
+          sinceOffset === undefined
+            ? 0
+            : sinceOffset === "-1"
+              ? Number(offset)
+              : Number(sinceOffset);
+        const start = Math.max(
+          Number(low),
+          options.fromOffset ?? 0,
+          sinceStart,
+        );
+        const end = Math.min(
+          Number(offset),
+          options.toOffset !== undefined
+            ? options.toOffset + 1
+            : Number.MAX_SAFE_INTEGER,
+        );
+        return { partition, start, end };
+      })
+      .filter(({ start, end }) => start < end);
+  } finally {
+    await admin.disconnect();
+  }
+}
+
+async function main(): Promise<void> {
+  const options = parseArgs(process.argv.slice(2));
+  const kafka = new Kafka({
+    clientId: "dlq-replay",
+    brokers: parseKafkaBrokers(),
+    ...getKafkaSecurityOverrides(),
+  });
+
+  const ranges = await resolveRanges(kafka, options);
+  if (ranges.length === 0) {
+    console.log(`[dlq-replay] ${options.topic}: 재처리할 메시지가 없습니다.`);
+    return;
+  }
+  console.log(
+    `[dlq-replay] ${options.topic} → ${options.target ?? "(dlq.source.topic 헤더)"}, 초당 최대 ${options.rate}건${options.dryRun ? " (dry-run)" : ""}`,
+  );
+  for (const range of ranges) {
+    console.log(
+      `  p${range.partition}: offset ${range.start} ~ ${range.end - 1} (${range.end - range.start}건)`,
+    );
+  }
+
+  const producer = kafka.producer();
+  // 커밋하지 않는 일회성 그룹으로 범위만 읽는다.
+  const consumer = kafka.consumer({ groupId: `dlq-replay-${Date.now()}` });
+  await Promise.all([producer.connect(), consumer.connect()]);
+  await consumer.subscribe({ topic: options.topic, fromBeginning: true });
+
+  const startedAt = Date.now();
+  const remaining = new Set(ranges.map((range) => range.partition));
+  let accepted = 0;
+  let replayed = 0;
+  let skipped = 0;
+  let finish: () => void = () => undefined;
+  const finished = new Promise<void>((resolve) => (finish = resolve));
+
+  // 토큰 버킷 대신 누적 게시 건수 기준으로 목표 시각까지 대기해 평균 속도를 맞춘다.
+  const throttle = async (count: number): Promise<void> => {
+    const dueMs = ((replayed + count) / options.rate) * 1000;
+    const waitMs = dueMs - (Date.now() - startedAt);
+    if (waitMs > 0) {
+      await new Promise((resolve) => setTimeout(resolve, waitMs));
+    }
+  };
+
+  const markDone = (partition: number): void => {
+    if (!remaining.delete(partition)) {
+      return;
+    }
+    consumer.pause([{ topic: options.topic, partitions: [partition] }]);
+    if (remaining.size === 0) {
+      finish();
+    }
+  };
+
+  /**
+   * 필터를 통과하면 재게시 대상 토픽을, 아니면 undefined를 돌려준다.
+   */
+  const resolveTarget = (message: KafkaMessage): string | undefined => {
+    if (
+      options.until !== undefined &&
+      Number(message.timestamp) > options.until
+    ) {
+      return undefined;
+    }
+    if (
+      options.stage !== undefined &&
+      headerValue(message.headers, DLQ_HEADERS.stage) !== options.stage
+    ) {
+      return undefined;
+    }
+    return (
+      options.target ??
+      (headerValue(message.headers, DLQ_HEADERS.sourceTopic) || undefined)
+    );
+  };
+
+  const send = async (
+    target: string,
+    messages: Array<{ key: Buffer | null; value: Buffer | string | null }>,
+  ): Promise<void> => {
+    await throttle(messages.length);
+    if (!options.dryRun) {
+      await producer.send({ topic: target, messages });
+    }
+    replayed += messages.length;
+  };
+
+  await consumer.run({
+    autoCommit: false,
+    eachBatch: async ({ batch, heartbeat }) => {
+      const range = ranges.find((entry) => entry.partition === batch.partition);
+      if (!range || !remaining.has(batch.partition)) {
+        return;
+      }
+
+      const byTarget = new Map<
+        string,
+        Array<{ key: Buffer | null; value: Buffer | string | null }>
+      >();
+      for (const message of batch.messages) {
+        const offset = Number(message.offset);
+        if (offset < range.start) {
+          continue;
+        }
+        if (offset >= range.end) {
+          markDone(batch.partition);
+          break;
+        }
+
+        const target = resolveTarget(message);
+        if (target) {
+          const messages = byTarget.get(target) ?? [];
+          messages.push({ key: message.key, value: toEventPayload(message) });
+          byTarget.set(target, messages);
+          accepted += 1;
+          if (messages.length >= SEND_CHUNK_SIZE) {
+            byTarget.delete(target);
+            await send(target, messages);
+            await heartbeat();
+          }
+        } else {
+          skipped += 1;
+        }
+
+        if (options.limit !== undefined && accepted >= options.limit) {
+          ranges.forEach((entry) => markDone(entry.partition));
+          break;
+        }
+        if (offset >= range.end - 1) {
+          markDone(batch.partition);
+          break;
+        }
+      }
+
+      for (const [target, messages] of byTarget) {
+        await send(target, messages);
+      }
+      await heartbeat();
+    },
+  });
+  for (const range of ranges) {
+    consumer.seek({
+      topic: options.topic,
+      partition: range.partition,
+      offset: String(range.start),
+    });
+  }
+
+  await finished;
+  await Promise.all([consumer.disconnect(), producer.disconnect()]);
+  const elapsedSeconds = Math.max((Date.now() - startedAt) / 1000, 0.001);
+  console.log(
+    `✅ DLQ 재처리 완료: 게시 ${replayed}건, 건너뜀 ${skipped}건, ${(replayed / elapsedSeconds).toFixed(1)}건/s`,
+  );
+}
+
+main().catch((error) => {
+  console.error("DLQ 재처리에 실패했습니다.", error);
+  process.exitCode = 1;
+});
@@ -4,15 +4,25 @@ import {
   OnModuleDestroy,
   OnModuleInit,
 } from "@nestjs/common";
-import { Kafka, type Producer } from "kafkajs";
+import { CompressionTypes, Kafka, type Producer } from "kafkajs";
 import { LogEventDto } from "../../shared/apm/logs/dto/log-event.dto";
 import {
   getKafkaSecurityOverrides,
   parseKafkaBrokers,
 } from "../../shared/common/kafka/kafka.config";
+import { ingestMetrics } from "../common/ingest-metrics";
+
+type OverloadPolicy = "drop" | "sample";
+
+// 드롭/중복 억제 건수를 요약 로그로 남기는 최소 간격
+const SUMMARY_INTERVAL_MS = 10_000;
 
 /**
  * 로그 중 ERROR 레벨 이벤트를 별도 Kafka 토픽으로 전달하는 책임을 분리한 서비스
+ * - forward/forwardBatch는 큐에 넣고 바로 반환해 수집 경로를 막지 않는다.
+ * - linger 시간 또는 배치 크기에 도달하면 압축된 한 번의 send로 묶어 보낸다.
+ * - 큐가 가득 차면 정책(drop/sample)에 따라 버리거나 표본만 남긴다.
+ * - 같은 서비스의 같은 메시지는 짧은 창 안에서 한 번만 전달한다.
  */
 @Injectable()
 export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
@@ -23,6 +33,37 @@ export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
     process.env.KAFKA_APM_LOG_ERROR_TOPIC ?? "apm.logs.error";
   private readonly clientId =
     process.env.KAFKA_APM_LOG_ERROR_CLIENT_ID ?? "log-consumer-error-forwarder";
+  private readonly lingerMs = Math.max(
+    0,
+    Number.parseInt(process.env.ERROR_FORWARDER_LINGER_MS ?? "100", 10),
+  );
+  private readonly batchSize = Math.max(
+    1,
+    Number.parseInt(process.env.ERROR_FORWARDER_BATCH_SIZE ?? "500", 10),
+  );
+  private readonly maxQueue = Math.max(
+    this.batchSize,
+    Number.parseInt(process.env.ERROR_FORWARDER_MAX_QUEUE ?? "10000", 10),
+  );
+  private readonly overloadPolicy: OverloadPolicy =
+    process.env.ERROR_FORWARDER_OVERLOAD_POLICY === "sample"
+      ? "sample"
+      : "drop";
+  private readonly sampleRate = Math.min(
+    1,
+    Math.max(
+      0,
+      Number.parseFloat(process.env.ERROR_FORWARDER_SAMPLE_RATE ?? "0.1"),
+    ),
+  );
+  private readonly dedupWindowMs = Math.max(
+    0,
+    Number.parseInt(process.env.ERROR_FORWARDER_DEDUP_WINDOW_MS ?? "5000", 10),
+  );
+  private readonly compression =
+    process.env.ERROR_FORWARDER_COMPRESSION === "none"
+      ? CompressionTypes.None
+      : CompressionTypes.GZIP;
 
   private readonly kafka = new Kafka({
     clientId: this.clientId,
@@ -30,6 +71,15 @@ export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
     ...getKafkaSecurityOverrides(),
   });
 
+  private queue: LogEventDto[] = [];
+  private lingerTimer: NodeJS.Timeout | null = null;
+  private sending: Promise<void> | null = null;
+  // service_name + message → 중복 억제 만료 시각
+  private readonly recent = new Map<string, number>();
+  private dropped = 0;
+  private deduplicated = 0;
+  private lastSummaryAt = Date.now();
+
   async onModuleInit(): Promise<void> {
     this.producer = this.kafka.producer({
       allowAutoTopicCreation: true,
@@ -50,6 +100,9 @@ export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
   }
 
   async onModuleDestroy(): Promise<void> {
+    while (this.queue.length > 0 || this.sending) {
+      await (this.sending ?? this.drain());
+    }
     if (this.producer) {
       await this.producer.disconnect();
     }
@@ -57,15 +110,121 @@ export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
 
   /**
    * ERROR 레벨 로그만 별도 Kafka 토픽으로 전달한다.
-   * 전송 실패는 기존 ingest 흐름에 영향을 주지 않도록 내부에서 처리한다.
+   * 전송은 비동기로 묶어서 처리하므로 기존 ingest 흐름에 영향을 주지 않는다.
+   */
+  forward(dto: LogEventDto): void {
+    this.forwardBatch([dto]);
+  }
+
+  /**
+   * 배치 안의 ERROR 레벨 로그를 전송 큐에 넣는다.
+   */
+  forwardBatch(dtos: LogEventDto[]): void {
+    const now = Date.now();
+    for (const dto of dtos) {
+      if (dto.level !== "ERROR" || this.isDuplicate(dto, now)) {
+        continue;
+      }
+      if (this.queue.length >= this.maxQueue && !this.admitOnOverload()) {
+        this.dropped += 1;
+        ingestMetrics.errorLogsDropped.inc({ reason: "overflow" });
+        continue;
+      }
+      // 드롭된 로그는 dedup 키를 남기지 않아, 같은 로그가 다시 오면 전달할 수 있다.
+      this.markForwarded(dto, now);
+      this.queue.push(dto);
+    }
+
+    if (this.queue.length >= this.batchSize) {
+      void this.drain();
+    } else if (this.queue.length > 0) {
+      this.ensureLingerTimer();
+    }
+    this.logSummaryIfDue(now);
+  }
+
+  /**
+   * dedup 창 안에서 같은 서비스/메시지의 ERROR 로그가 이미 전달되었는지 확인한다.
+   * (키는 기록하지 않는다. 큐에 넣은 뒤 markForwarded 로 기록한다)
+   */
+  private isDuplicate(dto: LogEventDto, now: number): boolean {
+    if (this.dedupWindowMs === 0) {
+      return false;
+    }
+    const expiresAt = this.recent.get(this.dedupKey(dto));
+    if (expiresAt !== undefined && expiresAt > now) {
+      this.deduplicated += 1;
+      ingestMetrics.errorLogsDeduplicated.inc();
+      return true;
+    }
+    return false;
+  }
+
+  private markForwarded(dto: LogEventDto, now: number): void {
+    if (this.dedupWindowMs === 0) {
+      return;
+    }
+    this.recent.set(this.dedupKey(dto), now + this.dedupWindowMs);
+  }
+
+  private dedupKey(dto: LogEventDto): string {
+    return `${dto.service_name}\u0000${dto.message}`;
+  }
+
+  /**
+   * 큐가 가득 찼을 때 새 로그를 받을지 결정한다.
+   * sample 정책이면 가장 오래된 항목을 밀어내고 표본 비율만큼만 받는다.
    */
-  async forward(dto: LogEventDto): Promise<void> {
-    if (dto.level !== "ERROR") {
+  private admitOnOverload(): boolean {
+    if (this.overloadPolicy !== "sample" || Math.random() >= this.sampleRate) {
+      return false;
+    }
+    this.queue.shift();
+    this.dropped += 1;
+    ingestMetrics.errorLogsDropped.inc({ reason: "overflow" });
+    return true;
+  }
+
+  private ensureLingerTimer(): void {
+    if (this.lingerTimer || this.sending) {
       return;
     }
+    this.lingerTimer = setTimeout(() => {
+      this.lingerTimer = null;
+      void this.drain();
+    }, this.lingerMs);
+  }
+
+  /**
+   * 큐를 배치 크기 단위로 비우며 한 번에 하나의 send만 진행한다.
+   */
+  private drain(): Promise<void> {
+    if (this.sending) {
+      return this.sending;
+    }
+    if (this.lingerTimer) {
+      clearTimeout(this.lingerTimer);
+      this.lingerTimer = null;
+    }
+
+    this.sending = (async () => {
+      while (this.queue.length > 0) {
+        const batch = this.queue.splice(0, this.batchSize);
+        await this.send(batch);
+      }
+    })().finally(() => {
+      this.sending = null;
+      this.pruneRecent(Date.now());
+    });
+    return this.sending;
+  }
+
+  private async send(batch: LogEventDto[]): Promise<void> {
     if (!this.producer) {
-      this.logger.warn(
-        "ERROR 로그 포워더 producer가 초기화되지 않아 전송을 건너뜁니다.",
+      this.dropped += batch.length;
+      ingestMetrics.errorLogsDropped.inc(
+        { reason: "send_failed" },
+        batch.length,
       );
       return;
     }
@@ -73,18 +232,52 @@ export class ErrorLogForwarderService implements OnModuleInit, OnModuleDestroy {
     try {
       await this.producer.send({
         topic: this.topic,
-        messages: [
-          {
-            key: dto.service_name,
-            value: JSON.stringify(dto),
-          },
-        ],
+        compression: this.compression,
+        messages: batch.map((dto) => ({
+          key: dto.service_name,
+          value: JSON.stringify(dto),
+        })),
       });
+      ingestMetrics.errorLogsForwarded.inc({}, batch.length);
     } catch (error) {
+      this.dropped += batch.length;
+      ingestMetrics.errorLogsDropped.inc(
+        { reason: "send_failed" },
+        batch.length,
+      );
       this.logger.error(
-        "ERROR 로그 이벤트 추가 게시에 실패했습니다.",
+        `ERROR 로그 이벤트 ${batch.length}건 추가 게시에 실패했습니다.`,
         error instanceof Error ? error.stack : String(error),
       );
     }
   }
+
+  /**
+   * 만료된 dedup 키를 정리해 맵이 무한히 커지지 않도록 한다.
+   */
+  private pruneRecent(now: number): void {
+    if (this.recent.size < this.maxQueue) {
+      return;
+    }
+    for (const [key, expiresAt] of this.recent) {
+      if (expiresAt <= now) {
+        this.recent.delete(key);
+      }
+    }
+  }
+
+  private logSummaryIfDue(now: number): void {
+    if (
+      (this.dropped === 0 && this.deduplicated === 0) ||
+      now - this.lastSummaryAt < SUMMARY_INTERVAL_MS
+    ) {
+      return;
+    }
+    this.logger.warn(
+      `ERROR 로그 포워더: 최근 ${Math.round((now - this.lastSummaryAt) / 1000)}초 동안 ${this.dropped}건 드롭, ${this.deduplicated}건 중복 억제 (queue=${this.queue.length}/${this.maxQueue})`,
+    );
+    this.dropped = 0;
+    this.deduplicated = 0;
+    this.lastSummaryAt = now;
+  }
 }
@@ -0,0 +1,107 @@
+import {
+  Injectable,
+  Logger,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+} from "@nestjs/common";
+import type { KafkaMessage } from "kafkajs";
+import { LogIngestService } from "../apm/log-ingest/log-ingest.service";
+import { BulkAckGroup } from "../common/bulk-ack";
+import { BulkIndexerService } from "../common/bulk-indexer.service";
+import { DeadLetterService } from "../common/dead-letter.service";
+import { decodeEventBatch } from "../common/event-payload";
+import { logEventValidator } from "../common/event-validator";
+import { ingestMetrics } from "../common/ingest-metrics";
+import {
+  KafkaBatchConsumer,
+  isBatchConsumerMode,
+} from "../common/kafka-batch-consumer";
+import { buildThroughputTracker } from "../common/throughput-tracker";
+import { ErrorLogForwarderService } from "./error-log-forwarder.service";
+
+/**
+ * APM 로그 eachBatch 컨슈머 (KAFKA_CONSUMER_MODE=batch 일 때만 동작)
+ * - fetch된 배치 전체를 한 번에 디코딩/검증한 뒤 BulkIndexer 버퍼에 적재한다.
+ * - 배치의 모든 문서가 ES에 확인된 뒤에만 반환해 오프셋이 확인된 문서까지만 커밋되도록 한다.
+ */
+@Injectable()
+export class LogBatchConsumerService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(LogBatchConsumerService.name);
+  private readonly throughputTracker = buildThroughputTracker(
+    this.logger,
+    "apm.logs",
+  );
+  private consumer?: KafkaBatchConsumer;
+
+  constructor(
+    private readonly logIngestService: LogIngestService,
+    private readonly errorLogForwarder: ErrorLogForwarderService,
+    private readonly bulkIndexer: BulkIndexerService,
+    private readonly deadLetters: DeadLetterService,
+  ) {}
+
+  async onApplicationBootstrap(): Promise<void> {
+    if (!isBatchConsumerMode()) {
+      return;
+    }
+
+    const topic = process.env.KAFKA_APM_LOG_TOPIC ?? "apm.logs";
+    this.consumer = new KafkaBatchConsumer(this.logger, {
+      clientId: process.env.KAFKA_CLIENT_ID ?? "log-consumer",
+      groupId: process.env.KAFKA_CONSUMER_GROUP ?? "log-consumer-group",
+      topic,
+      allowAutoTopicCreation:
+        process.env.KAFKA_ALLOW_AUTO_TOPIC_CREATION !== "false",
+      handleBatch: (messages, partition) =>
+        this.handleBatch(topic, partition, messages),
+      backpressure: this.bulkIndexer,
+    });
+    await this.consumer.start();
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    await this.consumer?.stop();
+  }
+
+  private async handleBatch(
+    topic: string,
+    partition: number,
+    messages: KafkaMessage[],
+  ): Promise<void> {
+    const { events, invalid, firstError, rejected } = decodeEventBatch(
+      logEventValidator,
+      messages.map((message) => message.value),
+    );
+
+    const ack = new BulkAckGroup();
+    for (const dto of events) {
+      this.logIngestService.ingest(dto, ack);
+    }
+    this.bulkIndexer.requestFlush();
+    this.errorLogForwarder.forwardBatch(events);
+    if (invalid > 0) {
+      ingestMetrics.messagesInvalid.inc({ topic }, invalid);
+      this.logger.warn(
+        `유효하지 않은 로그 이벤트 ${invalid}건을 DLQ로 보냅니다: ${firstError}`,
+      );
+      // DLQ 게시가 실패하면 예외가 전파되어 배치가 재전달된다.
+      await this.deadLetters.publish(
+        topic,
+        rejected.map(({ index, reason }) => ({
+          key: messages[index].key,
+          value: messages[index].value,
+          reason,
+          stage: "invalid",
+          format: "event",
+          partition,
+          offset: messages[index].offset,
+        })),
+      );
+    }
+    // 재시도 한도를 넘긴 문서가 있으면 예외가 전파되어 오프셋이 커밋되지 않고 배치가 재전달된다.
+    await ack.wait();
+    this.throughputTracker.markProcessed(events.length);
+  }
+}
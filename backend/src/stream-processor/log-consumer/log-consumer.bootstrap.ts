@@ -1,4 +1,4 @@
-import { INestMicroservice } from "@nestjs/common";
+import { INestApplicationContext, INestMicroservice } from "@nestjs/common";
 import { NestFactory } from "@nestjs/core";
 import { MicroserviceOptions } from "@nestjs/microservices";
 import { createKafkaMicroserviceOptions } from "../../shared/common/kafka/kafka.config";
@@ -19,3 +19,11 @@ export async function createLogConsumerMicroservice(): Promise<INestMicroservice
     }),
   );
 }
+
+/**
+ * eachBatch 모드: Nest Kafka 트랜스포트 없이 모듈만 띄우고,
+ * 배치 컨슈머 서비스가 onApplicationBootstrap에서 kafkajs 컨슈머를 직접 실행한다.
+ */
+export async function createLogBatchConsumerContext(): Promise<INestApplicationContext> {
+  return NestFactory.createApplicationContext(LogConsumerModule);
+}
@@ -1,19 +1,18 @@
 import { Controller, Logger } from "@nestjs/common";
 import { Ctx, EventPattern, KafkaContext } from "@nestjs/microservices";
-import { plainToInstance } from "class-transformer";
-import { validateSync } from "class-validator";
 import { LogIngestService } from "../apm/log-ingest/log-ingest.service";
 import { LogEventDto } from "../../shared/apm/logs/dto/log-event.dto";
 import { ErrorLogForwarderService } from "./error-log-forwarder.service";
+import { BulkIndexerService } from "../common/bulk-indexer.service";
+import { DeadLetterService } from "../common/dead-letter.service";
+import {
+  InvalidEventPayloadError,
+  parseEventPayload,
+} from "../common/event-payload";
+import { logEventValidator } from "../common/event-validator";
+import { ingestMetrics } from "../common/ingest-metrics";
 import { buildThroughputTracker } from "../common/throughput-tracker";
 
-class InvalidLogEventError extends Error {
-  constructor(message: string) {
-    super(message);
-    this.name = "InvalidLogEventError";
-  }
-}
-
 /**
  * APM 로그 전용 Kafka 컨슈머
  */
@@ -28,29 +27,40 @@ export class LogConsumerController {
   constructor(
     private readonly logIngestService: LogIngestService,
     private readonly errorLogForwarder: ErrorLogForwarderService,
+    private readonly bulkIndexer: BulkIndexerService,
+    private readonly deadLetters: DeadLetterService,
   ) {}
 
   @EventPattern(process.env.KAFKA_APM_LOG_TOPIC ?? "apm.logs")
   async handleLogEvent(@Ctx() context: KafkaContext): Promise<void> {
+    const topic = context.getTopic();
+    ingestMetrics.messagesConsumed.inc({ topic });
     const value = context.getMessage().value;
     if (value == null) {
+      ingestMetrics.messagesInvalid.inc({ topic });
       this.logger.warn("Kafka 메시지에 본문이 없어 처리를 건너뜁니다.");
       return;
     }
 
     try {
       const dto = this.parsePayload(value);
+      // ES 미확인 문서가 한도를 넘으면 여유가 생길 때까지 다음 메시지 소비를 늦춘다.
+      if (this.bulkIndexer.isSaturated()) {
+        await this.bulkIndexer.waitForCapacity();
+      }
       this.logIngestService.ingest(dto);
-      await this.errorLogForwarder.forward(dto);
+      this.errorLogForwarder.forward(dto);
       this.throughputTracker.markProcessed();
       this.logger.debug(
-        `로그가 색인되었습니다. topic=${context.getTopic()} partition=${context.getPartition()}`,
+        `로그가 색인되었습니다. topic=${topic} partition=${context.getPartition()}`,
       );
     } catch (error) {
-      if (error instanceof InvalidLogEventError) {
+      if (error instanceof InvalidEventPayloadError) {
+        ingestMetrics.messagesInvalid.inc({ topic });
         this.logger.warn(
-          `유효하지 않은 로그 이벤트를 건너뜁니다: ${error.message}`,
+          `유효하지 않은 로그 이벤트를 DLQ로 보냅니다: ${error.message}`,
         );
+        await this.publishDeadLetter(context, error.message);
         return;
       }
       this.logger.error(
@@ -62,53 +72,38 @@ export class LogConsumerController {
   }
 
   /**
-   * Kafka 메시지를 DTO로 변환하고 유효성 검증을 수행한다.
+   * 검증에 실패한 원본 메시지를 실패 사유와 함께 DLQ로 보낸다.
+   * 메시지 모드는 오프셋이 자동 커밋되므로 게시 실패는 로그로만 남긴다.
    */
-  private parsePayload(payload: unknown): LogEventDto {
-    const resolved = this.unwrapValue(payload);
-    let plain: unknown;
-
+  private async publishDeadLetter(
+    context: KafkaContext,
+    reason: string,
+  ): Promise<void> {
+    const message = context.getMessage();
     try {
-      if (typeof resolved === "string") {
-        plain = JSON.parse(resolved);
-      } else if (resolved instanceof Buffer) {
-        plain = JSON.parse(resolved.toString());
-      } else if (ArrayBuffer.isView(resolved)) {
-        plain = JSON.parse(Buffer.from(resolved.buffer).toString());
-      } else {
-        plain = resolved;
-      }
+      await this.deadLetters.publish(context.getTopic(), [
+        {
+          key: message.key,
+          value: message.value,
+          reason,
+          stage: "invalid",
+          format: "event",
+          partition: context.getPartition(),
+          offset: message.offset,
+        },
+      ]);
     } catch (error) {
-      throw new InvalidLogEventError(
-        `Kafka 로그 payload JSON 파싱 실패: ${String(error)}`,
-      );
-    }
-
-    if (!plain || typeof plain !== "object") {
-      throw new InvalidLogEventError(
-        "Kafka 로그 payload가 객체 형식이 아닙니다.",
-      );
-    }
-
-    const dto = plainToInstance(LogEventDto, plain as Record<string, unknown>);
-    const errors = validateSync(dto, { whitelist: true });
-    if (errors.length > 0) {
-      throw new InvalidLogEventError(
-        `로그 이벤트 형식이 올바르지 않습니다: ${errors
-          .map((err) => Object.values(err.constraints ?? {}).join(", "))
-          .join("; ")}`,
+      this.logger.error(
+        "유효하지 않은 로그 이벤트의 DLQ 게시에 실패했습니다.",
+        error instanceof Error ? error.stack : String(error),
       );
     }
-    return dto;
   }
 
   /**
-   * kafkajs 래퍼에 감싸진 value 필드를 추출한다.
+   * Kafka payload를 DTO로 변환하고 유효성 검증을 수행한다.
    */
-  private unwrapValue(value: unknown): unknown {
-    if (value && typeof value === "object" && "value" in value) {
-      return (value as { value: unknown }).value;
-    }
-    return value;
+  private parsePayload(payload: unknown): LogEventDto {
+    return parseEventPayload(logEventValidator, payload);
   }
 }
@@ -2,10 +2,11 @@ import { Module } from "@nestjs/common";
 import { LogIngestModule } from "../apm/log-ingest/log-ingest.module";
 import { LogConsumerController } from "./log-consumer.controller";
 import { ErrorLogForwarderService } from "./error-log-forwarder.service";
+import { LogBatchConsumerService } from "./log-batch-consumer.service";
 
 @Module({
   imports: [LogIngestModule],
-  providers: [ErrorLogForwarderService],
+  providers: [ErrorLogForwarderService, LogBatchConsumerService],
   controllers: [LogConsumerController],
 })
 export class LogConsumerModule {}
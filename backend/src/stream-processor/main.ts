@@ -1,10 +1,56 @@
 import { loadEnv } from "../shared/config/load-env";
 loadEnv();
 
-import { createLogConsumerMicroservice } from "./log-consumer/log-consumer.bootstrap";
-import { createSpanConsumerMicroservice } from "./span-consumer/span-consumer.bootstrap";
+import { Logger } from "@nestjs/common";
+import { streamMetrics } from "./common/ingest-metrics";
+import { isBatchConsumerMode } from "./common/kafka-batch-consumer";
+import { renderPrometheus } from "./common/metrics";
+import { startMetricsServer } from "./common/metrics-server";
+import {
+  createLogBatchConsumerContext,
+  createLogConsumerMicroservice,
+} from "./log-consumer/log-consumer.bootstrap";
+import {
+  createSpanBatchConsumerContext,
+  createSpanConsumerMicroservice,
+} from "./span-consumer/span-consumer.bootstrap";
+import {
+  StreamWorkerPool,
+  resolveStreamWorkerCount,
+} from "./worker/stream-worker-pool";
 
 async function bootstrap(): Promise<void> {
+  const logger = new Logger("StreamProcessor");
+  const workerCount = resolveStreamWorkerCount();
+  if (workerCount > 0) {
+    const pool = new StreamWorkerPool(workerCount);
+    pool.start();
+    startMetricsServer(logger, async () =>
+      renderPrometheus(await pool.collectMetrics()),
+    );
+    for (const signal of ["SIGINT", "SIGTERM"] as const) {
+      process.once(signal, () => {
+        void pool.stop().finally(() => process.exit(0));
+      });
+    }
+    console.log(
+      `✅ 스트림 프로세서가 워커 스레드 ${workerCount}개로 로그/스팬 컨슈머를 실행 중입니다.`,
+    );
+    return;
+  }
+
+  startMetricsServer(logger, () => renderPrometheus(streamMetrics.collect()));
+  if (isBatchConsumerMode()) {
+    await Promise.all([
+      createLogBatchConsumerContext(),
+      createSpanBatchConsumerContext(),
+    ]);
+    console.log(
+      "✅ 스트림 프로세서가 eachBatch 모드로 로그/스팬 컨슈머와 함께 실행 중입니다.",
+    );
+    return;
+  }
+
   const logConsumer = await createLogConsumerMicroservice();
   const spanConsumer = await createSpanConsumerMicroservice();
 
@@ -1,18 +1,17 @@
 import { Controller, Logger } from "@nestjs/common";
 import { Ctx, EventPattern, KafkaContext } from "@nestjs/microservices";
-import { plainToInstance } from "class-transformer";
-import { validateSync } from "class-validator";
 import { SpanIngestService } from "../apm/span-ingest/span-ingest.service";
 import { SpanEventDto } from "../../shared/apm/spans/dto/span-event.dto";
+import { BulkIndexerService } from "../common/bulk-indexer.service";
+import { DeadLetterService } from "../common/dead-letter.service";
+import {
+  InvalidEventPayloadError,
+  parseEventPayload,
+} from "../common/event-payload";
+import { spanEventValidator } from "../common/event-validator";
+import { ingestMetrics } from "../common/ingest-metrics";
 import { buildThroughputTracker } from "../common/throughput-tracker";
 
-class InvalidSpanEventError extends Error {
-  constructor(message: string) {
-    super(message);
-    this.name = "InvalidSpanEventError";
-  }
-}
-
 /**
  * APM 스팬 전용 Kafka 컨슈머
  */
@@ -24,28 +23,41 @@ export class SpanConsumerController {
     "apm.spans",
   );
 
-  constructor(private readonly spanIngestService: SpanIngestService) {}
+  constructor(
+    private readonly spanIngestService: SpanIngestService,
+    private readonly bulkIndexer: BulkIndexerService,
+    private readonly deadLetters: DeadLetterService,
+  ) {}
 
   @EventPattern(process.env.KAFKA_APM_SPAN_TOPIC ?? "apm.spans")
-  handleSpanEvent(@Ctx() context: KafkaContext): void {
+  async handleSpanEvent(@Ctx() context: KafkaContext): Promise<void> {
+    const topic = context.getTopic();
+    ingestMetrics.messagesConsumed.inc({ topic });
     const value = context.getMessage().value;
     if (value == null) {
+      ingestMetrics.messagesInvalid.inc({ topic });
       this.logger.warn("Kafka 메시지에 본문이 없어 처리를 건너뜁니다.");
       return;
     }
 
     try {
       const dto = this.parsePayload(value);
+      // ES 미확인 문서가 한도를 넘으면 여유가 생길 때까지 다음 메시지 소비를 늦춘다.
+      if (this.bulkIndexer.isSaturated()) {
+        await this.bulkIndexer.waitForCapacity();
+      }
       this.spanIngestService.ingest(dto);
       this.throughputTracker.markProcessed();
       this.logger.debug(
-        `스팬이 색인되었습니다. topic=${context.getTopic()} partition=${context.getPartition()}`,
+        `스팬이 색인되었습니다. topic=${topic} partition=${context.getPartition()}`,
       );
     } catch (error) {
-      if (error instanceof InvalidSpanEventError) {
+      if (error instanceof InvalidEventPayloadError) {
+        ingestMetrics.messagesInvalid.inc({ topic });
         this.logger.warn(
-          `유효하지 않은 스팬 이벤트를 건너뜁니다: ${error.message}`,
+          `유효하지 않은 스팬 이벤트를 DLQ로 보냅니다: ${error.message}`,
         );
+        await this.publishDeadLetter(context, error.message);
         return;
       }
       this.logger.error(
@@ -57,47 +69,38 @@ export class SpanConsumerController {
   }
 
   /**
-   * Kafka payload를 DTO로 변환한다.
+   * 검증에 실패한 원본 메시지를 실패 사유와 함께 DLQ로 보낸다.
+   * 메시지 모드는 오프셋이 자동 커밋되므로 게시 실패는 로그로만 남긴다.
    */
-  private parsePayload(payload: unknown): SpanEventDto {
-    const resolved = this.unwrapValue(payload);
-    let plain: unknown;
-
+  private async publishDeadLetter(
+    context: KafkaContext,
+    reason: string,
+  ): Promise<void> {
+    const message = context.getMessage();
     try {
-      if (typeof resolved === "string") {
-        plain = JSON.parse(resolved);
-      } else if (resolved instanceof Buffer) {
-        plain = JSON.parse(resolved.toString());
-      } else if (ArrayBuffer.isView(resolved)) {
-        plain = JSON.parse(Buffer.from(resolved.buffer).toString());
-      } else {
-        plain = resolved;
-      }
+      await this.deadLetters.publish(context.getTopic(), [
+        {
+          key: message.key,
+          value: message.value,
+          reason,
+          stage: "invalid",
+          format: "event",
+          partition: context.getPartition(),
+          offset: message.offset,
+        },
+      ]);
     } catch (error) {
-      throw new InvalidSpanEventError(
-        `Kafka 스팬 payload JSON 파싱 실패: ${String(error)}`,
-      );
-    }
-
-    const dto = plainToInstance(SpanEventDto, plain);
-    const errors = validateSync(dto, { whitelist: true });
-    if (errors.length > 0) {
-      throw new InvalidSpanEventError(
-        `스팬 이벤트 형식이 올바르지 않습니다: ${errors
-          .map((err) => Object.values(err.constraints ?? {}).join(", "))
-          .join("; ")}`,
+      this.logger.error(
+        "유효하지 않은 스팬 이벤트의 DLQ 게시에 실패했습니다.",
+        error instanceof Error ? error.stack : String(error),
       );
     }
-    return dto;
   }
 
   /**
-   * kafkajs 메시지의 value 필드만 추출한다.
+   * Kafka payload를 DTO로 변환하고 유효성 검증을 수행한다.
    */
-  private unwrapValue(value: unknown): unknown {
-    if (value && typeof value === "object" && "value" in value) {
-      return (value as { value: unknown }).value;
-    }
-    return value;
+  private parsePayload(payload: unknown): SpanEventDto {
+    return parseEventPayload(spanEventValidator, payload);
   }
 }
@@ -1,9 +1,11 @@
 import { Module } from "@nestjs/common";
 import { SpanIngestModule } from "../apm/span-ingest/span-ingest.module";
 import { SpanConsumerController } from "./span-consumer.controller";
+import { SpanBatchConsumerService } from "./span-batch-consumer.service";
 
 @Module({
   imports: [SpanIngestModule],
+  providers: [SpanBatchConsumerService],
   controllers: [SpanConsumerController],
 })
 export class SpanConsumerModule {}
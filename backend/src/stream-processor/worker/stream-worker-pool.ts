@@ -0,0 +1,163 @@
+import { Logger } from "@nestjs/common";
+import { extname, join } from "path";
+import { Worker } from "worker_threads";
+import { streamMetrics } from "../common/ingest-metrics";
+import { withLabels, type MetricFamily } from "../common/metrics";
+
+export interface StreamWorkerData {
+  workerIndex: number;
+}
+
+// 비정상 종료된 워커를 다시 띄우기 전 대기 시간 (연속 크래시 시 최대 30초까지 증가)
+const RESTART_BASE_DELAY_MS = 1000;
+const RESTART_MAX_DELAY_MS = 30_000;
+// 종료 요청 후 워커가 남은 bulk 버퍼를 비울 때까지 기다리는 최대 시간
+const SHUTDOWN_TIMEOUT_MS = 30_000;
+// /metrics 요청 시 워커 응답을 기다리는 최대 시간
+const METRICS_TIMEOUT_MS = 2000;
+
+export interface StreamWorkerMetricsReply {
+  type: "metrics";
+  requestId: number;
+  families: MetricFamily[];
+}
+
+const workerRestarts = streamMetrics.counter(
+  "stream_worker_restarts_total",
+  "비정상 종료 후 다시 띄운 워커 스레드 수",
+);
+
+/**
+ * STREAM_WORKER_THREADS 가 1 이상이면 그 수만큼 worker_threads로 컨슈머를 띄운다. (0이면 기존 단일 스레드)
+ */
+export function resolveStreamWorkerCount(): number {
+  return Math.max(
+    0,
+    Number.parseInt(process.env.STREAM_WORKER_THREADS ?? "0", 10) || 0,
+  );
+}
+
+/**
+ * 스트림 프로세서 워커 스레드 풀
+ * - 워커마다 eachBatch 로그/스팬 컨슈머, 검증기, BulkIndexer(ES 커넥션 풀 포함)를 독립적으로 가진다.
+ * - 모든 워커가 같은 컨슈머 그룹에 참여하므로 Kafka 리밸런싱이 파티션을 워커에 나눠 준다.
+ * - 워커가 비정상 종료되면 지수 백오프 후 다시 띄운다.
+ */
+export class StreamWorkerPool {
+  private readonly logger = new Logger(StreamWorkerPool.name);
+  private readonly workers = new Map<number, Worker>();
+  private readonly crashCounts = new Map<number, number>();
+  private stopping = false;
+  private nextMetricsRequestId = 0;
+
+  constructor(private readonly size: number) {}
+
+  start(): void {
+    for (let index = 0; index < this.size; index += 1) {
+      this.spawn(index);
+    }
+    this.logger.log(`스트림 워커 ${this.size}개를 시작했습니다.`);
+  }
+
+  /**
+   * 모든 워커에 종료를 요청하고, 남은 bulk 버퍼를 비운 뒤 종료될 때까지 기다린다.
+   */
+  async stop(): Promise<void> {
+    this.stopping = true;
+    await Promise.all(
+      [...this.workers.values()].map(
+        (worker) =>
+          new Promise<void>((resolve) => {
+            const timer = setTimeout(() => {
+              void worker.terminate().finally(resolve);
+            }, SHUTDOWN_TIMEOUT_MS);
+            worker.once("exit", () => {
+              clearTimeout(timer);
+              resolve();
+            });
+            worker.postMessage({ type: "shutdown" });
+          }),
+      ),
+    );
+  }
+
+  /**
+   * 각 워커의 메트릭을 모아 worker 라벨을 붙여 돌려준다. 응답이 늦은 워커는 건너뛴다.
+   */
+  async collectMetrics(): Promise<MetricFamily[]> {
+    const replies = await Promise.all(
+      [...this.workers.entries()].map(([workerIndex, worker]) =>
+        this.requestWorkerMetrics(worker).then((families) =>
+          withLabels(families, { worker: String(workerIndex) }),
+        ),
+      ),
+    );
+    return [...streamMetrics.collect(), ...replies.flat()];
+  }
+
+  private requestWorkerMetrics(worker: Worker): Promise<MetricFamily[]> {
+    const requestId = (this.nextMetricsRequestId += 1);
+    return new Promise((resolve) => {
+      const onMessage = (message: StreamWorkerMetricsReply): void => {
+        if (message?.type !== "metrics" || message.requestId !== requestId) {
+          return;
+        }
+        cleanup();
+        resolve(message.families);
+      };
+      const timer = setTimeout(() => {
+        cleanup();
+        resolve([]);
+      }, METRICS_TIMEOUT_MS);
+      const cleanup = (): void => {
+        clearTimeout(timer);
+        worker.off("message", onMessage);
+      };
+      worker.on("message", onMessage);
+      worker.postMessage({ type: "metrics", requestId });
+    });
+  }
+
+  private spawn(workerIndex: number): void {
+    const entry = join(__dirname, `stream-worker.main${extname(__filename)}`);
+    const workerData: StreamWorkerData = { workerIndex };
+    const worker = new Worker(entry, {
+      workerData,
+      // ts-node로 실행 중이면 워커에서도 TypeScript 로더를 등록한다.
+      execArgv: entry.endsWith(".ts")
+        ? ["-r", "ts-node/register", "-r", "tsconfig-paths/register"]
+        : undefined,
+    });
+    this.workers.set(workerIndex, worker);
+
+    worker.on("online", () => this.crashCounts.set(workerIndex, 0));
+    worker.on("error", (error) => {
+      this.logger.error(
+        `스트림 워커 #${workerIndex}에서 처리되지 않은 오류가 발생했습니다.`,
+        error instanceof Error ? error.stack : String(error),
+      );
+    });
+    worker.on("exit", (code) => {
+      this.workers.delete(workerIndex);
+      if (this.stopping) {
+        return;
+      }
+
+      workerRestarts.inc();
+      const crashes = (this.crashCounts.get(workerIndex) ?? 0) + 1;
+      this.crashCounts.set(workerIndex, crashes);
+      const delay = Math.min(
+        RESTART_MAX_DELAY_MS,
+        RESTART_BASE_DELAY_MS * 2 ** (crashes - 1),
+      );
+      this.logger.warn(
+        `스트림 워커 #${workerIndex}가 종료되었습니다(code=${code}). ${delay}ms 후 재시작합니다.`,
+      );
+      setTimeout(() => {
+        if (!this.stopping) {
+          this.spawn(workerIndex);
+        }
+      }, delay);
+    });
+  }
+}
@@ -0,0 +1,56 @@
+import { loadEnv } from "../../shared/config/load-env";
+loadEnv();
+// 워커의 process.env는 스레드마다 복사본이므로 메인 스레드 설정에 영향을 주지 않는다.
+process.env.KAFKA_CONSUMER_MODE = "batch";
+
+import { Logger } from "@nestjs/common";
+import { parentPort, workerData } from "worker_threads";
+import { streamMetrics } from "../common/ingest-metrics";
+import { createLogBatchConsumerContext } from "../log-consumer/log-consumer.bootstrap";
+import { createSpanBatchConsumerContext } from "../span-consumer/span-consumer.bootstrap";
+import type {
+  StreamWorkerData,
+  StreamWorkerMetricsReply,
+} from "./stream-worker-pool";
+
+interface WorkerCommand {
+  type?: "metrics" | "shutdown";
+  requestId?: number;
+}
+
+/**
+ * 워커 스레드 진입점
+ * - 워커 안에서는 항상 eachBatch 컨슈머를 사용한다. (파티션 분배는 컨슈머 그룹이 담당)
+ * - 메인 스레드의 metrics 요청에는 이 워커의 메트릭 스냅샷으로 응답한다.
+ * - 메인 스레드의 shutdown 메시지를 받으면 컨텍스트를 닫아 bulk 버퍼를 비우고 컨슈머를 해제한다.
+ */
+async function bootstrap(): Promise<void> {
+  const { workerIndex } = workerData as StreamWorkerData;
+  const logger = new Logger(`StreamWorker#${workerIndex}`);
+
+  const contexts = await Promise.all([
+    createLogBatchConsumerContext(),
+    createSpanBatchConsumerContext(),
+  ]);
+  logger.log("로그/스팬 eachBatch 컨슈머가 워커 스레드에서 실행 중입니다.");
+
+  parentPort?.on("message", (message: WorkerCommand) => {
+    if (message?.type === "metrics") {
+      const reply: StreamWorkerMetricsReply = {
+        type: "metrics",
+        requestId: message.requestId ?? 0,
+        families: streamMetrics.collect(),
+      };
+      parentPort?.postMessage(reply);
+      return;
+    }
+    if (message?.type !== "shutdown") {
+      return;
+    }
+    void Promise.all(contexts.map((context) => context.close())).finally(() =>
+      process.exit(0),
+    );
+  });
+}
+
+void bootstrap();
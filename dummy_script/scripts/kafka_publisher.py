@@ -0,0 +1,273 @@
+"""
+Kafka-Direct Publisher - apm.logs / apm.spans without producerServer
+
+Goal: Load the stream-processor (Span/LogConsumerController, BulkIndexerService)
+      in isolation by producing events straight to Kafka, one JSON event per
+      message exactly as producerServer publishes them
+
+Payloads come from the same builders as the locustfiles (linear_traces like
+locustfile_traffic.py, simple_logs like locustfile.py; --realistic switches to
+realistic_span_chains / realistic_logs). Producer batching, linger, compression
+and partition keys map directly to librdkafka settings, and the broker ack
+latency of every message (produce() -> delivery report) is collected from the
+delivery callbacks.
+
+Requirements:
+    pip3 install confluent-kafka
+
+Usage:
+    cd dummy_script/scripts
+
+    # Local Kafka from infra/docker-compose.yml (HOST listener), spans as fast as possible for 60s
+    python3 kafka_publisher.py --stream spans --duration 60
+
+    # 20k spans/sec + 5k logs/sec, lz4, 64KB batches, 5ms linger, keyed by trace_id
+    python3 kafka_publisher.py --stream both --span-rate 20000 --log-rate 5000 \\
+           --compression lz4 --batch-bytes 65536 --linger-ms 5 --key trace_id
+
+    # Exactly 1M spans, reproducible payloads
+    python3 kafka_publisher.py --stream spans --count 1000000 --seed 42
+
+Environment Variables:
+    KAFKA_BROKERS: Comma-separated bootstrap servers (default: localhost:19092)
+    KAFKA_APM_LOG_TOPIC: Log topic (default: apm.logs)
+    KAFKA_APM_SPAN_TOPIC: Span topic (default: apm.spans)
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from payload_gen import linear_traces, realistic_logs, realistic_span_chains, simple_logs
+
+try:
+    from confluent_kafka import Producer
+except ImportError:  # pragma: no cover - optional dependency
+    Producer = None
+
+
+# Configuration
+KAFKA_BROKERS = os.getenv('KAFKA_BROKERS', 'localhost:19092')
+LOG_TOPIC = os.getenv('KAFKA_APM_LOG_TOPIC', 'apm.logs')
+SPAN_TOPIC = os.getenv('KAFKA_APM_SPAN_TOPIC', 'apm.spans')
+
+# Ack latency samples kept for percentiles (reservoir sampling beyond this)
+LATENCY_SAMPLES = 200_000
+# Seconds between progress lines
+REPORT_INTERVAL = 5.0
+
+
+class StreamSpec:
+    """One topic's event source and pacing"""
+
+    def __init__(self, label, topic, build, items_per_batch, rate):
+        self.label = label
+        self.topic = topic
+        self.build = build
+        self.items_per_batch = items_per_batch
+        self.rate = rate
+        self.next_at = 0.0
+        self.produced = 0
+
+    def due(self, now):
+        return self.rate <= 0 or now >= self.next_at
+
+    def advance(self):
+        if self.rate > 0:
+            self.next_at += self.items_per_batch / self.rate
+
+
+class DeliveryStats:
+    """Delivery-report bookkeeping: acked/failed counts and ack latency reservoir"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.acked = 0
+        self.failed = 0
+        self.seen = 0
+        self.latencies = []
+        self.last_error = None
+
+    def on_delivery(self, error, message):
+        if error is not None:
+            self.failed += 1
+            self.last_error = error
+            return
+        self.acked += 1
+        latency = message.latency()
+        if latency is None:
+            return
+        self.seen += 1
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(latency)
+        else:
+            slot = self.rng.randrange(self.seen)
+            if slot < LATENCY_SAMPLES:
+                self.latencies[slot] = latency
+
+    def percentile(self, ordered, q):
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+def build_streams(args, rng):
+    if args.realistic:
+        span_build, span_items = (lambda: realistic_span_chains(10, rng=rng)), 30
+        log_build, log_items = (lambda: realistic_logs(100, rng=rng)), 100
+    else:
+        span_build, span_items = (lambda: linear_traces(3, 10, rng=rng)), 30
+        log_build, log_items = (lambda: simple_logs(100, rng=rng)), 100
+
+    streams = []
+    if args.stream in ('spans', 'both'):
+        streams.append(StreamSpec('spans', SPAN_TOPIC, span_build, span_items, args.span_rate))
+    if args.stream in ('logs', 'both'):
+        streams.append(StreamSpec('logs', LOG_TOPIC, log_build, log_items, args.log_rate))
+    return streams
+
+
+def producer_config(args):
+    return {
+        'bootstrap.servers': args.brokers,
+        'client.id': 'kafka-direct-publisher',
+        'acks': args.acks,
+        'linger.ms': args.linger_ms,
+        'batch.size': args.batch_bytes,
+        'compression.type': args.compression,
+        'queue.buffering.max.messages': args.queue_messages,
+    }
+
+
+def produce_batch(producer, stream, batch, key_field, stats):
+    """Produce one batch, waiting for queue space instead of dropping messages"""
+    topic = stream.topic
+    on_delivery = stats.on_delivery
+    dumps = json.dumps
+    for event in batch:
+        value = dumps(event, separators=(',', ':')).encode('utf-8')
+        key = event.get(key_field) if key_field else None
+        while True:
+            try:
+                producer.produce(topic, value=value, key=key, on_delivery=on_delivery)
+                break
+            except BufferError:
+                # Local queue full: serve delivery callbacks until space frees up
+                producer.poll(0.05)
+    stream.produced += len(batch)
+    producer.poll(0)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Produce APM events directly to Kafka')
+    parser.add_argument('--brokers', default=KAFKA_BROKERS, help=f'Bootstrap servers (default: {KAFKA_BROKERS})')
+    parser.add_argument('--stream', choices=('spans', 'logs', 'both'), default='spans')
+    parser.add_argument('--span-rate', type=float, default=0, help='Spans/sec (0 = as fast as possible)')
+    parser.add_argument('--log-rate', type=float, default=0, help='Logs/sec (0 = as fast as possible)')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run (default: 60)')
+    parser.add_argument('--count', type=int, default=0, help='Stop after this many events per stream (0 = use --duration)')
+    parser.add_argument('--batch-bytes', type=int, default=1_000_000, help='Producer batch.size in bytes (default: 1000000)')
+    parser.add_argument('--linger-ms', type=float, default=5, help='Producer linger.ms (default: 5)')
+    parser.add_argument('--compression', choices=('none', 'gzip', 'snappy', 'lz4', 'zstd'), default='none')
+    parser.add_argument('--acks', choices=('0', '1', 'all'), default='all', help='Producer acks (default: all)')
+    parser.add_argument('--key', choices=('none', 'trace_id', 'service_name'), default='none',
+                        help='Message key / partitioning (default: none = sticky partitioner)')
+    parser.add_argument('--queue-messages', type=int, default=500_000, help='Local producer queue size (messages)')
+    parser.add_argument('--realistic', action='store_true', help='Use realistic_span_chains / realistic_logs payloads')
+    parser.add_argument('--seed', type=int, default=None, help='Seed the payload generator (reproducible events)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if Producer is None:
+        print("❌ confluent-kafka is not installed!")
+        print("Install it with: pip3 install confluent-kafka")
+        sys.exit(1)
+
+    rng = random.Random(args.seed) if args.seed is not None else None
+    streams = build_streams(args, rng)
+    stats = DeliveryStats(random.Random(0))
+    key_field = None if args.key == 'none' else args.key
+    producer = Producer(producer_config(args))
+
+    print("\n" + "="*80)
+    print("🚀 Kafka-Direct Publisher Starting")
+    print("="*80)
+    print(f"Brokers: {args.brokers}")
+    for stream in streams:
+        rate = f"{stream.rate:,.0f}/s" if stream.rate > 0 else 'max'
+        print(f"  - {stream.label}: topic={stream.topic}, rate={rate}, {stream.items_per_batch} events per batch")
+    print(f"batch.size={args.batch_bytes:,}B linger.ms={args.linger_ms:g} compression={args.compression} "
+          f"acks={args.acks} key={args.key}")
+    print(f"Stop after: {f'{args.count:,} events per stream' if args.count else f'{args.duration:g}s'}")
+    print("="*80 + "\n")
+
+    started = time.monotonic()
+    for stream in streams:
+        stream.next_at = started
+    deadline = None if args.count else started + args.duration
+    next_report = started + REPORT_INTERVAL
+    last_produced, last_acked = 0, 0
+
+    try:
+        while True:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            active = [stream for stream in streams if not args.count or stream.produced < args.count]
+            if not active:
+                break
+
+            sent = False
+            for stream in active:
+                if stream.due(now):
+                    batch = stream.build()
+                    if args.count:
+                        batch = batch[:args.count - stream.produced]
+                    produce_batch(producer, stream, batch, key_field, stats)
+                    stream.advance()
+                    sent = True
+            if not sent:
+                producer.poll(max(0.0, min(stream.next_at for stream in active) - time.monotonic()))
+
+            if now >= next_report:
+                produced = sum(stream.produced for stream in streams)
+                print(f"[{now - started:6.0f}s] produced {(produced - last_produced) / REPORT_INTERVAL:>10,.0f}/s "
+                      f"acked {(stats.acked - last_acked) / REPORT_INTERVAL:>10,.0f}/s "
+                      f"queued {len(producer):>8,} failed {stats.failed:,}")
+                last_produced, last_acked = produced, stats.acked
+                next_report += REPORT_INTERVAL
+    except KeyboardInterrupt:
+        print("\nInterrupted - flushing queued messages...")
+
+    produce_elapsed = time.monotonic() - started
+    remaining = producer.flush(60)
+    elapsed = time.monotonic() - started
+
+    produced = sum(stream.produced for stream in streams)
+    ordered = sorted(stats.latencies)
+
+    print("\n" + "="*80)
+    print("✅ Kafka-Direct Publisher Completed")
+    print("="*80)
+    for stream in streams:
+        print(f"{stream.label:<6} {stream.produced:>14,} events → {stream.topic}")
+    print(f"Produce throughput: {produced / max(produce_elapsed, 1e-9):,.0f} events/sec "
+          f"({produce_elapsed:.1f}s)")
+    print(f"Acked throughput: {stats.acked / max(elapsed, 1e-9):,.0f} events/sec "
+          f"({stats.acked:,} acked in {elapsed:.1f}s incl. final flush)")
+    print(f"Failed deliveries: {stats.failed:,}" + (f" (last: {stats.last_error})" if stats.last_error else ''))
+    if remaining:
+        print(f"⚠️  {remaining:,} messages still queued after the 60s flush timeout")
+    print(f"\nBroker ack latency (produce() → delivery report, {len(ordered):,} samples):")
+    print(f"  p50={stats.percentile(ordered, 0.50):.1f}ms p95={stats.percentile(ordered, 0.95):.1f}ms "
+          f"p99={stats.percentile(ordered, 0.99):.1f}ms max={stats.percentile(ordered, 1.0):.1f}ms")
+    print("="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
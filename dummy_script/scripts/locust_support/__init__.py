@@ -0,0 +1,63 @@
+"""
+Shared Locust plumbing for the load-test locustfiles.
+
+Usage:
+    from locust import events
+    from locust_support import (
+        OpenLoopPacer, TargetQuota, TransportUser, arrival_shape, core_throughput,
+        freshness_probe_user,
+    )
+
+    core_throughput.attach(events)
+
+    # Fixed-volume runs: exactly N successful requests across all workers
+    quota = TargetQuota(1_000_000)
+    quota.attach(events)
+
+    # Open-loop mode: fixed arrival rate from SPAN_ARRIVAL_STAGES, step-ramp shape
+    span_pacer = OpenLoopPacer.from_env('SPAN_ARRIVAL_STAGES', items_per_request=30, name='spans')
+    if span_pacer is not None:
+        span_pacer.attach(events)
+    StepArrivalShape = arrival_shape(span_pacer)
+
+    # Publish -> queryable latency as a Locust metric (FRESHNESS_PROBE=true)
+    FreshnessProbe = freshness_probe_user(PRODUCER_URL)
+
+    class MyLoadTest(TransportUser):
+        ...
+"""
+
+from .arrival import (
+    ARRIVAL_USERS,
+    ArrivalSchedule,
+    OpenLoopPacer,
+    arrival_shape,
+    drive_streams,
+)
+from .freshness import FreshnessProbeUser, freshness_probe_user
+from .quota import TargetQuota
+from .transport import (
+    LOCUST_TRANSPORT,
+    CoreThroughputMeter,
+    TransportUser,
+    TunedFastHttpUser,
+    core_throughput,
+    describe_transport,
+)
+
+__all__ = [
+    'ARRIVAL_USERS',
+    'arrival_shape',
+    'ArrivalSchedule',
+    'core_throughput',
+    'CoreThroughputMeter',
+    'describe_transport',
+    'drive_streams',
+    'freshness_probe_user',
+    'FreshnessProbeUser',
+    'LOCUST_TRANSPORT',
+    'OpenLoopPacer',
+    'TargetQuota',
+    'TransportUser',
+    'TunedFastHttpUser',
+]
@@ -0,0 +1,226 @@
+"""
+Open-loop (constant arrival rate) pacing for producer benchmarks.
+
+Closed-loop users (wait_time = 0 / between(...)) send the next batch only after
+the previous response arrives, so a slow producer silently lowers the send
+rate and the latency blowup never shows up in the numbers (coordinated
+omission). In open-loop mode every simulated user fires requests at scheduled
+instants and does not wait for the response: the offered load follows the
+schedule, and when the pipeline cannot keep up it shows as growing response
+times, in-flight build-up and, past ARRIVAL_MAX_IN_FLIGHT, dropped arrivals
+reported as Locust failures.
+
+Schedules are given in items/sec (spans or logs, not requests) for the whole
+cluster and are split evenly over ARRIVAL_USERS users, which the step-ramp
+LoadTestShape spawns at once. Two syntaxes are accepted:
+
+    "60s:10000,60s:20000,2m:40000"    explicit stages (duration:items_per_sec)
+    "ramp:10000:60000:10000:60s"      start:stop:step:hold step ramp
+
+Environment Variables:
+    SPAN_ARRIVAL_STAGES / LOG_ARRIVAL_STAGES: Schedule per stream (unset = closed loop)
+    ARRIVAL_USERS: Simulated users sharing the rate, cluster-wide (default: 50)
+    ARRIVAL_MAX_IN_FLIGHT: Max outstanding requests per user before arrivals are dropped (default: 100)
+"""
+
+import os
+import time
+
+import gevent
+from gevent.pool import Pool
+from locust import LoadTestShape
+from locust.runners import MasterRunner
+
+ARRIVAL_USERS = int(os.getenv('ARRIVAL_USERS', '50'))
+ARRIVAL_MAX_IN_FLIGHT = int(os.getenv('ARRIVAL_MAX_IN_FLIGHT', '100'))
+
+# Dispatcher lag (seconds behind schedule) above which the generator itself is the bottleneck
+LAG_WARNING_SECONDS = 0.5
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_duration(text):
+    """'90', '90s', '2m', '1h' -> seconds"""
+    text = text.strip().lower()
+    if text and text[-1] in _DURATION_UNITS:
+        return float(text[:-1]) * _DURATION_UNITS[text[-1]]
+    return float(text)
+
+
+class ArrivalSchedule:
+    """Piecewise-constant arrival rate: list of (duration_seconds, items_per_sec)"""
+
+    def __init__(self, stages):
+        if not stages:
+            raise ValueError('Arrival schedule needs at least one stage')
+        self.stages = stages
+        self.duration = sum(duration for duration, _ in stages)
+
+    @classmethod
+    def from_spec(cls, spec):
+        spec = spec.strip()
+        if spec.startswith('ramp:'):
+            start, stop, step, hold = spec[len('ramp:'):].split(':')
+            start, stop, step = float(start), float(stop), float(step)
+            if step <= 0:
+                raise ValueError(f"Ramp step must be positive: '{spec}'")
+            hold = parse_duration(hold)
+            stages = []
+            rate = start
+            while rate <= stop:
+                stages.append((hold, rate))
+                rate += step
+            return cls(stages)
+
+        stages = []
+        for part in spec.split(','):
+            duration, rate = part.split(':')
+            stages.append((parse_duration(duration), float(rate)))
+        return cls(stages)
+
+    def rate_at(self, elapsed):
+        """Items/sec at `elapsed` seconds into the run, or None once the schedule is over"""
+        for duration, rate in self.stages:
+            if elapsed < duration:
+                return rate
+            elapsed -= duration
+        return None
+
+    def describe(self):
+        return ', '.join(f'{duration:g}s @ {rate:,.0f}/s' for duration, rate in self.stages)
+
+
+class OpenLoopPacer:
+    """
+    Fires one stream's requests at the scheduled arrival rate.
+
+    Args:
+        schedule: ArrivalSchedule in items/sec for the whole cluster
+        items_per_request: Items (spans/logs) carried by one request
+        name: Label used in dropped-arrival failures and the summary
+    """
+
+    def __init__(self, schedule, items_per_request, name):
+        self.schedule = schedule
+        self.items_per_request = items_per_request
+        self.name = name
+        self._reset()
+
+    def _reset(self):
+        self._started = time.monotonic()
+        self.scheduled = 0
+        self.dropped = 0
+        self.max_lag = 0.0
+
+    @classmethod
+    def from_env(cls, env_var, items_per_request, name):
+        """Build a pacer from a schedule env var, or None when it is unset (closed loop)"""
+        spec = os.getenv(env_var, '').strip()
+        if not spec:
+            return None
+        return cls(ArrivalSchedule.from_spec(spec), items_per_request, name)
+
+    def attach(self, events):
+        """Register test_start/test_stop listeners (schedule clock and summary)"""
+        events.test_start.add_listener(self._on_test_start)
+        events.test_stop.add_listener(self._on_test_stop)
+
+    def _on_test_start(self, environment, **_kwargs):
+        self._reset()
+
+    def _on_test_stop(self, environment, **_kwargs):
+        if isinstance(environment.runner, MasterRunner):
+            return
+        print(f"\nOpen-loop {self.name}: {self.scheduled:,} arrivals scheduled, "
+              f"{self.dropped:,} dropped at the in-flight limit, "
+              f"max dispatcher lag {self.max_lag * 1000:.0f}ms")
+        if self.max_lag > LAG_WARNING_SECONDS:
+            print(f"⚠️  The generator fell behind schedule - add workers before trusting this rate")
+
+    def drive(self, user, send):
+        """
+        Run the schedule for one user: call send() at each arrival without
+        waiting for earlier sends to finish. Returns when the schedule ends.
+        """
+        in_flight = Pool(ARRIVAL_MAX_IN_FLIGHT)
+        next_at = time.monotonic()
+        try:
+            while True:
+                rate = self.schedule.rate_at(next_at - self._started)
+                if rate is None:
+                    break
+                if rate <= 0:
+                    next_at += 1.0
+                    gevent.sleep(max(0.0, next_at - time.monotonic()))
+                    continue
+
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    gevent.sleep(delay)
+                else:
+                    self.max_lag = max(self.max_lag, -delay)
+
+                self.scheduled += 1
+                if in_flight.full():
+                    self.dropped += 1
+                    user.environment.events.request.fire(
+                        request_type='ARRIVAL',
+                        name=f'{self.name} dropped (in-flight limit)',
+                        response_time=0,
+                        response_length=0,
+                        exception=RuntimeError(f'{ARRIVAL_MAX_IN_FLIGHT} requests already in flight'),
+                        context={},
+                    )
+                else:
+                    in_flight.spawn(send)
+
+                # Per-user interval so that all users together offer `rate` items/sec
+                next_at += self.items_per_request * ARRIVAL_USERS / rate
+            in_flight.join()
+        finally:
+            in_flight.kill(block=False)
+
+
+def drive_streams(user, *streams):
+    """
+    Drive several (pacer, send) streams from one user concurrently, e.g. logs
+    and spans at independent rates. Pacers that are None are skipped.
+    """
+    greenlets = [
+        gevent.spawn(pacer.drive, user, send)
+        for pacer, send in streams
+        if pacer is not None
+    ]
+    try:
+        gevent.joinall(greenlets, raise_error=True)
+    finally:
+        gevent.killall(greenlets, block=False)
+
+
+def arrival_shape(*pacers):
+    """
+    Step-ramp LoadTestShape for the given pacers, or None in closed-loop mode.
+
+    Assign the result to a module-level name in the locustfile so Locust picks
+    it up: all ARRIVAL_USERS users start immediately and the run stops when the
+    longest schedule ends (the pacers vary the rate, not the user count).
+    """
+    pacers = [pacer for pacer in pacers if pacer is not None]
+    if not pacers:
+        return None
+    duration = max(pacer.schedule.duration for pacer in pacers)
+
+    class StepArrivalShape(LoadTestShape):
+        abstract = False
+
+        def tick(self):
+            if self.get_run_time() >= duration:
+                return None
+            # fixed_count users (e.g. the freshness probe) come on top of the pacing users
+            users = ARRIVAL_USERS + sum(
+                getattr(user_class, 'fixed_count', 0) for user_class in self.runner.user_classes
+            )
+            return users, users
+
+    return StepArrivalShape
@@ -0,0 +1,116 @@
+"""
+End-to-end freshness probe: producer POST -> searchable via query-api.
+
+The write-side locustfiles only see the producer's 202, which is returned as
+soon as the batch is handed to Kafka. The probe user posts a one-span canary
+with a fresh trace_id, then polls GET /query/traces/:traceId until the span is
+returned and records the publish -> queryable time as a Locust request entry
+(type FRESHNESS), so its percentiles show up next to the load in the web UI,
+CSV and HTML reports and are aggregated on the master. The measurement covers
+Kafka, the stream-processor's bulk buffer (BULK_FLUSH_INTERVAL_MS,
+BULK_MAX_PARALLEL_FLUSHES), the Elasticsearch refresh and the query path;
+its resolution is PROBE_POLL_INTERVAL.
+
+Environment Variables:
+    FRESHNESS_PROBE: 'true' to add the probe user to the run (default: off)
+    QUERY_API_URL: Query API base URL (default: https://api.jungle-panopticon.cloud/query)
+    PROBE_USERS: Number of probe users, cluster-wide (default: 1)
+    PROBE_INTERVAL: Seconds between canaries per probe user (default: 5)
+    PROBE_POLL_INTERVAL: Seconds between lookups of one canary (default: 0.25)
+    PROBE_TIMEOUT: Seconds before a canary counts as lost (default: 60)
+"""
+
+import os
+import time
+
+import gevent
+from locust import constant_pacing, task
+
+from payload_gen import canary_span
+
+from .transport import TransportUser
+
+QUERY_API_URL = os.getenv('QUERY_API_URL', 'https://api.jungle-panopticon.cloud/query').rstrip('/')
+PROBE_USERS = int(os.getenv('PROBE_USERS', '1'))
+PROBE_INTERVAL = float(os.getenv('PROBE_INTERVAL', '5'))
+PROBE_POLL_INTERVAL = float(os.getenv('PROBE_POLL_INTERVAL', '0.25'))
+PROBE_TIMEOUT = float(os.getenv('PROBE_TIMEOUT', '60'))
+
+PROBE_SERVICE = 'freshness-probe'
+PROBE_ENVIRONMENT = 'probe'
+FRESHNESS_METRIC = 'publish→queryable (span)'
+
+
+class FreshnessProbeUser(TransportUser):
+    """Posts canary spans and measures how long until query-api returns them"""
+
+    abstract = True
+
+    wait_time = constant_pacing(PROBE_INTERVAL)
+
+    def _record(self, started, exception=None):
+        self.environment.events.request.fire(
+            request_type='FRESHNESS',
+            name=FRESHNESS_METRIC,
+            response_time=(time.time() - started) * 1000,
+            response_length=0,
+            exception=exception,
+            context={},
+        )
+
+    @task
+    def probe(self):
+        batch = canary_span(PROBE_SERVICE, PROBE_ENVIRONMENT)
+        trace_id = batch[0]['trace_id']
+        published = time.time()
+
+        with self.client.post(
+            '/dummy/traces',
+            json=batch,
+            catch_response=True,
+            name='PROBE POST /dummy/traces (canary)'
+        ) as response:
+            if response.status_code != 202:
+                response.failure(f'Expected 202, got {response.status_code}')
+                return
+            response.success()
+
+        url = f'{QUERY_API_URL}/traces/{trace_id}?service={PROBE_SERVICE}&environment={PROBE_ENVIRONMENT}'
+        deadline = published + PROBE_TIMEOUT
+        while time.time() < deadline:
+            gevent.sleep(PROBE_POLL_INTERVAL)
+            with self.client.get(
+                url,
+                catch_response=True,
+                name='PROBE GET /query/traces/:traceId'
+            ) as response:
+                if response.status_code == 200:
+                    response.success()
+                    self._record(published)
+                    return
+                if response.status_code == 404:
+                    # Not searchable yet - keep polling
+                    response.success()
+                else:
+                    response.failure(f'Expected 200/404, got {response.status_code}')
+
+        self._record(published, TimeoutError(f'Canary {trace_id} not queryable after {PROBE_TIMEOUT:g}s'))
+
+
+def freshness_probe_user(host):
+    """
+    Probe user class for `host` (the producer URL), or None unless FRESHNESS_PROBE=true.
+
+    Assign the result to a module-level name in the locustfile so Locust picks
+    it up. The probe has fixed_count = PROBE_USERS, so with --users N that
+    many of the N users become probes (the open-loop shape adds them on top).
+    """
+    if os.getenv('FRESHNESS_PROBE', 'false').lower() != 'true':
+        return None
+
+    class FreshnessProbe(FreshnessProbeUser):
+        abstract = False
+        fixed_count = PROBE_USERS
+
+    FreshnessProbe.host = host
+    return FreshnessProbe
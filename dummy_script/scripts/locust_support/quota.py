@@ -0,0 +1,248 @@
+"""
+Master-coordinated send quota for fixed-volume runs ("send exactly N batches").
+
+A module-global counter only works on a single process: with --master/--worker
+every worker counts to the full target on its own and the run overshoots by
+the number of workers. TargetQuota keeps the authoritative count on the master
+and hands out permits to workers in leases over Locust custom messages:
+
+    worker --quota_lease {want, completed}--> master
+    worker <--quota_grant {granted, exhausted}-- master
+    worker --quota_report {completed}--> master     (periodic + final)
+    worker --quota_return {returned, completed}--> master   (on test stop)
+
+A user acquires one permit per request. A successful request completes the
+permit; a failed one releases it back to the worker so it is retried, which
+makes the cluster finish at exactly `target` successful requests. Lease sizes
+shrink as the remaining volume approaches zero so the tail is spread over all
+workers instead of being parked on one. When the master has seen `target`
+completions it stops the whole run.
+
+With a standalone (non-distributed) runner the same object grants permits to
+itself, so locustfiles use one code path for every mode.
+
+Environment Variables:
+    QUOTA_LEASE_SIZE: Max permits handed to a worker per lease (default: 200)
+    QUOTA_REPORT_INTERVAL: Seconds between worker progress reports (default: 1)
+"""
+
+import os
+import time
+
+import gevent
+from locust.runners import MasterRunner, WorkerRunner
+
+LEASE_SIZE = int(os.getenv('QUOTA_LEASE_SIZE', '200'))
+REPORT_INTERVAL = float(os.getenv('QUOTA_REPORT_INTERVAL', '1'))
+
+# How long a user waits between permit checks while a lease is in flight
+PERMIT_POLL_SECONDS = 0.01
+
+
+class TargetQuota:
+    """
+    Cluster-wide request quota shared by the master and its workers.
+
+    Args:
+        target: Number of successful requests the whole run should send
+        lease_size: Max permits per lease (defaults to QUOTA_LEASE_SIZE)
+        progress_every: Call on_progress every N completions (master/standalone only)
+        on_progress: Callable receiving the cluster-wide completed count
+        name: Message prefix, so several quotas can coexist in one locustfile
+    """
+
+    def __init__(self, target, lease_size=None, progress_every=0, on_progress=None, name='quota'):
+        self.target = target
+        self.lease_size = max(1, lease_size or LEASE_SIZE)
+        self.progress_every = progress_every
+        self.on_progress = on_progress
+        self.name = name
+        self._environment = None
+        self._role = 'local'
+        self._reset()
+
+    def _reset(self):
+        # Master / standalone bookkeeping
+        self._granted = 0
+        self._completed_total = 0
+        self._started = None
+        self._finished = None
+        # Worker / standalone bookkeeping
+        self._available = 0
+        self._local_completed = 0
+        self._unreported = 0
+        self._lease_pending = False
+        self._exhausted = False
+        self._reporter = None
+
+    # ------------------------------------------------------------------ wiring
+
+    def attach(self, events):
+        """Register init/test_start/test_stop listeners on Locust's event hooks"""
+        events.init.add_listener(self._on_init)
+        events.test_start.add_listener(self._on_test_start)
+        events.test_stop.add_listener(self._on_test_stop)
+
+    def _message(self, kind):
+        return f'{self.name}_{kind}'
+
+    def _on_init(self, environment, **_kwargs):
+        self._environment = environment
+        runner = environment.runner
+        if isinstance(runner, MasterRunner):
+            self._role = 'master'
+            runner.register_message(self._message('lease'), self._on_lease)
+            runner.register_message(self._message('report'), self._on_report)
+            runner.register_message(self._message('return'), self._on_return)
+        elif isinstance(runner, WorkerRunner):
+            self._role = 'worker'
+            runner.register_message(self._message('grant'), self._on_grant)
+
+    def _on_test_start(self, environment, **_kwargs):
+        self._reset()
+        self._started = time.perf_counter()
+        if self._role == 'worker':
+            self._reporter = gevent.spawn(self._report_loop)
+
+    def _on_test_stop(self, environment, **_kwargs):
+        if self._finished is None:
+            self._finished = time.perf_counter()
+        if self._role == 'worker':
+            if self._reporter is not None:
+                self._reporter.kill(block=False)
+                self._reporter = None
+            # Hand unused permits back so another worker (or the next run) can use them
+            self._send(self._message('return'), {
+                'returned': self._available,
+                'completed': self._take_unreported(),
+            })
+            self._available = 0
+
+    # ------------------------------------------------------------ user side
+
+    def acquire(self):
+        """
+        Take one send permit, waiting while a lease is in flight.
+
+        Returns False once the cluster-wide target has been fully handed out
+        and this worker holds no more permits; the caller should stop sending.
+        """
+        while True:
+            if self._available > 0:
+                self._available -= 1
+                if self._available <= self.lease_size // 2:
+                    self._request_lease()
+                return True
+            if self._exhausted:
+                return False
+            self._request_lease()
+            if self._available == 0:
+                gevent.sleep(PERMIT_POLL_SECONDS)
+
+    def complete(self):
+        """Mark an acquired permit as successfully sent"""
+        self._local_completed += 1
+        if self._role == 'local':
+            self._record_completed(1)
+        else:
+            self._unreported += 1
+            if self._available == 0 and self._exhausted:
+                # Last permits of the run: report immediately so the master can stop
+                self._flush_report()
+
+    def release(self):
+        """Give back an acquired permit after a failed send so it is retried"""
+        self._available += 1
+
+    @property
+    def completed(self):
+        """Completed requests: cluster-wide on the master/standalone, own share on a worker"""
+        if self._role == 'worker':
+            return self._local_completed
+        return self._completed_total
+
+    @property
+    def elapsed(self):
+        """Seconds from test start until the target was reached (or the test stopped)"""
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    # ---------------------------------------------------------- worker side
+
+    def _send(self, kind, data):
+        try:
+            self._environment.runner.send_message(kind, data)
+        except Exception as e:
+            print(f"⚠️  Quota message '{kind}' failed: {e}")
+
+    def _take_unreported(self):
+        unreported, self._unreported = self._unreported, 0
+        return unreported
+
+    def _request_lease(self):
+        if self._lease_pending or self._exhausted:
+            return
+        if self._role == 'local':
+            granted = self._grant(self.lease_size, workers=1)
+            self._available += granted
+            self._exhausted = granted == 0
+            return
+        self._lease_pending = True
+        self._send(self._message('lease'), {
+            'want': self.lease_size,
+            'completed': self._take_unreported(),
+        })
+
+    def _on_grant(self, environment, msg, **_kwargs):
+        self._available += msg.data['granted']
+        self._exhausted = msg.data['exhausted']
+        self._lease_pending = False
+
+    def _flush_report(self):
+        unreported = self._take_unreported()
+        if unreported:
+            self._send(self._message('report'), {'completed': unreported})
+
+    def _report_loop(self):
+        while True:
+            gevent.sleep(REPORT_INTERVAL)
+            self._flush_report()
+
+    # ---------------------------------------------------------- master side
+
+    def _grant(self, want, workers):
+        remaining = self.target - self._granted
+        # Smaller leases near the end keep every worker busy until the last permit
+        granted = max(0, min(want, remaining, max(1, remaining // (2 * max(1, workers)))))
+        self._granted += granted
+        return granted
+
+    def _on_lease(self, environment, msg, **_kwargs):
+        self._record_completed(msg.data.get('completed', 0))
+        granted = self._grant(msg.data['want'], workers=environment.runner.worker_count)
+        environment.runner.send_message(
+            self._message('grant'),
+            {'granted': granted, 'exhausted': self._granted >= self.target},
+            client_id=msg.node_id,
+        )
+
+    def _on_report(self, environment, msg, **_kwargs):
+        self._record_completed(msg.data['completed'])
+
+    def _on_return(self, environment, msg, **_kwargs):
+        self._granted -= msg.data['returned']
+        self._record_completed(msg.data['completed'])
+
+    def _record_completed(self, count):
+        if count <= 0:
+            return
+        before = self._completed_total
+        self._completed_total += count
+        if self.progress_every and self.on_progress is not None:
+            if self._completed_total // self.progress_every > before // self.progress_every:
+                self.on_progress(self._completed_total)
+        if before < self.target <= self._completed_total:
+            self._finished = time.perf_counter()
+            # Stop from a fresh greenlet: quit() kills the user/receiver greenlet calling us
+            gevent.spawn(self._environment.runner.quit)
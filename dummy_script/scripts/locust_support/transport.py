@@ -0,0 +1,117 @@
+"""
+HTTP transport switch for the Locust load generators.
+
+Every locustfile's user class inherits from TransportUser, which resolves at
+import time to either Locust's requests-based HttpUser or a FastHttpUser
+(geventhttpclient) with keep-alive pool sizes tuned for fire-and-forget batch
+posting. Both clients accept the same post(..., json=/data=/headers=,
+catch_response=True, name=...) calls, so task code does not change.
+
+CoreThroughputMeter reports what the chosen transport achieved on each worker
+process: requests per wall-clock second and requests per CPU second. A Locust
+worker runs on a single core (gevent), so the CPU-second figure is the
+requests/sec one worker core can sustain -- divide the target RPS by it to size
+the distributed setup.
+
+Environment Variables:
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser)
+    LOCUST_FAST_CONCURRENCY: Keep-alive connections per simulated user
+                             (default: 1, or ARRIVAL_MAX_IN_FLIGHT in open-loop mode)
+    LOCUST_FAST_CONNECTION_TIMEOUT: Connect timeout in seconds (default: 60)
+    LOCUST_FAST_NETWORK_TIMEOUT: Read/write timeout in seconds (default: 60)
+"""
+
+import os
+import time
+
+from locust import HttpUser
+from locust.contrib.fasthttp import FastHttpUser
+from locust.runners import MasterRunner
+
+from .arrival import ARRIVAL_MAX_IN_FLIGHT
+
+TRANSPORTS = ('requests', 'fast')
+
+# Request types fired by locust_support itself rather than by an HTTP client
+SYNTHETIC_REQUEST_TYPES = ('ARRIVAL', 'FRESHNESS')
+
+OPEN_LOOP = any(os.getenv(name) for name in ('SPAN_ARRIVAL_STAGES', 'LOG_ARRIVAL_STAGES'))
+
+LOCUST_TRANSPORT = os.getenv('LOCUST_TRANSPORT', 'requests').lower()
+if LOCUST_TRANSPORT not in TRANSPORTS:
+    raise ValueError(f"LOCUST_TRANSPORT must be one of {TRANSPORTS}, got '{LOCUST_TRANSPORT}'")
+
+
+class TunedFastHttpUser(FastHttpUser):
+    """
+    FastHttpUser tuned for batch posting.
+
+    Each closed-loop user sends one request at a time, so a single keep-alive
+    connection per user is enough; the default pool of 10 only adds sockets
+    on the producer's load balancer without adding throughput. Open-loop users
+    (see arrival.py) keep up to ARRIVAL_MAX_IN_FLIGHT requests outstanding and
+    need a connection for each, otherwise sends queue inside the client.
+    """
+
+    abstract = True
+
+    concurrency = int(os.getenv('LOCUST_FAST_CONCURRENCY', '0')) or (
+        ARRIVAL_MAX_IN_FLIGHT if OPEN_LOOP else 1
+    )
+    connection_timeout = float(os.getenv('LOCUST_FAST_CONNECTION_TIMEOUT', '60'))
+    network_timeout = float(os.getenv('LOCUST_FAST_NETWORK_TIMEOUT', '60'))
+
+
+TransportUser = TunedFastHttpUser if LOCUST_TRANSPORT == 'fast' else HttpUser
+
+
+def describe_transport():
+    """Human-readable description of the active transport"""
+    if LOCUST_TRANSPORT == 'fast':
+        return (f"fast (FastHttpUser, {TunedFastHttpUser.concurrency} keep-alive "
+                f"connection(s) per user)")
+    return 'requests (HttpUser)'
+
+
+class CoreThroughputMeter:
+    """Counts requests on this worker process and reports requests/sec per core"""
+
+    def __init__(self):
+        self.requests = 0
+        self._wall_started = None
+        self._cpu_started = None
+
+    def attach(self, events):
+        """Register test_start/request/test_stop listeners on Locust's event hooks"""
+        events.test_start.add_listener(self._on_test_start)
+        events.request.add_listener(self._on_request)
+        events.test_stop.add_listener(self._on_test_stop)
+
+    def _on_test_start(self, environment, **_kwargs):
+        self.requests = 0
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    def _on_request(self, request_type=None, **_kwargs):
+        # Synthetic entries (dropped open-loop arrivals, freshness timings) never hit the wire
+        if request_type not in SYNTHETIC_REQUEST_TYPES:
+            self.requests += 1
+
+    def _on_test_stop(self, environment, **_kwargs):
+        if isinstance(environment.runner, MasterRunner) or self._wall_started is None:
+            return
+
+        wall = time.perf_counter() - self._wall_started
+        cpu = time.process_time() - self._cpu_started
+        print("\n" + "-"*80)
+        print(f"⚙️  Transport: {describe_transport()}")
+        print(f"Requests on this worker: {self.requests:,}")
+        if wall > 0:
+            print(f"Requests/sec (wall clock): {self.requests / wall:,.1f}")
+        if cpu > 0:
+            print(f"Requests/sec per worker core: {self.requests / cpu:,.1f} "
+                  f"(CPU {cpu:.1f}s over {wall:.1f}s, {cpu / wall * 100 if wall else 0:.0f}% busy)")
+        print("-"*80 + "\n")
+
+
+core_throughput = CoreThroughputMeter()
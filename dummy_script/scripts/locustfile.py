@@ -12,16 +12,29 @@ Usage:
     locust -f scripts/locustfile.py --host https://api.jungle-panopticon.cloud/producer \
            --users 10 --spawn-rate 10 --headless
 
+    # Max-throughput: pre-serialized ring of 256 bodies, gzip-compressed
+    PAYLOAD_POOL_SIZE=256 PAYLOAD_POOL_GZIP=true locust -f scripts/locustfile.py ...
+
+    # Distributed: the 1M target is shared by all workers (master leases send permits)
+    locust -f scripts/locustfile.py --master --expect-workers 4 ...
+    locust -f scripts/locustfile.py --worker --master-host <master-ip>
+
 Environment Variables:
     PRODUCER_URL: Override target server URL (default: https://api.jungle-panopticon.cloud/producer)
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser, keep-alive pool)
+    PAYLOAD_POOL_SIZE: Pre-encode N request bodies per worker and patch IDs/timestamps per send (0 = off)
+    PAYLOAD_POOL_GZIP: 'true' to post gzip-compressed pooled bodies
+    QUOTA_LEASE_SIZE: Max batches leased to a worker at a time in distributed mode (default: 200)
 """
 
-import random
 import os
-from datetime import datetime, timezone
-from locust import HttpUser, task, between, events
+from locust import task, between, events
+from locust.exception import StopUser
 from locust.runners import MasterRunner, WorkerRunner
 
+from locust_support import TargetQuota, TransportUser, core_throughput
+from payload_gen import pool_from_env, simple_logs
+
 
 # Configuration
 PRODUCER_URL = os.getenv('PRODUCER_URL', 'https://api.jungle-panopticon.cloud/producer')
@@ -29,41 +42,30 @@ PRODUCER_URL = os.getenv('PRODUCER_URL', 'https://api.jungle-panopticon.cloud/pr
 # Target: ~1,000,000 logs (sent in batches of 15)
 BATCH_SIZE = 100
 TARGET_BATCHES = 35000  # 66,667 batches × 15 = 1,000,005 logs
-current_batch_count = 0
 
 
-def generate_trace_id():
-    """Generate a random 32-character hex trace ID"""
-    return ''.join(random.choices('0123456789abcdef', k=32))
+def print_progress(completed):
+    """Print cluster-wide progress (called on the master / standalone runner)"""
+    total_logs = completed * BATCH_SIZE
+    target_logs = TARGET_BATCHES * BATCH_SIZE
+    progress = (completed / TARGET_BATCHES * 100)
+    print(f"Progress: {completed:,} batches ({total_logs:,} logs / ~{target_logs:,}) - {progress:.1f}%")
+
 
+# Cluster-wide batch counter: the master leases send permits to workers, so the
+# run stops at exactly TARGET_BATCHES successful batches however many workers join
+batch_quota = TargetQuota(TARGET_BATCHES, progress_every=3000, on_progress=print_progress)
+batch_quota.attach(events)
 
-def generate_span_id():
-    """Generate a random 16-character hex span ID"""
-    return ''.join(random.choices('0123456789abcdef', k=16))
+# Pre-serialized body ring (built per worker in on_test_start when PAYLOAD_POOL_SIZE > 0)
+payload_pool = None
 
 
-def generate_log_data():
-    """Generate a simple log entry matching the producer's expected format"""
-    return {
-        'type': 'log',
-        'timestamp': datetime.now(timezone.utc).isoformat(),
-        'service_name': 'sample-service',
-        'environment': 'prod',
-        'level': 'INFO',
-        'message': '샘플 APM 로그 이벤트',
-        'trace_id': generate_trace_id(),
-        'span_id': generate_span_id(),
-        'http_method': 'GET',
-        'http_path': '/api/sample',
-        'http_status_code': 200,
-        'labels': {
-            'feature': 'sample',
-            'host': 'local',
-        }
-    }
+# Requests/sec per worker core for the selected transport (printed on test stop)
+core_throughput.attach(events)
 
 
-class ProducerLoadTest(HttpUser):
+class ProducerLoadTest(TransportUser):
     """
     Sends logs to the producer server continuously.
 
@@ -81,26 +83,29 @@ class ProducerLoadTest(HttpUser):
     @task
     def send_batch_logs(self):
         """Send a batch of 15 logs to /dummy/logs endpoint"""
-        global current_batch_count
+        # Every batch of the target has been handed out; the master stops the run
+        if not batch_quota.acquire():
+            raise StopUser()
 
-        # Check if we've reached the target batches
-        if current_batch_count >= TARGET_BATCHES:
-            self.environment.runner.quit()
-            return
-
-        # Generate batch of 15 logs
-        batch_data = [generate_log_data() for _ in range(BATCH_SIZE)]
+        if payload_pool is not None:
+            # Pooled mode: post pre-encoded bytes with fresh IDs/timestamps
+            request_kwargs = {'data': payload_pool.next_body(), 'headers': payload_pool.headers}
+        else:
+            # Generate the whole batch in one call (bulk IDs, shared timestamp)
+            request_kwargs = {'json': simple_logs(BATCH_SIZE)}
 
         with self.client.post(
             '/dummy/logs',
-            json=batch_data,
+            **request_kwargs,
             catch_response=True,
             name=f'POST /dummy/logs (batch of {BATCH_SIZE})'
         ) as response:
             if response.status_code == 202:
-                current_batch_count += 1
+                batch_quota.complete()
                 response.success()
             else:
+                # Failed batches do not count towards the target and are retried
+                batch_quota.release()
                 response.failure(f'Expected 202, got {response.status_code}')
 
 
@@ -109,8 +114,8 @@ class ProducerLoadTest(HttpUser):
 def on_test_start(environment, **kwargs):
     """Print test configuration when test starts"""
     if not isinstance(environment.runner, MasterRunner):
-        global current_batch_count
-        current_batch_count = 0
+        global payload_pool
+        payload_pool = pool_from_env(lambda: simple_logs(BATCH_SIZE))
 
         total_logs = TARGET_BATCHES * BATCH_SIZE
         print("\n" + "="*80)
@@ -122,39 +127,39 @@ def on_test_start(environment, **kwargs):
         print(f"Target Batches: {TARGET_BATCHES:,}")
         print(f"Total Logs: ~{total_logs:,} logs")
         print(f"Payload: Simple fixed format (trace_id/span_id randomized)")
+        if payload_pool is not None:
+            print(f"Payload Pool: {len(payload_pool)} pre-encoded bodies"
+                  f"{' (gzip)' if payload_pool.compress else ''}")
         print(f"\nTest will automatically stop when target is reached.")
         print("="*80 + "\n")
 
 
-@events.request.add_listener
-def on_request(request_type, name, response_time, response_length, exception, context, **kwargs):
-    """Track progress every 3,000 batches"""
-    global current_batch_count
-
-    if current_batch_count % 3000 == 0 and current_batch_count > 0:
-        total_logs = current_batch_count * BATCH_SIZE
-        target_logs = TARGET_BATCHES * BATCH_SIZE
-        progress = (current_batch_count / TARGET_BATCHES * 100)
-        print(f"Progress: {current_batch_count:,} batches ({total_logs:,} logs / ~{target_logs:,}) - {progress:.1f}%")
-
-
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
-    """Print summary when test stops"""
-    if not isinstance(environment.runner, MasterRunner):
-        stats = environment.stats.total
-        total_requests = stats.num_requests
-        total_logs = current_batch_count * BATCH_SIZE
-
-        print("\n" + "="*80)
-        print("✅ Locust Load Test Completed")
-        print("="*80)
-        print(f"Total Batches Sent: {current_batch_count:,}")
-        print(f"Total Logs Sent: ~{total_logs:,}")
-        print(f"Total HTTP Requests: {total_requests:,}")
-        print(f"\nTotal Failures: {stats.num_failures:,}")
-        print(f"Average Response Time: {stats.avg_response_time:.2f}ms")
-        print("\nDetailed metrics available in:")
-        print("  - Locust web UI: http://localhost:8089")
-        print("  - HTML report (if --html flag was used)")
-        print("="*80 + "\n")
+    """Print summary when test stops (cluster-wide on the master / standalone runner)"""
+    if isinstance(environment.runner, WorkerRunner):
+        print(f"\nThis worker's share: {batch_quota.completed:,} batches "
+              f"(~{batch_quota.completed * BATCH_SIZE:,} logs) - cluster totals are on the master\n")
+        return
+
+    stats = environment.stats.total
+    total_requests = stats.num_requests
+    total_batches = batch_quota.completed
+    total_logs = total_batches * BATCH_SIZE
+    elapsed = batch_quota.elapsed
+
+    print("\n" + "="*80)
+    print("✅ Locust Load Test Completed")
+    print("="*80)
+    print(f"Total Batches Sent: {total_batches:,} / {TARGET_BATCHES:,}")
+    print(f"Total Logs Sent: ~{total_logs:,}")
+    print(f"Total HTTP Requests: {total_requests:,}")
+    print(f"\nTotal Failures: {stats.num_failures:,}")
+    print(f"Average Response Time: {stats.avg_response_time:.2f}ms")
+    if elapsed > 0:
+        print(f"Elapsed: {elapsed:.1f}s - {total_batches / elapsed:,.1f} batches/sec "
+              f"(≈ {total_logs / elapsed:,.0f} logs/sec)")
+    print("\nDetailed metrics available in:")
+    print("  - Locust web UI: http://localhost:8089")
+    print("  - HTML report (if --html flag was used)")
+    print("="*80 + "\n")
@@ -0,0 +1,246 @@
+"""
+Locust Read-Path Load Test for Query API - Dashboard Sessions
+
+Goal: Replay realistic dashboard sessions against query-api while the write
+      side is loaded, and measure p95 of the read paths with and without cache
+
+Session (one pass per simulated user, then think time and a new session):
+    1. Overview            GET /services
+    2. Service metrics     GET /services/:serviceName/metrics over 15m, 1h, 24h
+    3. Endpoint ranking    GET /services/:serviceName/endpoints
+    4. Endpoint drilldown  GET /services/:serviceName/endpoints/:endpointName/traces
+    5. Trace lookup        GET /traces/:traceId
+    6. Span / log search   GET /spans, GET /logs
+
+Cache-hit ratio:
+    ServiceMetricsService only caches sliding windows (no from/to) in Redis, and
+    the rollup cache keys on the requested window. A CACHE_HIT_RATIO share of the
+    metric requests therefore use the shared form every dashboard sends (sliding
+    15m window, 1h/24h ranges aligned to the minute) and the rest use ranges
+    jittered to the millisecond, which no other request shares. Both kinds are
+    reported under separate names ([shared] / [unique]), so the two p95 columns
+    compare the cached and uncached paths directly; run once with REDIS_HOST
+    unset on query-api to get the no-Redis baseline.
+
+Usage:
+    # Web UI
+    locust -f scripts/locustfile_dashboard.py --host https://api.jungle-panopticon.cloud/query
+
+    # 50 concurrent dashboard users for 10 minutes, 50% cache-friendly requests
+    CACHE_HIT_RATIO=0.5 locust -f scripts/locustfile_dashboard.py --users 50 --spawn-rate 5 \
+           --run-time 10m --headless
+
+Environment Variables:
+    QUERY_API_URL: Override target server URL (default: https://api.jungle-panopticon.cloud/query)
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser, keep-alive pool)
+    CACHE_HIT_RATIO: Share of metric requests using shared (cacheable) windows (default: 0.8)
+    DASHBOARD_ENVIRONMENT: Environment filter sent with every request (default: none)
+"""
+
+import os
+import random
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote, urlencode
+
+from locust import SequentialTaskSet, between, events, task
+from locust.runners import MasterRunner
+
+from locust_support import TransportUser, core_throughput
+from payload_gen.catalog import SERVICES
+
+
+# Configuration
+QUERY_API_URL = os.getenv('QUERY_API_URL', 'https://api.jungle-panopticon.cloud/query')
+CACHE_HIT_RATIO = float(os.getenv('CACHE_HIT_RATIO', '0.8'))
+DASHBOARD_ENVIRONMENT = os.getenv('DASHBOARD_ENVIRONMENT') or None
+
+# Metric windows a dashboard user flips through: (label, seconds, alignment of shared ranges)
+METRIC_WINDOWS = [
+    ('15m', 15 * 60, 10),
+    ('1h', 60 * 60, 60),
+    ('24h', 24 * 60 * 60, 60),
+]
+METRICS = ['http_requests_total', 'latency_p95_ms', 'error_rate']
+ENDPOINT_RANKINGS = ['request_count', 'latency_p95_ms', 'error_rate']
+
+
+def iso_utc(epoch):
+    """Epoch seconds -> ISO8601 with milliseconds (what the dashboard sends)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def time_range(seconds, align, shared):
+    """
+    from/to for the last `seconds`.
+
+    Shared ranges end on an `align`-second boundary so concurrent dashboards
+    send identical parameters; unique ranges are jittered to the millisecond.
+    """
+    now = time.time()
+    if shared:
+        end = now - now % align
+    else:
+        end = now - random.uniform(0, 1)
+    return {'from': iso_utc(end - seconds), 'to': iso_utc(end)}
+
+
+class DashboardSession(SequentialTaskSet):
+    """One dashboard visit: overview -> metrics -> endpoints -> drilldown -> trace -> search"""
+
+    def on_start(self):
+        self.service = None
+        self.endpoint = None
+        self.trace_id = None
+
+    def params(self, **extra):
+        params = {key: value for key, value in extra.items() if value is not None}
+        if DASHBOARD_ENVIRONMENT:
+            params['environment'] = DASHBOARD_ENVIRONMENT
+        return params
+
+    def get_json(self, path, name, params=None):
+        """GET and return the decoded body, or None on failure / empty result"""
+        # Query string built here so requests and FastHttpUser clients send identical URLs
+        url = f'{path}?{urlencode(params)}' if params else path
+        with self.client.get(url, catch_response=True, name=name) as response:
+            if response.status_code == 200:
+                try:
+                    body = response.json()
+                except ValueError:
+                    response.failure('Invalid JSON body')
+                    return None
+                response.success()
+                return body
+            if response.status_code == 404:
+                # Nothing matched (e.g. no traces for the endpoint yet) - not a server failure
+                response.success()
+                return None
+            response.failure(f'Expected 200, got {response.status_code}')
+            return None
+
+    @task
+    def overview(self):
+        body = self.get_json(
+            '/services',
+            name='GET /services',
+            params=self.params(sort_by='request_count', limit=20),
+        )
+        services = [item['service_name'] for item in (body or {}).get('services', [])]
+        self.service = random.choice(services or SERVICES)
+
+    @task
+    def service_metrics(self):
+        service = quote(self.service, safe='')
+        for label, seconds, align in METRIC_WINDOWS:
+            shared = random.random() < CACHE_HIT_RATIO
+            if label == '15m' and shared:
+                # Sliding window: the only form ServiceMetricsService caches in Redis
+                window = {}
+            else:
+                window = time_range(seconds, align, shared)
+            self.get_json(
+                f'/services/{service}/metrics',
+                name=f"GET /services/:serviceName/metrics {label} [{'shared' if shared else 'unique'}]",
+                params=self.params(metric=random.choice(METRICS), **window),
+            )
+
+    @task
+    def endpoint_ranking(self):
+        body = self.get_json(
+            f'/services/{quote(self.service, safe="")}/endpoints',
+            name='GET /services/:serviceName/endpoints',
+            params=self.params(metric=random.choice(ENDPOINT_RANKINGS), limit=10),
+        )
+        endpoints = [item['endpoint_name'] for item in (body or {}).get('endpoints', [])]
+        self.endpoint = random.choice(endpoints) if endpoints else None
+
+    @task
+    def endpoint_drilldown(self):
+        if self.endpoint is None:
+            return
+        body = self.get_json(
+            f'/services/{quote(self.service, safe="")}/endpoints/{quote(self.endpoint, safe="")}/traces',
+            name='GET /services/:serviceName/endpoints/:endpointName/traces',
+            params=self.params(status=random.choice(['ERROR', 'SLOW']), limit=20),
+        )
+        # This route returns a bare array of camelCase items
+        trace_ids = [item['traceId'] for item in (body or [])]
+        self.trace_id = random.choice(trace_ids) if trace_ids else None
+
+    @task
+    def trace_lookup(self):
+        if self.trace_id is None:
+            return
+        self.get_json(f'/traces/{self.trace_id}', name='GET /traces/:traceId')
+
+    @task
+    def search(self):
+        self.get_json(
+            '/spans',
+            name='GET /spans',
+            params=self.params(service_name=self.service, size=50, sort='start_time_desc'),
+        )
+        self.get_json(
+            '/logs',
+            name='GET /logs',
+            params=self.params(service_name=self.service, level='ERROR', size=50),
+        )
+
+    @task
+    def end_session(self):
+        self.interrupt(reschedule=False)
+
+
+# Requests/sec per worker core for the selected transport (printed on test stop)
+core_throughput.attach(events)
+
+
+class DashboardUser(TransportUser):
+    """
+    Simulates an engineer clicking through the APM dashboard.
+
+    Think time between pages mirrors a person reading charts.
+    """
+
+    wait_time = between(1, 5)
+
+    host = QUERY_API_URL
+
+    tasks = [DashboardSession]
+
+
+# Event handlers for test lifecycle
+@events.test_start.add_listener
+def on_test_start(environment, **_kwargs):
+    """Print test configuration when test starts"""
+    if not isinstance(environment.runner, MasterRunner):
+        print("\n" + "="*80)
+        print("🚀 Locust Query API Dashboard Test Starting")
+        print("="*80)
+        print(f"Target Server: {QUERY_API_URL}")
+        print(f"Environment Filter: {DASHBOARD_ENVIRONMENT or 'none'}")
+        print(f"Cache-hit Ratio (shared metric windows): {CACHE_HIT_RATIO * 100:.0f}%")
+        print(f"\nSession: overview → metrics (15m/1h/24h) → endpoints → drilldown → trace → search")
+        print(f"\nCompare '[shared]' vs '[unique]' rows for cached vs uncached metric latency.")
+        print("="*80 + "\n")
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **_kwargs):
+    """Print summary when test stops"""
+    if not isinstance(environment.runner, MasterRunner):
+        stats = environment.stats
+
+        print("\n" + "="*80)
+        print("✅ Locust Query API Dashboard Test Completed")
+        print("="*80)
+        print(f"Total HTTP Requests: {stats.total.num_requests:,}")
+        print(f"Total Failures: {stats.total.num_failures:,}")
+        print(f"\n{'Request':<72} {'p50':>7} {'p95':>7}")
+        for entry in sorted(stats.entries.values(), key=lambda e: e.name):
+            if entry.num_requests:
+                print(f"{entry.name:<72} {entry.get_response_time_percentile(0.5):>7.0f} "
+                      f"{entry.get_response_time_percentile(0.95):>7.0f}")
+        print("\nDetailed metrics available in Locust web UI or HTML report")
+        print("="*80 + "\n")
@@ -11,15 +11,34 @@ Usage:
     locust -f scripts/locustfile_traces.py --host https://api.jungle-panopticon.cloud/producer \
            --users 10 --spawn-rate 10 --headless
 
+    # Max-throughput: pre-serialized ring of 256 bodies, gzip-compressed
+    PAYLOAD_POOL_SIZE=256 PAYLOAD_POOL_GZIP=true locust -f scripts/locustfile_traces.py ...
+
+    # Distributed: the 10M target is shared by all workers (master leases send permits)
+    locust -f scripts/locustfile_traces.py --master --expect-workers 4 ...
+    locust -f scripts/locustfile_traces.py --worker --master-host <master-ip>
+
 Environment Variables:
     PRODUCER_URL: Override target server URL (default: https://api.jungle-panopticon.cloud/producer)
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser, keep-alive pool)
+    FRESHNESS_PROBE: 'true' to add a probe user measuring publish→queryable latency via QUERY_API_URL
+    PAYLOAD_POOL_SIZE: Pre-encode N request bodies per worker and patch IDs/timestamps per send (0 = off)
+    PAYLOAD_POOL_GZIP: 'true' to post gzip-compressed pooled bodies
+    QUOTA_LEASE_SIZE: Max requests leased to a worker at a time in distributed mode (default: 200)
 """
 
-import random
 import os
-from datetime import datetime, timezone, timedelta
-from locust import HttpUser, task, between, events
-from locust.runners import MasterRunner
+from locust import task, between, events
+from locust.exception import StopUser
+from locust.runners import MasterRunner, WorkerRunner
+
+from locust_support import (
+    TargetQuota,
+    TransportUser,
+    core_throughput,
+    freshness_probe_user,
+)
+from payload_gen import pool_from_env, three_span_chains
 
 
 # Configuration
@@ -30,153 +49,33 @@ PRODUCER_URL = os.getenv('PRODUCER_URL', 'https://api.jungle-panopticon.cloud/pr
 # Goal: Send 10M spans for performance testing
 SPANS_PER_REQUEST = 40
 TARGET_REQUESTS = 250000  # 250,000 requests × 40 spans = 10,000,000 spans
-current_request_count = 0
 
 
-def generate_trace_id():
-    """Generate a random 32-character hex trace ID"""
-    return ''.join(random.choices('0123456789abcdef', k=32))
+def print_progress(completed):
+    """Print cluster-wide progress (called on the master / standalone runner)"""
+    total_spans = completed * SPANS_PER_REQUEST
+    target_spans = TARGET_REQUESTS * SPANS_PER_REQUEST
+    progress = (completed / TARGET_REQUESTS * 100)
+    print(f"Progress: {completed:,} requests ({total_spans:,} spans / ~{target_spans:,}) - {progress:.1f}%")
 
 
-def generate_span_id():
-    """Generate a random 16-character hex span ID"""
-    return ''.join(random.choices('0123456789abcdef', k=16))
+# Cluster-wide request counter: the master leases send permits to workers, so the
+# run stops at exactly TARGET_REQUESTS successful requests however many workers join
+request_quota = TargetQuota(TARGET_REQUESTS, progress_every=5000, on_progress=print_progress)
+request_quota.attach(events)
 
+# Pre-serialized body ring (built per worker in on_test_start when PAYLOAD_POOL_SIZE > 0)
+payload_pool = None
 
-def generate_single_trace_chain():
-    """
-    Generate a single chain of 3 connected spans sharing the same trace_id.
-
-    Structure:
-    - Root span (parent_span_id: null)
-      - Child span 1 (parent_span_id: root)
-        - Child span 2 (parent_span_id: child1)
-
-    All spans:
-    - kind: SERVER
-    - duration_ms: random 0-1000ms
-    - status: OK or ERROR
-    - service_name: same for all spans in a trace
-    - trace_id: unified across all 3 spans
-    """
-    # Shared trace ID for all spans
-    trace_id = generate_trace_id()
-
-    # Generate span IDs
-    root_span_id = generate_span_id()
-    child1_span_id = generate_span_id()
-    child2_span_id = generate_span_id()
-
-    # Shared service name for this trace
-    service_name = "demo-service"
-
-    # Base timestamp
-    base_time = datetime.now(timezone.utc) - timedelta(milliseconds=random.randint(0, 1000))
-
-    spans = []
-
-    # Root Span
-    root_duration = random.uniform(0, 1000)
-    root_status = random.choice(['OK', 'ERROR'])
-
-    root_span = {
-        'type': 'span',
-        'timestamp': base_time.isoformat(),
-        'service_name': service_name,
-        'environment': 'production',
-        'trace_id': trace_id,
-        'span_id': root_span_id,
-        'parent_span_id': None,
-        'name': f'GET /api/endpoint-{random.randint(1, 100)}',
-        'kind': 'SERVER',
-        'duration_ms': round(root_duration, 2),
-        'status': root_status,
-        'http_method': 'GET',
-        'http_path': f'/api/endpoint-{random.randint(1, 100)}',
-        'http_status_code': 200 if root_status == 'OK' else 500,
-        'labels': {
-            'component': 'api'
-        }
-    }
-    spans.append(root_span)
-
-    # Child Span 1
-    child1_start = base_time + timedelta(milliseconds=random.uniform(1, 10))
-    child1_duration = random.uniform(0, min(root_duration * 0.8, 1000))
-    child1_status = random.choice(['OK', 'ERROR'])
-
-    child1_span = {
-        'type': 'span',
-        'timestamp': child1_start.isoformat(),
-        'service_name': service_name,
-        'environment': 'production',
-        'trace_id': trace_id,
-        'span_id': child1_span_id,
-        'parent_span_id': root_span_id,
-        'name': f'process-request-{random.randint(1, 50)}',
-        'kind': 'SERVER',
-        'duration_ms': round(child1_duration, 2),
-        'status': child1_status,
-        'http_method': 'POST',
-        'http_path': f'/internal/process-{random.randint(1, 50)}',
-        'http_status_code': 200 if child1_status == 'OK' else 500,
-        'labels': {
-            'component': 'processor'
-        }
-    }
-    spans.append(child1_span)
-
-    # Child Span 2 (grandchild of root)
-    child2_start = child1_start + timedelta(milliseconds=random.uniform(1, 5))
-    child2_duration = random.uniform(0, min(child1_duration * 0.6, 1000))
-    child2_status = random.choice(['OK', 'ERROR'])
-
-    child2_span = {
-        'type': 'span',
-        'timestamp': child2_start.isoformat(),
-        'service_name': service_name,
-        'environment': 'production',
-        'trace_id': trace_id,
-        'span_id': child2_span_id,
-        'parent_span_id': child1_span_id,
-        'name': f'database-query-{random.randint(1, 20)}',
-        'kind': 'SERVER',
-        'duration_ms': round(child2_duration, 2),
-        'status': child2_status,
-        'http_method': 'GET',
-        'http_path': f'/db/query-{random.randint(1, 20)}',
-        'http_status_code': 200 if child2_status == 'OK' else 500,
-        'labels': {
-            'component': 'database'
-        }
-    }
-    spans.append(child2_span)
-
-    return spans
-
-
-def generate_batch_spans():
-    """
-    Generate a batch of 40 spans (13-14 trace chains).
-
-    Returns a flat list of 40 spans from multiple independent traces.
-    Each trace maintains its own trace_id and parent-child relationships.
-    """
-    all_spans = []
-
-    # Generate 13 complete trace chains (13 × 3 = 39 spans)
-    for _ in range(13):
-        trace_chain = generate_single_trace_chain()
-        all_spans.extend(trace_chain)
 
-    # Generate 1 more span from a partial trace chain (to reach 40 total)
-    partial_trace = generate_single_trace_chain()
-    all_spans.extend(partial_trace[:1])  # Take only first 1 span
+# Requests/sec per worker core for the selected transport (printed on test stop)
+core_throughput.attach(events)
 
-    return all_spans
+# Publish -> queryable latency probe (FRESHNESS_PROBE=true), reported as a FRESHNESS entry
+FreshnessProbe = freshness_probe_user(PRODUCER_URL)
 
 
-class TracesLoadTest(HttpUser):
+class TracesLoadTest(TransportUser):
     """
     Sends batches of trace spans to the producer server continuously.
 
@@ -193,26 +92,29 @@ class TracesLoadTest(HttpUser):
     @task
     def send_batch_spans(self):
         """Send a batch of 40 spans (multiple trace chains) to /dummy/traces endpoint"""
-        global current_request_count
+        # Every request of the target has been handed out; the master stops the run
+        if not request_quota.acquire():
+            raise StopUser()
 
-        # Check if we've reached the target requests
-        if current_request_count >= TARGET_REQUESTS:
-            self.environment.runner.quit()
-            return
-
-        # Generate a batch of 40 spans from multiple trace chains
-        batch_spans = generate_batch_spans()
+        if payload_pool is not None:
+            # Pooled mode: post pre-encoded bytes with fresh IDs/timestamps
+            request_kwargs = {'data': payload_pool.next_body(), 'headers': payload_pool.headers}
+        else:
+            # Generate a batch of 40 spans (13 full Root → Child1 → Child2 chains + 1 root)
+            request_kwargs = {'json': three_span_chains(SPANS_PER_REQUEST)}
 
         with self.client.post(
             '/dummy/traces',
-            json=batch_spans,
+            **request_kwargs,
             catch_response=True,
             name=f'POST /dummy/traces (batch of {SPANS_PER_REQUEST})'
         ) as response:
             if response.status_code == 202:
-                current_request_count += 1
+                request_quota.complete()
                 response.success()
             else:
+                # Failed requests do not count towards the target and are retried
+                request_quota.release()
                 response.failure(f'Expected 202, got {response.status_code}')
 
 
@@ -221,8 +123,8 @@ class TracesLoadTest(HttpUser):
 def on_test_start(environment, **kwargs):
     """Print test configuration when test starts"""
     if not isinstance(environment.runner, MasterRunner):
-        global current_request_count
-        current_request_count = 0
+        global payload_pool
+        payload_pool = pool_from_env(lambda: three_span_chains(SPANS_PER_REQUEST))
 
         total_spans = TARGET_REQUESTS * SPANS_PER_REQUEST
         print("\n" + "="*80)
@@ -243,42 +145,39 @@ def on_test_start(environment, **kwargs):
         print(f"  - duration_ms: 0-1000 (random)")
         print(f"  - status: OK or ERROR (random)")
         print(f"  - service_name: backend-service (unified)")
+        if payload_pool is not None:
+            print(f"\nPayload Pool: {len(payload_pool)} pre-encoded bodies"
+                  f"{' (gzip)' if payload_pool.compress else ''}")
         print(f"\nTest will automatically stop when target is reached.")
         print("="*80 + "\n")
 
 
-@events.request.add_listener
-def on_request(request_type, name, response_time, response_length, exception, context, **kwargs):
-    """Track progress every 5,000 requests"""
-    global current_request_count
-
-    if current_request_count % 5000 == 0 and current_request_count > 0:
-        total_spans = current_request_count * SPANS_PER_REQUEST
-        target_spans = TARGET_REQUESTS * SPANS_PER_REQUEST
-        progress = (current_request_count / TARGET_REQUESTS * 100)
-        print(f"Progress: {current_request_count:,} requests ({total_spans:,} spans / ~{target_spans:,}) - {progress:.1f}%")
-
-
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
-    """Print summary when test stops"""
-    if not isinstance(environment.runner, MasterRunner):
-        stats = environment.stats.total
-        total_requests = stats.num_requests
-        total_spans = current_request_count * SPANS_PER_REQUEST
-
-        print("\n" + "="*80)
-        print("✅ Locust Traces Load Test Completed")
-        print("="*80)
-        print(f"Total Trace Requests Sent: {current_request_count:,}")
-        print(f"Total Spans Sent: ~{total_spans:,}")
-        print(f"Total HTTP Requests: {total_requests:,}")
-        print(f"\nTotal Failures: {stats.num_failures:,}")
-        print(f"Average Response Time: {stats.avg_response_time:.2f}ms")
-        if stats.total_rps > 0:
-            actual_spans_per_sec = stats.total_rps * SPANS_PER_REQUEST
-            print(f"Requests/sec: {stats.total_rps:.2f} (≈ {actual_spans_per_sec:,.0f} spans/sec)")
-        print("\nDetailed metrics available in:")
-        print("  - Locust web UI: http://localhost:8089")
-        print("  - HTML report (if --html flag was used)")
-        print("="*80 + "\n")
+    """Print summary when test stops (cluster-wide on the master / standalone runner)"""
+    if isinstance(environment.runner, WorkerRunner):
+        print(f"\nThis worker's share: {request_quota.completed:,} requests "
+              f"(~{request_quota.completed * SPANS_PER_REQUEST:,} spans) - cluster totals are on the master\n")
+        return
+
+    stats = environment.stats.total
+    total_requests = stats.num_requests
+    total_trace_requests = request_quota.completed
+    total_spans = total_trace_requests * SPANS_PER_REQUEST
+    elapsed = request_quota.elapsed
+
+    print("\n" + "="*80)
+    print("✅ Locust Traces Load Test Completed")
+    print("="*80)
+    print(f"Total Trace Requests Sent: {total_trace_requests:,} / {TARGET_REQUESTS:,}")
+    print(f"Total Spans Sent: ~{total_spans:,}")
+    print(f"Total HTTP Requests: {total_requests:,}")
+    print(f"\nTotal Failures: {stats.num_failures:,}")
+    print(f"Average Response Time: {stats.avg_response_time:.2f}ms")
+    if elapsed > 0:
+        print(f"Requests/sec: {total_trace_requests / elapsed:,.2f} "
+              f"(≈ {total_spans / elapsed:,.0f} spans/sec over {elapsed:.1f}s)")
+    print("\nDetailed metrics available in:")
+    print("  - Locust web UI: http://localhost:8089")
+    print("  - HTML report (if --html flag was used)")
+    print("="*80 + "\n")
@@ -20,16 +20,35 @@ Usage:
     # Distributed worker
     locust -f scripts/locustfile_traffic.py --worker --master-host <master-ip>
 
+    # geventhttpclient transport (several times more requests/sec per worker core)
+    LOCUST_TRANSPORT=fast ./scripts/run-locust-traffic.sh
+
+    # Open-loop step ramp: 10k → 60k spans/sec in 10k steps, 60s each (finds the saturation point)
+    SPAN_ARRIVAL_STAGES=ramp:10000:60000:10000:60s locust -f scripts/locustfile_traffic.py --headless ...
+
 Environment Variables:
     PRODUCER_URL: Override target server (default: https://api.jungle-panopticon.cloud/producer)
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser, keep-alive pool)
+    FRESHNESS_PROBE: 'true' to add a probe user measuring publish→queryable latency via QUERY_API_URL
+    SPAN_ARRIVAL_STAGES: Open-loop spans/sec schedule, e.g. '60s:20000,60s:40000' (unset = closed loop)
+    ARRIVAL_USERS: Users sharing the open-loop rate, cluster-wide (default: 50)
 """
 
-import random
 import os
-from datetime import datetime, timezone, timedelta
-from locust import HttpUser, task, constant, events
+from locust import task, constant, events
+from locust.exception import StopUser
 from locust.runners import MasterRunner
 
+from locust_support import (
+    ARRIVAL_USERS,
+    OpenLoopPacer,
+    TransportUser,
+    arrival_shape,
+    core_throughput,
+    freshness_probe_user,
+)
+from payload_gen import linear_traces
+
 
 # Configuration
 PRODUCER_URL = os.getenv("PRODUCER_URL", "https://api.jungle-panopticon.cloud/producer")
@@ -43,146 +62,23 @@ TOTAL_ITEMS_PER_REQUEST = TRACES_PER_REQUEST * SPANS_PER_TRACE  # 30 total items
 request_count = 0
 
 
-def generate_trace_id():
-    """Generate a random 32-character hex trace ID"""
-    return "".join(random.choices("0123456789abcdef", k=32))
-
-
-def generate_span_id():
-    """Generate a random 16-character hex span ID"""
-    return "".join(random.choices("0123456789abcdef", k=16))
-
-
-def generate_single_trace(service_name="API-Backend-Local", environment="Develop"):
-    """
-    Generate a single trace containing 10 connected spans.
-
-    All 10 spans share the same trace_id and are connected via parent-child
-    relationships forming a chain.
-
-    Args:
-        service_name: Service name for all spans in this trace
-        environment: Environment name (e.g., 'Develop', 'production')
-
-    Returns:
-        list: 10 span dictionaries sharing the same trace_id
-    """
-    # Generate unique trace_id for this trace
-    trace_id = generate_trace_id()
-
-    # Base timestamp for this trace (will increment slightly for each span)
-    base_time = datetime.now(timezone.utc) - timedelta(
-        milliseconds=random.randint(0, 1000)
-    )
-
-    spans = []
-    parent_span_id = None  # First span has no parent
-
-    for i in range(SPANS_PER_TRACE):
-        # Generate unique span_id
-        span_id = generate_span_id()
-
-        # Increment timestamp slightly for each span in the chain
-        span_timestamp = base_time + timedelta(milliseconds=i * random.uniform(1, 5))
-
-        # Alternate between CLIENT (database) and SERVER (HTTP) kinds
-        kind = random.choice(["CLIENT", "SERVER"])
-
-        # Build span based on kind
-        span = {
-            "type": "span",
-            "timestamp": span_timestamp.isoformat(),
-            "service_name": service_name,
-            "environment": environment,
-            "trace_id": trace_id,
-            "span_id": span_id,
-            "parent_span_id": parent_span_id,  # null for first span, else previous span_id
-            "name": (
-                f"SELECT operation-{i}"
-                if kind == "CLIENT"
-                else f"GET /api/endpoint-{i}"
-            ),
-            "kind": kind,
-            "duration_ms": round(random.uniform(1, 100), 2),
-            "status": random.choice(["OK"] * 9 + ["ERROR"]),  # 90% OK, 10% ERROR
-        }
-
-        # Add kind-specific fields
-        if kind == "CLIENT":
-            span.update(
-                {
-                    "db_system": "postgresql",
-                    "db_statement": f"SELECT * FROM table{i} WHERE id = {random.randint(1, 1000)}",
-                    "db_operation": "SELECT",
-                }
-            )
-        else:  # SERVER
-            span.update(
-                {
-                    "http_method": "GET",
-                    "http_path": f"/posts/{i}",
-                    "http_url": f"http://localhost:3001/posts/{i}",
-                    "http_status_code": 200 if span["status"] == "OK" else 500,
-                }
-            )
-
-        spans.append(span)
-        parent_span_id = span_id  # Next span's parent is this span
-
-    return spans
-
-
-def generate_log_data():
-    """Generate a simple log entry matching the producer's expected format"""
-    return {
-        "type": "log",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "service_name": "sample-service",
-        "environment": "prod",
-        "level": "INFO",
-        "message": "샘플 APM 로그 이벤트",
-        "trace_id": generate_trace_id(),
-        "span_id": generate_span_id(),
-        "http_method": "GET",
-        "http_path": "/api/sample",
-        "http_status_code": 200,
-        "labels": {
-            "feature": "sample",
-            "host": "local",
-        },
-    }
-
-
-def generate_batch_spans():
-    """
-    Generate a batch of 30 spans (3 traces × 10 spans each).
-
-    Each trace is independent with its own trace_id and timestamp.
+# Requests/sec per worker core for the selected transport (printed on test stop)
+core_throughput.attach(events)
 
-    Returns:
-        list: 30 span dictionaries from 3 independent traces
-    """
-    all_spans = []
-
-    # Generate 3 complete traces
-    for _ in range(TRACES_PER_REQUEST):
-        trace_spans = generate_single_trace()
-        all_spans.extend(trace_spans)
+# Open-loop mode: requests follow SPAN_ARRIVAL_STAGES regardless of response time,
+# and the step-ramp shape replaces --users/--spawn-rate
+span_pacer = OpenLoopPacer.from_env(
+    "SPAN_ARRIVAL_STAGES", items_per_request=TOTAL_ITEMS_PER_REQUEST, name="spans"
+)
+if span_pacer is not None:
+    span_pacer.attach(events)
+StepArrivalShape = arrival_shape(span_pacer)
 
-    return all_spans
+# Publish -> queryable latency probe (FRESHNESS_PROBE=true), reported as a FRESHNESS entry
+FreshnessProbe = freshness_probe_user(PRODUCER_URL)
 
 
-def generate_batch_logs():
-    """
-    Generate a batch of 20 logs.
-
-    Returns:
-        list: 20 log dictionaries
-    """
-    return [generate_log_data() for _ in range(LOGS_PER_REQUEST)]
-
-
-class HighVolumeTrafficTest(HttpUser):
+class HighVolumeTrafficTest(TransportUser):
     """
     High-volume traces load test for producer server.
 
@@ -201,11 +97,18 @@ class HighVolumeTrafficTest(HttpUser):
 
     @task
     def send_batch_spans(self):
+        """Send batches closed-loop, or hand the user to the open-loop pacer"""
+        if span_pacer is not None:
+            span_pacer.drive(self, self.post_spans)
+            raise StopUser()
+        self.post_spans()
+
+    def post_spans(self):
         """Send 30 spans (3 traces × 10 spans) to /dummy/traces endpoint"""
         global request_count
 
-        # Generate batch of 30 spans
-        batch_spans = generate_batch_spans()
+        # Generate batch of 30 spans (3 traces × 10 spans) in one call
+        batch_spans = linear_traces(TRACES_PER_REQUEST, SPANS_PER_TRACE)
 
         with self.client.post(
             "/dummy/traces",
@@ -249,7 +152,11 @@ def on_test_start(environment, **kwargs):
         print(f"  - duration_ms: 1-100ms (random)")
         print(f"  - status: OK (90%) or ERROR (10%)")
         print(f"  - parent_span_id: null for root, else previous span_id")
-        print(f"\nTest will run continuously until stopped.")
+        if span_pacer is not None:
+            print(f"\nOpen-loop Schedule (spans/sec, {ARRIVAL_USERS} users): {span_pacer.schedule.describe()}")
+            print(f"Test will stop when the schedule ends.")
+        else:
+            print(f"\nTest will run continuously until stopped.")
         print("=" * 80 + "\n")
 
 
@@ -0,0 +1,53 @@
+"""
+Shared payload generation for the dummy data / Locust scripts.
+
+Usage:
+    from payload_gen import simple_logs, linear_traces
+
+    batch = linear_traces(3, spans_per_trace=10)
+
+Generator-only throughput (spans/sec per core):
+    cd dummy_script/scripts && python3 -m payload_gen.bench
+
+Seeded dataset export (NDJSON / Elasticsearch _bulk files):
+    cd dummy_script/scripts && python3 -m payload_gen.dataset --help
+"""
+
+from .builders import (
+    canary_span,
+    checkout_span_chains,
+    linear_traces,
+    realistic_logs,
+    realistic_span_chains,
+    simple_logs,
+    three_span_chains,
+)
+from .clock import iso_timestamp
+from .ids import (
+    container_ids,
+    generate_span_id,
+    generate_trace_id,
+    random_hex_ids,
+    span_ids,
+    trace_ids,
+)
+from .pool import EncodedPayloadPool, pool_from_env
+
+__all__ = [
+    'canary_span',
+    'checkout_span_chains',
+    'container_ids',
+    'EncodedPayloadPool',
+    'generate_span_id',
+    'generate_trace_id',
+    'iso_timestamp',
+    'linear_traces',
+    'pool_from_env',
+    'random_hex_ids',
+    'realistic_logs',
+    'realistic_span_chains',
+    'simple_logs',
+    'span_ids',
+    'three_span_chains',
+    'trace_ids',
+]
@@ -0,0 +1,88 @@
+"""
+Generator-only throughput benchmark.
+
+Measures how many items per second of CPU time each builder produces in a
+single process, i.e. the ceiling one Locust worker core can reach before any
+HTTP work, followed by the full request-body path (build + json.dumps vs. the
+pre-serialized EncodedPayloadPool).
+
+Usage:
+    cd dummy_script/scripts
+    python3 -m payload_gen.bench                 # 3s per builder
+    python3 -m payload_gen.bench --seconds 10
+"""
+
+import argparse
+import json
+import time
+
+from .builders import (
+    checkout_span_chains,
+    linear_traces,
+    realistic_logs,
+    realistic_span_chains,
+    simple_logs,
+    three_span_chains,
+)
+from .pool import EncodedPayloadPool
+
+# (label, callable producing one batch, items per batch)
+SCENARIOS = [
+    ('simple_logs (locustfile.py, 100/batch)', lambda: simple_logs(100), 100),
+    ('three_span_chains (locustfile_traces.py, 40/batch)', lambda: three_span_chains(40), 40),
+    ('linear_traces (locustfile_traffic.py, 3x10/batch)', lambda: linear_traces(3, 10), 30),
+    ('realistic_logs (locustfile_user*.py, 15/batch)', lambda: realistic_logs(15), 15),
+    ('realistic_span_chains (locustfile_user*.py, 10 chains)', lambda: realistic_span_chains(10), 30),
+    ('checkout_span_chains (locustfile_user_v3.py, 10 chains)', lambda: checkout_span_chains(10), 40),
+]
+
+# Request-body paths: build + json.dumps per send vs. pre-serialized pool
+ENCODE_SCENARIOS = [
+    ('simple_logs + json.dumps (100/batch)',
+     lambda: lambda: json.dumps(simple_logs(100)).encode(), 100),
+    ('EncodedPayloadPool simple_logs (100/batch)',
+     lambda: EncodedPayloadPool(lambda: simple_logs(100)).next_body, 100),
+    ('EncodedPayloadPool simple_logs gzip (100/batch)',
+     lambda: EncodedPayloadPool(lambda: simple_logs(100), compress=True).next_body, 100),
+    ('three_span_chains + json.dumps (40/batch)',
+     lambda: lambda: json.dumps(three_span_chains(40)).encode(), 40),
+    ('EncodedPayloadPool three_span_chains (40/batch)',
+     lambda: EncodedPayloadPool(lambda: three_span_chains(40)).next_body, 40),
+    ('EncodedPayloadPool three_span_chains gzip (40/batch)',
+     lambda: EncodedPayloadPool(lambda: three_span_chains(40), compress=True).next_body, 40),
+]
+
+
+def measure(build, items_per_batch, seconds):
+    """Run `build` repeatedly for `seconds` of CPU time; return items/sec per core"""
+    items = 0
+    started = time.process_time()
+    deadline = started + seconds
+    while True:
+        build()
+        items += items_per_batch
+        now = time.process_time()
+        if now >= deadline:
+            return items / (now - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Payload generator throughput benchmark')
+    parser.add_argument('--seconds', type=float, default=3.0, help='CPU seconds per scenario')
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("📏 Payload Generator Benchmark (single core, generation only)")
+    print("="*80)
+    for label, build, items_per_batch in SCENARIOS:
+        rate = measure(build, items_per_batch, args.seconds)
+        print(f"{label:<60} {rate:>12,.0f} items/sec/core")
+    print("-"*80)
+    for label, setup, items_per_batch in ENCODE_SCENARIOS:
+        rate = measure(setup(), items_per_batch, args.seconds)
+        print(f"{label:<60} {rate:>12,.0f} items/sec/core")
+    print("="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
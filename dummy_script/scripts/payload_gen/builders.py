@@ -0,0 +1,638 @@
+"""
+Batch payload builders shared by every locustfile.
+
+Each builder produces a whole batch in one call:
+- trace/span/container IDs are drawn in bulk (see ids.py)
+- timestamps are formatted from epoch floats with a cached prefix (see clock.py)
+- constant fields come from template dicts instead of being rebuilt per span
+
+All builders accept an optional `rng` (random.Random) so a seeded generator
+can reproduce the exact same batch, and an optional `now` (epoch seconds) to
+place the batch at a chosen point in time. The payload shapes match what the
+producer's /dummy/logs and /dummy/traces endpoints expect.
+"""
+
+import random
+import time
+
+from .catalog import (
+    ENVIRONMENTS,
+    ERROR_MESSAGES,
+    INFO_MESSAGES,
+    PROBLEMATIC_CARDS,
+    SERVICE_ENDPOINTS,
+    VALID_CARDS,
+    WARN_MESSAGES,
+)
+from .clock import iso_timestamp
+from .ids import container_ids, span_ids, trace_ids
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+ERROR_STATUS_CODES = [500, 502, 503, 504, 400, 401, 403, 404]
+WARN_STATUS_CODES = [200, 304, 400, 429]
+INFO_STATUS_CODES = [200, 201, 204, 304]
+SPAN_ERROR_STATUS_CODES = [400, 401, 404, 500, 502, 503]
+MONGOOSE_OPERATIONS = ['findOne', 'find', 'create', 'updateOne', 'deleteOne']
+MONGOOSE_MODELS = ['User', 'Post', 'Product', 'Order', 'Comment']
+MONGODB_OPERATIONS = ['find', 'findOne', 'insert', 'update', 'delete']
+MONGODB_COLLECTIONS = ['users', 'posts', 'products', 'orders', 'comments']
+
+_SIMPLE_LOG_TEMPLATE = {
+    'type': 'log',
+    'timestamp': None,
+    'service_name': 'sample-service',
+    'environment': 'prod',
+    'level': 'INFO',
+    'message': '샘플 APM 로그 이벤트',
+    'trace_id': None,
+    'span_id': None,
+    'http_method': 'GET',
+    'http_path': '/api/sample',
+    'http_status_code': 200,
+    'labels': {
+        'feature': 'sample',
+        'host': 'local',
+    }
+}
+
+_LABELS_API = {'component': 'api'}
+_LABELS_PROCESSOR = {'component': 'processor'}
+_LABELS_DATABASE = {'component': 'database'}
+
+
+def _resolve(rng):
+    """Fall back to the module-level random functions when no rng is given"""
+    return rng if rng is not None else random
+
+
+def _now(now):
+    return time.time() if now is None else now
+
+
+def simple_logs(count, rng=None, now=None):
+    """
+    Generate `count` simple fixed-format logs (trace_id/span_id randomized).
+
+    Every log in the batch shares one timestamp string.
+    """
+    timestamp = iso_timestamp(_now(now))
+    template = _SIMPLE_LOG_TEMPLATE
+    return [
+        {**template, 'timestamp': timestamp, 'trace_id': trace_id, 'span_id': span_id}
+        for trace_id, span_id in zip(trace_ids(count, rng), span_ids(count, rng))
+    ]
+
+
+def three_span_chains(span_count, service_name='demo-service', environment='production',
+                      rng=None, now=None):
+    """
+    Generate `span_count` spans from Root -> Child1 -> Child2 chains.
+
+    Chains share one trace_id each; the last chain is truncated when
+    span_count is not a multiple of 3.
+    """
+    chains = -(-span_count // 3)
+    r = _resolve(rng)
+    rand, randint, uniform = r.random, r.randint, r.uniform
+    base_now = _now(now)
+    tids = trace_ids(chains, rng)
+    sids = span_ids(chains * 3, rng)
+
+    spans = []
+    append = spans.append
+    for c in range(chains):
+        trace_id = tids[c]
+        root_span_id, child1_span_id, child2_span_id = sids[c * 3:c * 3 + 3]
+        base_time = base_now - randint(0, 1000) / 1000
+
+        root_duration = uniform(0, 1000)
+        root_status = 'ERROR' if rand() < 0.5 else 'OK'
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(base_time),
+            'service_name': service_name,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': root_span_id,
+            'parent_span_id': None,
+            'name': f'GET /api/endpoint-{randint(1, 100)}',
+            'kind': 'SERVER',
+            'duration_ms': round(root_duration, 2),
+            'status': root_status,
+            'http_method': 'GET',
+            'http_path': f'/api/endpoint-{randint(1, 100)}',
+            'http_status_code': 200 if root_status == 'OK' else 500,
+            'labels': _LABELS_API
+        })
+
+        child1_start = base_time + uniform(1, 10) / 1000
+        child1_duration = uniform(0, min(root_duration * 0.8, 1000))
+        child1_status = 'ERROR' if rand() < 0.5 else 'OK'
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(child1_start),
+            'service_name': service_name,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': child1_span_id,
+            'parent_span_id': root_span_id,
+            'name': f'process-request-{randint(1, 50)}',
+            'kind': 'SERVER',
+            'duration_ms': round(child1_duration, 2),
+            'status': child1_status,
+            'http_method': 'POST',
+            'http_path': f'/internal/process-{randint(1, 50)}',
+            'http_status_code': 200 if child1_status == 'OK' else 500,
+            'labels': _LABELS_PROCESSOR
+        })
+
+        child2_start = child1_start + uniform(1, 5) / 1000
+        child2_duration = uniform(0, min(child1_duration * 0.6, 1000))
+        child2_status = 'ERROR' if rand() < 0.5 else 'OK'
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(child2_start),
+            'service_name': service_name,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': child2_span_id,
+            'parent_span_id': child1_span_id,
+            'name': f'database-query-{randint(1, 20)}',
+            'kind': 'SERVER',
+            'duration_ms': round(child2_duration, 2),
+            'status': child2_status,
+            'http_method': 'GET',
+            'http_path': f'/db/query-{randint(1, 20)}',
+            'http_status_code': 200 if child2_status == 'OK' else 500,
+            'labels': _LABELS_DATABASE
+        })
+
+    if len(spans) > span_count:
+        del spans[span_count:]
+    return spans
+
+
+def canary_span(service_name='freshness-probe', environment='probe', rng=None, now=None):
+    """
+    Generate a one-span batch whose trace_id is looked up afterwards.
+
+    Used by the freshness probe: a single OK root span, so the canary never
+    shows up in error rates and is cheap to find via /query/traces/:traceId.
+    """
+    trace_id, = trace_ids(1, rng)
+    span_id, = span_ids(1, rng)
+    return [{
+        'type': 'span',
+        'timestamp': iso_timestamp(_now(now)),
+        'service_name': service_name,
+        'environment': environment,
+        'trace_id': trace_id,
+        'span_id': span_id,
+        'parent_span_id': None,
+        'name': 'GET /canary',
+        'kind': 'SERVER',
+        'duration_ms': 1.0,
+        'status': 'OK',
+        'http_method': 'GET',
+        'http_path': '/canary',
+        'http_status_code': 200,
+        'labels': {'component': 'freshness-probe'}
+    }]
+
+
+def linear_traces(trace_count, spans_per_trace=10, service_name='API-Backend-Local',
+                  environment='Develop', rng=None, now=None):
+    """
+    Generate `trace_count` traces of `spans_per_trace` spans chained by parent_span_id.
+
+    Spans alternate randomly between CLIENT (database) and SERVER (HTTP) kinds,
+    with 90% OK / 10% ERROR status and timestamps increasing within a trace.
+    """
+    r = _resolve(rng)
+    rand, randint, uniform = r.random, r.randint, r.uniform
+    base_now = _now(now)
+    tids = trace_ids(trace_count, rng)
+    sids = span_ids(trace_count * spans_per_trace, rng)
+    client_names = [f'SELECT operation-{i}' for i in range(spans_per_trace)]
+    server_names = [f'GET /api/endpoint-{i}' for i in range(spans_per_trace)]
+    server_paths = [f'/posts/{i}' for i in range(spans_per_trace)]
+    server_urls = [f'http://localhost:3001/posts/{i}' for i in range(spans_per_trace)]
+
+    spans = []
+    append = spans.append
+    for t in range(trace_count):
+        trace_id = tids[t]
+        base_time = base_now - randint(0, 1000) / 1000
+        parent_span_id = None  # First span has no parent
+
+        for i in range(spans_per_trace):
+            span_id = sids[t * spans_per_trace + i]
+            is_client = rand() < 0.5
+            status = 'ERROR' if rand() < 0.1 else 'OK'
+            span = {
+                'type': 'span',
+                'timestamp': iso_timestamp(base_time + i * uniform(1, 5) / 1000),
+                'service_name': service_name,
+                'environment': environment,
+                'trace_id': trace_id,
+                'span_id': span_id,
+                'parent_span_id': parent_span_id,
+                'name': client_names[i] if is_client else server_names[i],
+                'kind': 'CLIENT' if is_client else 'SERVER',
+                'duration_ms': round(uniform(1, 100), 2),
+                'status': status,
+            }
+            if is_client:
+                span['db_system'] = 'postgresql'
+                span['db_statement'] = f'SELECT * FROM table{i} WHERE id = {randint(1, 1000)}'
+                span['db_operation'] = 'SELECT'
+            else:
+                span['http_method'] = 'GET'
+                span['http_path'] = server_paths[i]
+                span['http_url'] = server_urls[i]
+                span['http_status_code'] = 200 if status == 'OK' else 500
+
+            append(span)
+            parent_span_id = span_id  # Next span's parent is this span
+
+    return spans
+
+
+def _pick_endpoint(r, service_endpoints, service, methods_by_service):
+    """Pick an HTTP method/path for the service, filling {id} placeholders"""
+    methods = methods_by_service[service]
+    method = methods[int(r.random() * len(methods))]
+    paths = service_endpoints[service][method]
+    path = paths[int(r.random() * len(paths))]
+    if '{id}' in path:
+        path = path.replace('{id}', str(r.randint(1, 1000)))
+    return method, path
+
+
+def realistic_logs(count, service_endpoints=SERVICE_ENDPOINTS, environments=ENVIRONMENTS,
+                   error_rate=0.02, rng=None, now=None):
+    """
+    Generate `count` realistic logs across services.
+
+    - ERROR logs appear at `error_rate`; the rest are INFO (80%), WARN (15%), DEBUG (5%)
+    - Durations: normal 100-200ms, errors 500-1000ms
+    - Two log formats (container metadata vs. docker json-file labels) are mixed 50/50
+    """
+    r = _resolve(rng)
+    rand, randint, uniform, choice = r.random, r.randint, r.uniform, r.choice
+    base_now = _now(now)
+    now_iso = iso_timestamp(base_now)
+    services = list(service_endpoints.keys())
+    methods_by_service = {service: list(eps.keys()) for service, eps in service_endpoints.items()}
+    tids = trace_ids(count, rng)
+    sids = span_ids(count, rng)
+    cids = container_ids(count, rng)
+
+    logs = []
+    append = logs.append
+    for n in range(count):
+        is_error = rand() < error_rate
+
+        # Select log level and corresponding data
+        if is_error:
+            level = 'ERROR'
+            status_code = choice(ERROR_STATUS_CODES)
+            message_template = choice(ERROR_MESSAGES)
+        else:
+            roll = rand()
+            level = 'INFO' if roll < 0.80 else ('WARN' if roll < 0.95 else 'DEBUG')
+            if level == 'WARN':
+                status_code = choice(WARN_STATUS_CODES)
+                message_template = choice(WARN_MESSAGES)
+            else:
+                status_code = choice(INFO_STATUS_CODES)
+                message_template = choice(INFO_MESSAGES)
+
+        service = choice(services)
+        environment = choice(environments)
+        method, path = _pick_endpoint(r, service_endpoints, service, methods_by_service)
+
+        log = {
+            'timestamp': iso_timestamp(base_now - randint(0, 10)),
+            'type': 'log',
+            'service_name': service,
+            'environment': environment,
+            'level': level,
+            'message': f'{message_template}: {method} {path}',
+            'trace_id': tids[n],
+            'span_id': sids[n],
+            'http_method': method,
+            'http_path': path,
+            'http_status_code': status_code,
+        }
+
+        duration = uniform(500, 1000) if is_error else uniform(100, 200)
+
+        if rand() < 0.5:
+            log['duration_ms'] = round(duration, 2)
+            log['client_ip'] = f'::ffff:192.168.{randint(1, 255)}.{randint(1, 255)}'
+            log['container_id'] = cids[n]
+            log['container_name'] = f'/panopticon-{service}'
+            log['source'] = 'stdout'
+        else:
+            log['labels'] = {'duration_ms': round(duration, 0)}
+            log['stream'] = 'stdout'
+            log['time'] = now_iso
+            log['filepath'] = f'/var/lib/docker/containers/{cids[n][:12]}/log.json'
+
+        append(log)
+
+    return logs
+
+
+def realistic_span_chains(chains=1, service_endpoints=SERVICE_ENDPOINTS,
+                          environments=ENVIRONMENTS, error_rate=0.02, rng=None, now=None):
+    """
+    Generate `chains` realistic request flows (flattened, 3 spans each):
+    HTTP Request -> Request Handler -> Database/MongoDB
+
+    All spans in a chain share the same trace_id and are connected via parent_span_id.
+    """
+    r = _resolve(rng)
+    rand, randint, uniform, choice = r.random, r.randint, r.uniform, r.choice
+    base_now = _now(now)
+    services = list(service_endpoints.keys())
+    methods_by_service = {service: list(eps.keys()) for service, eps in service_endpoints.items()}
+    tids = trace_ids(chains, rng)
+    sids = span_ids(chains * 3, rng)
+
+    spans = []
+    append = spans.append
+    for c in range(chains):
+        service = choice(services)
+        environment = choice(environments)
+        method, path = _pick_endpoint(r, service_endpoints, service, methods_by_service)
+        trace_id = tids[c]
+        root_span_id, handler_span_id, db_span_id = sids[c * 3:c * 3 + 3]
+        base_time = base_now - randint(100, 2000) / 1000
+
+        # Error requests take 500-1000ms, normal requests take 100-200ms
+        is_error_span = rand() < error_rate
+        total_duration = uniform(500, 1000) if is_error_span else uniform(100, 200)
+        handler_duration = total_duration * uniform(0.8, 0.95)
+        db_duration = handler_duration * uniform(0.1, 0.3)
+
+        if is_error_span:
+            http_status = choice(SPAN_ERROR_STATUS_CODES)
+            status = 'ERROR'
+        else:
+            http_status = choice(INFO_STATUS_CODES)
+            status = 'OK'
+
+        # 1. Root Span - HTTP Server Request (SERVER kind)
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(base_time),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': root_span_id,
+            'parent_span_id': None,
+            'name': f'{method} {path}',
+            'kind': 'SERVER',
+            'duration_ms': round(total_duration, 6),
+            'status': status,
+            'etc': {
+                'http.url': f'http://localhost:3000{path}',
+                'http.host': 'localhost:3000',
+                'net.host.name': 'localhost',
+                'http.scheme': 'http',
+                'http.user_agent': USER_AGENT,
+                'http.request_content_length_uncompressed': randint(20, 1000),
+                'http.flavor': '1.1',
+                'net.transport': 'ip_tcp',
+                'net.host.ip': f'::ffff:172.18.0.{randint(2, 10)}',
+                'net.host.port': 3000,
+                'net.peer.ip': f'::ffff:172.21.100.{randint(1, 254)}',
+                'net.peer.port': randint(10000, 65000),
+                'http.status_text': 'OK' if http_status < 400 else 'ERROR'
+            },
+            'http_method': method,
+            'http_path': path,
+            'http_status_code': http_status
+        })
+
+        # 2. Request Handler Span (INTERNAL kind)
+        handler_start = base_time + uniform(1, 5) / 1000
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(handler_start),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': handler_span_id,
+            'parent_span_id': root_span_id,
+            'name': f'request handler - {path}',
+            'kind': 'INTERNAL',
+            'duration_ms': round(handler_duration, 6),
+            'status': 'OK',
+            'etc': {
+                'express.name': path,
+                'express.type': 'request_handler'
+            },
+            'http_path': path
+        })
+
+        # 3. Database Span (CLIENT kind) - randomly choose mongoose or mongodb
+        db_start = handler_start + uniform(1, 10) / 1000
+        db_span = {
+            'type': 'span',
+            'timestamp': iso_timestamp(db_start),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': db_span_id,
+            'parent_span_id': handler_span_id,
+            'name': None,
+            'kind': 'CLIENT',
+            'duration_ms': round(db_duration, 6),
+            'status': 'OK'
+        }
+        if rand() < 0.5:
+            db_span['name'] = f'mongoose.{choice(MONGOOSE_MODELS)}.{choice(MONGOOSE_OPERATIONS)}'
+        else:
+            db_operation = choice(MONGODB_OPERATIONS)
+            collection = choice(MONGODB_COLLECTIONS)
+            db_span['name'] = f'mongodb.{db_operation}'
+            db_span['etc'] = {
+                'db.system': 'mongodb',
+                'db.name': f'{service}_db',
+                'db.mongodb.collection': collection,
+                'db.operation': db_operation,
+                'db.connection_string': f'mongodb://172.18.0.3:27017/{service}_db',
+                'net.peer.name': '172.18.0.3',
+                'net.peer.port': 27017,
+                'db.statement': f'{{"find":"{collection}","filter":{{}},"limit":10}}'
+            }
+        append(db_span)
+
+    return spans
+
+
+def checkout_span_chains(chains=1, environments=ENVIRONMENTS, error_rate=0.05,
+                         rng=None, now=None):
+    """
+    Generate `chains` order-service checkout flows (flattened, 4 spans each):
+    POST /orders/checkout -> request handler -> payment validation -> DB insert
+
+    At `error_rate` a DB connection error appears in the DB span and the
+    ERROR status propagates up the chain.
+    """
+    r = _resolve(rng)
+    rand, randint, uniform, choice = r.random, r.randint, r.uniform, r.choice
+    base_now = _now(now)
+    service = 'order-service'
+    method = 'POST'
+    path = '/orders/checkout'
+    tids = trace_ids(chains, rng)
+    sids = span_ids(chains * 4, rng)
+
+    spans = []
+    append = spans.append
+    for c in range(chains):
+        environment = choice(environments)
+        trace_id = tids[c]
+        root_span_id, handler_span_id, payment_span_id, db_span_id = sids[c * 4:c * 4 + 4]
+        base_time = base_now - randint(100, 2000) / 1000
+
+        is_checkout_error = rand() < error_rate
+        card_number = choice(PROBLEMATIC_CARDS if is_checkout_error else VALID_CARDS)
+
+        if is_checkout_error:
+            # Error requests take longer due to retries
+            total_duration = uniform(800, 1500)
+            handler_duration = total_duration * uniform(0.85, 0.95)
+            payment_duration = handler_duration * uniform(0.4, 0.6)
+            db_duration = payment_duration * uniform(0.5, 0.8)
+            http_status = 500
+            status = 'ERROR'
+        else:
+            total_duration = uniform(150, 300)
+            handler_duration = total_duration * uniform(0.85, 0.95)
+            payment_duration = handler_duration * uniform(0.3, 0.5)
+            db_duration = handler_duration * uniform(0.2, 0.4)
+            http_status = 200
+            status = 'OK'
+
+        # 1. Root Span - HTTP Server Request (SERVER kind)
+        root_span = {
+            'type': 'span',
+            'timestamp': iso_timestamp(base_time),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': root_span_id,
+            'parent_span_id': None,
+            'name': f'{method} {path}',
+            'kind': 'SERVER',
+            'duration_ms': round(total_duration, 6),
+            'status': status,
+            'etc': {
+                'http.url': f'http://localhost:3000{path}',
+                'http.host': 'localhost:3000',
+                'net.host.name': 'localhost',
+                'http.scheme': 'http',
+                'http.user_agent': USER_AGENT,
+                'http.request_content_length_uncompressed': randint(200, 500),
+                'http.flavor': '1.1',
+                'net.transport': 'ip_tcp',
+                'net.host.ip': f'::ffff:172.18.0.{randint(2, 10)}',
+                'net.host.port': 3000,
+                'net.peer.ip': f'::ffff:172.21.100.{randint(1, 254)}',
+                'net.peer.port': randint(10000, 65000),
+                'http.status_text': 'OK' if http_status < 400 else 'INTERNAL SERVER ERROR',
+                'checkout.card_number': card_number,
+                'checkout.amount': round(uniform(10, 500), 2)
+            },
+            'http_method': method,
+            'http_path': path,
+            'http_status_code': http_status
+        }
+        if is_checkout_error:
+            root_span['etc']['error.message'] = 'Database connection timeout'
+            root_span['etc']['error.type'] = 'DatabaseConnectionError'
+        append(root_span)
+
+        # 2. Request Handler Span (INTERNAL kind)
+        handler_start = base_time + uniform(1, 5) / 1000
+        handler_span = {
+            'type': 'span',
+            'timestamp': iso_timestamp(handler_start),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': handler_span_id,
+            'parent_span_id': root_span_id,
+            'name': f'request handler - {path}',
+            'kind': 'INTERNAL',
+            'duration_ms': round(handler_duration, 6),
+            'status': status,
+            'etc': {
+                'express.name': path,
+                'express.type': 'request_handler'
+            },
+            'http_path': path
+        }
+        if is_checkout_error:
+            handler_span['etc']['error.message'] = 'Database connection timeout'
+        append(handler_span)
+
+        # 3. Payment Validation Span (INTERNAL kind)
+        payment_start = handler_start + uniform(2, 10) / 1000
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(payment_start),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': payment_span_id,
+            'parent_span_id': handler_span_id,
+            'name': 'payment.validate',
+            'kind': 'INTERNAL',
+            'duration_ms': round(payment_duration, 6),
+            'status': status,
+            'etc': {
+                'payment.card_type': card_number[:4],
+                'payment.card_last4': card_number[-4:],
+                'payment.amount': round(uniform(10, 500), 2)
+            }
+        })
+
+        # 4. Database Span (CLIENT kind) - This is where the error occurs
+        db_start = payment_start + uniform(5, 15) / 1000
+        db_etc = {
+            'db.system': 'mongodb',
+            'db.name': 'order_service_db',
+            'db.mongodb.collection': 'orders',
+            'db.operation': 'insert',
+            'db.connection_string': 'mongodb://172.18.0.3:27017/order_service_db',
+            'net.peer.name': '172.18.0.3',
+            'net.peer.port': 27017
+        }
+        if is_checkout_error:
+            db_etc['error.message'] = 'Connection timeout to database'
+            db_etc['error.type'] = 'MongoNetworkError'
+            db_etc['error.code'] = 'ETIMEDOUT'
+        db_etc['db.statement'] = f'{{"insert":"orders","documents":[{{"card":"{card_number}","amount":100}}]}}'
+        append({
+            'type': 'span',
+            'timestamp': iso_timestamp(db_start),
+            'service_name': service,
+            'environment': environment,
+            'trace_id': trace_id,
+            'span_id': db_span_id,
+            'parent_span_id': payment_span_id,
+            'name': 'mongodb.insert',
+            'kind': 'CLIENT',
+            'duration_ms': round(db_duration, 6),
+            'status': status,
+            'etc': db_etc
+        })
+
+    return spans
@@ -0,0 +1,119 @@
+"""
+Shared sample data pools for realistic log/span generation.
+"""
+
+# Each service has its own relevant endpoints
+SERVICE_ENDPOINTS = {
+    'ecommerce-backend': {
+        'GET': ['/products', '/products/{id}', '/categories', '/health', '/api/items'],
+        'POST': ['/products', '/api/cart', '/api/checkout'],
+        'PUT': ['/products/{id}', '/api/cart/{id}'],
+        'DELETE': ['/products/{id}', '/api/cart/{id}']
+    },
+    'week14-board-backend': {
+        'GET': ['/posts', '/posts/{id}', '/comments', '/health'],
+        'POST': ['/posts', '/comments', '/auth/login', '/auth/register'],
+        'PUT': ['/posts/{id}', '/comments/{id}'],
+        'DELETE': ['/posts/{id}', '/comments/{id}']
+    },
+    'user-service': {
+        'GET': ['/users', '/users/{id}', '/users/profile', '/health'],
+        'POST': ['/auth/login', '/auth/register', '/users'],
+        'PUT': ['/users/{id}', '/users/profile', '/users/settings'],
+        'DELETE': ['/users/{id}']
+    },
+    'payment-service': {
+        'GET': ['/payments', '/payments/{id}', '/transactions', '/health'],
+        'POST': ['/payments', '/payments/process', '/refunds'],
+        'PUT': ['/payments/{id}'],
+        'DELETE': ['/payments/{id}']
+    },
+    'notification-service': {
+        'GET': ['/notifications', '/notifications/{id}', '/health'],
+        'POST': ['/notifications', '/notifications/send'],
+        'PUT': ['/notifications/{id}/read'],
+        'DELETE': ['/notifications/{id}']
+    },
+    'order-service': {
+        'GET': ['/orders', '/orders/{id}', '/orders/status/{id}', '/health'],
+        'POST': ['/orders', '/orders/checkout'],
+        'PUT': ['/orders/{id}', '/orders/{id}/status'],
+        'DELETE': ['/orders/{id}']
+    },
+    'inventory-service': {
+        'GET': ['/inventory', '/inventory/{id}', '/stock/{id}', '/health'],
+        'POST': ['/inventory', '/stock/reserve'],
+        'PUT': ['/inventory/{id}', '/stock/{id}'],
+        'DELETE': ['/inventory/{id}']
+    }
+}
+
+SERVICES = list(SERVICE_ENDPOINTS.keys())
+
+# Endpoints shared by every service (original user simulation scenario)
+GENERIC_ENDPOINTS = {
+    'GET': [
+        '/users', '/products', '/orders', '/health', '/api/items',
+        '/api/categories', '/api/cart', '/api/profile'
+    ],
+    'POST': [
+        '/auth/login', '/auth/register', '/orders', '/payments',
+        '/api/cart', '/api/checkout', '/api/reviews'
+    ],
+    'PUT': [
+        '/users/profile', '/orders/{id}', '/products/{id}',
+        '/api/cart/{id}', '/api/settings'
+    ],
+    'DELETE': [
+        '/cart/{id}', '/orders/{id}', '/api/wishlist/{id}'
+    ]
+}
+
+GENERIC_SERVICE_ENDPOINTS = {service: GENERIC_ENDPOINTS for service in SERVICES}
+
+ENVIRONMENTS = ['production']
+
+INFO_MESSAGES = [
+    'Request processed successfully',
+    'User authenticated',
+    'Data fetched from cache',
+    'Transaction completed',
+    'Response sent to client',
+    'Query executed successfully'
+]
+
+WARN_MESSAGES = [
+    'Slow query detected',
+    'Cache miss - fetching from database',
+    'Rate limit approaching',
+    'Deprecated API usage',
+    'High memory usage detected'
+]
+
+ERROR_MESSAGES = [
+    'Database connection timeout',
+    'Invalid authentication token',
+    'Resource not found',
+    'Internal server error',
+    'Failed to process payment',
+    'Service unavailable',
+    'Network timeout',
+    'Permission denied',
+    'Invalid request parameters',
+    'External API call failed'
+]
+
+# Problematic card numbers that cause DB connection errors
+PROBLEMATIC_CARDS = [
+    '4532-1111-2222-3333',
+    '5555-6666-7777-8888',
+    '4111-1111-1111-1111'
+]
+
+# Valid card numbers
+VALID_CARDS = [
+    '4532-0000-0000-0000',
+    '5555-0000-0000-0000',
+    '3782-0000-0000-0000',
+    '6011-0000-0000-0000'
+]
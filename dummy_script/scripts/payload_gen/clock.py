@@ -0,0 +1,35 @@
+"""
+Fast ISO-8601 timestamp formatting.
+
+datetime.now(timezone.utc).isoformat() builds a datetime object and formats
+every field for each span. Spans in a batch share the same few seconds, so the
+'YYYY-MM-DDTHH:MM:SS' prefix is cached per second and only the microsecond
+suffix is formatted per call.
+"""
+
+import time
+
+_MAX_CACHED_SECONDS = 4096
+
+
+class IsoTimestampFormatter:
+    """Format epoch seconds as UTC strings compatible with datetime.isoformat()"""
+
+    __slots__ = ('_prefixes',)
+
+    def __init__(self):
+        self._prefixes = {}
+
+    def __call__(self, epoch_seconds):
+        second = int(epoch_seconds)
+        micros = int((epoch_seconds - second) * 1_000_000)
+        prefix = self._prefixes.get(second)
+        if prefix is None:
+            if len(self._prefixes) >= _MAX_CACHED_SECONDS:
+                self._prefixes.clear()
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._prefixes[second] = prefix
+        return f'{prefix}.{micros:06d}+00:00'
+
+
+iso_timestamp = IsoTimestampFormatter()
@@ -0,0 +1,413 @@
+"""
+Seeded, reproducible dataset export for offline benchmarks.
+
+Streams N spans and N logs spread over a chosen time range to files, using
+the same builders as the locustfiles (realistic_span_chains,
+checkout_span_chains, realistic_logs) driven by a seeded random.Random, so the
+same --seed and range always produce byte-identical output. Batches are
+generated, written and dropped one at a time, so memory stays flat no matter
+how many items are exported.
+
+With --shards N the range is cut into N consecutive time slices, each with its
+own seed ('<seed>/<shard>') and share of the counts, and a process pool
+(--workers, default: one per core) writes the shards in parallel as
+'shardNNNN-*' files. The output depends only on the seed, range and shard
+count, not on the number of workers, and throughput scales with cores.
+
+Output formats:
+    ndjson  one producer event per line (the /dummy/logs, /dummy/traces payload
+            items), e.g. for replaying through Kafka or the producer
+    bulk    Elasticsearch _bulk bodies for the logs-apm / traces-apm data
+            streams with the documents shaped like LogIngestService /
+            SpanIngestService write them, split into files of --bulk-docs
+            documents so each fits one _bulk request
+
+Usage:
+    cd dummy_script/scripts
+
+    # 1M spans + 1M logs over the last 24h as _bulk bodies
+    python3 -m payload_gen.dataset --spans 1000000 --logs 1000000 --hours 24 \\
+           --format bulk --out ../dataset
+
+    # Load into a local Elasticsearch
+    for f in ../dataset/*.bulk; do
+        curl -s -o /dev/null -H 'Content-Type: application/x-ndjson' \\
+             --data-binary @"$f" http://localhost:9200/_bulk
+    done
+    # (with --gzip: *.bulk.gz and -H 'Content-Encoding: gzip')
+
+    # Fixed range (reproducible regardless of when it runs)
+    python3 -m payload_gen.dataset --seed 7 --spans 200000 --logs 0 \\
+           --start 2025-01-01T00:00:00Z --end 2025-01-01T06:00:00Z
+
+    # 1B spans over 7 days, 256 gzip shards on every core
+    python3 -m payload_gen.dataset --spans 1000000000 --logs 0 --hours 168 \\
+           --format bulk --gzip --shards 256 --out ../dataset
+
+Environment Variables:
+    ELASTICSEARCH_APM_LOG_STREAM: Log data stream for bulk output (default: logs-apm)
+    ELASTICSEARCH_APM_SPAN_STREAM: Span data stream for bulk output (default: traces-apm)
+"""
+
+import argparse
+import gzip
+import multiprocessing
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from .builders import checkout_span_chains, realistic_logs, realistic_span_chains
+
+LOG_STREAM = os.getenv('ELASTICSEARCH_APM_LOG_STREAM', 'logs-apm')
+SPAN_STREAM = os.getenv('ELASTICSEARCH_APM_SPAN_STREAM', 'traces-apm')
+
+# Items per builder call; smaller batches are used when needed so consecutive
+# batches stay about a second apart and the data covers the range evenly
+MAX_BATCH_ITEMS = 300
+REALISTIC_CHAIN_SPANS = 3
+CHECKOUT_CHAIN_SPANS = 4
+
+SPAN_DOCUMENT_FIELDS = (
+    'service_name', 'environment', 'trace_id', 'span_id', 'parent_span_id', 'name', 'kind',
+    'duration_ms', 'status', 'http_method', 'http_path', 'http_status_code',
+)
+LOG_DOCUMENT_FIELDS = (
+    'service_name', 'environment', 'trace_id', 'span_id', 'level', 'message',
+    'http_method', 'http_path', 'http_status_code',
+)
+
+# Latency sketch buckets, same as backend/src/shared/apm/rollup/latency-sketch.ts
+LATENCY_SKETCH_RELATIVE_ACCURACY = 0.02
+LATENCY_SKETCH_MIN_MS = 0.001
+_LN_GAMMA = math.log((1 + LATENCY_SKETCH_RELATIVE_ACCURACY) / (1 - LATENCY_SKETCH_RELATIVE_ACCURACY))
+_MIN_BUCKET = math.ceil(math.log(LATENCY_SKETCH_MIN_MS) / _LN_GAMMA)
+
+
+def parse_time(text):
+    """ISO-8601 ('2025-01-01T00:00:00Z') or epoch seconds -> epoch seconds"""
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+
+
+def _batch_slots(count, batch_items, start, end):
+    """Split `count` items over [start, end): yields (items, batch end time)"""
+    batches = max(1, -(-count // batch_items))
+    width = (end - start) / batches
+    for b in range(batches):
+        yield min(batch_items, count - b * batch_items), start + (b + 1) * width
+
+
+def _batch_size(count, start, end):
+    """Items per batch so that batches are at most ~1s apart (and <= MAX_BATCH_ITEMS)"""
+    return max(1, min(MAX_BATCH_ITEMS, int(count / max(end - start, 1.0))))
+
+
+def span_batches(count, start, end, rng, checkout_ratio=0.2):
+    """
+    Yield span batches totalling exactly `count` spans between `start` and `end`.
+
+    Each batch is a run of realistic 3-span chains or, at `checkout_ratio`,
+    order-service checkout chains. The last batch is cut to the exact count,
+    which keeps the root of the cut chain.
+    """
+    for items, batch_end in _batch_slots(count, _batch_size(count, start, end), start, end):
+        if rng.random() < checkout_ratio:
+            spans = checkout_span_chains(-(-items // CHECKOUT_CHAIN_SPANS), rng=rng, now=batch_end)
+        else:
+            spans = realistic_span_chains(-(-items // REALISTIC_CHAIN_SPANS), rng=rng, now=batch_end)
+        yield spans[:items]
+
+
+def log_batches(count, start, end, rng):
+    """Yield realistic log batches totalling exactly `count` logs between `start` and `end`"""
+    for items, batch_end in _batch_slots(count, _batch_size(count, start, end), start, end):
+        yield realistic_logs(items, rng=rng, now=batch_end)
+
+
+def _es_timestamp(value):
+    """Builder timestamp ('...T00:00:00.123456+00:00') -> Date.toISOString() form"""
+    return value[:23] + 'Z'
+
+
+def _normalize_labels(labels):
+    """Same rule as the ingest services: primitives kept, everything else JSON-encoded"""
+    normalized = {}
+    for key, value in labels.items():
+        if isinstance(value, (str, int, float, bool)):
+            normalized[key] = value
+        elif value is not None:
+            normalized[key] = json.dumps(value, separators=(',', ':'))
+    return normalized
+
+
+def _document(event, doc_type, fields):
+    timestamp = _es_timestamp(event['timestamp'])
+    document = {'@timestamp': timestamp, 'type': doc_type}
+    for field in fields:
+        value = event.get(field)
+        if value is not None:
+            document[field] = value
+    if event.get('labels'):
+        document['labels'] = _normalize_labels(event['labels'])
+    # ingestedAt follows the event time so the export stays reproducible
+    document['ingestedAt'] = timestamp
+    return document
+
+
+def latency_bucket(duration_ms):
+    """Sketch bucket index for a duration, same as toLatencyBucket()"""
+    if not isinstance(duration_ms, (int, float)) or not duration_ms > LATENCY_SKETCH_MIN_MS:
+        return _MIN_BUCKET
+    return math.ceil(math.log(duration_ms) / _LN_GAMMA)
+
+
+def span_document(event):
+    """traces-apm document for one span event (see SpanIngestService and SpanEnricher)"""
+    document = _document(event, 'span', SPAN_DOCUMENT_FIELDS)
+    document.setdefault('parent_span_id', None)
+    # Derived fields the ingest enrichment adds, so preloaded data takes the same query paths
+    document['is_error'] = document.get('status') == 'ERROR'
+    document['is_root'] = not document.get('parent_span_id')
+    document['duration_bucket'] = latency_bucket(document.get('duration_ms'))
+    return document
+
+
+def log_document(event):
+    """logs-apm document for one log event (see LogIngestService)"""
+    return _document(event, 'log', LOG_DOCUMENT_FIELDS)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class _PartWriter:
+    """Writes lines to `<prefix>-00001.<ext>`, `-00002`, ... with at most `per_part` records each"""
+
+    def __init__(self, out_dir, prefix, ext, per_part, compress):
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.ext = ext + ('.gz' if compress else '')
+        self.per_part = per_part
+        self.compress = compress
+        self.paths = []
+        self.bytes_written = 0
+        self._file = None
+        self._raw = None
+        self._in_part = 0
+
+    def _open_next(self):
+        self.close()
+        path = os.path.join(self.out_dir, f'{self.prefix}-{len(self.paths) + 1:05d}.{self.ext}')
+        # mtime=0 keeps gzip output byte-identical across runs
+        self._raw = open(path, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', mtime=0) if self.compress else self._raw
+        self._in_part = 0
+        self.paths.append(path)
+
+    def write(self, records):
+        """Write encoded records (bytes, newline-terminated), rolling parts as needed"""
+        for record in records:
+            if self._file is None or (self.per_part and self._in_part >= self.per_part):
+                self._open_next()
+            self._file.write(record)
+            self._in_part += 1
+            self.bytes_written += len(record)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            if self.compress:
+                self._raw.close()
+            self._file = None
+
+
+def export_stream(batches, writer, fmt, to_document, index):
+    """Encode and write every batch; returns the number of items written"""
+    action = (_dumps({'create': {'_index': index}}) + '\n').encode('utf-8')
+    items = 0
+    for batch in batches:
+        if fmt == 'bulk':
+            writer.write(action + (_dumps(to_document(event)) + '\n').encode('utf-8') for event in batch)
+        else:
+            writer.write((_dumps(event) + '\n').encode('utf-8') for event in batch)
+        items += len(batch)
+    return items
+
+
+def export_dataset(out_dir, spans, logs, start, end, seed, fmt='ndjson', bulk_docs=5000,
+                   compress=False, checkout_ratio=0.2, prefix=''):
+    """
+    Write the dataset for (`seed`, `start`, `end`) into `out_dir`.
+
+    Spans and logs use separate seeded streams, so changing one count does not
+    change the other stream's content. Returns {stream: (items, paths, bytes)}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ext = 'bulk' if fmt == 'bulk' else 'ndjson'
+    # ndjson parts only roll over for bulk output; raw events go to one file per stream
+    per_part = bulk_docs if fmt == 'bulk' else 0
+    streams = [
+        ('spans', SPAN_STREAM, spans,
+         lambda rng: span_batches(spans, start, end, rng, checkout_ratio), span_document),
+        ('logs', LOG_STREAM, logs,
+         lambda rng: log_batches(logs, start, end, rng), log_document),
+    ]
+
+    results = {}
+    for label, index, count, batches, to_document in streams:
+        if count <= 0:
+            continue
+        rng = random.Random(f'{seed}:{label}')
+        name = f'{prefix}{index if fmt == "bulk" else label}'
+        writer = _PartWriter(out_dir, name, ext, per_part, compress)
+        try:
+            items = export_stream(batches(rng), writer, fmt, to_document, index)
+        finally:
+            writer.close()
+        results[label] = (items, writer.paths, writer.bytes_written)
+    return results
+
+
+def _export_shard(shard, shards, out_dir, spans, logs, start, end, seed, options):
+    """Process-pool entry point: export one time slice with its own seed and counts"""
+    width = (end - start) / shards
+    return shard, export_dataset(
+        out_dir,
+        spans * (shard + 1) // shards - spans * shard // shards,
+        logs * (shard + 1) // shards - logs * shard // shards,
+        start + shard * width,
+        start + (shard + 1) * width,
+        f'{seed}/{shard}',
+        prefix=f'shard{shard:04d}-',
+        **options,
+    )
+
+
+def export_sharded(out_dir, spans, logs, start, end, seed, shards, workers=None,
+                   on_shard=None, **options):
+    """
+    Export `shards` time slices in a process pool of `workers` processes.
+
+    Shard i covers the i-th slice of [start, end) and gets seed '<seed>/<i>',
+    so the files only depend on (seed, range, shards). `on_shard(shard,
+    result)` is called as shards finish. Returns the merged
+    {stream: (items, paths, bytes)}.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or multiprocessing.cpu_count()) as pool:
+        futures = [
+            pool.submit(_export_shard, shard, shards, out_dir, spans, logs, start, end, seed, options)
+            for shard in range(shards)
+        ]
+        for future in as_completed(futures):
+            shard, result = future.result()
+            if on_shard is not None:
+                on_shard(shard, result)
+            for label, (items, paths, size) in result.items():
+                total_items, total_paths, total_size = results.get(label, (0, [], 0))
+                results[label] = (total_items + items, total_paths + paths, total_size + size)
+    for _, paths, _ in results.values():
+        paths.sort()
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Seeded APM dataset export (NDJSON / _bulk)')
+    parser.add_argument('--seed', default='0', help='Seed; same seed + range = identical output (default: 0)')
+    parser.add_argument('--spans', type=int, default=100_000, help='Number of spans (default: 100000)')
+    parser.add_argument('--logs', type=int, default=100_000, help='Number of logs (default: 100000)')
+    parser.add_argument('--start', help='Range start, ISO-8601 or epoch seconds (default: end - hours)')
+    parser.add_argument('--end', help='Range end, ISO-8601 or epoch seconds (default: now, to the minute)')
+    parser.add_argument('--hours', type=float, default=1.0, help='Range length when --start is omitted (default: 1)')
+    parser.add_argument('--format', choices=('ndjson', 'bulk'), default='ndjson', dest='fmt',
+                        help='Raw producer events or Elasticsearch _bulk bodies (default: ndjson)')
+    parser.add_argument('--bulk-docs', type=int, default=5000, help='Documents per _bulk file (default: 5000)')
+    parser.add_argument('--gzip', action='store_true', help='gzip every output file')
+    parser.add_argument('--checkout-ratio', type=float, default=0.2,
+                        help='Share of span batches that are checkout flows (default: 0.2)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Time slices written as separate seeded shards (default: 1)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Processes writing shards in parallel (default: one per core)')
+    parser.add_argument('--out', default='dataset', help='Output directory (default: ./dataset)')
+    args = parser.parse_args(argv)
+
+    if args.shards < 1:
+        parser.error('--shards must be at least 1')
+    args.workers = min(args.workers or multiprocessing.cpu_count(), args.shards)
+
+    if args.end is not None:
+        args.end = parse_time(args.end)
+    else:
+        now = time.time()
+        args.end = now - now % 60
+    args.start = parse_time(args.start) if args.start is not None else args.end - args.hours * 3600
+    if args.start >= args.end:
+        parser.error('--start must be before --end')
+    return args
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def main():
+    args = parse_args()
+
+    print("\n" + "="*80)
+    print("📦 Seeded Dataset Export")
+    print("="*80)
+    print(f"Seed: {args.seed}")
+    print(f"Range: {_iso(args.start)} → {_iso(args.end)}")
+    print(f"Spans: {args.spans:,} | Logs: {args.logs:,}")
+    print(f"Format: {args.fmt}{' (gzip)' if args.gzip else ''} → {args.out}")
+    print(f"Shards: {args.shards:,} on {args.workers} process(es)")
+    print("-"*80)
+
+    options = {
+        'fmt': args.fmt,
+        'bulk_docs': args.bulk_docs,
+        'compress': args.gzip,
+        'checkout_ratio': args.checkout_ratio,
+    }
+    started = time.perf_counter()
+    if args.shards == 1:
+        results = export_dataset(
+            args.out, args.spans, args.logs, args.start, args.end, args.seed, **options,
+        )
+    else:
+        done = []
+
+        def on_shard(shard, result):
+            done.append(shard)
+            spans_done = result.get('spans', (0,))[0]
+            print(f"shard {shard:04d} done ({len(done):,}/{args.shards:,}), "
+                  f"{spans_done:,} spans, {time.perf_counter() - started:.1f}s elapsed")
+
+        results = export_sharded(
+            args.out, args.spans, args.logs, args.start, args.end, args.seed,
+            args.shards, args.workers, on_shard=on_shard, **options,
+        )
+    elapsed = time.perf_counter() - started
+
+    total = 0
+    for label, (items, paths, size) in results.items():
+        total += items
+        print(f"{label:<6} {items:>12,} items in {len(paths):,} file(s), {size / 1e6:,.1f} MB uncompressed")
+    print(f"\nTotal: {total:,} items in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} items/sec)")
+    if 'spans' in results:
+        spans_per_sec = results['spans'][0] / max(elapsed, 1e-9)
+        print(f"Spans: {spans_per_sec:,.0f} spans/sec aggregate, "
+              f"{spans_per_sec / args.workers:,.0f} spans/sec per worker")
+    print("="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
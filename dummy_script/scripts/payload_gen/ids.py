@@ -0,0 +1,46 @@
+"""
+Bulk random hex ID generation.
+
+A whole batch of IDs is drawn from a single byte buffer (os.urandom, or a
+seeded random.Random when reproducibility matters) and sliced, instead of
+calling random.choices once per ID.
+"""
+
+import os
+
+
+def random_hex_ids(count, width, rng=None):
+    """Return `count` lowercase hex strings of `width` characters"""
+    if count <= 0:
+        return []
+
+    step = width + (width & 1)
+    nbytes = count * step // 2
+    raw = rng.randbytes(nbytes) if rng is not None else os.urandom(nbytes)
+    blob = raw.hex()
+    return [blob[i:i + width] for i in range(0, count * step, step)]
+
+
+def trace_ids(count, rng=None):
+    """Generate `count` random 32-character hex trace IDs"""
+    return random_hex_ids(count, 32, rng)
+
+
+def span_ids(count, rng=None):
+    """Generate `count` random 16-character hex span IDs"""
+    return random_hex_ids(count, 16, rng)
+
+
+def container_ids(count, rng=None):
+    """Generate `count` realistic 64-character container IDs"""
+    return random_hex_ids(count, 64, rng)
+
+
+def generate_trace_id(rng=None):
+    """Generate a random 32-character hex trace ID"""
+    return random_hex_ids(1, 32, rng)[0]
+
+
+def generate_span_id(rng=None):
+    """Generate a random 16-character hex span ID"""
+    return random_hex_ids(1, 16, rng)[0]
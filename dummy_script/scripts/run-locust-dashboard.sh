@@ -0,0 +1,115 @@
+#!/bin/bash
+
+# Locust Query API Dashboard Test Runner
+# Replays dashboard read sessions against query-api
+
+set -e
+
+# Colors for output
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+YELLOW='\033[1;33m'
+RED='\033[0;31m'
+NC='\033[0m' # No Color
+
+# Default configuration
+QUERY_API_URL="${QUERY_API_URL:-https://api.jungle-panopticon.cloud/query}"
+export CACHE_HIT_RATIO="${CACHE_HIT_RATIO:-0.8}"
+
+# Get script directory and set locustfile path
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+LOCUST_FILE="${SCRIPT_DIR}/locustfile_dashboard.py"
+REPORTS_DIR="$( cd "${SCRIPT_DIR}/.." && pwd )/reports"
+
+echo -e "${BLUE}=================================================${NC}"
+echo -e "${BLUE}🦗 Locust Query API Dashboard Test Runner${NC}"
+echo -e "${BLUE}=================================================${NC}"
+echo ""
+
+# Check if locust is installed (try both command and python module)
+if command -v locust &> /dev/null; then
+    LOCUST_CMD="locust"
+elif python3 -m locust --version &> /dev/null; then
+    LOCUST_CMD="python3 -m locust"
+else
+    echo -e "${RED}❌ Locust is not installed!${NC}"
+    echo -e "${YELLOW}Install it with: pip3 install locust${NC}"
+    exit 1
+fi
+
+echo -e "${GREEN}✓ Locust is installed${NC}"
+echo -e "Target Server: ${BLUE}${QUERY_API_URL}${NC}"
+echo -e "Cache-hit Ratio: ${BLUE}${CACHE_HIT_RATIO}${NC}"
+echo ""
+
+# Display menu
+echo "Select test mode:"
+echo "  1) Short Test - 10 minutes (20 dashboard users, Headless)"
+echo "  2) Concurrency Test - 10 minutes (100 dashboard users, Headless)"
+echo "  3) Web UI mode (Interactive)"
+echo "  4) Custom parameters"
+echo ""
+read -p "Enter choice [1-4]: " choice
+
+case $choice in
+    1|2)
+        if [[ "$choice" == "1" ]]; then users=20; spawn_rate=2; else users=100; spawn_rate=10; fi
+        echo -e "${GREEN}Starting 10-minute dashboard test...${NC}"
+        echo -e "${YELLOW}Users: ${users} concurrent dashboard sessions${NC}"
+        echo -e "${YELLOW}Compare [shared] vs [unique] metric rows for cached vs uncached p95${NC}"
+        echo ""
+        mkdir -p "$REPORTS_DIR"
+        $LOCUST_CMD -f "$LOCUST_FILE" \
+               --host "$QUERY_API_URL" \
+               --users "$users" \
+               --spawn-rate "$spawn_rate" \
+               --run-time 10m \
+               --headless \
+               --print-stats \
+               --html "${REPORTS_DIR}/locust-dashboard-${users}u-$(date +%Y%m%d-%H%M%S).html"
+        ;;
+    3)
+        echo -e "${GREEN}Starting Locust in Web UI mode...${NC}"
+        echo -e "${YELLOW}Open http://localhost:8089 in your browser${NC}"
+        echo ""
+        mkdir -p "$REPORTS_DIR"
+        $LOCUST_CMD -f "$LOCUST_FILE" \
+               --host "$QUERY_API_URL" \
+               --html "${REPORTS_DIR}/locust-dashboard-webui-$(date +%Y%m%d-%H%M%S).html"
+        ;;
+    4)
+        echo ""
+        read -p "Number of users: " users
+        read -p "Spawn rate (users/sec): " spawn_rate
+        read -p "Run time (e.g., 1h, 30m, 300s): " run_time
+        echo -e "${GREEN}Starting custom dashboard test...${NC}"
+        echo -e "${YELLOW}Users: ${users}, Spawn rate: ${spawn_rate}, Duration: ${run_time}${NC}"
+        mkdir -p "$REPORTS_DIR"
+        $LOCUST_CMD -f "$LOCUST_FILE" \
+               --host "$QUERY_API_URL" \
+               --users "$users" \
+               --spawn-rate "$spawn_rate" \
+               --run-time "$run_time" \
+               --headless \
+               --print-stats \
+               --html "${REPORTS_DIR}/locust-dashboard-custom-$(date +%Y%m%d-%H%M%S).html"
+        ;;
+    *)
+        echo -e "${RED}Invalid choice!${NC}"
+        exit 1
+        ;;
+esac
+
+echo ""
+echo -e "${BLUE}=================================================${NC}"
+echo -e "${GREEN}✅ Test completed!${NC}"
+echo -e "${BLUE}=================================================${NC}"
+
+# Check if reports directory exists and show last report
+if [ -d "$REPORTS_DIR" ]; then
+    LATEST_REPORT=$(ls -t "${REPORTS_DIR}"/locust-dashboard-*.html 2>/dev/null | head -1)
+    if [ -n "$LATEST_REPORT" ]; then
+        echo -e "${YELLOW}Report saved: ${LATEST_REPORT}${NC}"
+        echo -e "${YELLOW}Open it in a browser to view detailed results${NC}"
+    fi
+fi
@@ -14,6 +14,8 @@ NC='\033[0m' # No Color
 
 # Default configuration
 PRODUCER_URL="${PRODUCER_URL:-https://api.jungle-panopticon.cloud/producer}"
+# HTTP client: requests (HttpUser) or fast (FastHttpUser, keep-alive pool)
+export LOCUST_TRANSPORT="${LOCUST_TRANSPORT:-requests}"
 
 # Get script directory and set locustfile path
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
@@ -38,6 +40,10 @@ fi
 
 echo -e "${GREEN}✓ Locust is installed${NC}"
 echo -e "Target Server: ${BLUE}${PRODUCER_URL}${NC}"
+echo -e "Transport: ${BLUE}${LOCUST_TRANSPORT}${NC}"
+if [[ "$LOCUST_TRANSPORT" != "fast" ]]; then
+    echo -e "${YELLOW}Tip: LOCUST_TRANSPORT=fast uses FastHttpUser and needs fewer worker machines${NC}"
+fi
 echo ""
 
 # Display menu
@@ -47,8 +53,9 @@ echo "  2) Web UI Mode - Interactive monitoring (single instance)"
 echo "  3) Distributed Master - For 5-instance distributed setup (RECOMMENDED)"
 echo "  4) Distributed Worker - Run on worker nodes"
 echo "  5) Custom parameters"
+echo "  6) Open-loop step ramp - Fixed spans/sec per stage, finds saturation point (headless)"
 echo ""
-read -p "Enter choice [1-5]: " choice
+read -p "Enter choice [1-6]: " choice
 
 case $choice in
     1)
@@ -107,6 +114,7 @@ case $choice in
         echo -e "${GREEN}Starting Locust Worker node...${NC}"
         echo -e "${YELLOW}Connecting to master: ${master_host}:5557${NC}"
         echo -e "${YELLOW}This worker will run tasks assigned by the master${NC}"
+        echo -e "${YELLOW}Requests/sec per worker core is printed when the test stops${NC}"
         echo ""
         $LOCUST_CMD -f "$LOCUST_FILE" \
                --worker \
@@ -152,6 +160,23 @@ case $choice in
                    --html "${REPORTS_DIR}/locust-traffic-custom-$(date +%Y%m%d-%H%M%S).html"
         fi
         ;;
+    6)
+        # Stages are cluster-wide spans/sec; users only carry the rate (see locust_support/arrival.py)
+        export SPAN_ARRIVAL_STAGES="${SPAN_ARRIVAL_STAGES:-ramp:10000:60000:10000:60s}"
+        export ARRIVAL_USERS="${ARRIVAL_USERS:-50}"
+        echo -e "${GREEN}Starting open-loop step-ramp test...${NC}"
+        echo -e "${YELLOW}Configuration:${NC}"
+        echo -e "${YELLOW}  - Schedule (spans/sec): ${SPAN_ARRIVAL_STAGES}${NC}"
+        echo -e "${YELLOW}  - Users: ${ARRIVAL_USERS} (requests are not throttled by response time)${NC}"
+        echo -e "${YELLOW}  - Saturation shows as rising latency and 'dropped (in-flight limit)' failures${NC}"
+        echo ""
+        mkdir -p "$REPORTS_DIR"
+        $LOCUST_CMD -f "$LOCUST_FILE" \
+               --host "$PRODUCER_URL" \
+               --headless \
+               --print-stats \
+               --html "${REPORTS_DIR}/locust-traffic-openloop-$(date +%Y%m%d-%H%M%S).html"
+        ;;
     *)
         echo -e "${RED}Invalid choice!${NC}"
         exit 1
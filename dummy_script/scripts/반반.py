@@ -21,16 +21,34 @@ Usage:
     # Distributed worker
     locust -f scripts/locustfile_traffic.py --worker --master-host <master-ip>
 
+    # Open-loop: logs and spans at independent fixed rates (step ramp on spans)
+    LOG_ARRIVAL_STAGES=5m:10000 SPAN_ARRIVAL_STAGES=ramp:10000:50000:10000:60s locust -f scripts/반반.py --headless ...
+
 Environment Variables:
     PRODUCER_URL: Override target server (default: https://api.jungle-panopticon.cloud/producer)
+    LOCUST_TRANSPORT: 'requests' (HttpUser, default) or 'fast' (FastHttpUser, keep-alive pool)
+    FRESHNESS_PROBE: 'true' to add a probe user measuring publish→queryable latency via QUERY_API_URL
+    LOG_ARRIVAL_STAGES: Open-loop logs/sec schedule, e.g. '60s:10000,60s:20000' (unset = closed loop)
+    SPAN_ARRIVAL_STAGES: Open-loop spans/sec schedule, same syntax (unset = closed loop)
+    ARRIVAL_USERS: Users sharing the open-loop rates, cluster-wide (default: 50)
 """
 
-import random
 import os
-from datetime import datetime, timezone, timedelta
-from locust import HttpUser, task, constant, events
+from locust import task, constant, events
+from locust.exception import StopUser
 from locust.runners import MasterRunner
 
+from locust_support import (
+    ARRIVAL_USERS,
+    OpenLoopPacer,
+    TransportUser,
+    arrival_shape,
+    core_throughput,
+    drive_streams,
+    freshness_probe_user,
+)
+from payload_gen import linear_traces, simple_logs
+
 
 # Configuration
 PRODUCER_URL = os.getenv("PRODUCER_URL", "https://api.jungle-panopticon.cloud/producer")
@@ -47,146 +65,30 @@ TOTAL_ITEMS_PER_REQUEST = (
 request_count = 0
 
 
-def generate_trace_id():
-    """Generate a random 32-character hex trace ID"""
-    return "".join(random.choices("0123456789abcdef", k=32))
-
-
-def generate_span_id():
-    """Generate a random 16-character hex span ID"""
-    return "".join(random.choices("0123456789abcdef", k=16))
-
-
-def generate_single_trace(service_name="API-Backend-Local", environment="Develop"):
-    """
-    Generate a single trace containing 10 connected spans.
-
-    All 10 spans share the same trace_id and are connected via parent-child
-    relationships forming a chain.
-
-    Args:
-        service_name: Service name for all spans in this trace
-        environment: Environment name (e.g., 'Develop', 'production')
-
-    Returns:
-        list: 10 span dictionaries sharing the same trace_id
-    """
-    # Generate unique trace_id for this trace
-    trace_id = generate_trace_id()
-
-    # Base timestamp for this trace (will increment slightly for each span)
-    base_time = datetime.now(timezone.utc) - timedelta(
-        milliseconds=random.randint(0, 1000)
-    )
-
-    spans = []
-    parent_span_id = None  # First span has no parent
-
-    for i in range(SPANS_PER_TRACE):
-        # Generate unique span_id
-        span_id = generate_span_id()
-
-        # Increment timestamp slightly for each span in the chain
-        span_timestamp = base_time + timedelta(milliseconds=i * random.uniform(1, 5))
-
-        # Alternate between CLIENT (database) and SERVER (HTTP) kinds
-        kind = random.choice(["CLIENT", "SERVER"])
-
-        # Build span based on kind
-        span = {
-            "type": "span",
-            "timestamp": span_timestamp.isoformat(),
-            "service_name": service_name,
-            "environment": environment,
-            "trace_id": trace_id,
-            "span_id": span_id,
-            "parent_span_id": parent_span_id,  # null for first span, else previous span_id
-            "name": (
-                f"SELECT operation-{i}"
-                if kind == "CLIENT"
-                else f"GET /api/endpoint-{i}"
-            ),
-            "kind": kind,
-            "duration_ms": round(random.uniform(1, 100), 2),
-            "status": random.choice(["OK"] * 9 + ["ERROR"]),  # 90% OK, 10% ERROR
-        }
-
-        # Add kind-specific fields
-        if kind == "CLIENT":
-            span.update(
-                {
-                    "db_system": "postgresql",
-                    "db_statement": f"SELECT * FROM table{i} WHERE id = {random.randint(1, 1000)}",
-                    "db_operation": "SELECT",
-                }
-            )
-        else:  # SERVER
-            span.update(
-                {
-                    "http_method": "GET",
-                    "http_path": f"/posts/{i}",
-                    "http_url": f"http://localhost:3001/posts/{i}",
-                    "http_status_code": 200 if span["status"] == "OK" else 500,
-                }
-            )
-
-        spans.append(span)
-        parent_span_id = span_id  # Next span's parent is this span
-
-    return spans
-
-
-def generate_log_data():
-    """Generate a simple log entry matching the producer's expected format"""
-    return {
-        "type": "log",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "service_name": "sample-service",
-        "environment": "prod",
-        "level": "INFO",
-        "message": "샘플 APM 로그 이벤트",
-        "trace_id": generate_trace_id(),
-        "span_id": generate_span_id(),
-        "http_method": "GET",
-        "http_path": "/api/sample",
-        "http_status_code": 200,
-        "labels": {
-            "feature": "sample",
-            "host": "local",
-        },
-    }
-
-
-def generate_batch_spans():
-    """
-    Generate a batch of 20 spans (2 traces × 10 spans each).
-
-    Each trace is independent with its own trace_id and timestamp.
-
-    Returns:
-        list: 20 span dictionaries from 2 independent traces
-    """
-    all_spans = []
-
-    # Generate 2 complete traces
-    for _ in range(TRACES_PER_REQUEST):
-        trace_spans = generate_single_trace()
-        all_spans.extend(trace_spans)
+# Requests/sec per worker core for the selected transport (printed on test stop)
+core_throughput.attach(events)
 
-    return all_spans
+# Open-loop mode: each stream follows its own *_ARRIVAL_STAGES schedule regardless
+# of response time, and the step-ramp shape replaces --users/--spawn-rate
+log_pacer = OpenLoopPacer.from_env(
+    "LOG_ARRIVAL_STAGES", items_per_request=LOGS_PER_REQUEST, name="logs"
+)
+span_pacer = OpenLoopPacer.from_env(
+    "SPAN_ARRIVAL_STAGES",
+    items_per_request=TRACES_PER_REQUEST * SPANS_PER_TRACE,
+    name="spans",
+)
+for pacer in (log_pacer, span_pacer):
+    if pacer is not None:
+        pacer.attach(events)
+StepArrivalShape = arrival_shape(log_pacer, span_pacer)
+OPEN_LOOP = StepArrivalShape is not None
 
+# Publish -> queryable latency probe (FRESHNESS_PROBE=true), reported as a FRESHNESS entry
+FreshnessProbe = freshness_probe_user(PRODUCER_URL)
 
-def generate_batch_logs():
-    """
-    Generate a batch of 20 logs.
 
-    Returns:
-        list: 20 log dictionaries
-    """
-    return [generate_log_data() for _ in range(LOGS_PER_REQUEST)]
-
-
-class HighVolumeTrafficTest(HttpUser):
+class HighVolumeTrafficTest(TransportUser):
     """
     High-volume logs and traces load test for producer server.
 
@@ -204,11 +106,33 @@ class HighVolumeTrafficTest(HttpUser):
     # Override host with environment variable
     host = PRODUCER_URL
 
+    def run_open_loop(self):
+        """Drive both streams at their scheduled rates until the schedules end"""
+        drive_streams(
+            self,
+            (log_pacer, self.post_logs),
+            (span_pacer, self.post_spans),
+        )
+        raise StopUser()
+
     @task
     def send_batch_logs(self):
+        """Send logs closed-loop, or hand the user to the open-loop pacers"""
+        if OPEN_LOOP:
+            self.run_open_loop()
+        self.post_logs()
+
+    @task
+    def send_batch_spans(self):
+        """Send spans closed-loop, or hand the user to the open-loop pacers"""
+        if OPEN_LOOP:
+            self.run_open_loop()
+        self.post_spans()
+
+    def post_logs(self):
         """Send 20 logs to /dummy/logs endpoint"""
-        # Generate batch of 20 logs
-        batch_logs = generate_batch_logs()
+        # Generate batch of 20 logs in one call
+        batch_logs = simple_logs(LOGS_PER_REQUEST)
 
         with self.client.post(
             "/dummy/logs",
@@ -221,13 +145,12 @@ class HighVolumeTrafficTest(HttpUser):
             else:
                 response.failure(f"Expected 202, got {response.status_code}")
 
-    @task
-    def send_batch_spans(self):
+    def post_spans(self):
         """Send 20 spans (2 traces × 10 spans) to /dummy/traces endpoint"""
         global request_count
 
-        # Generate batch of 20 spans
-        batch_spans = generate_batch_spans()
+        # Generate batch of 20 spans (2 traces × 10 spans) in one call
+        batch_spans = linear_traces(TRACES_PER_REQUEST, SPANS_PER_TRACE)
 
         with self.client.post(
             "/dummy/traces",
@@ -273,7 +196,14 @@ def on_test_start(environment, **kwargs):
         print(f"  - duration_ms: 1-100ms (random)")
         print(f"  - status: OK (90%) or ERROR (10%)")
         print(f"  - parent_span_id: null for root, else previous span_id")
-        print(f"\nTest will run continuously until stopped.")
+        if OPEN_LOOP:
+            print(f"\nOpen-loop Schedule ({ARRIVAL_USERS} users):")
+            for pacer in (log_pacer, span_pacer):
+                if pacer is not None:
+                    print(f"  - {pacer.name}/sec: {pacer.schedule.describe()}")
+            print(f"Test will stop when the schedules end.")
+        else:
+            print(f"\nTest will run continuously until stopped.")
         print("=" * 80 + "\n")
 
 